@@ -0,0 +1,306 @@
+"""
+Batch assembly jobs for the doc-assembler API.
+
+A batch job renders one document per data row from a single template on the
+shared RenderPool (process pool, off the event loop) and exposes progress
+while it runs. Results are either one ZIP archive or individual .docx
+files, both under BATCH_OUTPUTS_DIR/<job_id>.
+
+Jobs live in memory (this service has no job database); finished jobs and
+their files are dropped after BATCH_JOB_TTL_SECONDS or when more than
+BATCH_MAX_JOBS are kept. A background sweep applies the TTL between requests
+and removes output directories left without a job (e.g. by a restart).
+"""
+
+import asyncio
+import json
+import logging
+import shutil
+import time
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_ZIP = "zip"
+OUTPUT_FILES = "files"
+
+TERMINAL_STATUSES = {"completed", "failed"}
+
+
+def parse_records(content: bytes) -> List[Dict[str, Any]]:
+    """
+    Parse uploaded rows: a JSON array of objects or NDJSON (one object per line).
+
+    Raises:
+        ValueError: If the content is not valid JSON/NDJSON of objects
+    """
+    text = content.decode("utf-8-sig").strip()
+    if not text:
+        raise ValueError("Upload contains no records")
+
+    if text.startswith("["):
+        try:
+            records = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON array: {e}")
+    else:
+        records = []
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid NDJSON on line {line_number}: {e}")
+
+    if not all(isinstance(record, dict) for record in records):
+        raise ValueError("Every record must be a JSON object")
+    return records
+
+
+@dataclass
+class BatchJob:
+    """State of one batch assembly job."""
+
+    job_id: str
+    template_path: str
+    output: str
+    total: int
+    status: str = "queued"
+    done: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    documents: List[str] = field(default_factory=list)
+    zip_name: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def progress(self) -> float:
+        return round(100.0 * self.done / self.total, 1) if self.total else 100.0
+
+
+class BatchJobManager:
+    """
+    Runs batch jobs as asyncio tasks on a RenderPool.
+
+    At most max_concurrent_jobs render at once; further jobs wait queued.
+    """
+
+    def __init__(
+        self,
+        render_pool,
+        output_root: Path,
+        max_concurrent_jobs: int = 2,
+        max_jobs: int = 200,
+        ttl_seconds: int = 86400,
+    ):
+        """
+        Args:
+            render_pool: RenderPool used for rendering
+            output_root: Directory for job outputs (one subdirectory per job)
+            max_concurrent_jobs: Jobs rendering at the same time
+            max_jobs: Jobs kept in memory (oldest finished jobs are dropped)
+            ttl_seconds: Finished jobs and their files are dropped after this
+        """
+        self.render_pool = render_pool
+        self.output_root = Path(output_root)
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self._jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._slots = asyncio.Semaphore(max_concurrent_jobs)
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def job_dir(self, job: BatchJob) -> Path:
+        return self.output_root / job.job_id
+
+    def create(
+        self,
+        template_path: str,
+        abs_template_path: Path,
+        records: List[Dict[str, Any]],
+        output: str = OUTPUT_ZIP,
+        name_field: Optional[str] = None,
+        field_types: Optional[Dict[str, str]] = None,
+        auto_normalize: bool = True,
+    ) -> BatchJob:
+        """Register a job and start it in the background."""
+        for path in self._evict():
+            shutil.rmtree(path, ignore_errors=True)
+
+        job = BatchJob(
+            job_id=uuid4().hex,
+            template_path=template_path,
+            output=output,
+            total=len(records),
+        )
+        if output == OUTPUT_ZIP:
+            job.zip_name = f"{abs_template_path.stem}_{job.job_id[:8]}.zip"
+
+        self._jobs[job.job_id] = job
+        self._tasks[job.job_id] = asyncio.create_task(
+            self._run(job, abs_template_path, records, name_field, field_types, auto_normalize)
+        )
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        return self._jobs.get(job_id)
+
+    def document_path(self, job: BatchJob, name: str) -> Optional[Path]:
+        """Path of a finished output file of the job (None if unknown)."""
+        if job.output == OUTPUT_ZIP:
+            allowed = {job.zip_name}
+        else:
+            allowed = set(job.documents)
+        if name not in allowed:
+            return None
+        path = self.job_dir(job) / name
+        return path if path.exists() else None
+
+    async def _run(
+        self,
+        job: BatchJob,
+        abs_template_path: Path,
+        records: List[Dict[str, Any]],
+        name_field: Optional[str],
+        field_types: Optional[Dict[str, str]],
+        auto_normalize: bool,
+    ) -> None:
+        # Import here: the batch helpers come from the doc-assembler package
+        from src.batch_engine import unique_docx_name
+
+        async with self._slots:
+            job.status = "running"
+            job.started_at = time.time()
+            job_dir = self.job_dir(job)
+            job_dir.mkdir(parents=True, exist_ok=True)
+            used_names: set = set()
+            zf = None
+
+            try:
+                if job.output == OUTPUT_ZIP:
+                    zf = zipfile.ZipFile(job_dir / job.zip_name, "w", zipfile.ZIP_DEFLATED)
+
+                async for result in self.render_pool.iter_render_records(
+                    records,
+                    abs_template_path,
+                    name_field=name_field,
+                    field_types=field_types,
+                    auto_normalize=auto_normalize,
+                ):
+                    if result["status"] == "success":
+                        name = unique_docx_name(result["filename_base"], used_names)
+                        # Compression/disk writes stay off the event loop too
+                        if zf is not None:
+                            await asyncio.to_thread(zf.writestr, name, result["content"])
+                        else:
+                            await asyncio.to_thread((job_dir / name).write_bytes, result["content"])
+                            job.documents.append(name)
+                    else:
+                        job.failed += 1
+                        job.errors.append({
+                            "item": result["json_file"],
+                            "error_type": result.get("error_type", "Unknown"),
+                            "message": result.get("message", "Unknown error"),
+                        })
+                    job.done += 1
+
+                if zf is not None and job.errors:
+                    zf.writestr("errors.json", json.dumps(
+                        {"error_count": len(job.errors), "errors": job.errors},
+                        indent=2,
+                        ensure_ascii=False,
+                    ))
+                job.status = "completed"
+            except Exception as e:
+                logger.error("Batch job failed", extra={"job_id": job.job_id, "error": str(e)}, exc_info=True)
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                if zf is not None:
+                    zf.close()
+                job.finished_at = time.time()
+                self._tasks.pop(job.job_id, None)
+
+            logger.info("Batch job finished", extra={
+                "job_id": job.job_id,
+                "status": job.status,
+                "total": job.total,
+                "failed": job.failed,
+                "duration_seconds": round(job.finished_at - job.started_at, 2),
+            })
+
+    def _evict(self) -> List[Path]:
+        """
+        Drop expired finished jobs, then the oldest finished ones over max_jobs.
+
+        Returns:
+            Output directories of the dropped jobs (for the caller to remove)
+        """
+        now = time.time()
+        finished = [
+            job for job in self._jobs.values()
+            if job.status in TERMINAL_STATUSES and job.finished_at is not None
+        ]
+        expired = [job for job in finished if now - job.finished_at > self.ttl_seconds]
+        overflow = max(0, len(self._jobs) - len(expired) - self.max_jobs + 1)
+        remaining = [job for job in finished if job not in expired]
+        dropped = expired + remaining[:overflow]
+        for job in dropped:
+            self._jobs.pop(job.job_id, None)
+        return [self.job_dir(job) for job in dropped]
+
+    async def sweep(self) -> int:
+        """
+        Apply the TTL/max_jobs limits and remove orphaned output directories.
+
+        Jobs are only known in memory, so a directory under output_root
+        without a job (left by a restart or a cancelled job) can never be
+        downloaded again.
+
+        Returns:
+            Number of directories removed
+        """
+        paths = set(self._evict())
+        if self.output_root.is_dir():
+            paths.update(
+                path for path in self.output_root.iterdir()
+                if path.is_dir() and path.name not in self._jobs
+            )
+        for path in paths:
+            await asyncio.to_thread(shutil.rmtree, path, ignore_errors=True)
+        if paths:
+            logger.info("Batch outputs swept", extra={"removed": len(paths)})
+        return len(paths)
+
+    def start_sweeper(self, interval_seconds: float) -> None:
+        """Sweep now and then every interval_seconds (on the running loop)."""
+        async def sweep_forever() -> None:
+            while True:
+                try:
+                    await self.sweep()
+                except Exception as e:
+                    logger.warning("Batch output sweep failed", extra={"error": str(e)})
+                await asyncio.sleep(interval_seconds)
+
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(sweep_forever())
+
+    async def shutdown(self) -> None:
+        """Stop the sweeper and cancel running jobs (their partial outputs are swept on the next start)."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
@@ -5,7 +5,7 @@ These models define request/response schemas for creating templates from DOCX fi
 """
 
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from datetime import datetime
 
 
@@ -16,11 +16,22 @@ from datetime import datetime
 class PatternsRequest(BaseModel):
     """Request model for pattern detection endpoint."""
 
-    text: str = Field(
-        ...,
+    text: Optional[str] = Field(
+        None,
         description="Text content to analyze for patterns",
         min_length=1
     )
+    document_id: Optional[str] = Field(
+        None,
+        description="Document ID from upload endpoint (analyzes its cached text instead of text)"
+    )
+
+    @model_validator(mode='after')
+    def validate_text_or_document(self) -> "PatternsRequest":
+        """Ensure text or document_id is given."""
+        if self.text is None and self.document_id is None:
+            raise ValueError("text or document_id is required")
+        return self
 
 
 class FieldAnnotation(BaseModel):
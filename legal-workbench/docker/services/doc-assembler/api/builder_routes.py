@@ -4,8 +4,8 @@ Template Builder API routes.
 Endpoints for creating templates from DOCX files with pattern detection and annotation.
 """
 
+import asyncio
 import os
-import re
 import json
 import shutil
 import logging
@@ -14,11 +14,11 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
 # Import builder models
 from .builder_models import (
@@ -34,8 +34,11 @@ from .builder_models import (
     DuplicateTemplateResponse,
 )
 
-# Import python-docx for document manipulation
-from docx import Document
+# doc-assembler package (path set up by main.py)
+from src.annotation_engine import AnnotationEngine
+from src.document_session import DocumentSession, DocumentSessionStore
+from src.pattern_detector import PatternDetector
+from src.template_catalog import TemplateCatalog
 
 
 # ============================================================================
@@ -61,6 +64,27 @@ except PermissionError:
     BUILDER_TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
     print(f"Warning: Using fallback templates directory: {BUILDER_TEMPLATES_DIR}")
 
+# Indexed builder templates ({id}.json metadata, newest first)
+builder_catalog = TemplateCatalog(
+    BUILDER_TEMPLATES_DIR,
+    require_docx=False,
+    sort_key=lambda entry: entry.created_at,
+    reverse=True,
+)
+
+# Parsed uploads kept in memory between /upload, /patterns and /save. The
+# upload is also written to TEMP_UPLOAD_DIR, so an evicted session is
+# re-parsed from disk instead of being lost.
+BUILDER_SESSION_TTL_SECONDS = int(os.getenv("BUILDER_SESSION_TTL_SECONDS", "3600"))
+BUILDER_SESSION_MAX_MB = int(os.getenv("BUILDER_SESSION_MAX_MB", "256"))
+BUILDER_MAX_SESSIONS = int(os.getenv("BUILDER_MAX_SESSIONS", "50"))
+
+document_sessions = DocumentSessionStore(
+    ttl_seconds=BUILDER_SESSION_TTL_SECONDS,
+    max_bytes=BUILDER_SESSION_MAX_MB * 1024 * 1024,
+    max_sessions=BUILDER_MAX_SESSIONS,
+)
+
 # Router instance
 router = APIRouter()
 
@@ -108,11 +132,46 @@ PATTERNS = {
     },
 }
 
+# All builder patterns compiled into one scanner (one pass per paragraph;
+# at the same position the pattern listed first above wins)
+pattern_detector = PatternDetector(PATTERNS, flags=0, include_defaults=False)
+
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
+def iter_patterns(text: str) -> Iterator[PatternMatch]:
+    """
+    Detect patterns in text, yielding matches paragraph by paragraph.
+
+    Text is scanned per "\n\n"-separated paragraph (the layout of
+    DocumentSession.text_content), so the first matches are available
+    before the whole document has been scanned. Offsets refer to the full
+    text.
+
+    Args:
+        text: Text to analyze
+
+    Yields:
+        Non-overlapping PatternMatch objects, sorted by position
+    """
+    pattern_counters: Dict[str, int] = {}
+
+    for match in pattern_detector.iter_detect(text.split("\n\n"), separator="\n\n"):
+        # Count occurrences of each pattern type for unique field naming
+        count = pattern_counters.get(match.type, 0) + 1
+        pattern_counters[match.type] = count
+
+        yield PatternMatch(
+            pattern_type=match.type,
+            start=match.start,
+            end=match.end,
+            value=match.value,
+            suggested_field=match.type if count == 1 else f"{match.type}_{count}",
+        )
+
+
 def detect_patterns(text: str) -> List[PatternMatch]:
     """
     Detect all patterns in text.
@@ -121,101 +180,103 @@ def detect_patterns(text: str) -> List[PatternMatch]:
         text: Text to analyze
 
     Returns:
-        List of PatternMatch objects
+        List of PatternMatch objects, sorted by position
     """
-    matches = []
-    pattern_counters = {}
-
-    for pattern_type, pattern_info in PATTERNS.items():
-        regex = pattern_info["regex"]
-
-        for match in re.finditer(regex, text):
-            # Count occurrences of each pattern type for unique field naming
-            if pattern_type not in pattern_counters:
-                pattern_counters[pattern_type] = 0
-            pattern_counters[pattern_type] += 1
-
-            # Generate field name with counter if multiple occurrences
-            if pattern_counters[pattern_type] == 1:
-                suggested_field = pattern_type
-            else:
-                suggested_field = f"{pattern_type}_{pattern_counters[pattern_type]}"
-
-            matches.append(
-                PatternMatch(
-                    pattern_type=pattern_type,
-                    start=match.start(),
-                    end=match.end(),
-                    value=match.group(),
-                    suggested_field=suggested_field,
-                )
-            )
-
-    # Sort by position
-    matches.sort(key=lambda m: m.start)
+    return list(iter_patterns(text))
 
-    return matches
 
-
-def extract_text_from_docx(file_path: Path) -> Dict[str, Any]:
+def get_document_session(document_id: str) -> Optional[DocumentSession]:
     """
-    Extract text content and metadata from DOCX file.
+    Parsed upload by document ID.
+
+    Served from memory; an evicted session is re-parsed from its temp file.
 
     Args:
-        file_path: Path to DOCX file
+        document_id: Document ID from the upload endpoint
 
     Returns:
-        Dict with text_content, paragraphs, and metadata
+        DocumentSession or None if the upload does not exist
     """
-    doc = Document(str(file_path))
+    session = document_sessions.get(document_id)
+    if session is not None:
+        return session
 
-    # Extract paragraphs
-    paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
+    source_path = TEMP_UPLOAD_DIR / f"{document_id}.docx"
+    if not source_path.exists():
+        return None
+    logger.info("Document session reloaded from disk: %s", document_id)
+    return document_sessions.open(source_path.read_bytes(), session_id=document_id)
 
-    # Full text
-    text_content = "\n\n".join(paragraphs)
 
-    # Calculate metadata
-    word_count = len(text_content.split())
-    char_count = len(text_content)
+async def require_document_session(document_id: str) -> DocumentSession:
+    """Parsed upload by document ID, or 404."""
+    session = await asyncio.to_thread(get_document_session, document_id)
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Uploaded document not found: {document_id}"
+        )
+    return session
 
-    metadata = {
-        "paragraphs": len(paragraphs),
-        "word_count": word_count,
-        "char_count": char_count,
-        "sections": len(doc.sections),
-        "tables": len(doc.tables),
-    }
 
-    return {
-        "text_content": text_content,
-        "paragraphs": paragraphs,
-        "metadata": metadata,
-    }
+def claim_document_session(document_id: str) -> Optional[DocumentSession]:
+    """
+    Parsed upload owned by one save.
+
+    The session is taken out of the store (annotating modifies its Document),
+    so a double or retried save re-parses a clean copy from the temp file.
+
+    Args:
+        document_id: Document ID from the upload endpoint
+
+    Returns:
+        DocumentSession or None if the upload does not exist
+    """
+    session = document_sessions.take(document_id)
+    if session is not None:
+        return session
+
+    source_path = TEMP_UPLOAD_DIR / f"{document_id}.docx"
+    if not source_path.exists():
+        return None
+    return DocumentSession.from_bytes(source_path.read_bytes(), session_id=document_id)
+
+
+def session_patterns(session: DocumentSession) -> List[PatternMatch]:
+    """Detected patterns of a session (computed on first use, then cached)."""
+    with session.lock:
+        if session.patterns is None:
+            session.patterns = detect_patterns(session.text_content)
+        return session.patterns
 
 
 def apply_annotations_to_docx(
-    source_path: Path,
+    session: DocumentSession,
     output_path: Path,
-    annotations: List[Dict[str, Any]],
-    text_content: str
+    annotations: List[Dict[str, Any]]
 ) -> List[str]:
     """
     Apply field annotations to DOCX document.
 
+    Every occurrence of each annotated text is replaced with its Jinja2
+    placeholder, including text split across runs; runs outside the
+    matches keep their formatting.
+
+    The session's Document is modified in place, so the session must come
+    from claim_document_session (not shared with the store).
+
     Args:
-        source_path: Path to source DOCX
+        session: Parsed upload, claimed for this save
         output_path: Path to save modified DOCX
         annotations: List of annotation dicts
-        text_content: Original text content
 
     Returns:
         List of field names that were applied
     """
-    # Load document
-    doc = Document(str(source_path))
+    text_content = session.text_content
 
-    # Sort annotations by position (reverse order for safe replacement)
+    # Sort annotations by position (reverse order; the first annotation of a
+    # repeated text decides its field)
     sorted_annotations = sorted(annotations, key=lambda a: a["start"], reverse=True)
 
     # Build replacement map
@@ -228,26 +289,16 @@ def apply_annotations_to_docx(
         replacements[original] = jinja_var
         field_names.append(annotation["field_name"])
 
-    # Apply replacements to all paragraphs
-    for para in doc.paragraphs:
-        for original, jinja_var in replacements.items():
-            if original in para.text:
-                # Replace in each run
-                for run in para.runs:
-                    if original in run.text:
-                        run.text = run.text.replace(original, jinja_var)
-
-                # Handle text split across runs
-                if original in para.text:
-                    full_text = para.text.replace(original, jinja_var)
-                    # Clear existing runs and add new
-                    for run in para.runs:
-                        run.text = ""
-                    if para.runs:
-                        para.runs[0].text = full_text
-
-    # Save modified document
-    doc.save(str(output_path))
+    # Replace every occurrence in one run-aware pass over the session's run
+    # map (keeps run formatting), then save the modified document
+    with session.lock:
+        stats = AnnotationEngine(replacements).apply_run_map(session.runs)
+        session.document.save(str(output_path))
+
+    logger.info(
+        "Annotations applied: replacements=%d, paragraphs=%d, runs=%d",
+        stats.replacements, stats.paragraphs, stats.runs_rewritten
+    )
 
     return field_names
 
@@ -286,6 +337,8 @@ def save_template_metadata(
     with open(meta_path, "w", encoding="utf-8") as f:
         json.dump(metadata, f, indent=2, ensure_ascii=False)
 
+    builder_catalog.reload(template_id)
+
     return metadata
 
 
@@ -310,20 +363,25 @@ def load_template_metadata(template_id: str) -> Dict[str, Any]:
         return json.load(f)
 
 
-def list_builder_templates() -> List[TemplateBuilderInfo]:
+def list_builder_templates(
+    query: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[TemplateBuilderInfo]:
     """
-    List all builder templates.
+    List builder templates from the template catalog.
+
+    Args:
+        query: Optional search on name and description (case/accent-insensitive)
+        limit: Optional maximum number of results
 
     Returns:
-        List of TemplateBuilderInfo objects
+        List of TemplateBuilderInfo objects, newest first
     """
     templates = []
 
-    for meta_file in BUILDER_TEMPLATES_DIR.glob("*.json"):
+    for entry in builder_catalog.search(query or "", limit=limit):
+        metadata = entry.metadata
         try:
-            with open(meta_file, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
-
             templates.append(
                 TemplateBuilderInfo(
                     id=metadata["id"],
@@ -337,12 +395,9 @@ def list_builder_templates() -> List[TemplateBuilderInfo]:
             )
         except Exception as e:
             # Skip malformed metadata files
-            print(f"Warning: Failed to load template metadata from {meta_file}: {e}")
+            print(f"Warning: Failed to load template metadata from {entry.meta_path}: {e}")
             continue
 
-    # Sort by creation date (newest first)
-    templates.sort(key=lambda t: t.created_at, reverse=True)
-
     return templates
 
 
@@ -392,14 +447,14 @@ async def upload_document(file: UploadFile = File(...)):
             len(content), content[:20].hex() if content else "empty"
         )
 
-        # Extract text and metadata
-        extracted = extract_text_from_docx(temp_file_path)
+        # Parse once; later builder calls reuse the session
+        session = await asyncio.to_thread(document_sessions.open, content, document_id)
 
         return UploadResponse(
             document_id=document_id,
-            text_content=extracted["text_content"],
-            paragraphs=extracted["paragraphs"],
-            metadata=extracted["metadata"],
+            text_content=session.text_content,
+            paragraphs=session.texts,
+            metadata=session.metadata,
         )
 
     except Exception as e:
@@ -421,15 +476,25 @@ async def detect_text_patterns(request: PatternsRequest):
     Detect patterns in text (CPF, CNPJ, dates, etc.).
 
     Analyzes text for common Brazilian legal patterns and suggests field names.
+    With document_id, the uploaded document's text is analyzed once and the
+    result is cached in its session.
 
     Args:
-        request: PatternsRequest with text to analyze
+        request: PatternsRequest with text or document ID to analyze
 
     Returns:
         PatternsResponse with detected patterns
     """
+    session = None
+    if request.document_id is not None:
+        session = await require_document_session(request.document_id)
+
     try:
-        matches = detect_patterns(request.text)
+        # Large documents are scanned off the event loop
+        if session is not None:
+            matches = await asyncio.to_thread(session_patterns, session)
+        else:
+            matches = await asyncio.to_thread(detect_patterns, request.text)
 
         # Get unique pattern types
         pattern_types_found = list(set(m.pattern_type for m in matches))
@@ -446,6 +511,43 @@ async def detect_text_patterns(request: PatternsRequest):
         )
 
 
+@router.post("/patterns/stream")
+async def stream_text_patterns(request: PatternsRequest):
+    """
+    Detect patterns in text, streaming matches as NDJSON.
+
+    Each line is one PatternMatch, sent as soon as its paragraph has been
+    scanned, so the UI can highlight matches while a large document is
+    still being analyzed.
+
+    Args:
+        request: PatternsRequest with text or document ID to analyze
+
+    Returns:
+        Streaming application/x-ndjson response
+    """
+    session = None
+    if request.document_id is not None:
+        session = await require_document_session(request.document_id)
+
+    def ndjson_lines() -> Iterator[str]:
+        if session is not None and session.patterns is not None:
+            for match in session.patterns:
+                yield match.model_dump_json() + "\n"
+            return
+
+        text = session.text_content if session is not None else request.text
+        matches = []
+        for match in iter_patterns(text):
+            matches.append(match)
+            yield match.model_dump_json() + "\n"
+        if session is not None:
+            session.patterns = matches
+
+    # Sync generator: Starlette iterates it in the threadpool
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @router.post("/save", response_model=SaveTemplateResponse)
 async def save_template(request: SaveTemplateRequest):
     """
@@ -459,22 +561,16 @@ async def save_template(request: SaveTemplateRequest):
     Returns:
         SaveTemplateResponse with template information
     """
-    # Validate uploaded document exists
-    source_path = TEMP_UPLOAD_DIR / f"{request.document_id}.docx"
-    if not source_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Uploaded document not found: {request.document_id}"
-        )
+    # Validate uploaded document exists (parsed once, at upload)
+    session = await require_document_session(request.document_id)
 
     try:
-        # Extract text content for validation
-        extracted = extract_text_from_docx(source_path)
-        text_content = extracted["text_content"]
+        # Text content for validation
+        text_content = session.text_content
 
         # DEBUG: Log text content info
         logger.info(f"Validating template: text_content length={len(text_content)}")
-        logger.info(f"Backend paragraphs count: {len(extracted.get('paragraphs', []))}")
+        logger.info(f"Backend paragraphs count: {len(session.texts)}")
 
         # Validate annotations are within text bounds
         for annotation in request.annotations:
@@ -514,12 +610,19 @@ async def save_template(request: SaveTemplateRequest):
         # Output path
         output_path = BUILDER_TEMPLATES_DIR / f"{template_id}.docx"
 
-        # Apply annotations
-        fields = apply_annotations_to_docx(
-            source_path=source_path,
+        # Apply annotations to a session owned by this save (its Document is
+        # modified in place; a concurrent or retried save re-parses the upload)
+        session = await asyncio.to_thread(claim_document_session, request.document_id)
+        if session is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Uploaded document not found: {request.document_id}"
+            )
+        fields = await asyncio.to_thread(
+            apply_annotations_to_docx,
+            session=session,
             output_path=output_path,
             annotations=[a.model_dump() for a in request.annotations],
-            text_content=text_content,
         )
 
         # Save metadata
@@ -533,7 +636,7 @@ async def save_template(request: SaveTemplateRequest):
         )
 
         # Clean up uploaded file
-        source_path.unlink()
+        (TEMP_UPLOAD_DIR / f"{request.document_id}.docx").unlink(missing_ok=True)
 
         return SaveTemplateResponse(
             id=template_id,
@@ -554,15 +657,19 @@ async def save_template(request: SaveTemplateRequest):
 
 
 @router.get("/templates", response_model=TemplateListResponse)
-async def list_templates():
+async def list_templates(q: Optional[str] = None, limit: Optional[int] = Query(None, ge=1)):
     """
     List all saved builder templates.
 
+    Args:
+        q: Optional search on name and description
+        limit: Optional maximum number of results
+
     Returns:
         TemplateListResponse with list of templates
     """
     try:
-        templates = list_builder_templates()
+        templates = list_builder_templates(q, limit)
         return TemplateListResponse(
             templates=templates,
             count=len(templates),
@@ -4,6 +4,7 @@ FastAPI application for Legal Document Assembler.
 RESTful API wrapping the DocumentEngine for web-based document generation.
 """
 
+import asyncio
 import os
 import sys
 import logging
@@ -27,12 +28,13 @@ logger = setup_logging("doc-assembler", level=log_level)
 
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
+from urllib.parse import quote
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 
 # Import DocumentEngine from the src package
 # In Docker: /app/src/engine.py (PYTHONPATH includes /app)
@@ -51,10 +53,16 @@ else:
 # Import as package to support relative imports within engine.py
 engine_module = importlib.import_module("src.engine")
 DocumentEngine = engine_module.DocumentEngine
+BatchProcessor = importlib.import_module("src.batch_engine").BatchProcessor
+RenderPool = importlib.import_module("src.render_pool").RenderPool
+TemplateCatalog = importlib.import_module("src.template_catalog").TemplateCatalog
 
 from .models import (
     AssembleRequest,
     AssembleResponse,
+    BatchAssembleRequest,
+    BatchJobRequest,
+    BatchJobResponse,
     ValidateRequest,
     ValidateResponse,
     PreviewRequest,
@@ -67,6 +75,8 @@ from .models import (
     ErrorResponse,
 )
 
+from .batch_jobs import OUTPUT_FILES, OUTPUT_ZIP, BatchJob, BatchJobManager, parse_records
+
 # Import builder router
 from .builder_routes import router as builder_router
 
@@ -80,10 +90,37 @@ TEMPLATES_DIR = Path(os.getenv("TEMPLATES_DIR", "/app/templates"))
 OUTPUTS_DIR = Path(os.getenv("OUTPUTS_DIR", "/app/outputs"))
 API_VERSION = "1.0.0"
 
+# Batch assembly: records per request and render processes (1 = in-process)
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "5000"))
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "1"))
+
+# Render process pool shared by /assemble, /preview and batch jobs
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
+
+# Asynchronous batch jobs (/api/v1/batch/jobs)
+BATCH_OUTPUTS_DIR = Path(os.getenv("BATCH_OUTPUTS_DIR", str(OUTPUTS_DIR / "batches")))
+BATCH_CONCURRENT_JOBS = int(os.getenv("BATCH_CONCURRENT_JOBS", "2"))
+BATCH_MAX_JOBS = int(os.getenv("BATCH_MAX_JOBS", "200"))
+BATCH_JOB_TTL_SECONDS = int(os.getenv("BATCH_JOB_TTL_SECONDS", "86400"))
+BATCH_SWEEP_SECONDS = int(os.getenv("BATCH_SWEEP_SECONDS", "600"))
+
 # Ensure directories exist
 TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
 OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Indexed listing of TEMPLATES_DIR (templates are plain .docx, no metadata)
+template_catalog = TemplateCatalog(TEMPLATES_DIR, with_metadata=False, recursive=True)
+
+# Worker processes are spawned (never forked from the server) on first use
+render_pool = RenderPool(max_workers=RENDER_WORKERS, start_method="spawn")
+batch_jobs = BatchJobManager(
+    render_pool,
+    output_root=BATCH_OUTPUTS_DIR,
+    max_concurrent_jobs=BATCH_CONCURRENT_JOBS,
+    max_jobs=BATCH_MAX_JOBS,
+    ttl_seconds=BATCH_JOB_TTL_SECONDS,
+)
+
 
 # ============================================================================
 # FastAPI App
@@ -232,41 +269,121 @@ def get_download_url(output_path: Path) -> str:
     return f"/outputs/{rel_path}"
 
 
-def list_templates_in_dir(directory: Path) -> List[TemplateInfo]:
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def batch_job_response(job: BatchJob) -> BatchJobResponse:
     """
-    List all .docx templates in directory and subdirectories.
+    Build the status response of a batch job.
 
     Args:
-        directory: Directory to search
+        job: Batch job
 
     Returns:
-        List of TemplateInfo objects
+        BatchJobResponse with progress and download URLs
+    """
+    base_url = f"/api/v1/batch/jobs/{job.job_id}"
+    download_url = None
+    if job.output == OUTPUT_ZIP and job.status == "completed":
+        download_url = f"{base_url}/files/{quote(job.zip_name)}"
+
+    return BatchJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        template_path=job.template_path,
+        output=job.output,
+        total=job.total,
+        done=job.done,
+        failed=job.failed,
+        progress=job.progress,
+        status_url=base_url,
+        download_url=download_url,
+        documents=[f"{base_url}/files/{quote(name)}" for name in job.documents],
+        errors=job.errors,
+        error=job.error,
+        created_at=_isoformat(job.created_at),
+        finished_at=_isoformat(job.finished_at),
+    )
+
+
+def start_batch_job(
+    template_path: str,
+    items: List[Dict],
+    output: str = OUTPUT_ZIP,
+    name_field: Optional[str] = None,
+    field_types: Optional[Dict[str, str]] = None,
+    auto_normalize: bool = True,
+) -> BatchJob:
+    """
+    Validate a batch and start it as a background job.
+
+    Raises:
+        FileNotFoundError: If template doesn't exist
+        ValueError: If the batch is empty or too large
+    """
+    if not items:
+        raise ValueError("Batch has no items")
+    if len(items) > BATCH_MAX_ITEMS:
+        raise ValueError(f"Batch has {len(items)} items; maximum is {BATCH_MAX_ITEMS}")
+
+    abs_template_path = resolve_template_path(template_path)
+
+    job = batch_jobs.create(
+        template_path=template_path,
+        abs_template_path=abs_template_path,
+        records=items,
+        output=output,
+        name_field=name_field,
+        field_types=field_types,
+        auto_normalize=auto_normalize,
+    )
+    logger.info("Batch job queued", extra={
+        "job_id": job.job_id,
+        "template": template_path,
+        "items": job.total,
+        "output": output,
+    })
+    return job
+
+
+def template_info(entry) -> TemplateInfo:
     """
-    templates = []
+    Build TemplateInfo from a template catalog entry.
+
+    Args:
+        entry: CatalogEntry of a .docx under TEMPLATES_DIR
 
-    for docx_file in directory.rglob("*.docx"):
-        # Skip temporary files
-        if docx_file.name.startswith("~$"):
-            continue
+    Returns:
+        TemplateInfo object
+    """
+    return TemplateInfo(
+        id=entry.key,
+        name=entry.docx_path.stem,
+        path=f"{entry.key}.docx",
+        filename=entry.docx_path.name,
+        size_bytes=entry.size_bytes
+    )
 
-        # Get relative path from TEMPLATES_DIR
-        rel_path = docx_file.relative_to(TEMPLATES_DIR)
 
-        # Generate template ID (path without extension)
-        template_id = str(rel_path.with_suffix('')).replace(os.sep, '/')
+def list_catalog_templates(query: Optional[str] = None, limit: Optional[int] = None) -> List[TemplateInfo]:
+    """
+    List .docx templates in TEMPLATES_DIR and subdirectories.
 
-        # Human-readable name (filename without extension)
-        name = docx_file.stem
+    Served from the in-memory template catalog; the disk is only rescanned
+    when a directory changed.
 
-        templates.append(TemplateInfo(
-            id=template_id,
-            name=name,
-            path=str(rel_path).replace(os.sep, '/'),
-            filename=docx_file.name,
-            size_bytes=docx_file.stat().st_size
-        ))
+    Args:
+        query: Optional case/accent-insensitive search on the template name
+        limit: Optional maximum number of results
 
-    return sorted(templates, key=lambda t: t.id)
+    Returns:
+        List of TemplateInfo objects sorted by id
+    """
+    entries = template_catalog.search(query or "", limit=limit)
+    return [template_info(entry) for entry in entries]
 
 
 # ============================================================================
@@ -298,14 +415,18 @@ async def health_check():
 
 
 @app.get("/api/v1/templates", response_model=TemplateListResponse)
-async def list_templates():
+async def list_templates(q: Optional[str] = None, limit: Optional[int] = Query(None, ge=1)):
     """
     List all available document templates.
 
+    Args:
+        q: Optional search on template names (case/accent-insensitive)
+        limit: Optional maximum number of results
+
     Returns:
         List of template information objects
     """
-    templates = list_templates_in_dir(TEMPLATES_DIR)
+    templates = list_catalog_templates(q, limit)
 
     return TemplateListResponse(
         templates=templates,
@@ -417,14 +538,12 @@ async def preview_document(request: PreviewRequest):
     # Resolve template path
     abs_template_path = resolve_template_path(request.template_path)
 
-    # Create engine instance
-    engine = DocumentEngine(auto_normalize=request.auto_normalize)
-
-    # Extract rendered text
-    result = engine.extract_rendered_text(
+    # Extract rendered text (render pool, off the event loop)
+    result = await render_pool.extract_text(
         template_path=abs_template_path,
         data=request.data,
-        field_types=request.field_types
+        field_types=request.field_types,
+        auto_normalize=request.auto_normalize
     )
 
     return PreviewResponse(
@@ -453,15 +572,13 @@ async def assemble_document(request: AssembleRequest):
     # Generate output path
     output_path = generate_output_path(request.output_filename)
 
-    # Create engine instance
-    engine = DocumentEngine(auto_normalize=request.auto_normalize)
-
-    # Render document
-    result_path = engine.render(
+    # Render document (render pool, off the event loop)
+    result_path = await render_pool.render_file(
         template_path=abs_template_path,
         data=request.data,
         output_path=output_path,
-        field_types=request.field_types
+        field_types=request.field_types,
+        auto_normalize=request.auto_normalize
     )
 
     # Generate download URL
@@ -476,6 +593,179 @@ async def assemble_document(request: AssembleRequest):
     )
 
 
+@app.post("/api/v1/assemble/batch")
+async def assemble_batch(request: BatchAssembleRequest):
+    """
+    Assemble one document per data record and stream them back as a ZIP.
+
+    Documents are rendered in memory and appended to the ZIP as they
+    complete; nothing is written to OUTPUTS_DIR. Records that fail to
+    render are listed in an errors.json entry inside the archive.
+
+    Args:
+        request: Batch request with template, records, and options
+
+    Returns:
+        Streaming application/zip response
+    """
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise ValueError(
+            f"Batch has {len(request.items)} items; maximum is {BATCH_MAX_ITEMS}"
+        )
+
+    # Resolve (and compile) the template before the response starts, so a
+    # bad template is a 404/400 instead of a truncated download; compiling
+    # parses the DOCX, so it runs off the event loop
+    abs_template_path = resolve_template_path(request.template_path)
+    await asyncio.to_thread(
+        DocumentEngine(auto_normalize=request.auto_normalize).get_template_variables,
+        abs_template_path,
+    )
+
+    processor = BatchProcessor(
+        max_workers=BATCH_WORKERS,
+        auto_normalize=request.auto_normalize,
+        checkpoint_enabled=False,
+        start_method="spawn",  # never fork the server process
+    )
+    zip_name = Path(request.zip_name).name if request.zip_name else f"{abs_template_path.stem}_batch.zip"
+
+    logger.info("Batch assembly started", extra={
+        "template": request.template_path,
+        "items": len(request.items),
+        "workers": BATCH_WORKERS,
+    })
+
+    # Sync generator: Starlette iterates it in the threadpool
+    return StreamingResponse(
+        processor.iter_zip_stream(
+            records=request.items,
+            template_path=abs_template_path,
+            name_field=request.name_field,
+            field_types=request.field_types,
+        ),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{zip_name}"'},
+    )
+
+
+@app.post(
+    "/api/v1/batch/jobs",
+    response_model=BatchJobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def create_batch_job(request: BatchJobRequest):
+    """
+    Start an asynchronous batch job (one document per data record).
+
+    Rendering runs on the render pool in the background; poll status_url
+    for progress and download the results when the job is completed.
+
+    Args:
+        request: Batch job request with template, records, and options
+
+    Returns:
+        Initial job status
+    """
+    job = start_batch_job(
+        template_path=request.template_path,
+        items=request.items,
+        output=request.output,
+        name_field=request.name_field,
+        field_types=request.field_types,
+        auto_normalize=request.auto_normalize,
+    )
+    return batch_job_response(job)
+
+
+@app.post(
+    "/api/v1/batch/jobs/upload",
+    response_model=BatchJobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def upload_batch_job(
+    file: UploadFile = File(..., description="JSON array or NDJSON file of records"),
+    template_path: str = Form(...),
+    output: str = Form(OUTPUT_ZIP),
+    name_field: Optional[str] = Form(None),
+    auto_normalize: bool = Form(True),
+):
+    """
+    Start an asynchronous batch job from an uploaded JSON/NDJSON file.
+
+    Args:
+        file: Records as a JSON array or one JSON object per line
+        template_path: Path to the .docx template file
+        output: 'zip' or 'files'
+        name_field: Data field used to name each document
+        auto_normalize: Enable automatic text normalization
+
+    Returns:
+        Initial job status
+    """
+    if output not in (OUTPUT_ZIP, OUTPUT_FILES):
+        raise ValueError("output must be 'zip' or 'files'")
+    if not template_path.endswith('.docx'):
+        raise ValueError("Template path must end with .docx")
+
+    records = parse_records(await file.read())
+
+    job = start_batch_job(
+        template_path=template_path,
+        items=records,
+        output=output,
+        name_field=name_field,
+        auto_normalize=auto_normalize,
+    )
+    return batch_job_response(job)
+
+
+@app.get("/api/v1/batch/jobs/{job_id}", response_model=BatchJobResponse)
+async def get_batch_job(job_id: str):
+    """
+    Get status and progress of a batch job.
+
+    Args:
+        job_id: Batch job identifier
+
+    Returns:
+        Job status, progress and download URLs
+    """
+    job = batch_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Batch job not found: {job_id}")
+    return batch_job_response(job)
+
+
+@app.get("/api/v1/batch/jobs/{job_id}/files/{filename}")
+async def download_batch_file(job_id: str, filename: str):
+    """
+    Download a batch job output (the ZIP or one generated document).
+
+    Args:
+        job_id: Batch job identifier
+        filename: Output filename from the job status
+
+    Returns:
+        File download
+    """
+    job = batch_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Batch job not found: {job_id}")
+    if job.output == OUTPUT_ZIP and job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Batch job is {job.status}")
+
+    path = batch_jobs.document_path(job, filename)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"File not found: {filename}")
+
+    media_type = (
+        "application/zip" if job.output == OUTPUT_ZIP
+        else "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    )
+    return FileResponse(path, media_type=media_type, filename=filename)
+
+
 # ============================================================================
 # Include Builder Router
 # ============================================================================
@@ -489,17 +779,27 @@ app.include_router(builder_router, prefix="/api/v1/builder", tags=["builder"])
 
 @app.on_event("startup")
 async def startup_event():
-    """Log startup information."""
-    templates = list_templates_in_dir(TEMPLATES_DIR)
+    """Log startup information and start the batch output sweep."""
+    batch_jobs.start_sweeper(BATCH_SWEEP_SECONDS)
+    templates = list_catalog_templates()
     logger.info("Service starting", extra={
         "event": "startup",
         "version": API_VERSION,
         "templates_dir": str(TEMPLATES_DIR),
         "outputs_dir": str(OUTPUTS_DIR),
-        "template_count": len(templates)
+        "template_count": len(templates),
+        "render_workers": RENDER_WORKERS
     })
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Cancel running batch jobs and stop the render processes."""
+    await batch_jobs.shutdown()
+    render_pool.shutdown(wait=False)
+    logger.info("Service stopped", extra={"event": "shutdown"})
+
+
 @app.get("/debug/sentry", tags=["Debug"])
 async def debug_sentry():
     """
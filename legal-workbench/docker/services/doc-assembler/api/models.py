@@ -4,7 +4,7 @@ Pydantic models for Doc Assembler API.
 Request and response schemas for all endpoints.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -57,6 +57,85 @@ class AssembleRequest(BaseModel):
         return v
 
 
+class BatchAssembleRequest(BaseModel):
+    """Request model for batch assembly (one template, many data records)."""
+
+    template_path: str = Field(
+        ...,
+        description="Path to the .docx template file"
+    )
+    items: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        description="One data dictionary per document"
+    )
+    name_field: Optional[str] = Field(
+        None,
+        description="Data field used to name each document in the ZIP",
+        examples=["nome"]
+    )
+    zip_name: Optional[str] = Field(
+        None,
+        description="Optional ZIP filename for the download",
+        examples=["lote_peticoes.zip"]
+    )
+    field_types: Optional[Dict[str, str]] = Field(
+        None,
+        description="Optional field type mapping for normalization"
+    )
+    auto_normalize: bool = Field(
+        True,
+        description="Enable automatic text normalization"
+    )
+
+    @field_validator('template_path')
+    @classmethod
+    def validate_template_path(cls, v: str) -> str:
+        """Ensure template path has .docx extension."""
+        if not v.endswith('.docx'):
+            raise ValueError("Template path must end with .docx")
+        return v
+
+
+class BatchJobRequest(BaseModel):
+    """Request model for an asynchronous batch job (one template, many data records)."""
+
+    template_path: str = Field(
+        ...,
+        description="Path to the .docx template file"
+    )
+    items: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        description="One data dictionary per document"
+    )
+    output: Literal["zip", "files"] = Field(
+        "zip",
+        description="'zip' for a single archive, 'files' for one download per document"
+    )
+    name_field: Optional[str] = Field(
+        None,
+        description="Data field used to name each document",
+        examples=["nome"]
+    )
+    field_types: Optional[Dict[str, str]] = Field(
+        None,
+        description="Optional field type mapping for normalization"
+    )
+    auto_normalize: bool = Field(
+        True,
+        description="Enable automatic text normalization"
+    )
+
+    @field_validator('template_path')
+    @classmethod
+    def validate_template_path(cls, v: str) -> str:
+        """Ensure template path has .docx extension."""
+        if not v.endswith('.docx'):
+            raise ValueError("Template path must end with .docx")
+        return v
+
+
 class ValidateRequest(BaseModel):
     """Request model for data validation endpoint."""
 
@@ -175,6 +254,40 @@ class PreviewResponse(BaseModel):
     table_count: int = Field(..., description="Number of tables")
 
 
+class BatchJobError(BaseModel):
+    """A batch item that failed to render."""
+
+    item: str = Field(..., description="Item reference (index in the batch)")
+    error_type: str = Field(..., description="Error type/category")
+    message: str = Field(..., description="Error message")
+
+
+class BatchJobResponse(BaseModel):
+    """Status and progress of an asynchronous batch job."""
+
+    job_id: str = Field(..., description="Batch job identifier")
+    status: str = Field(..., description="queued, running, completed or failed")
+    template_path: str = Field(..., description="Template used by the job")
+    output: str = Field(..., description="'zip' or 'files'")
+    total: int = Field(..., description="Number of items in the batch")
+    done: int = Field(..., description="Items processed so far")
+    failed: int = Field(..., description="Items that failed to render")
+    progress: float = Field(..., description="Percentage of items processed")
+    status_url: str = Field(..., description="URL to poll for progress")
+    download_url: Optional[str] = Field(
+        None,
+        description="ZIP download URL (output='zip', once completed)"
+    )
+    documents: List[str] = Field(
+        default_factory=list,
+        description="Per-document download URLs (output='files')"
+    )
+    errors: List[BatchJobError] = Field(default_factory=list, description="Failed items")
+    error: Optional[str] = Field(None, description="Job-level error, if the job failed")
+    created_at: str = Field(..., description="Creation timestamp (ISO 8601)")
+    finished_at: Optional[str] = Field(None, description="Completion timestamp (ISO 8601)")
+
+
 class HealthResponse(BaseModel):
     """Response model for health check endpoint."""
 
@@ -0,0 +1,105 @@
+"""Result cache keys and in-flight dedup for extraction jobs.
+
+Cache keys cover the PDF content hash *and* the parameters that change the
+extracted text:
+
+    pdf_cache:{sha256}:{params_fingerprint}
+
+``params_fingerprint`` hashes the normalized (engine, use_gemini, options).
+gpu_mode is left out: it only picks Modal hardware, not the output.
+
+Reuse rules: a request is also satisfied by a result from a stronger engine
+run with the same Gemini flag and options (REUSABLE_ENGINES), e.g. a Marker
+result answers a pdfplumber request.
+
+In-flight dedup: before queuing, the API claims
+``pdf_inflight:{sha256}:{params_fingerprint}`` with SET NX. Concurrent
+uploads of the same PDF attach to the claiming job instead of starting
+another extraction. The worker releases the claim when the job ends.
+
+This module only depends on the standard library so the worker can import it too.
+"""
+import hashlib
+import json
+import os
+from typing import Any, Optional
+
+CACHE_KEY_PREFIX = "pdf_cache"
+INFLIGHT_KEY_PREFIX = "pdf_inflight"
+
+# Safety net only: the worker releases the claim when the job ends
+INFLIGHT_TTL_SECONDS = int(os.getenv("INFLIGHT_TTL_SECONDS", "21600"))
+
+# Results that can answer a request for the given engine, best match first
+REUSABLE_ENGINES = {
+    "pdfplumber": ["pdfplumber", "auto", "marker"],
+    "auto": ["auto", "marker"],
+    "marker": ["marker"],
+}
+
+# Compare-and-delete: only the job that owns the claim may release it
+_RELEASE_CLAIM_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _normalize(value: Any) -> Any:
+    """Canonical form for hashing (sorted dicts, 10 vs 10.0 collapsed)."""
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else round(value, 6)
+    return value
+
+
+def params_fingerprint(engine: str, use_gemini: bool, options: Optional[dict]) -> str:
+    """Short hash of the parameters that affect the extracted text."""
+    payload = json.dumps(
+        {"engine": engine, "use_gemini": bool(use_gemini), "options": _normalize(options or {})},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(pdf_hash: str, engine: str, use_gemini: bool, options: Optional[dict]) -> str:
+    return f"{CACHE_KEY_PREFIX}:{pdf_hash}:{params_fingerprint(engine, use_gemini, options)}"
+
+
+def inflight_key(pdf_hash: str, engine: str, use_gemini: bool, options: Optional[dict]) -> str:
+    return f"{INFLIGHT_KEY_PREFIX}:{pdf_hash}:{params_fingerprint(engine, use_gemini, options)}"
+
+
+def candidate_cache_keys(
+    pdf_hash: str, engine: str, use_gemini: bool, options: Optional[dict]
+) -> list[str]:
+    """Cache keys whose result may answer this request (exact match first)."""
+    return [
+        cache_key(pdf_hash, candidate, use_gemini, options)
+        for candidate in REUSABLE_ENGINES.get(engine, [engine])
+    ]
+
+
+def candidate_inflight_keys(
+    pdf_hash: str, engine: str, use_gemini: bool, options: Optional[dict]
+) -> list[str]:
+    """In-flight claims whose job may answer this request (exact match first)."""
+    return [
+        inflight_key(pdf_hash, candidate, use_gemini, options)
+        for candidate in REUSABLE_ENGINES.get(engine, [engine])
+    ]
+
+
+def release_inflight(redis_client, key: str, job_id: str):
+    """
+    Drop the in-flight claim if job_id still owns it.
+
+    Works with sync (worker) and async (API) clients; await the result on
+    the latter.
+    """
+    return redis_client.eval(_RELEASE_CLAIM_SCRIPT, 1, key, job_id)
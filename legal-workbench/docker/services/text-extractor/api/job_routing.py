@@ -0,0 +1,182 @@
+"""Cost-based queue routing for extraction jobs.
+
+A 2,000-page Marker job must not sit in front of dozens of 3-page pdfplumber
+jobs. Before queuing, the API runs a cheap pre-pass on the spooled PDF
+(page count plus a few sampled pages to estimate how much of it is scanned)
+and routes the job by estimated cost:
+
+- Queue per job class: ``extract_fast`` (pdfplumber, or engine=auto with
+  no raster page sampled) and ``extract_heavy`` (Marker / Modal), each
+  consumed by its own worker with its own concurrency and time limit
+  (see entrypoint.sh)
+- Shortest job first inside a queue: the estimated cost is mapped to a
+  Redis priority step (0 = cheapest = served first)
+- Queue wait time per class is recorded by the worker and reported by
+  ``GET /api/v1/queues``
+
+This module only depends on the standard library (pdfplumber is imported
+lazily) so the worker can import it too.
+"""
+import logging
+import math
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+logger = logging.getLogger("job_routing")
+
+FAST_QUEUE = "extract_fast"
+HEAVY_QUEUE = "extract_heavy"
+QUEUE_BY_CLASS = {"fast": FAST_QUEUE, "heavy": HEAVY_QUEUE}
+
+# Redis priority steps (kombu): 0 is served first
+PRIORITY_STEPS = list(range(10))
+PRIORITY_SEP = ":"
+
+FAST_JOB_TIMEOUT_SECONDS = int(os.getenv("FAST_JOB_TIMEOUT_SECONDS", "300"))
+HEAVY_JOB_TIMEOUT_SECONDS = int(os.getenv("JOB_TIMEOUT_SECONDS", "2100"))
+TIMEOUT_BY_CLASS = {"fast": FAST_JOB_TIMEOUT_SECONDS, "heavy": HEAVY_JOB_TIMEOUT_SECONDS}
+
+# Relative cost per page (pdfplumber page = 1)
+PAGE_COST = {
+    "pdfplumber": 1.0,
+    "marker_native": 8.0,    # layout models only
+    "marker_scanned": 30.0,  # layout + OCR
+}
+# Pages sampled to estimate the scanned ratio
+SAMPLE_PAGES = 3
+# Below this many characters a sampled page is considered scanned
+SCANNED_PAGE_MIN_CHARS = 50
+
+QUEUE_WAIT_KEY = "queue_wait:{job_class}"
+QUEUE_WAIT_SAMPLES = 1000
+
+
+@dataclass
+class JobCostEstimate:
+    """Routing decision for one job."""
+    job_class: str
+    queue: str
+    priority: int
+    pages: Optional[int]
+    scanned_ratio: Optional[float]
+    cost: float
+    time_limit: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def engine_class(engine: str, scanned_ratio: Optional[float] = None) -> str:
+    """
+    Job class served by the engine's queue.
+
+    engine=auto only needs the heavy queue when the pre-pass saw raster pages.
+    """
+    if engine == "auto":
+        return "fast" if scanned_ratio == 0 else "heavy"
+    return "fast" if engine == "pdfplumber" else "heavy"
+
+
+def cost_priority(cost: float) -> int:
+    """Map cost to a priority step on a log scale (1 -> 0, ~100k -> 9)."""
+    if cost <= 1:
+        return 0
+    return min(int(math.log10(cost) * 2), PRIORITY_STEPS[-1])
+
+
+def inspect_pdf(pdf_path: str, sample_pages: int = SAMPLE_PAGES) -> tuple[Optional[int], Optional[float]]:
+    """
+    Cheap pre-pass: page count and fraction of sampled pages without a text layer.
+
+    Returns:
+        (pages, scanned_ratio), (None, None) if the PDF cannot be read
+    """
+    try:
+        import pdfplumber
+
+        with pdfplumber.open(pdf_path) as pdf:
+            pages = len(pdf.pages)
+            if pages == 0:
+                return 0, 0.0
+            # First, middle and last pages
+            indexes = sorted({0, pages // 2, pages - 1})[:sample_pages]
+            scanned = sum(
+                1 for i in indexes
+                if len((pdf.pages[i].extract_text() or "").strip()) < SCANNED_PAGE_MIN_CHARS
+            )
+            return pages, scanned / len(indexes)
+    except Exception as e:
+        logger.warning("PDF pre-pass failed for %s: %s", pdf_path, e)
+        return None, None
+
+
+def estimate_job_cost(pdf_path: str, engine: str) -> JobCostEstimate:
+    """Estimate cost and pick queue, priority and time limit for a job."""
+    pages, scanned_ratio = inspect_pdf(pdf_path)
+    job_class = engine_class(engine, scanned_ratio)
+
+    if pages is None:
+        # Unknown cost: middle priority so it neither starves nor jumps the queue
+        cost, priority = 0.0, len(PRIORITY_STEPS) // 2
+    else:
+        if job_class == "fast":
+            page_cost = PAGE_COST["pdfplumber"]
+        elif engine == "auto":
+            # Native pages stay on pdfplumber, only raster pages pay for Marker
+            page_cost = (
+                (1 - scanned_ratio) * PAGE_COST["pdfplumber"]
+                + scanned_ratio * PAGE_COST["marker_scanned"]
+            )
+        else:
+            page_cost = (
+                (1 - scanned_ratio) * PAGE_COST["marker_native"]
+                + scanned_ratio * PAGE_COST["marker_scanned"]
+            )
+        cost = round(pages * page_cost, 1)
+        priority = cost_priority(cost)
+
+    return JobCostEstimate(
+        job_class=job_class,
+        queue=QUEUE_BY_CLASS[job_class],
+        priority=priority,
+        pages=pages,
+        scanned_ratio=scanned_ratio,
+        cost=cost,
+        time_limit=TIMEOUT_BY_CLASS[job_class],
+    )
+
+
+def queue_keys(queue: str) -> list[str]:
+    """Redis list keys holding a queue's messages (one per priority step)."""
+    return [queue] + [f"{queue}{PRIORITY_SEP}{step}" for step in PRIORITY_STEPS[1:]]
+
+
+def record_queue_wait(redis_client, job_class: str, enqueued_at: float) -> float:
+    """Record how long a job waited in its queue (sync, for the worker)."""
+    waited = max(time.time() - enqueued_at, 0.0)
+    key = QUEUE_WAIT_KEY.format(job_class=job_class)
+    pipe = redis_client.pipeline()
+    pipe.lpush(key, round(waited, 3))
+    pipe.ltrim(key, 0, QUEUE_WAIT_SAMPLES - 1)
+    pipe.execute()
+    return waited
+
+
+def summarize_waits(samples: list[float]) -> dict:
+    """count/avg/p50/p95/max of recent queue waits (seconds)."""
+    if not samples:
+        return {"count": 0, "avg": None, "p50": None, "p95": None, "max": None}
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        return ordered[min(int(p * len(ordered)), len(ordered) - 1)]
+
+    return {
+        "count": len(ordered),
+        "avg": round(sum(ordered) / len(ordered), 3),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "max": ordered[-1],
+    }
@@ -0,0 +1,234 @@
+"""Job state store shared by the Celery worker and the API.
+
+Worker side (``JobStore``):
+- One WAL-mode SQLite connection per worker process (re-opened after fork)
+- Log lines are buffered and inserted in batches; progress-only updates are
+  coalesced per job. Both are flushed together with the next status change,
+  when the batch is full, at task end, or by a background thread at most
+  JOB_STORE_FLUSH_SECONDS after they were buffered
+- Every update and log line is published right away on Redis pub/sub
+  (``job_events:{job_id}``), so followers do not have to poll the database
+
+API side: ``job_channel``/``JOB_EVENTS_PATTERN``/``format_sse`` are used by
+the SSE endpoints to relay those events.
+
+This module only depends on the standard library (redis is imported lazily)
+so the worker can import it too.
+"""
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger("job_store")
+
+JOB_EVENTS_PREFIX = "job_events:"
+JOB_EVENTS_PATTERN = f"{JOB_EVENTS_PREFIX}*"
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+JOB_STORE_FLUSH_SECONDS = float(os.getenv("JOB_STORE_FLUSH_SECONDS", "1.0"))
+JOB_STORE_MAX_BATCH = int(os.getenv("JOB_STORE_MAX_BATCH", "50"))
+
+# Large columns stay out of the pub/sub payload
+_UNPUBLISHED_FIELDS = frozenset({"result_text", "metadata"})
+
+
+def job_channel(job_id: str) -> str:
+    """Redis pub/sub channel for one job's events."""
+    return f"{JOB_EVENTS_PREFIX}{job_id}"
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Encode one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """WAL lets the API read while the worker writes; NORMAL sync is safe with WAL."""
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+class JobStore:
+    """
+    Batched writer for the jobs/job_logs tables plus event publisher.
+
+    Example:
+        >>> store = JobStore("/app/data/jobs.db", "redis://redis:6379/0")
+        >>> store.log(job_id, "INFO", "File validated")
+        >>> store.update(job_id, progress=40.0)          # coalesced
+        >>> store.update(job_id, status="completed")      # flushes everything
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        redis_url: Optional[str] = None,
+        flush_seconds: float = JOB_STORE_FLUSH_SECONDS,
+        max_batch: int = JOB_STORE_MAX_BATCH,
+    ):
+        self.db_path = db_path
+        self.redis_url = redis_url
+        self.flush_seconds = flush_seconds
+        self.max_batch = max_batch
+
+        self._lock = threading.RLock()
+        self._pending_logs: list[tuple] = []
+        self._pending_progress: dict[str, dict] = {}
+        self._last_flush = time.monotonic()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._redis = None
+        self._redis_pid: Optional[int] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_pid: Optional[int] = None
+        self._closed = threading.Event()
+
+    # ------------------------------------------------------------------ public
+
+    def update(self, job_id: str, **fields) -> None:
+        """Update job columns; progress-only updates are coalesced."""
+        with self._lock:
+            if set(fields) <= {"progress"}:
+                self._pending_progress.setdefault(job_id, {}).update(fields)
+                self._flush_if_due()
+                self._ensure_flusher()
+            else:
+                merged = self._pending_progress.pop(job_id, {})
+                merged.update(fields)
+                self._flush(extra_update=(job_id, merged))
+        self._publish(job_id, "status" if "status" in fields else "progress", fields)
+
+    def log(self, job_id: str, level: str, message: str) -> None:
+        """Buffer one job_logs row."""
+        timestamp = datetime.utcnow().isoformat()
+        with self._lock:
+            self._pending_logs.append((job_id, timestamp, level, message))
+            self._flush_if_due()
+            self._ensure_flusher()
+        self._publish(job_id, "log", {"timestamp": timestamp, "level": level, "message": message})
+
+    def flush(self) -> None:
+        """Write all buffered logs and progress in one transaction."""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """Stop the flush thread, flush and close the process connection."""
+        self._closed.set()
+        with self._lock:
+            try:
+                self._flush()
+            finally:
+                if self._conn is not None and self._conn_pid == os.getpid():
+                    self._conn.close()
+                self._conn = None
+
+    # ----------------------------------------------------------------- private
+
+    def _connection(self) -> sqlite3.Connection:
+        # Celery prefork children must not reuse the parent's connection
+        if self._conn is None or self._conn_pid != os.getpid():
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = configure_connection(
+                sqlite3.connect(self.db_path, check_same_thread=False)
+            )
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def _ensure_flusher(self) -> None:
+        # Threads do not survive fork: each worker process starts its own
+        if self.flush_seconds <= 0 or self._closed.is_set():
+            return
+        if self._flusher is not None and self._flusher_pid == os.getpid() and self._flusher.is_alive():
+            return
+        self._flusher = threading.Thread(target=self._flush_loop, name="job-store-flush", daemon=True)
+        self._flusher_pid = os.getpid()
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        """Flush buffered rows once they are JOB_STORE_FLUSH_SECONDS old, even without new writes."""
+        while not self._closed.wait(self.flush_seconds / 2):
+            try:
+                with self._lock:
+                    if self._pending_logs or self._pending_progress:
+                        self._flush_if_due()
+            except Exception as e:
+                logger.warning("Background job store flush failed: %s", e)
+
+    def _flush_if_due(self) -> None:
+        if (
+            len(self._pending_logs) >= self.max_batch
+            or time.monotonic() - self._last_flush >= self.flush_seconds
+        ):
+            self._flush()
+
+    def _flush(self, extra_update: Optional[tuple[str, dict]] = None) -> None:
+        updates = list(self._pending_progress.items())
+        if extra_update is not None:
+            updates.append(extra_update)
+        logs = self._pending_logs
+        if not updates and not logs:
+            self._last_flush = time.monotonic()
+            return
+
+        conn = self._connection()
+        with conn:  # single transaction / commit
+            for job_id, fields in updates:
+                if not fields:
+                    continue
+                set_clause = ", ".join(f"{key} = ?" for key in fields)
+                conn.execute(
+                    f"UPDATE jobs SET {set_clause} WHERE job_id = ?",
+                    list(fields.values()) + [job_id],
+                )
+            if logs:
+                conn.executemany(
+                    "INSERT INTO job_logs (job_id, timestamp, level, message) VALUES (?, ?, ?, ?)",
+                    logs,
+                )
+        self._pending_logs = []
+        self._pending_progress.clear()
+        self._last_flush = time.monotonic()
+
+    def _redis_client(self):
+        if not self.redis_url:
+            return None
+        if self._redis is None or self._redis_pid != os.getpid():
+            import redis
+            self._redis = redis.Redis.from_url(self.redis_url, decode_responses=True)
+            self._redis_pid = os.getpid()
+        return self._redis
+
+    def _publish(self, job_id: str, event: str, fields: dict) -> None:
+        """Best effort: a Redis hiccup must never fail the job."""
+        try:
+            client = self._redis_client()
+            if client is None:
+                return
+            payload = {k: v for k, v in fields.items() if k not in _UNPUBLISHED_FIELDS}
+            payload.update(job_id=job_id, event=event)
+            client.publish(job_channel(job_id), json.dumps(payload, default=str))
+        except Exception as e:
+            logger.debug("Job event publish failed for %s: %s", job_id, e)
+
+
+_stores: dict[tuple, JobStore] = {}
+
+
+def get_job_store(db_path: str, redis_url: Optional[str] = None) -> JobStore:
+    """Process-wide JobStore (flushed at interpreter exit)."""
+    key = (db_path, redis_url)
+    store = _stores.get(key)
+    if store is None:
+        store = _stores[key] = JobStore(db_path, redis_url)
+        atexit.register(store.close)
+    return store
@@ -2,7 +2,7 @@
 import os
 import sys
 import logging
-import hashlib
+import asyncio
 
 # Add shared module path for logging and Sentry
 sys.path.insert(0, '/app')
@@ -21,17 +21,16 @@ from shared.middleware import RequestIDMiddleware
 log_level = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
 logger = setup_logging("text-extractor", level=log_level)
 
+import time
 import uuid
 import aiosqlite
-import tempfile
-import base64
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Request
+from fastapi.responses import RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from celery.result import AsyncResult
 import redis.asyncio as aioredis
@@ -48,11 +47,47 @@ from .models import (
     LogEntry,
     JobLogsResponse
 )
+from .upload_spool import (
+    UploadTooLarge,
+    InvalidBase64,
+    spool_upload,
+    spool_base64,
+    commit_spooled_pdf,
+    release_spooled_pdf_async,
+)
+from .job_store import (
+    JOB_EVENTS_PATTERN,
+    TERMINAL_STATUSES,
+    job_channel,
+    format_sse,
+)
+from .extraction_cache import (
+    INFLIGHT_TTL_SECONDS,
+    cache_key,
+    candidate_cache_keys,
+    candidate_inflight_keys,
+    inflight_key,
+    release_inflight,
+)
+from .job_routing import (
+    QUEUE_BY_CLASS,
+    QUEUE_WAIT_KEY,
+    QUEUE_WAIT_SAMPLES,
+    estimate_job_cost,
+    queue_keys,
+    summarize_waits,
+)
+from .result_store import (
+    PDF_CACHE_TTL_SECONDS,
+    ResultStore,
+    ResultNotFound,
+)
 
 # Environment variables
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/0")
 JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "/app/data/jobs.db")
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
 
 # Global Redis connection
 redis_client: Optional[aioredis.Redis] = None
@@ -115,6 +150,8 @@ async def init_db():
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
     async with aiosqlite.connect(JOBS_DB_PATH) as db:
+        # WAL: API reads don't block the worker's batched writes (persistent per DB file)
+        await db.execute("PRAGMA journal_mode=WAL")
         await db.execute("""
             CREATE TABLE IF NOT EXISTS jobs (
                 job_id TEXT PRIMARY KEY,
@@ -142,6 +179,14 @@ async def init_db():
                 FOREIGN KEY (job_id) REFERENCES jobs(job_id)
             )
         """)
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_job_logs_job_id ON job_logs (job_id, timestamp)"
+        )
+        # Out-of-row results (result_store); added to databases created before it existed
+        async with db.execute("PRAGMA table_info(jobs)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        if "result_ref" not in columns:
+            await db.execute("ALTER TABLE jobs ADD COLUMN result_ref TEXT")
         await db.commit()
 
 
@@ -176,6 +221,43 @@ async def update_job_status(job_id: str, status: JobStatus, **kwargs):
         await db.commit()
 
 
+async def result_available(job: dict) -> bool:
+    """True if a completed job's text is still readable (inline or not yet evicted)."""
+    if not job.get("result_ref"):
+        return True
+    try:
+        await asyncio.to_thread(ResultStore().open, job["result_ref"])
+        return True
+    except ResultNotFound:
+        return False
+
+
+ACTIVE_STATUSES = (JobStatus.QUEUED.value, JobStatus.PROCESSING.value)
+
+
+async def find_reusable_job(
+    pdf_hash: str, engine: str, use_gemini: bool, options: dict
+) -> Optional[dict]:
+    """
+    Completed or running job that can answer this request.
+
+    Completed results (exact parameters, then stronger engines) win over
+    jobs still in flight.
+    """
+    for key in candidate_cache_keys(pdf_hash, engine, use_gemini, options):
+        job_id = await redis_client.get(key)
+        job = await get_job(job_id) if job_id else None
+        if job and job["status"] == JobStatus.COMPLETED.value and await result_available(job):
+            return job
+
+    for key in candidate_inflight_keys(pdf_hash, engine, use_gemini, options):
+        job_id = await redis_client.get(key)
+        job = await get_job(job_id) if job_id else None
+        if job and job["status"] in ACTIVE_STATUSES:
+            return job
+    return None
+
+
 async def get_job(job_id: str) -> Optional[dict]:
     """Retrieve job from database."""
     async with aiosqlite.connect(JOBS_DB_PATH) as db:
@@ -267,75 +349,125 @@ async def extract_text(
             detail="Provide only one of 'file' or 'file_base64'"
         )
 
+    # Parse options before touching the upload
+    import json
+    parsed_options = {}
+    if options:
+        try:
+            parsed_options = json.loads(options)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON in options")
+
     # Generate job ID
     job_id = str(uuid.uuid4())
 
-    # Save file to temp location
-    temp_file = None
+    # Stream upload to the shared spool, hashing on the fly (no full copy in memory)
+    spooled = None
+    pdf_path = None
+    committed = False
+    claimed = None
+    queued = False
     try:
-        if file:
-            # Handle multipart upload
-            content = await file.read()
-        else:
-            # Handle base64 upload
-            try:
-                content = base64.b64decode(file_base64)
-            except Exception:
-                raise HTTPException(status_code=400, detail="Invalid base64 encoding")
-
-        # Calcular hash do PDF para cache
-        pdf_hash = hashlib.sha256(content).hexdigest()
-
-        # Verificar cache
-        cached_job_id = await redis_client.get(f"pdf_cache:{pdf_hash}")
-        if cached_job_id:
-            # Buscar resultado do job cacheado
-            cached_result = await get_job(cached_job_id)
-            if cached_result and cached_result.get("status") == JobStatus.COMPLETED.value:
-                logger.info("Cache hit for PDF hash %s, returning job %s", pdf_hash[:8], cached_job_id)
+        try:
+            if file:
+                spooled = await spool_upload(file)
+            else:
+                spooled = await asyncio.to_thread(spool_base64, file_base64)
+        except InvalidBase64:
+            raise HTTPException(status_code=400, detail="Invalid base64 encoding")
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+
+        pdf_hash = spooled.sha256
+
+        # Verificar cache (hash + parametros) e jobs em andamento
+        reusable = await find_reusable_job(pdf_hash, engine.value, use_gemini, parsed_options)
+        if reusable:
+            logger.info(
+                "Cache hit for PDF hash %s, returning %s job %s",
+                pdf_hash[:8], reusable["status"], reusable["job_id"],
+            )
+            spooled.discard()
+            return ExtractionResponse(
+                job_id=reusable["job_id"],
+                status=JobStatus(reusable["status"]),
+                created_at=datetime.fromisoformat(reusable["created_at"])
+            )
+
+        # Claim the in-flight slot; a concurrent identical upload attaches to the winner
+        claim_key = inflight_key(pdf_hash, engine.value, use_gemini, parsed_options)
+        if not await redis_client.set(claim_key, job_id, nx=True, ex=INFLIGHT_TTL_SECONDS):
+            owner_id = await redis_client.get(claim_key)
+            owner = await get_job(owner_id) if owner_id else None
+            if owner_id and (owner is None or owner["status"] in ACTIVE_STATUSES):
+                logger.info("Attaching upload of %s to in-flight job %s", pdf_hash[:8], owner_id)
+                spooled.discard()
                 return ExtractionResponse(
-                    job_id=cached_job_id,
-                    status=JobStatus.COMPLETED,
-                    created_at=datetime.fromisoformat(cached_result["created_at"])
+                    job_id=owner_id,
+                    status=JobStatus(owner["status"]) if owner else JobStatus.QUEUED,
+                    created_at=(
+                        datetime.fromisoformat(owner["created_at"]) if owner
+                        else datetime.now(timezone.utc)
+                    ),
                 )
+            # Stale claim (job failed or killed without releasing it)
+            await redis_client.set(claim_key, job_id, ex=INFLIGHT_TTL_SECONDS)
+        claimed = claim_key
 
-        # Salvar arquivo temporario
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        temp_file.write(content)
-        temp_file.close()
-        temp_path = temp_file.name
-
-        # Parse options if provided
-        import json
-        parsed_options = {}
-        if options:
-            try:
-                parsed_options = json.loads(options)
-            except json.JSONDecodeError:
-                raise HTTPException(status_code=400, detail="Invalid JSON in options")
+        # Reference first, then move to the content-addressed path, under the
+        # spool lock: a worker finishing an identical job cannot delete the
+        # file we hand off
+        pdf_path = str(await commit_spooled_pdf(redis_client, spooled))
+        committed = True
 
         # Save job to database
         await save_job(job_id, engine.value, use_gemini)
 
-        # Queue Celery task
+        # Route by estimated cost: fast/heavy queue, SJF priority, per-class time limit
+        estimate = await asyncio.to_thread(estimate_job_cost, pdf_path, engine.value)
+        routing = {
+            "job_class": estimate.job_class,
+            "priority": estimate.priority,
+            "pages": estimate.pages,
+            "cost": estimate.cost,
+            "enqueued_at": time.time(),
+        }
+
+        # Queue Celery task (path on the shared volume, never the payload)
         from celery_worker import extract_pdf
         task = extract_pdf.apply_async(
-            args=[job_id, temp_path, engine.value, gpu_mode.value, use_gemini, parsed_options],
-            task_id=job_id
+            args=[job_id, pdf_path, engine.value, gpu_mode.value, use_gemini, parsed_options],
+            kwargs={"routing": routing, "inflight_key": claimed},
+            task_id=job_id,
+            queue=estimate.queue,
+            priority=estimate.priority,
+            time_limit=estimate.time_limit,
+            soft_time_limit=estimate.time_limit - 30,
         )
 
-        # NOTE: Temp file cleanup is handled by the Celery worker in its finally block
-        # Do NOT cleanup here - causes race condition where file is deleted before worker reads it
+        queued = True
 
-        # Salvar hash->job_id no cache (TTL 7 dias)
-        await redis_client.setex(f"pdf_cache:{pdf_hash}", 604800, job_id)
+        # NOTE: Spool file and in-flight claim are released by the Celery worker
+        # in its finally block. Do NOT cleanup here - causes race condition where
+        # the file is deleted before the worker reads it
+
+        # Salvar (hash + parametros)->job_id no cache (TTL 7 dias)
+        await redis_client.setex(
+            cache_key(pdf_hash, engine.value, use_gemini, parsed_options),
+            PDF_CACHE_TTL_SECONDS,
+            job_id,
+        )
 
         logger.info("Extraction job submitted", extra={
             "job_id": job_id,
             "engine": engine.value,
             "gpu_mode": gpu_mode.value,
             "use_gemini": use_gemini,
-            "pdf_hash": pdf_hash[:8]
+            "pdf_hash": pdf_hash[:8],
+            "size_bytes": spooled.size,
+            "queue": estimate.queue,
+            "priority": estimate.priority,
+            "pages": estimate.pages,
         })
 
         return ExtractionResponse(
@@ -347,13 +479,18 @@ async def extract_text(
 
     except HTTPException:
         # Cleanup on validation errors
-        if temp_file and os.path.exists(temp_file.name):
-            os.remove(temp_file.name)
+        if spooled and not committed:
+            spooled.discard()
         raise
     except Exception as e:
         # Cleanup on unexpected errors
-        if temp_file and os.path.exists(temp_file.name):
-            os.remove(temp_file.name)
+        if spooled and not committed:
+            spooled.discard()
+        if committed and not queued:
+            # The job never reached the worker, so nothing else drops this reference
+            await release_spooled_pdf_async(redis_client, pdf_path)
+        if claimed and not queued:
+            await release_inflight(redis_client, claimed, job_id)
         raise HTTPException(status_code=500, detail=f"Job submission failed: {str(e)}")
 
 
@@ -404,9 +541,17 @@ async def get_job_result(job_id: str):
         except json.JSONDecodeError:
             pass
 
+    text = job["result_text"] or ""
+    if job.get("result_ref"):
+        try:
+            stored = await asyncio.to_thread(ResultStore().open, job["result_ref"])
+        except ResultNotFound:
+            raise HTTPException(status_code=410, detail="Result expired, resubmit the PDF")
+        text = await asyncio.to_thread(stored.read_text)
+
     return ExtractionResult(
         job_id=job_id,
-        text=job["result_text"] or "",
+        text=text,
         pages_processed=job["pages_processed"] or 0,
         execution_time_seconds=job["execution_time"] or 0.0,
         engine_used=EngineType(job["engine"]),
@@ -415,6 +560,135 @@ async def get_job_result(job_id: str):
     )
 
 
+def parse_byte_range(header: str, total: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single 'bytes=start-end' Range header (inclusive end).
+
+    Returns None when there is no Range header. A malformed, multi-range or
+    unsatisfiable header is answered with 416 and 'Content-Range: bytes */total'.
+    """
+    header = header.strip()
+    if not header:
+        return None
+    not_satisfiable = HTTPException(
+        status_code=416,
+        detail="Requested range not satisfiable",
+        headers={"Content-Range": f"bytes */{total}", "Accept-Ranges": "bytes"},
+    )
+    if not header.startswith("bytes=") or "," in header:
+        raise not_satisfiable
+    start_str, dash, end_str = header[len("bytes="):].strip().partition("-")
+    if not dash or any(part and not (part.isascii() and part.isdigit()) for part in (start_str, end_str)):
+        raise not_satisfiable
+    if start_str:
+        start = int(start_str)
+        end = int(end_str) if end_str else total - 1
+        if end_str and end < start:
+            raise not_satisfiable
+    elif end_str and int(end_str) > 0:  # suffix range: last N bytes
+        start = max(total - int(end_str), 0)
+        end = total - 1
+    else:
+        raise not_satisfiable
+    end = min(end, total - 1)
+    if start > end:
+        raise not_satisfiable
+    return start, end
+
+
+@app.get("/api/v1/jobs/{job_id}/result/text")
+async def stream_job_result(
+    job_id: str,
+    request: Request,
+    page_start: int = 0,
+    page_end: Optional[int] = None,
+):
+    """
+    Stream a completed result as text/plain.
+
+    Pages are selected with page_start/page_end (0-indexed, end exclusive),
+    or an HTTP Range header (bytes of the UTF-8 text). Only the needed
+    segments are decompressed. X-Total-Pages gives the number of pages
+    (Marker pages, or fixed-size segments when X-Paginated is false).
+    """
+    job = await get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != JobStatus.COMPLETED.value:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Job is not completed yet. Current status: {job['status']}"
+        )
+
+    if not job.get("result_ref"):
+        # Small result kept inline: a single page
+        data = (job["result_text"] or "").encode("utf-8")
+        byte_range = parse_byte_range(request.headers.get("range", ""), len(data))
+        if byte_range:
+            start, end = byte_range
+            return StreamingResponse(
+                iter([data[start:end + 1]]),
+                status_code=206,
+                media_type="text/plain; charset=utf-8",
+                headers={"Content-Range": f"bytes {start}-{end}/{len(data)}", "Accept-Ranges": "bytes"},
+            )
+        return StreamingResponse(
+            iter([data] if page_start == 0 else []),
+            media_type="text/plain; charset=utf-8",
+            headers={"X-Total-Pages": "1", "X-Paginated": "false", "Accept-Ranges": "bytes"},
+        )
+
+    try:
+        # Reads the segment index from disk: off the event loop
+        stored = await asyncio.to_thread(ResultStore().open, job["result_ref"])
+    except ResultNotFound:
+        raise HTTPException(status_code=410, detail="Result expired, resubmit the PDF")
+
+    byte_range = parse_byte_range(request.headers.get("range", ""), stored.total_bytes)
+    if byte_range:
+        start, end = byte_range
+        return StreamingResponse(
+            stored.iter_byte_range(start, end),
+            status_code=206,
+            media_type="text/plain; charset=utf-8",
+            headers={
+                "Content-Range": f"bytes {start}-{end}/{stored.total_bytes}",
+                "Accept-Ranges": "bytes",
+            },
+        )
+
+    if page_start < 0 or (page_end is not None and page_end < page_start):
+        raise HTTPException(status_code=400, detail="Invalid page range")
+
+    return StreamingResponse(
+        (page.encode("utf-8") for page in stored.iter_pages(page_start, page_end)),
+        media_type="text/plain; charset=utf-8",
+        headers={
+            "X-Total-Pages": str(stored.page_count),
+            "X-Paginated": str(stored.paginated).lower(),
+            "Accept-Ranges": "bytes",
+        },
+    )
+
+
+@app.get("/api/v1/queues")
+async def queue_stats():
+    """Queue depth and recent queue wait times (seconds) per job class."""
+    stats = {}
+    for job_class, queue in QUEUE_BY_CLASS.items():
+        pipe = redis_client.pipeline()
+        for key in queue_keys(queue):
+            pipe.llen(key)
+        pipe.lrange(QUEUE_WAIT_KEY.format(job_class=job_class), 0, QUEUE_WAIT_SAMPLES - 1)
+        *depths, waits = await pipe.execute()
+        stats[job_class] = {
+            "queue": queue,
+            "depth": sum(depths),
+            "wait_seconds": summarize_waits([float(w) for w in waits]),
+        }
+    return stats
+
+
 @app.get("/api/v1/jobs/{job_id}/logs", response_model=JobLogsResponse)
 async def get_job_logs(job_id: str, since: Optional[datetime] = None):
     """Get logs for a specific job."""
@@ -449,6 +723,82 @@ async def get_job_logs(job_id: str, since: Optional[datetime] = None):
     return JobLogsResponse(job_id=job_id, logs=logs)
 
 
+async def relay_job_events(request: Request, pubsub, snapshot: Optional[dict] = None):
+    """
+    Relay Redis pub/sub job events as Server-Sent Events.
+
+    Sends an optional snapshot first, keep-alive comments while idle, and
+    stops when a single-job stream reaches a terminal status or the client
+    disconnects.
+    """
+    import json
+    try:
+        if snapshot is not None:
+            yield format_sse("snapshot", snapshot)
+            if snapshot.get("status") in TERMINAL_STATUSES:
+                return
+
+        while not await request.is_disconnected():
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=SSE_KEEPALIVE_SECONDS
+            )
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+
+            try:
+                event = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+            yield format_sse(event.get("event", "message"), event)
+
+            if snapshot is not None and event.get("status") in TERMINAL_STATUSES:
+                return
+    finally:
+        await pubsub.close()
+
+
+@app.get("/api/v1/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    """
+    Follow one job via Server-Sent Events (progress, status and log lines).
+
+    Replaces polling /jobs/{id} and /jobs/{id}/logs.
+    """
+    pubsub = redis_client.pubsub()
+    # Subscribe before reading the snapshot so no event falls in between
+    await pubsub.subscribe(job_channel(job_id))
+
+    job = await get_job(job_id)
+    if not job:
+        await pubsub.close()
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    snapshot = {
+        "job_id": job_id,
+        "status": job["status"],
+        "progress": job["progress"],
+        "error_message": job["error_message"],
+    }
+    return StreamingResponse(
+        relay_job_events(request, pubsub, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/v1/events")
+async def stream_all_job_events(request: Request):
+    """Follow every job via one Server-Sent Events stream (batch clients, dashboards)."""
+    pubsub = redis_client.pubsub()
+    await pubsub.psubscribe(JOB_EVENTS_PATTERN)
+    return StreamingResponse(
+        relay_job_events(request, pubsub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/debug/sentry", tags=["Debug"])
 async def debug_sentry():
     """
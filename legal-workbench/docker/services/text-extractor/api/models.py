@@ -9,6 +9,7 @@ class EngineType(str, Enum):
     """PDF extraction engine types."""
     MARKER = "marker"
     PDFPLUMBER = "pdfplumber"
+    AUTO = "auto"  # Per page: native -> pdfplumber, raster -> Marker
 
 
 class GpuMode(str, Enum):
@@ -0,0 +1,103 @@
+"""Per-page engine routing for ``engine=auto``.
+
+Mirrors the NATIVE / RASTER_NEEDED split of legal-text-extractor's
+LayoutAnalyzer (a page with at least MIN_TEXT_CHARS characters in its text
+layer is native) in a single pdfplumber pass that also extracts the native
+pages' text. Only raster pages go to Marker, grouped into contiguous
+page_range runs, and the results are merged back in page order with
+Marker-style page separators (so the result store can paginate them).
+
+This module only depends on the standard library (pdfplumber is imported
+lazily) so the API and worker can both import it.
+"""
+import logging
+import re
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# Same default as LayoutAnalyzer (FigureConfig.min_text_chars)
+MIN_TEXT_CHARS = 50
+
+PAGE_SEPARATOR = "-" * 48
+_PAGE_MARKER = re.compile(r"^\{(\d+)\}-{8,}\s*$", re.MULTILINE)
+
+
+@dataclass
+class PageRoute:
+    """Outcome of the routing pass."""
+    total_pages: int
+    native_text: dict[int, str] = field(default_factory=dict)  # 0-indexed page -> text
+    raster_pages: list[int] = field(default_factory=list)
+
+    @property
+    def raster_ratio(self) -> float:
+        return len(self.raster_pages) / self.total_pages if self.total_pages else 0.0
+
+
+def route_pages(pdf_path: str, min_text_chars: int = MIN_TEXT_CHARS) -> PageRoute:
+    """Classify every page and keep the text of the native ones."""
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        route = PageRoute(total_pages=len(pdf.pages))
+        for index, page in enumerate(pdf.pages):
+            text = page.extract_text() or ""
+            if len(text.strip()) >= min_text_chars:
+                route.native_text[index] = text
+            else:
+                route.raster_pages.append(index)
+            page.flush_cache()
+    return route
+
+
+def plan_runs(pages: list[int], max_batch: int) -> list[list[int]]:
+    """Group pages into contiguous runs of at most max_batch pages."""
+    runs: list[list[int]] = []
+    for page in sorted(pages):
+        if runs and page == runs[-1][-1] + 1 and len(runs[-1]) < max_batch:
+            runs[-1].append(page)
+        else:
+            runs.append([page])
+    return runs
+
+
+def split_marker_output(text: str, pages: list[int]) -> dict[int, str]:
+    """
+    Split paginated Marker output for a page run back into pages.
+
+    Markers are matched by position when their count equals the run length,
+    otherwise by the page number they carry (e.g. Marker dropped an empty
+    page). If neither lines up, the whole text is attributed to the first
+    page of the run and a warning is logged.
+    """
+    matches = list(_PAGE_MARKER.finditer(text))
+    bodies = [
+        text[m.end():matches[i + 1].start() if i + 1 < len(matches) else len(text)].strip()
+        for i, m in enumerate(matches)
+    ]
+    if len(matches) == len(pages):
+        return dict(zip(pages, bodies))
+
+    numbers = [int(m.group(1)) for m in matches]
+    if numbers and set(numbers) <= set(pages) and len(set(numbers)) == len(numbers):
+        logger.warning(
+            "Marker returned %d of %d pages for run %d-%d; missing pages left empty",
+            len(numbers), len(pages), pages[0] + 1, pages[-1] + 1,
+        )
+        return dict(zip(numbers, bodies))
+
+    logger.warning(
+        "Marker page markers (%d) do not match run %d-%d (%d pages); "
+        "attributing the whole text to page %d",
+        len(matches), pages[0] + 1, pages[-1] + 1, len(pages), pages[0] + 1,
+    )
+    return {pages[0]: text.strip()} if text.strip() else {}
+
+
+def merge_pages(texts: dict[int, str], total_pages: int) -> str:
+    """Join page texts in order with Marker paginate_output separators."""
+    return "\n\n".join(
+        f"{{{page}}}{PAGE_SEPARATOR}\n\n{texts.get(page, '').strip()}"
+        for page in range(total_pages)
+    )
@@ -0,0 +1,273 @@
+"""Out-of-row result store for large extractions.
+
+Large results are not kept in ``jobs.result_text``. The worker splits the
+text into pages (Marker ``paginate_output`` markers) or, when there are no
+markers, into fixed-size segments on paragraph boundaries. Each segment is
+compressed as an independent frame and written to
+``RESULT_STORE_DIR/<job_id>/``:
+
+- ``pages.bin``: concatenated frames (zstd, or zlib when zstandard is absent)
+- ``index.json``: codec plus, per segment, the frame offset/length and the
+  segment's offset/length in the uncompressed UTF-8 text
+
+The job row only keeps ``result_ref``. Readers decompress only the segments
+they need, whether selected by page or by uncompressed byte range.
+
+Results are kept as long as the Redis ``pdf_cache`` entry that can point
+to them (PDF_CACHE_TTL_SECONDS); ``evict_expired`` removes older ones.
+
+This module only depends on the standard library (zstandard is optional)
+so the worker can import it too.
+"""
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger("result_store")
+
+DATA_PATH = os.getenv("DATA_PATH", "/app/data")
+RESULT_STORE_DIR = Path(os.getenv("RESULT_STORE_DIR", os.path.join(DATA_PATH, "results")))
+
+# Results up to this size stay inline in jobs.result_text
+RESULT_INLINE_MAX_CHARS = int(os.getenv("RESULT_INLINE_MAX_CHARS", str(64 * 1024)))
+# Segment size when the text has no page markers
+RESULT_SEGMENT_CHARS = int(os.getenv("RESULT_SEGMENT_CHARS", str(64 * 1024)))
+RESULT_ZSTD_LEVEL = int(os.getenv("RESULT_ZSTD_LEVEL", "3"))
+
+# Redis pdf_cache TTL (7 days); results must live at least as long
+PDF_CACHE_TTL_SECONDS = int(os.getenv("PDF_CACHE_TTL_SECONDS", "604800"))
+
+INDEX_NAME = "index.json"
+BLOB_NAME = "pages.bin"
+_EVICTION_STAMP = ".last_eviction"
+
+# Marker paginate_output separator: "{12}------------------------------------------------"
+_PAGE_MARKER = re.compile(r"^\{\d+\}-{8,}", re.MULTILINE)
+
+
+class ResultNotFound(Exception):
+    """Raised when a result_ref points to an evicted or missing result."""
+
+
+def split_pages(text: str, segment_chars: int = RESULT_SEGMENT_CHARS) -> tuple[list[str], bool]:
+    """
+    Split text into segments whose concatenation is exactly ``text``.
+
+    Returns:
+        (segments, paginated) - paginated is True when Marker page markers
+        were used, so segment N is page N of the PDF
+    """
+    starts = [m.start() for m in _PAGE_MARKER.finditer(text)]
+    if starts:
+        if starts[0] != 0:
+            starts.insert(0, 0)
+        bounds = starts + [len(text)]
+        return [text[a:b] for a, b in zip(bounds, bounds[1:])], True
+
+    segments = []
+    position = 0
+    while position < len(text):
+        end = min(position + segment_chars, len(text))
+        if end < len(text):
+            cut = text.rfind("\n\n", position + 1, end)
+            if cut > position:
+                end = cut + 2
+        segments.append(text[position:end])
+        position = end
+    return segments or [""], False
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=RESULT_ZSTD_LEVEL).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Result was stored with zstd but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+@dataclass
+class Segment:
+    """Index entry of one stored segment."""
+    blob_offset: int
+    blob_length: int
+    text_offset: int   # uncompressed UTF-8 byte offset
+    text_length: int   # uncompressed UTF-8 byte length
+
+
+class StoredResult:
+    """Read access to one stored result."""
+
+    def __init__(self, directory: Path):
+        index_path = directory / INDEX_NAME
+        if not index_path.exists():
+            raise ResultNotFound(str(directory))
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        self.directory = directory
+        self.codec: str = index["codec"]
+        self.paginated: bool = index["paginated"]
+        self.chars: int = index["chars"]
+        self.segments = [Segment(*entry) for entry in index["segments"]]
+
+    @property
+    def page_count(self) -> int:
+        return len(self.segments)
+
+    @property
+    def total_bytes(self) -> int:
+        """Uncompressed UTF-8 size."""
+        if not self.segments:
+            return 0
+        last = self.segments[-1]
+        return last.text_offset + last.text_length
+
+    def _read_segment(self, handle, segment: Segment) -> bytes:
+        handle.seek(segment.blob_offset)
+        return _decompress(handle.read(segment.blob_length), self.codec)
+
+    def iter_pages(self, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+        """Yield segments [start, end) as text, one decompression at a time."""
+        with open(self.directory / BLOB_NAME, "rb") as handle:
+            for segment in self.segments[start:end]:
+                yield self._read_segment(handle, segment).decode("utf-8")
+
+    def iter_byte_range(self, start: int, end: int) -> Iterator[bytes]:
+        """Yield uncompressed bytes [start, end] (inclusive, like HTTP Range)."""
+        with open(self.directory / BLOB_NAME, "rb") as handle:
+            for segment in self.segments:
+                seg_start = segment.text_offset
+                seg_end = seg_start + segment.text_length - 1
+                if seg_end < start:
+                    continue
+                if seg_start > end:
+                    break
+                data = self._read_segment(handle, segment)
+                yield data[max(start - seg_start, 0):end - seg_start + 1]
+
+    def read_text(self) -> str:
+        return "".join(self.iter_pages())
+
+
+class ResultStore:
+    """
+    Writes, opens and evicts out-of-row results.
+
+    Example:
+        >>> store = ResultStore()
+        >>> ref = store.save(job_id, full_text)       # worker
+        >>> store.open(ref).iter_pages(10, 20)        # API
+    """
+
+    def __init__(self, root: Path = RESULT_STORE_DIR):
+        self.root = Path(root)
+
+    def should_offload(self, text: str) -> bool:
+        return len(text) > RESULT_INLINE_MAX_CHARS
+
+    def save(self, job_id: str, text: str) -> str:
+        """
+        Compress and store ``text``.
+
+        Returns:
+            result_ref to keep in the job row
+        """
+        codec = "zstd" if ZSTD_AVAILABLE else "zlib"
+        segments, paginated = split_pages(text)
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_dir = self.root / f".tmp-{job_id}-{uuid.uuid4().hex[:8]}"
+        tmp_dir.mkdir()
+        try:
+            index_entries = []
+            blob_offset = text_offset = 0
+            with open(tmp_dir / BLOB_NAME, "wb") as blob:
+                for segment in segments:
+                    raw = segment.encode("utf-8")
+                    frame = _compress(raw, codec)
+                    blob.write(frame)
+                    index_entries.append([blob_offset, len(frame), text_offset, len(raw)])
+                    blob_offset += len(frame)
+                    text_offset += len(raw)
+            index = {
+                "codec": codec,
+                "paginated": paginated,
+                "chars": len(text),
+                "segments": index_entries,
+                "created_at": time.time(),
+            }
+            (tmp_dir / INDEX_NAME).write_text(json.dumps(index), encoding="utf-8")
+
+            final_dir = self.root / job_id
+            if final_dir.exists():
+                shutil.rmtree(final_dir)  # redelivered task
+            os.replace(tmp_dir, final_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        logger.info(
+            "Stored result %s: %d chars, %d segments, %d bytes (%s)",
+            job_id, len(text), len(segments), blob_offset, codec,
+        )
+        return job_id
+
+    def open(self, result_ref: str) -> StoredResult:
+        # result_ref is a job id; refuse anything that could escape the root
+        if not result_ref or "/" in result_ref or result_ref.startswith("."):
+            raise ResultNotFound(result_ref)
+        return StoredResult(self.root / result_ref)
+
+    def evict_expired(
+        self,
+        max_age_seconds: int = PDF_CACHE_TTL_SECONDS,
+        min_interval_seconds: int = 3600,
+    ) -> int:
+        """
+        Remove results older than the pdf_cache TTL.
+
+        Throttled through a stamp file so callers can invoke it after every job.
+
+        Returns:
+            Number of results removed
+        """
+        if not self.root.exists():
+            return 0
+        stamp = self.root / _EVICTION_STAMP
+        now = time.time()
+        if stamp.exists() and now - stamp.stat().st_mtime < min_interval_seconds:
+            return 0
+        stamp.touch()
+
+        removed = 0
+        for directory in self.root.iterdir():
+            if not directory.is_dir():
+                continue
+            try:
+                age = now - directory.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if age > max_age_seconds:
+                shutil.rmtree(directory, ignore_errors=True)
+                removed += 1
+        if removed:
+            logger.info("Evicted %d expired results from %s", removed, self.root)
+        return removed
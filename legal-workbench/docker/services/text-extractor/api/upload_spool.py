@@ -0,0 +1,263 @@
+"""Streaming upload spool for the Text Extractor API.
+
+Uploads are copied in fixed-size chunks to a spool directory on the volume
+shared with the Celery worker, hashing each chunk as it is written. The
+request never holds the whole PDF in memory (Starlette already spools large
+multipart bodies to disk), and the finished file is renamed to its sha256 so
+identical uploads share one spool file.
+
+Spool files are reference-counted in Redis (``pdf_spool_refs:{sha256}``):
+the API increments the count for each queued job *before* committing the
+file to its content address, and the worker releases it when the job ends;
+the last release deletes the file. Both steps run under a per-sha Redis lock
+(``pdf_spool_lock:{sha256}``), so a release never deletes a file that an
+identical upload is committing at the same moment.
+
+This module only uses the standard library so the worker can import it too.
+"""
+import asyncio
+import base64
+import binascii
+import hashlib
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+DATA_PATH = os.getenv("DATA_PATH", "/app/data")
+UPLOAD_SPOOL_DIR = Path(os.getenv("UPLOAD_SPOOL_DIR", os.path.join(DATA_PATH, "uploads")))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(500 * 1024 * 1024)))
+
+# Keep refcounts around as long as the pdf_cache entries (7 days)
+SPOOL_REF_TTL_SECONDS = 604800
+# Retain+commit and release+delete are short: a lock older than this is stale
+SPOOL_LOCK_TIMEOUT_SECONDS = 30
+
+_WHITESPACE = re.compile(r"\s")
+
+# Atomic decrement that removes the key when the last reference goes
+_RELEASE_SCRIPT = """
+local remaining = redis.call('DECR', KEYS[1])
+if remaining <= 0 then redis.call('DEL', KEYS[1]) end
+return remaining
+"""
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds MAX_UPLOAD_BYTES."""
+
+
+class InvalidBase64(Exception):
+    """Raised when a base64 payload cannot be decoded."""
+
+
+@dataclass
+class SpooledPdf:
+    """A fully written upload, still under its temporary .part name."""
+    part_path: Path
+    path: Path
+    sha256: str
+    size: int
+
+    def commit(self) -> Path:
+        """Move to the content address (overwrites an identical spool file)."""
+        os.replace(self.part_path, self.path)
+        return self.path
+
+    def discard(self) -> None:
+        """Drop the upload (e.g. result already cached)."""
+        if self.part_path.exists():
+            self.part_path.unlink()
+
+
+def spool_ref_key(sha256: str) -> str:
+    """Redis key holding the number of jobs using a spool file."""
+    return f"pdf_spool_refs:{sha256}"
+
+
+def spool_lock_key(sha256: str) -> str:
+    """Redis lock serializing commit and delete of one spool file."""
+    return f"pdf_spool_lock:{sha256}"
+
+
+class _SpoolWriter:
+    """Writes chunks to a .part file while hashing them."""
+
+    def __init__(self, spool_dir: Path, max_bytes: int):
+        spool_dir.mkdir(parents=True, exist_ok=True)
+        self.spool_dir = spool_dir
+        self.max_bytes = max_bytes
+        self.part_path = spool_dir / f".incoming-{uuid.uuid4().hex}.part"
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self._handle = open(self.part_path, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLarge(f"Upload exceeds {self.max_bytes} bytes")
+        self.digest.update(chunk)
+        self._handle.write(chunk)
+
+    def finish(self) -> SpooledPdf:
+        """Close the .part file; the caller decides to commit or discard."""
+        self._handle.close()
+        sha256 = self.digest.hexdigest()
+        return SpooledPdf(
+            part_path=self.part_path,
+            path=self.spool_dir / f"{sha256}.pdf",
+            sha256=sha256,
+            size=self.size,
+        )
+
+    def abort(self) -> None:
+        self._handle.close()
+        if self.part_path.exists():
+            self.part_path.unlink()
+
+
+async def spool_upload(
+    upload,
+    spool_dir: Path = UPLOAD_SPOOL_DIR,
+    chunk_bytes: int = UPLOAD_CHUNK_BYTES,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+) -> SpooledPdf:
+    """
+    Stream a multipart upload to the spool, hashing on the fly.
+
+    Args:
+        upload: FastAPI UploadFile (anything with ``async read(n)``)
+        spool_dir: Spool directory (shared with the worker)
+        chunk_bytes: Read/write block size
+        max_bytes: Reject uploads larger than this (UploadTooLarge)
+    """
+    writer = _SpoolWriter(spool_dir, max_bytes)
+    try:
+        while True:
+            chunk = await upload.read(chunk_bytes)
+            if not chunk:
+                break
+            # Hash + disk write off the event loop
+            await asyncio.to_thread(writer.write, chunk)
+        return writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def spool_base64(
+    payload: str,
+    spool_dir: Path = UPLOAD_SPOOL_DIR,
+    chunk_bytes: int = UPLOAD_CHUNK_BYTES,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+) -> SpooledPdf:
+    """
+    Decode a base64 payload to the spool block by block.
+
+    Only one decoded block is alive at a time instead of the full PDF.
+    """
+    if _WHITESPACE.search(payload):
+        payload = _WHITESPACE.sub("", payload)
+
+    # Block size must be a multiple of 4 base64 chars (3 bytes)
+    block_chars = max(4, (chunk_bytes // 3) * 4)
+    writer = _SpoolWriter(spool_dir, max_bytes)
+    try:
+        for start in range(0, len(payload), block_chars):
+            try:
+                chunk = base64.b64decode(payload[start:start + block_chars], validate=True)
+            except (binascii.Error, ValueError) as e:
+                raise InvalidBase64(str(e)) from e
+            writer.write(chunk)
+        if writer.size == 0:
+            raise InvalidBase64("Empty payload")
+        return writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def is_spooled(path: str, spool_dir: Path = UPLOAD_SPOOL_DIR) -> bool:
+    """True if path is a spool file (vs. a legacy per-job temp file)."""
+    return Path(path).resolve().parent == spool_dir.resolve()
+
+
+def release_spooled_pdf(redis_client, path: str) -> bool:
+    """
+    Drop one job reference to a spool file (sync, for the worker).
+
+    Deletes the file once no queued job references it. Decrement and delete
+    hold the spool lock, so they cannot interleave with commit_spooled_pdf.
+
+    Returns:
+        True if the file was deleted
+    """
+    sha256 = Path(path).stem
+    key = spool_ref_key(sha256)
+    with redis_client.lock(
+        spool_lock_key(sha256),
+        timeout=SPOOL_LOCK_TIMEOUT_SECONDS,
+        blocking_timeout=SPOOL_LOCK_TIMEOUT_SECONDS,
+    ):
+        remaining = redis_client.eval(_RELEASE_SCRIPT, 1, key)
+        if remaining > 0:
+            return False
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return True
+
+
+async def retain_spooled_pdf(redis_client, spooled: SpooledPdf) -> int:
+    """Add one job reference to a spool file (async, for the API)."""
+    key = spool_ref_key(spooled.sha256)
+    refs = await redis_client.incr(key)
+    await redis_client.expire(key, SPOOL_REF_TTL_SECONDS)
+    return refs
+
+
+async def commit_spooled_pdf(redis_client, spooled: SpooledPdf) -> Path:
+    """
+    Reference a spool file for a new job, then move it to its content address.
+
+    Runs under the spool lock, so a worker releasing the last reference to
+    an identical file either finishes deleting it before the commit or sees
+    the new reference and keeps it.
+    """
+    async with redis_client.lock(
+        spool_lock_key(spooled.sha256),
+        timeout=SPOOL_LOCK_TIMEOUT_SECONDS,
+        blocking_timeout=SPOOL_LOCK_TIMEOUT_SECONDS,
+    ):
+        await retain_spooled_pdf(redis_client, spooled)
+        return await asyncio.to_thread(spooled.commit)
+
+
+async def release_spooled_pdf_async(redis_client, path: str) -> bool:
+    """
+    Drop one job reference to a spool file (async, for the API).
+
+    Undoes commit_spooled_pdf when the job could not be queued; same lock
+    and delete rule as release_spooled_pdf.
+
+    Returns:
+        True if the file was deleted
+    """
+    sha256 = Path(path).stem
+    key = spool_ref_key(sha256)
+    async with redis_client.lock(
+        spool_lock_key(sha256),
+        timeout=SPOOL_LOCK_TIMEOUT_SECONDS,
+        blocking_timeout=SPOOL_LOCK_TIMEOUT_SECONDS,
+    ):
+        remaining = await redis_client.eval(_RELEASE_SCRIPT, 1, key)
+        if remaining > 0:
+            return False
+        try:
+            await asyncio.to_thread(os.remove, path)
+        except FileNotFoundError:
+            pass
+        return True
@@ -1,17 +1,52 @@
 """Celery worker for PDF text extraction."""
+import asyncio
 import os
 import signal
 import time
-import sqlite3
 import json
 import logging
+import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
 
 from celery import Celery, Task
 from celery.exceptions import SoftTimeLimitExceeded
-from celery.signals import task_prerun, task_postrun, task_failure
+from celery.signals import task_prerun, task_postrun, task_failure, worker_ready
+
+# Process-wide Marker model registry (shared with legal-text-extractor;
+# copied from ferramentas/legal-text-extractor/src/engines/model_registry.py)
+from model_registry import get_marker_registry, warmup_from_env
+# Chunked page_range extraction (copied from .../src/engines/marker_chunked.py)
+from marker_chunked import (
+    ChunkedMarkerExtractor,
+    ChunkProgress,
+    keep_checkpoint_for_retry,
+    page_range_converter,
+)
+# Local multi-process chunk pool (copied from .../src/engines/marker_pool.py)
+from marker_pool import LocalChunkPool, MarkerChunkWorker
+# Chunked async Gemini enhancement (copied from .../src/gemini/async_enhancer.py)
+from async_enhancer import AsyncChunkEnhancer, ChunkCache, GenaiBackend
+# Content-addressed upload spool shared with the API (refcounted in Redis)
+from api.upload_spool import is_spooled, release_spooled_pdf
+# Batched job state writes + Redis pub/sub progress events
+from api.job_store import get_job_store
+# Compressed out-of-row storage for large results
+from api.result_store import ResultStore
+# Cost-based routing: fast/heavy queues, SJF priorities, queue wait stats
+from api.job_routing import (
+    FAST_QUEUE,
+    HEAVY_QUEUE,
+    HEAVY_JOB_TIMEOUT_SECONDS,
+    PRIORITY_SEP,
+    PRIORITY_STEPS,
+    record_queue_wait,
+)
+# engine=auto: native pages via pdfplumber, only raster pages through Marker
+from api.page_router import route_pages, plan_runs, split_marker_output, merge_pages
+# In-flight dedup claim taken by the API (released when the job ends)
+from api.extraction_cache import release_inflight
 
 # Configure logger
 logger = logging.getLogger("celery_worker")
@@ -28,16 +63,57 @@ JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "/app/data/jobs.db")
 MARKER_CACHE_DIR = os.getenv("MARKER_CACHE_DIR", "/app/cache")
 MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "2"))
 JOB_TIMEOUT_SECONDS = int(os.getenv("JOB_TIMEOUT_SECONDS", "2100"))  # 35 minutes for large PDFs
+# Errors extract_pdf retries automatically (the retry resumes Marker chunks)
+RETRYABLE_ERRORS = (RuntimeError, ConnectionError, TimeoutError)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# Gemini enhancement runs per chunk (page/section boundaries) instead of
+# truncating the document; responses are cached by chunk hash
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-pro")
+GEMINI_CHUNK_CHARS = int(os.getenv("GEMINI_CHUNK_CHARS", "8000"))
+GEMINI_CONCURRENCY = int(os.getenv("GEMINI_CONCURRENCY", "4"))
+GEMINI_CALLS_PER_MINUTE = float(os.getenv("GEMINI_CALLS_PER_MINUTE", "60"))
+GEMINI_CACHE_PATH = os.getenv("GEMINI_CACHE_PATH", os.path.join(MARKER_CACHE_DIR, "gemini_chunks.db"))
+
+DEFAULT_GEMINI_PROMPT = """
+Clean and improve the following extracted text from a PDF document.
+Fix OCR errors, improve formatting, and maintain the original structure.
+Return only the cleaned text without any additional commentary.
+
+Text:
+"""
 
 # Marker-specific timeout (30 minutes for CPU-only processing of large legal documents)
+# In chunked mode the timeout applies to each page window
 MARKER_TIMEOUT = int(os.getenv("MARKER_TIMEOUT", "1800"))
 
+# Local chunked Marker: PDFs above the threshold run as page_range windows
+# (0 disables chunking). Checkpoints live under MARKER_CHUNK_DIR/<job_id>
+# so a redelivered task (acks_late) resumes after a worker restart.
+MARKER_CHUNK_THRESHOLD = int(os.getenv("MARKER_CHUNK_THRESHOLD", "100"))
+MARKER_CHUNK_SIZE = int(os.getenv("MARKER_CHUNK_SIZE", "50"))
+MARKER_CHUNK_DIR = os.getenv("MARKER_CHUNK_DIR", os.path.join(MARKER_CACHE_DIR, "chunks"))
+# Chunked mode on N local processes, each with its own warm models
+# (~6GB RAM each; 1 = single warm converter in the worker process)
+MARKER_POOL_PROCESSES = int(os.getenv("MARKER_POOL_PROCESSES", "1"))
+
 # Modal GPU acceleration
 MODAL_ENABLED = os.getenv("MODAL_ENABLED", "false").lower() == "true"
 MODAL_TOKEN_ID = os.getenv("MODAL_TOKEN_ID")
 MODAL_TOKEN_SECRET = os.getenv("MODAL_TOKEN_SECRET")
 
+# Sync Redis client for spool refcounts (created on first use)
+_spool_redis = None
+
+
+def get_spool_redis():
+    """Lazily connect to Redis for spool reference counting."""
+    global _spool_redis
+    if _spool_redis is None:
+        import redis
+        _spool_redis = redis.Redis.from_url(CELERY_BROKER_URL, decode_responses=True)
+    return _spool_redis
+
+
 # Create Celery app
 celery_app = Celery(
     "text_extractor",
@@ -58,6 +134,17 @@ celery_app.conf.update(
     task_acks_late=True,
     worker_prefetch_multiplier=1,
     result_expires=3600,  # 1 hour
+    # fast (pdfplumber) and heavy (Marker/Modal) queues are consumed by
+    # separate workers; unrouted tasks go to the heavy queue
+    task_default_queue=HEAVY_QUEUE,
+    task_queue_max_priority=PRIORITY_STEPS[-1],
+    task_default_priority=len(PRIORITY_STEPS) // 2,
+    # Shortest job first: lower priority step (cheaper job) is served first
+    broker_transport_options={
+        "priority_steps": PRIORITY_STEPS,
+        "sep": PRIORITY_SEP,
+        "queue_order_strategy": "priority",
+    },
 )
 
 class MarkerTimeoutError(Exception):
@@ -70,6 +157,11 @@ class ModalTimeoutError(Exception):
     pass
 
 
+class NeedsHeavyQueue(Exception):
+    """Raised when an engine=auto job on the fast queue turns out to need Marker."""
+    pass
+
+
 # Timeout for Modal calls (30 minutes)
 MODAL_TIMEOUT = int(os.getenv("MODAL_TIMEOUT", "1800"))
 
@@ -84,71 +176,50 @@ def modal_timeout_handler(signum, frame):
     raise ModalTimeoutError(f"Modal call exceeded {MODAL_TIMEOUT}s")
 
 
-# Singleton for Marker model artifacts (lazy loading)
-_marker_artifacts = None
+def log_marker_environment():
+    """Log Marker-related environment config (useful when model loading stalls)."""
+    logger.info("Marker environment:")
+    logger.info("  TORCH_DEVICE=%s", os.getenv("TORCH_DEVICE", "auto"))
+    logger.info("  DETECTOR_BATCH_SIZE=%s", os.getenv("DETECTOR_BATCH_SIZE", "default"))
+    logger.info("  RECOGNITION_BATCH_SIZE=%s", os.getenv("RECOGNITION_BATCH_SIZE", "default"))
+    logger.info("  MARKER_TIMEOUT=%s seconds", MARKER_TIMEOUT)
+    logger.info("  MARKER_IDLE_UNLOAD_SECONDS=%s", os.getenv("MARKER_IDLE_UNLOAD_SECONDS", "0"))
+    logger.info("  MARKER_WARMUP=%s", os.getenv("MARKER_WARMUP", "false"))
 
 
-def get_marker_artifacts():
-    """Get or initialize Marker model artifacts (singleton pattern)."""
-    global _marker_artifacts
+def update_job_db(job_id: str, **fields):
+    """Update job in SQLite (progress ticks are coalesced) and publish the change."""
+    get_job_store(JOBS_DB_PATH, CELERY_BROKER_URL).update(job_id, **fields)
 
-    if _marker_artifacts is None:
-        try:
-            from marker.models import create_model_dict
 
-            # Log environment config for debugging
-            torch_device = os.getenv("TORCH_DEVICE", "auto")
-            detector_batch = os.getenv("DETECTOR_BATCH_SIZE", "default")
-            recognition_batch = os.getenv("RECOGNITION_BATCH_SIZE", "default")
+def save_job_log(job_id: str, level: str, message: str):
+    """Buffer a job_logs entry (inserted in batches) and publish it."""
+    get_job_store(JOBS_DB_PATH, CELERY_BROKER_URL).log(job_id, level, message)
 
-            logger.info("Loading Marker models...")
-            logger.info("  TORCH_DEVICE=%s", torch_device)
-            logger.info("  DETECTOR_BATCH_SIZE=%s", detector_batch)
-            logger.info("  RECOGNITION_BATCH_SIZE=%s", recognition_batch)
-            logger.info("  MARKER_TIMEOUT=%s seconds", MARKER_TIMEOUT)
-            logger.info("This may take several minutes on CPU...")
 
-            start_time = time.time()
-            _marker_artifacts = create_model_dict()
-            load_time = time.time() - start_time
+# OTIMIZACAO: Config igual ao marker_engine.py
+MARKER_CONFIG = {
+    "output_format": "markdown",
+    "paginate_output": True,
+    "disable_image_extraction": True,  # CRITICO: evita 80MB de base64
+    "disable_links": True,
+    "drop_repeated_text": True,
+    "keep_pageheader_in_output": False,
+    "keep_pagefooter_in_output": False,
+}
 
-            logger.info("Marker models loaded successfully in %.1f seconds", load_time)
-        except Exception as e:
-            logger.error("Failed to load Marker models: %s", e)
-            raise
 
-    return _marker_artifacts
+def count_pdf_pages(pdf_path: str) -> int:
+    """Count pages without rendering (pdfplumber/pdfminer)."""
+    import pdfplumber
 
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
 
-def update_job_db(job_id: str, **fields):
-    """Update job in SQLite database."""
-    db_path = Path(JOBS_DB_PATH)
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-
-    set_clause = ", ".join(f"{key} = ?" for key in fields.keys())
-    values = list(fields.values()) + [job_id]
-
-    with sqlite3.connect(JOBS_DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            f"UPDATE jobs SET {set_clause} WHERE job_id = ?",
-            values
-        )
-        conn.commit()
 
-
-def save_job_log(job_id: str, level: str, message: str):
-    """Save log entry to job_logs table."""
-    db_path = Path(JOBS_DB_PATH)
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with sqlite3.connect(JOBS_DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO job_logs (job_id, timestamp, level, message) VALUES (?, ?, ?, ?)",
-            (job_id, datetime.utcnow().isoformat(), level, message)
-        )
-        conn.commit()
+def marker_chunk_dir(job_id: str) -> Path:
+    """Checkpoint directory of a job's chunked Marker extraction."""
+    return Path(MARKER_CHUNK_DIR) / job_id
 
 
 def extract_with_marker(pdf_path: str, options: Dict[str, Any]) -> tuple[str, int, Dict]:
@@ -158,21 +229,9 @@ def extract_with_marker(pdf_path: str, options: Dict[str, Any]) -> tuple[str, in
         from marker.config.parser import ConfigParser
         from marker.output import text_from_rendered
 
-        # Get Marker model artifacts
-        artifact_dict = get_marker_artifacts()
-
         logger.info("Starting Marker extraction for: %s", pdf_path)
 
-        # OTIMIZACAO: Config igual ao marker_engine.py
-        config_dict = {
-            "output_format": "markdown",
-            "paginate_output": True,
-            "disable_image_extraction": True,  # CRITICO: evita 80MB de base64
-            "disable_links": True,
-            "drop_repeated_text": True,
-            "keep_pageheader_in_output": False,
-            "keep_pagefooter_in_output": False,
-        }
+        config_dict = dict(MARKER_CONFIG)
 
         pdf_size = os.path.getsize(pdf_path)
         logger.info("PDF file: %s", pdf_path)
@@ -182,27 +241,32 @@ def extract_with_marker(pdf_path: str, options: Dict[str, Any]) -> tuple[str, in
         # Create config parser
         config_parser = ConfigParser(config_dict)
 
-        # Create converter with optimized config
-        logger.info("Creating PDF converter...")
-        converter = PdfConverter(
-            config=config_parser.generate_config_dict(),
-            artifact_dict=artifact_dict,
-            processor_list=config_parser.get_processors(),
-            renderer=config_parser.get_renderer(),
-        )
-
-        # Set timeout for Marker extraction
-        logger.info("Starting extraction with %d second timeout...", MARKER_TIMEOUT)
-        original_handler = signal.signal(signal.SIGALRM, marker_timeout_handler)
-        signal.alarm(MARKER_TIMEOUT)
-
-        try:
-            # Convert PDF
-            rendered = converter(pdf_path)
-        finally:
-            # Always restore original handler and cancel alarm
-            signal.alarm(0)
-            signal.signal(signal.SIGALRM, original_handler)
+        # Lease shared models (first lease loads them; may take minutes on CPU)
+        registry = get_marker_registry()
+        with registry.lease() as artifact_dict:
+            # Create converter with optimized config
+            logger.info("Creating PDF converter...")
+            converter = PdfConverter(
+                config=config_parser.generate_config_dict(),
+                artifact_dict=artifact_dict,
+                processor_list=config_parser.get_processors(),
+                renderer=config_parser.get_renderer(),
+            )
+
+            # Set timeout for Marker extraction
+            logger.info("Starting extraction with %d second timeout...", MARKER_TIMEOUT)
+            original_handler = signal.signal(signal.SIGALRM, marker_timeout_handler)
+            signal.alarm(MARKER_TIMEOUT)
+
+            try:
+                # Convert PDF
+                rendered = converter(pdf_path)
+            finally:
+                # Always restore original handler and cancel alarm
+                signal.alarm(0)
+                signal.signal(signal.SIGALRM, original_handler)
+                # Don't keep models reachable past the lease (idle unload)
+                del converter
 
         # Extract text from rendered output
         full_text = rendered.markdown if hasattr(rendered, 'markdown') else ""
@@ -218,6 +282,7 @@ def extract_with_marker(pdf_path: str, options: Dict[str, Any]) -> tuple[str, in
             "ocr_applied": True,
             "file_size_bytes": os.path.getsize(pdf_path),
             "config_applied": config_dict,
+            "model_registry": registry.stats(),
         }
 
         logger.info("Marker extraction completed: %d pages", pages_processed)
@@ -229,6 +294,261 @@ def extract_with_marker(pdf_path: str, options: Dict[str, Any]) -> tuple[str, in
         raise
 
 
+def extract_with_marker_chunked(
+    job_id: str,
+    pdf_path: str,
+    options: Dict[str, Any],
+    total_pages: int,
+) -> tuple[str, int, Dict]:
+    """
+    Extract text with local Marker in page_range windows.
+
+    One warm converter processes MARKER_CHUNK_SIZE pages at a time; each
+    window is checkpointed to disk and reported in the jobs table, so memory
+    stays bounded and a restarted worker resumes from the last finished window.
+    """
+    if MARKER_POOL_PROCESSES > 1:
+        return extract_with_marker_pool(job_id, pdf_path, options, total_pages)
+
+    from marker.converters.pdf import PdfConverter
+    from marker.config.parser import ConfigParser
+
+    config_dict = dict(MARKER_CONFIG)
+    config_parser = ConfigParser(config_dict)
+    work_dir = marker_chunk_dir(job_id)
+
+    def rendered_text(rendered) -> str:
+        if getattr(rendered, "markdown", ""):
+            return rendered.markdown
+        from marker.output import text_from_rendered
+
+        return text_from_rendered(rendered)[0]
+
+    def on_progress(progress: ChunkProgress):
+        # Extraction spans 10% -> 70% of the job progress bar
+        update_job_db(job_id, progress=round(10.0 + 0.6 * progress.percent, 1))
+        first, last = progress.page_range
+        action = "resumed from checkpoint" if progress.resumed else f"done in {progress.chunk_seconds:.1f}s"
+        save_job_log(
+            job_id,
+            "INFO",
+            f"Marker chunk {progress.chunk}/{progress.total_chunks} "
+            f"(pages {first + 1}-{last + 1}) {action}",
+        )
+
+    logger.info(
+        "Starting chunked Marker extraction: %d pages, windows of %d, checkpoint %s",
+        total_pages, MARKER_CHUNK_SIZE, work_dir,
+    )
+
+    registry = get_marker_registry()
+    with registry.lease() as artifact_dict:
+        converter = PdfConverter(
+            config=config_parser.generate_config_dict(),
+            artifact_dict=artifact_dict,
+            processor_list=config_parser.get_processors(),
+            renderer=config_parser.get_renderer(),
+        )
+        convert_window = page_range_converter(converter, text_fn=rendered_text)
+
+        def convert_with_timeout(path: str, pages: list) -> str:
+            original_handler = signal.signal(signal.SIGALRM, marker_timeout_handler)
+            signal.alarm(MARKER_TIMEOUT)
+            try:
+                return convert_window(path, pages)
+            finally:
+                signal.alarm(0)
+                signal.signal(signal.SIGALRM, original_handler)
+
+        extractor = ChunkedMarkerExtractor(convert_with_timeout, chunk_size=MARKER_CHUNK_SIZE)
+        result = extractor.run(
+            Path(pdf_path),
+            total_pages,
+            work_dir,
+            progress_callback=on_progress,
+            settings=config_dict,
+        )
+        del converter, convert_window, extractor
+
+    full_text = result.output_path.read_text(encoding="utf-8")
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    extraction_metadata = {
+        "ocr_applied": True,
+        "file_size_bytes": os.path.getsize(pdf_path),
+        "config_applied": config_dict,
+        "chunked": True,
+        "chunk_size": MARKER_CHUNK_SIZE,
+        "total_chunks": result.total_chunks,
+        "resumed_chunks": result.resumed_chunks,
+        "model_registry": registry.stats(),
+    }
+
+    logger.info(
+        "Chunked Marker extraction completed: %d pages, %d chunks (%d resumed)",
+        total_pages, result.total_chunks, result.resumed_chunks,
+    )
+    return full_text, total_pages, extraction_metadata
+
+
+def extract_with_marker_pool(
+    job_id: str,
+    pdf_path: str,
+    options: Dict[str, Any],
+    total_pages: int,
+) -> tuple[str, int, Dict]:
+    """
+    Extract text with MARKER_POOL_PROCESSES local Marker processes.
+
+    Page windows are handed to whichever process is idle and reassembled in
+    page order; checkpoints share marker_chunk_dir(job_id) so a redelivered
+    task resumes.
+    """
+    pool = LocalChunkPool(
+        MarkerChunkWorker(MARKER_CONFIG),
+        processes=MARKER_POOL_PROCESSES,
+        chunk_size=MARKER_CHUNK_SIZE,
+    )
+    save_job_log(job_id, "INFO", f"Marker pool: {pool.processes} processes")
+
+    def on_progress(event: dict):
+        # Extraction spans 10% -> 70% of the job progress bar
+        update_job_db(job_id, progress=round(10.0 + 0.6 * event["percent"], 1))
+        save_job_log(job_id, "INFO", event["message"])
+
+    work_dir = marker_chunk_dir(job_id)
+    data = pool.extract(
+        Path(pdf_path),
+        total_pages,
+        work_dir,
+        progress_callback=on_progress,
+        settings=MARKER_CONFIG,
+    )
+    full_text = data.pop("text")
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    extraction_metadata = {
+        "ocr_applied": True,
+        "file_size_bytes": os.path.getsize(pdf_path),
+        "config_applied": MARKER_CONFIG,
+        "chunked": True,
+        "chunk_size": data["chunk_size"],
+        "total_chunks": data["total_chunks"],
+        "resumed_chunks": data["resumed_chunks"],
+        "workers_used": data["workers_used"],
+        "chunk_stats": data["chunk_stats"],
+    }
+    logger.info(
+        "Marker pool extraction completed: %d pages, %d chunks on %d processes in %.1fs",
+        total_pages, data["total_chunks"], data["workers_used"], data["processing_time"],
+    )
+    return full_text, total_pages, extraction_metadata
+
+
+def extract_with_hybrid(
+    job_id: str,
+    pdf_path: str,
+    options: Dict[str, Any],
+    gpu_mode: str = "auto",
+    allow_marker: bool = True,
+) -> tuple[str, int, Dict]:
+    """
+    Extract text choosing the engine per page (engine=auto).
+
+    One pdfplumber pass classifies pages (LayoutAnalyzer rule: native if the
+    text layer has enough characters) and keeps the native text. Raster pages
+    run through one warm Marker converter in contiguous page_range runs of up
+    to MARKER_CHUNK_SIZE pages; results are merged back in page order.
+
+    Raises:
+        NeedsHeavyQueue: raster pages found but allow_marker is False (the
+            API's sampled pre-pass routed the job to the fast queue)
+    """
+    route = route_pages(pdf_path)
+    native_count = len(route.native_text)
+    raster_count = len(route.raster_pages)
+    if raster_count and not allow_marker:
+        raise NeedsHeavyQueue(f"{raster_count} raster pages")
+    save_job_log(
+        job_id, "INFO",
+        f"Page routing: {native_count} native (pdfplumber), {raster_count} raster (Marker)"
+    )
+    update_job_db(job_id, progress=20.0)
+
+    extraction_metadata = {
+        "file_size_bytes": os.path.getsize(pdf_path),
+        "native_pages": native_count,
+        "ocr_pages": raster_count,
+        "ocr_applied": raster_count > 0,
+        "hybrid": True,
+    }
+
+    if raster_count and MODAL_ENABLED:
+        # Local Marker is not available next to Modal (ARM VM): whole PDF on GPU
+        save_job_log(job_id, "INFO", "Raster pages found, using Modal GPU for the whole PDF")
+        full_text, pages_processed, modal_metadata = extract_with_modal(pdf_path, options, gpu_mode)
+        modal_metadata["hybrid"] = False
+        return full_text, pages_processed, modal_metadata
+
+    texts = dict(route.native_text)
+    if raster_count:
+        from marker.converters.pdf import PdfConverter
+        from marker.config.parser import ConfigParser
+
+        config_dict = dict(MARKER_CONFIG)
+        config_parser = ConfigParser(config_dict)
+        runs = plan_runs(route.raster_pages, MARKER_CHUNK_SIZE)
+
+        def rendered_text(rendered) -> str:
+            if getattr(rendered, "markdown", ""):
+                return rendered.markdown
+            from marker.output import text_from_rendered
+
+            return text_from_rendered(rendered)[0]
+
+        registry = get_marker_registry()
+        with registry.lease() as artifact_dict:
+            converter = PdfConverter(
+                config=config_parser.generate_config_dict(),
+                artifact_dict=artifact_dict,
+                processor_list=config_parser.get_processors(),
+                renderer=config_parser.get_renderer(),
+            )
+            convert_run = page_range_converter(converter, text_fn=rendered_text)
+
+            done = 0
+            for number, run in enumerate(runs, start=1):
+                original_handler = signal.signal(signal.SIGALRM, marker_timeout_handler)
+                signal.alarm(MARKER_TIMEOUT)
+                try:
+                    texts.update(split_marker_output(convert_run(pdf_path, run), run))
+                finally:
+                    signal.alarm(0)
+                    signal.signal(signal.SIGALRM, original_handler)
+
+                done += len(run)
+                # Marker runs span 20% -> 70% of the job progress bar
+                update_job_db(job_id, progress=round(20.0 + 50.0 * done / raster_count, 1))
+                save_job_log(
+                    job_id, "INFO",
+                    f"Marker run {number}/{len(runs)} (pages {run[0] + 1}-{run[-1] + 1}) done"
+                )
+            del converter, convert_run
+
+        extraction_metadata.update({
+            "marker_runs": len(runs),
+            "config_applied": config_dict,
+            "model_registry": registry.stats(),
+        })
+
+    full_text = merge_pages(texts, route.total_pages)
+    logger.info(
+        "Hybrid extraction completed: %d pages (%d native, %d raster)",
+        route.total_pages, native_count, raster_count,
+    )
+    return full_text, route.total_pages, extraction_metadata
+
+
 def extract_with_pdfplumber(pdf_path: str, options: Dict[str, Any]) -> tuple[str, int, Dict]:
     """Extract text using pdfplumber engine."""
     try:
@@ -351,39 +671,59 @@ def extract_with_modal(pdf_path: str, options: Dict[str, Any], gpu_mode: str = "
         raise
 
 
-def enhance_with_gemini(text: str, options: Dict[str, Any]) -> str:
-    """Post-process extracted text with Gemini."""
-    if not GEMINI_API_KEY:
-        logger.info("Gemini API key not configured, skipping enhancement")
-        return text
-
-    try:
-        import google.generativeai as genai
-
-        genai.configure(api_key=GEMINI_API_KEY)
-        model = genai.GenerativeModel('gemini-pro')
-
-        prompt = options.get("gemini_prompt", """
-        Clean and improve the following extracted text from a PDF document.
-        Fix OCR errors, improve formatting, and maintain the original structure.
-        Return only the cleaned text without any additional commentary.
-
-        Text:
-        {text}
-        """).format(text=text[:8000])  # Limit to avoid token limits
+def enhance_with_gemini(text: str, options: Dict[str, Any], job_id: Optional[str] = None) -> tuple[str, Dict[str, Any]]:
+    """
+    Post-process extracted text with Gemini, chunk by chunk.
 
-        logger.info("Enhancing text with Gemini...")
+    The text is split on page/section boundaries and the chunks are sent
+    concurrently (GEMINI_CONCURRENCY, GEMINI_CALLS_PER_MINUTE). Only failed
+    chunks are retried; a chunk that still fails keeps its original text.
 
-        response = model.generate_content(prompt)
-        enhanced_text = response.text
+    Returns:
+        (text, stats) - stats is empty when enhancement was skipped
+    """
+    if not GEMINI_API_KEY:
+        logger.info("Gemini API key not configured, skipping enhancement")
+        return text, {}
 
-        logger.info("Gemini enhancement completed")
+    # Custom prompts may still carry the old "{text}" placeholder; the chunk
+    # is appended after the prompt
+    prompt = options.get("gemini_prompt", DEFAULT_GEMINI_PROMPT).replace("{text}", "").rstrip()
 
-        return enhanced_text
+    def on_chunk(done: int, total: int) -> None:
+        if job_id:
+            # Enhancement spans 70-90% of the job
+            update_job_db(job_id, progress=70.0 + 20.0 * done / total)
 
+    cache = None
+    try:
+        cache = ChunkCache(GEMINI_CACHE_PATH)
+        enhancer = AsyncChunkEnhancer(
+            backend=GenaiBackend(GEMINI_API_KEY, GEMINI_MODEL),
+            prompt=prompt,
+            cache=cache,
+            max_chars=GEMINI_CHUNK_CHARS,
+            concurrency=GEMINI_CONCURRENCY,
+            calls_per_minute=GEMINI_CALLS_PER_MINUTE,
+        )
+        logger.info("Enhancing text with Gemini (%s chars)...", len(text))
+        result = asyncio.run(enhancer.enhance(text, on_chunk=on_chunk))
     except Exception as e:
         logger.warning("Gemini enhancement failed: %s, returning original text", e)
-        return text
+        return text, {}
+    finally:
+        if cache is not None:
+            cache.close()
+
+    stats = {
+        "chunks": result.chunks,
+        "cached": result.cached,
+        "calls": result.calls,
+        "failed_chunks": result.failed,
+        "seconds": result.seconds,
+    }
+    logger.info("Gemini enhancement completed: %s", stats)
+    return result.text, stats
 
 
 class ExtractionTask(Task):
@@ -414,7 +754,7 @@ class ExtractionTask(Task):
     name="extract_pdf",
     time_limit=JOB_TIMEOUT_SECONDS,
     soft_time_limit=JOB_TIMEOUT_SECONDS - 30,
-    autoretry_for=(RuntimeError, ConnectionError, TimeoutError),
+    autoretry_for=RETRYABLE_ERRORS,
     retry_backoff=True,
     retry_backoff_max=300,
     max_retries=3,
@@ -426,7 +766,9 @@ def extract_pdf(
     engine: str,
     gpu_mode: str = "auto",
     use_gemini: bool = False,
-    options: Optional[Dict[str, Any]] = None
+    options: Optional[Dict[str, Any]] = None,
+    routing: Optional[Dict[str, Any]] = None,
+    inflight_key: Optional[str] = None
 ):
     """
     Extract text from PDF file.
@@ -434,15 +776,28 @@ def extract_pdf(
     Args:
         job_id: Unique job identifier
         pdf_path: Path to PDF file
-        engine: Extraction engine ('marker' or 'pdfplumber')
+        engine: Extraction engine ('marker', 'pdfplumber' or 'auto' = per page)
         gpu_mode: GPU mode for Modal ('auto', 'economy', 'performance')
         use_gemini: Whether to use Gemini for post-processing
         options: Engine-specific options
+        routing: Cost estimate from the API (job_class, pages, priority, enqueued_at)
+        inflight_key: In-flight dedup claim to release when the job ends
     """
     if options is None:
         options = {}
 
     start_time = time.time()
+    rerouted = False
+    retrying = False
+
+    queue_wait = None
+    if routing and routing.get("enqueued_at") and self.request.retries == 0:
+        try:
+            queue_wait = record_queue_wait(
+                get_spool_redis(), routing.get("job_class", "heavy"), routing["enqueued_at"]
+            )
+        except Exception as e:
+            logger.warning("Failed to record queue wait for %s: %s", job_id, e)
 
     try:
         # Update job status to processing
@@ -453,6 +808,12 @@ def extract_pdf(
             progress=0.0
         )
         save_job_log(job_id, "INFO", f"Job started with engine: {engine}, gpu_mode: {gpu_mode}")
+        if queue_wait is not None:
+            save_job_log(
+                job_id, "INFO",
+                f"Waited {queue_wait:.1f}s in {routing.get('job_class')} queue "
+                f"(priority {routing.get('priority')}, ~{routing.get('pages')} pages)"
+            )
 
         logger.info("Processing job %s with engine: %s, gpu_mode: %s", job_id, engine, gpu_mode)
 
@@ -479,11 +840,28 @@ def extract_pdf(
             else:
                 # CPU-only mode (requires high-memory server, not suitable for ARM VM)
                 save_job_log(job_id, "INFO", "Using CPU Marker (slow, requires >10GB RAM)")
-                full_text, pages_processed, metadata = extract_with_marker(pdf_path, options)
-                metadata["extraction_mode"] = "cpu"
+                total_pages = count_pdf_pages(pdf_path)
+                if 0 < MARKER_CHUNK_THRESHOLD < total_pages:
+                    save_job_log(
+                        job_id, "INFO",
+                        f"{total_pages} pages: chunked mode ({MARKER_CHUNK_SIZE} pages per window)"
+                    )
+                    full_text, pages_processed, metadata = extract_with_marker_chunked(
+                        job_id, pdf_path, options, total_pages
+                    )
+                    metadata["extraction_mode"] = "cpu_chunked"
+                else:
+                    full_text, pages_processed, metadata = extract_with_marker(pdf_path, options)
+                    metadata["extraction_mode"] = "cpu"
         elif engine == "pdfplumber":
             full_text, pages_processed, metadata = extract_with_pdfplumber(pdf_path, options)
             metadata["extraction_mode"] = "pdfplumber"
+        elif engine == "auto":
+            on_fast_queue = (self.request.delivery_info or {}).get("routing_key") == FAST_QUEUE
+            full_text, pages_processed, metadata = extract_with_hybrid(
+                job_id, pdf_path, options, gpu_mode, allow_marker=not on_fast_queue
+            )
+            metadata["extraction_mode"] = "hybrid" if metadata.get("hybrid") else "modal_gpu"
         else:
             raise ValueError(f"Unknown engine: {engine}")
         save_job_log(job_id, "INFO", f"Extraction completed: {pages_processed} pages")
@@ -493,8 +871,12 @@ def extract_pdf(
 
         # Optional Gemini enhancement
         if use_gemini:
-            full_text = enhance_with_gemini(full_text, options)
-            metadata["gemini_enhanced"] = True
+            full_text, gemini_stats = enhance_with_gemini(full_text, options, job_id)
+            metadata["gemini_enhanced"] = (
+                bool(gemini_stats) and len(gemini_stats["failed_chunks"]) < gemini_stats["chunks"]
+            )
+            if gemini_stats:
+                metadata["gemini"] = gemini_stats
 
         # Update progress
         update_job_db(job_id, progress=90.0)
@@ -502,12 +884,31 @@ def extract_pdf(
         # Calculate execution time
         execution_time = time.time() - start_time
 
+        if routing:
+            metadata["routing"] = {**routing, "queue_wait_seconds": queue_wait}
+
+        # Large results go to the compressed result store, the row keeps a reference
+        result_text, result_ref = full_text, None
+        result_store = ResultStore()
+        if result_store.should_offload(full_text):
+            try:
+                result_ref = result_store.save(job_id, full_text)
+                result_text = None
+                save_job_log(job_id, "INFO", f"Result stored out-of-row ({len(full_text)} chars)")
+            except OSError as e:
+                logger.warning("Result store failed for %s, keeping result inline: %s", job_id, e)
+            try:
+                result_store.evict_expired()
+            except OSError as e:
+                logger.warning("Result eviction failed: %s", e)
+
         # Update job with results
         update_job_db(
             job_id,
             status="completed",
             progress=100.0,
-            result_text=full_text,
+            result_text=result_text,
+            result_ref=result_ref,
             pages_processed=pages_processed,
             execution_time=execution_time,
             completed_at=datetime.utcnow().isoformat(),
@@ -523,6 +924,24 @@ def extract_pdf(
             "execution_time": execution_time
         }
 
+    except NeedsHeavyQueue as e:
+        # The sampled pre-pass missed raster pages: hand the job (and its
+        # spool reference) to the heavy worker instead of loading Marker here
+        rerouted = True
+        save_job_log(job_id, "INFO", f"Rerouting to heavy queue: {e}")
+        extract_pdf.apply_async(
+            args=[job_id, pdf_path, engine, gpu_mode, use_gemini, options],
+            kwargs={
+                "routing": {**(routing or {}), "job_class": "heavy", "enqueued_at": time.time()},
+                "inflight_key": inflight_key,
+            },
+            task_id=job_id,
+            queue=HEAVY_QUEUE,
+            time_limit=HEAVY_JOB_TIMEOUT_SECONDS,
+            soft_time_limit=HEAVY_JOB_TIMEOUT_SECONDS - 30,
+        )
+        return {"job_id": job_id, "status": "rerouted"}
+
     except SoftTimeLimitExceeded:
         save_job_log(job_id, "ERROR", "Job timeout - partial state saved")
         update_job_db(job_id, status="failed", error_message="Timeout exceeded")
@@ -530,19 +949,72 @@ def extract_pdf(
         raise
 
     except Exception as e:
-        # Error handling is done by on_failure
+        # Error handling is done by on_failure; autoretried errors keep the
+        # PDF, the in-flight claim and the chunk checkpoints for the retry
+        retrying = keep_checkpoint_for_retry(
+            e, self.request.retries, self.max_retries, RETRYABLE_ERRORS
+        )
         save_job_log(job_id, "ERROR", f"Job failed: {str(e)[:200]}")
+        if retrying:
+            save_job_log(
+                job_id, "INFO",
+                f"Retry {self.request.retries + 1}/{self.max_retries} will resume from checkpoints"
+            )
         logger.error("Job %s failed with error: %s", job_id, e)
         raise
 
     finally:
-        # Cleanup temporary file
+        # Cleanup temporary file (a killed worker skips this, so the PDF and
+        # any Marker chunk checkpoints survive for the redelivered task)
         try:
-            if os.path.exists(pdf_path):
+            if rerouted or retrying:
+                pass  # the PDF now belongs to the re-queued (or retried) task
+            elif is_spooled(pdf_path):
+                # Shared by identical uploads: only the last job removes it
+                if release_spooled_pdf(get_spool_redis(), pdf_path):
+                    logger.debug("Released last reference, removed spool file: %s", pdf_path)
+            elif os.path.exists(pdf_path):
                 os.remove(pdf_path)
                 logger.debug("Cleaned up temporary file: %s", pdf_path)
+            if not retrying:
+                shutil.rmtree(marker_chunk_dir(job_id), ignore_errors=True)
         except Exception as e:
             logger.warning("Failed to cleanup temporary file: %s", e)
+        # Identical uploads stop attaching to this job once it is done
+        if inflight_key and not (rerouted or retrying):
+            try:
+                release_inflight(get_spool_redis(), inflight_key, job_id)
+            except Exception as e:
+                logger.warning("Failed to release in-flight claim %s: %s", inflight_key, e)
+        # Buffered log lines must not wait for the next job
+        try:
+            get_job_store(JOBS_DB_PATH, CELERY_BROKER_URL).flush()
+        except Exception as e:
+            logger.warning("Failed to flush job store: %s", e)
+
+
+def consumed_queues(consumer) -> set:
+    """Names of the queues a worker consumer reads (its -Q option)."""
+    task_consumer = getattr(consumer, "task_consumer", None)
+    if task_consumer is not None:
+        return {queue.name for queue in task_consumer.queues}
+    return set(consumer.app.amqp.queues.consume_from or consumer.app.amqp.queues)
+
+
+@worker_ready.connect
+def worker_ready_handler(sender=None, **kwargs):
+    """
+    Log Marker config and optionally warm up models (MARKER_WARMUP=true).
+
+    Only the worker consuming the heavy queue loads Marker: the prefork fast
+    worker never runs it and would otherwise hold the models in memory too.
+    """
+    log_marker_environment()
+    queues = consumed_queues(sender) if sender is not None else {HEAVY_QUEUE}
+    if HEAVY_QUEUE not in queues:
+        logger.info("Skipping Marker warmup: worker consumes %s", ", ".join(sorted(queues)))
+        return
+    warmup_from_env(background=True)
 
 
 @task_prerun.connect
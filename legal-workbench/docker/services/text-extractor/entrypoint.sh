@@ -11,12 +11,14 @@ echo "  - CELERY_BROKER_URL: ${CELERY_BROKER_URL}"
 echo "  - CELERY_RESULT_BACKEND: ${CELERY_RESULT_BACKEND}"
 echo "  - MAX_CONCURRENT_JOBS: ${MAX_CONCURRENT_JOBS}"
 echo "  - JOB_TIMEOUT_SECONDS: ${JOB_TIMEOUT_SECONDS}"
+echo "  - FAST_CONCURRENCY: ${FAST_CONCURRENCY:-2}"
+echo "  - FAST_JOB_TIMEOUT_SECONDS: ${FAST_JOB_TIMEOUT_SECONDS:-300}"
 echo "  - MARKER_CACHE_DIR: ${MARKER_CACHE_DIR}"
 
 # Function to gracefully shutdown
 shutdown() {
     echo "Shutting down services..."
-    kill -TERM "$celery_pid" "$flower_pid" "$uvicorn_pid" 2>/dev/null || true
+    kill -TERM "$celery_pid" "$celery_fast_pid" "$flower_pid" "$uvicorn_pid" 2>/dev/null || true
     wait
     exit 0
 }
@@ -44,9 +46,13 @@ if [ $retry_count -eq $max_retries ]; then
     exit 1
 fi
 
-# Start Celery Worker
-echo "Starting Celery Worker..."
+# Start Celery Workers: heavy (Marker/Modal) and fast (pdfplumber) queues are
+# consumed separately so small jobs never wait behind a large Marker job.
+# The heavy worker also drains the legacy "celery" queue.
+echo "Starting Celery Worker (heavy queue)..."
 celery -A celery_worker worker \
+    --hostname=heavy@%h \
+    --queues=extract_heavy,celery \
     --loglevel=info \
     --concurrency=${MAX_CONCURRENT_JOBS} \
     --pool=solo \
@@ -54,6 +60,18 @@ celery -A celery_worker worker \
 celery_pid=$!
 echo "Celery Worker started (PID: $celery_pid)"
 
+# The fast worker never runs Marker: never warm the models up there
+echo "Starting Celery Worker (fast queue)..."
+MARKER_WARMUP=false celery -A celery_worker worker \
+    --hostname=fast@%h \
+    --queues=extract_fast \
+    --loglevel=info \
+    --concurrency=${FAST_CONCURRENCY:-2} \
+    --pool=prefork \
+    --logfile=/dev/stdout &
+celery_fast_pid=$!
+echo "Celery Fast Worker started (PID: $celery_fast_pid)"
+
 # Start Celery Flower (monitoring)
 echo "Starting Celery Flower..."
 celery -A celery_worker flower \
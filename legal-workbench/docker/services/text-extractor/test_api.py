@@ -0,0 +1,57 @@
+"""
+Tests for the Text Extractor API submission path.
+
+Needs the service dependencies and a reachable Redis
+(CELERY_BROKER_URL, default redis://localhost:6379/15).
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+DATA_DIR = tempfile.mkdtemp(prefix="text-extractor-test-")
+os.environ.setdefault("CELERY_BROKER_URL", "redis://localhost:6379/15")
+os.environ["JOBS_DB_PATH"] = os.path.join(DATA_DIR, "jobs.db")
+os.environ["UPLOAD_SPOOL_DIR"] = os.path.join(DATA_DIR, "uploads")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import main
+from api.upload_spool import UPLOAD_SPOOL_DIR, spool_ref_key
+
+PDF_BYTES = b"%PDF-1.4\n% enqueue failure test\n%%EOF\n"
+
+
+@pytest.fixture
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_enqueue_failure_releases_spool_reference(client, monkeypatch):
+    """A job that fails after commit must not leave its spool file referenced."""
+    sha256 = hashlib.sha256(PDF_BYTES).hexdigest()
+
+    async def no_reusable_job(*args, **kwargs):
+        return None
+
+    async def broken_save_job(*args, **kwargs):
+        raise RuntimeError("jobs db unavailable")
+
+    monkeypatch.setattr(main, "find_reusable_job", no_reusable_job)
+    monkeypatch.setattr(main, "save_job", broken_save_job)
+
+    response = client.post(
+        "/api/v1/extract",
+        files={"file": ("doc.pdf", PDF_BYTES, "application/pdf")},
+        data={"engine": "pdfplumber"},
+    )
+
+    assert response.status_code == 500
+    assert not (Path(UPLOAD_SPOOL_DIR) / f"{sha256}.pdf").exists()
+
+    async def refs():
+        return await main.redis_client.get(spool_ref_key(sha256))
+
+    assert client.portal.call(refs) is None
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the normalization pipeline on a synthetic party/address dataset.
+
+Compares:
+1. Plain normalizers per record (no memoization)
+2. NormalizationEngine.normalize_record per record (memoized by field type)
+3. NormalizationEngine.normalize_records (column-wise batch API)
+
+Before timing, every field type is checked against the golden outputs in
+tests/fixtures/normalizers_golden.json (recorded before the regexes were
+precompiled and merged; tests/test_normalizers.py checks the same file).
+The memoized variants must match the plain normalizers' output.
+
+Usage:
+    cd ferramentas/legal-doc-assembler
+    python scripts/benchmark_normalizers.py --records 50000 --parties 2000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root (src) to PYTHONPATH
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.normalizers import FIELD_NORMALIZERS, NormalizationEngine  # noqa: E402
+
+GOLDEN_PATH = project_root / "tests" / "fixtures" / "normalizers_golden.json"
+
+FIRST_NAMES = ["MARIA", "joão", "ANA", "josé", "FRANCISCO", "antônio", "LUIZA", "Pedro", "carla", "PAULO"]
+SURNAMES = ["DA SILVA", "de souza", "DOS SANTOS", "oliveira", "PEREIRA", "lima", "FERREIRA", "costa", "RODRIGUES"]
+COMPANIES = ["COMERCIO DE ALIMENTOS", "construtora", "SERVICOS MEDICOS", "transportes", "INDUSTRIA TEXTIL"]
+SUFFIXES = ["LTDA", "s/a", "ME", "EIRELI", "epp"]
+STREET_TYPES = ["R.", "AV", "av.", "TV.", "AL", "PÇA", "ROD.", "ESTR.", "Rua"]
+STREETS = ["DAS FLORES", "brasil", "SAO JOAO", "paulista", "DOS BANDEIRANTES", "XV DE NOVEMBRO", "das acacias"]
+UNITS = ["", " APTO 12", " BL B", " sala 3", " CJ 45", " LJ 2", ""]
+COURTS = [
+    "1ª VARA CIVEL DA COMARCA DE SAO PAULO ,",
+    "tribunal de justica do estado do rio de janeiro..",
+    "2ª  VARA DO TRABALHO DE CAMPINAS",
+]
+
+FIELD_TYPES = {
+    "autor": "name",
+    "reu": "name",
+    "endereco": "address",
+    "cpf": "cpf",
+    "cnpj": "cnpj",
+    "cep": "cep",
+    "advogado_oab": "oab",
+    "vara": "text",
+}
+
+
+def build_dataset(n_records: int, n_parties: int, seed: int = 0) -> list[dict]:
+    """Records drawn from a fixed pool of parties, so values repeat like real batches."""
+    rng = random.Random(seed)
+
+    def person():
+        return f"  {rng.choice(FIRST_NAMES)}  {rng.choice(SURNAMES)} "
+
+    def company():
+        return f"{rng.choice(COMPANIES)} {rng.choice(SURNAMES)} {rng.choice(SUFFIXES)}"
+
+    def address():
+        return (
+            f"{rng.choice(STREET_TYPES)} {rng.choice(STREETS)} N {rng.randint(1, 3000)}"
+            f"{rng.choice(UNITS)}"
+        )
+
+    parties = [
+        {
+            "autor": person(),
+            "endereco": address(),
+            "cpf": "".join(rng.choice("0123456789") for _ in range(11)),
+            "cep": f"{rng.randint(1000000, 99999999):08d}",
+        }
+        for _ in range(n_parties)
+    ]
+    defendants = [
+        {"reu": company(), "cnpj": "".join(rng.choice("0123456789") for _ in range(14))}
+        for _ in range(max(1, n_parties // 10))
+    ]
+    lawyers = [f"{rng.randint(1000, 999999)}{rng.choice(['SP', 'RJ', 'MG'])}" for _ in range(50)]
+
+    return [
+        {
+            **rng.choice(parties),
+            **rng.choice(defendants),
+            "advogado_oab": rng.choice(lawyers),
+            "vara": rng.choice(COURTS),
+        }
+        for _ in range(n_records)
+    ]
+
+
+def golden_check() -> int:
+    """Compare current normalizers and the engine with the golden outputs; returns mismatches."""
+    golden = json.loads(GOLDEN_PATH.read_text(encoding="utf-8"))
+    engine = NormalizationEngine()
+    mismatches = 0
+    for field_type, pairs in golden.items():
+        current = FIELD_NORMALIZERS[field_type]
+        for value, expected in pairs:
+            for label, got in (
+                ("normalizer", current(value)),
+                ("engine", engine.normalize(value, field_type)),
+            ):
+                if got != expected:
+                    mismatches += 1
+                    if mismatches <= 10:
+                        print(f"  MISMATCH {field_type} ({label}): {value!r} -> {got!r}, golden {expected!r}")
+    return mismatches
+
+
+def plain_normalize(records: list[dict], normalizers: dict) -> list[dict]:
+    text = normalizers["text"]
+    return [
+        {
+            field: None if value is None else normalizers.get(FIELD_TYPES.get(field, "text"), text)(value)
+            for field, value in record.items()
+        }
+        for record in records
+    ]
+
+
+def timed(label: str, fn, baseline: float | None = None):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    speedup = f"  ({baseline / elapsed:5.1f}x)" if baseline else ""
+    print(f"  {label:<40} {elapsed * 1000:9.1f} ms{speedup}")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50_000, help="Number of records")
+    parser.add_argument("--parties", type=int, default=2_000, help="Distinct parties in the pool")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"Golden check: {GOLDEN_PATH.relative_to(project_root)}")
+    mismatches = golden_check()
+    if mismatches:
+        print(f"\nERROR: {mismatches} outputs differ from the golden outputs")
+        sys.exit(1)
+    print("  no differences\n")
+
+    records = build_dataset(args.records, args.parties, args.seed)
+    distinct = len({record["endereco"] for record in records})
+    print(f"{len(records)} records, {distinct} distinct addresses, {len(FIELD_TYPES)} fields\n")
+
+    expected, baseline = timed(
+        "plain normalizers (per record)", lambda: plain_normalize(records, FIELD_NORMALIZERS)
+    )
+
+    engine = NormalizationEngine()
+    per_record, _ = timed(
+        "engine.normalize_record (cold cache)",
+        lambda: [engine.normalize_record(record, FIELD_TYPES) for record in records],
+        baseline,
+    )
+    timed(
+        "engine.normalize_record (warm cache)",
+        lambda: [engine.normalize_record(record, FIELD_TYPES) for record in records],
+        baseline,
+    )
+
+    batch_engine = NormalizationEngine()
+    batched, _ = timed(
+        "engine.normalize_records (column-wise)",
+        lambda: batch_engine.normalize_records(records, FIELD_TYPES),
+        baseline,
+    )
+
+    if per_record != expected or batched != expected:
+        print("\nERROR: memoized output differs from the plain normalizers")
+        sys.exit(1)
+
+    print("\nOutputs identical. Cache per field type:")
+    for field_type, info in engine.cache_info().items():
+        if info["hits"] or info["misses"]:
+            print(f"  {field_type:<8} hits={info['hits']:<8} misses={info['misses']:<8} size={info['currsize']}")
+
+
+if __name__ == "__main__":
+    main()
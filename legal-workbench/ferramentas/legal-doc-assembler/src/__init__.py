@@ -6,12 +6,18 @@ docxtpl (Jinja2 for MS Word) with fault-tolerant template processing.
 
 Exports:
 - DocumentEngine: Core rendering engine
+- TemplateCache: Parse-once cache of compiled .docx templates
 - BatchProcessor: Parallel batch processing
+- RenderPool: Process pool for rendering from async code
 - DocxParser: DOCX content extraction
 - PatternDetector: Automatic pattern detection
 - TemplateBuilder: Create templates from plain DOCX
 - TemplateManager: Manage saved templates
+- TemplateCatalog: Indexed, mtime-refreshed template listing and search
+- DocumentSessionStore: Parse-once, in-memory store of uploaded documents
+- ConverterPool: Long-lived LibreOffice processes for DOCX → PDF
 - Normalizers: Brazilian legal document normalization
+- NormalizationEngine: Memoized, batch normalization by field type
 """
 
 __version__ = "2.0.0"
@@ -27,22 +33,34 @@ from .normalizers import (
     format_oab,
     normalize_punctuation,
     normalize_all,
+    NormalizationEngine,
 )
 
 from .engine import DocumentEngine
+from .template_cache import TemplateCache
 from .batch_engine import BatchProcessor
+from .render_pool import RenderPool
 from .docx_parser import DocxParser
 from .pattern_detector import PatternDetector
 from .template_builder import TemplateBuilder
 from .template_manager import TemplateManager
+from .template_catalog import TemplateCatalog
+from .document_session import DocumentSessionStore
+from .pdf_converter import ConverterPool, PdfConversionError
 
 __all__ = [
     "DocumentEngine",
+    "TemplateCache",
     "BatchProcessor",
+    "RenderPool",
     "DocxParser",
     "PatternDetector",
     "TemplateBuilder",
     "TemplateManager",
+    "TemplateCatalog",
+    "DocumentSessionStore",
+    "ConverterPool",
+    "PdfConversionError",
     "normalize_whitespace",
     "normalize_name",
     "normalize_address",
@@ -52,4 +70,5 @@ __all__ = [
     "format_oab",
     "normalize_punctuation",
     "normalize_all",
+    "NormalizationEngine",
 ]
@@ -0,0 +1,268 @@
+"""
+Annotation Engine - replace annotated text with Jinja2 fields in a DOCX.
+
+Replacing text run by run with `in para.text` checks costs
+paragraphs × replacements × runs; python-docx rebuilds `para.text` on every
+access. Text that spans runs was also collapsed into the first run, which
+lost the formatting of the rest of the paragraph.
+
+AnnotationEngine instead:
+    1. compiles all original texts into one Aho-Corasick automaton
+    2. builds each paragraph's run-offset map once
+    3. finds every annotation in one pass (leftmost-longest, non-overlapping)
+    4. rewrites only the runs a match touches; the placeholder takes the
+       formatting of the run where the match starts, other runs keep theirs
+
+Usage:
+    engine = AnnotationEngine({"João da Silva": "{{ nome }}"})
+    engine.apply_to_document(doc)
+"""
+
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from docx.document import Document as DocumentObject
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a fixed set of literal patterns.
+
+    Finds all occurrences of all patterns in a single left-to-right pass.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Build the automaton.
+
+        Args:
+            patterns: Literal strings to find (empty and duplicate patterns
+                are ignored)
+        """
+        self.patterns: List[str] = list(dict.fromkeys(p for p in patterns if p))
+
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(index)
+
+        # Failure links (breadth-first); outputs inherit the failure state's
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield every (start, end, pattern_index) occurrence, overlaps included.
+
+        Args:
+            text: Text to scan
+        """
+        goto, fail, outputs, patterns = self._goto, self._fail, self._outputs, self.patterns
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in outputs[state]:
+                end = position + 1
+                yield end - len(patterns[index]), end, index
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Non-overlapping matches, leftmost first and longest at each start.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Sorted list of (start, end, pattern_index)
+        """
+        if not self.patterns:
+            return []
+        candidates = sorted(self.iter_matches(text), key=lambda m: (m[0], -m[1]))
+        selected = []
+        last_end = 0
+        for start, end, index in candidates:
+            if start >= last_end:
+                selected.append((start, end, index))
+                last_end = end
+        return selected
+
+
+def paragraph_runs(paragraph: Paragraph) -> List[Run]:
+    """Runs of a paragraph in document order, including hyperlink runs."""
+    runs: List[Run] = []
+    for item in paragraph.iter_inner_content():
+        if isinstance(item, Run):
+            runs.append(item)
+        else:
+            runs.extend(item.runs)
+    return runs
+
+
+def iter_document_paragraphs(document: DocumentObject, include_tables: bool = False) -> Iterator[Paragraph]:
+    """
+    Body paragraphs of a document, optionally followed by table cell paragraphs.
+
+    Args:
+        document: python-docx Document
+        include_tables: Also yield paragraphs inside tables (nested included)
+    """
+    yield from document.paragraphs
+    if include_tables:
+        pending = list(document.tables)
+        while pending:
+            table = pending.pop(0)
+            for row in table.rows:
+                for cell in row.cells:
+                    yield from cell.paragraphs
+                    pending.extend(cell.tables)
+
+
+@dataclass
+class AnnotationStats:
+    """Result of applying annotations."""
+
+    replacements: int = 0           # Occurrences replaced
+    paragraphs: int = 0             # Paragraphs modified
+    runs_rewritten: int = 0         # Runs whose text was set
+    counts: Dict[str, int] = field(default_factory=dict)  # Original text -> occurrences
+
+
+class AnnotationEngine:
+    """
+    Run-aware, single-pass text → placeholder replacement.
+
+    Features:
+        - One Aho-Corasick pass per paragraph for all annotations
+        - Matches may span runs (and hyperlinks)
+        - Only runs touched by a match are rewritten; formatting is kept
+    """
+
+    def __init__(self, replacements: Dict[str, str]):
+        """
+        Initialize the engine.
+
+        Args:
+            replacements: Original text -> replacement (e.g. "{{ nome }}").
+                When originals overlap, the longest one starting first wins.
+        """
+        self.replacements = {original: new for original, new in replacements.items() if original}
+        self.automaton = AhoCorasick(self.replacements)
+
+    def apply_to_paragraph(self, paragraph: Paragraph, stats: AnnotationStats) -> None:
+        """Replace all annotations in one paragraph, updating stats."""
+        self.apply_to_runs(paragraph_runs(paragraph), stats)
+
+    def apply_to_runs(self, runs: List[Run], stats: AnnotationStats) -> None:
+        """Replace all annotations in one paragraph given as its runs, updating stats."""
+        if not runs:
+            return
+
+        # Run-offset map, built once per paragraph
+        texts = [run.text for run in runs]
+        offsets = []
+        position = 0
+        for text in texts:
+            offsets.append(position)
+            position += len(text)
+
+        matches = self.automaton.find("".join(texts))
+        if not matches:
+            return
+
+        patterns = self.automaton.patterns
+        touched = set()
+
+        # Right to left, so earlier offsets stay valid
+        for start, end, index in reversed(matches):
+            original = patterns[index]
+            first = bisect_right(offsets, start) - 1
+            last = bisect_right(offsets, end - 1) - 1
+
+            head = texts[first][:start - offsets[first]]
+            if first == last:
+                texts[first] = head + self.replacements[original] + texts[first][end - offsets[first]:]
+            else:
+                texts[first] = head + self.replacements[original]
+                for middle in range(first + 1, last):
+                    texts[middle] = ""
+                texts[last] = texts[last][end - offsets[last]:]
+            touched.update(range(first, last + 1))
+
+            stats.replacements += 1
+            stats.counts[original] = stats.counts.get(original, 0) + 1
+
+        for i in sorted(touched):
+            runs[i].text = texts[i]
+        stats.runs_rewritten += len(touched)
+        stats.paragraphs += 1
+
+    def apply(self, paragraphs: Iterable[Paragraph]) -> AnnotationStats:
+        """
+        Replace all annotations in the given paragraphs.
+
+        Returns:
+            AnnotationStats with replacement counts
+        """
+        stats = AnnotationStats()
+        if self.replacements:
+            for paragraph in paragraphs:
+                self.apply_to_paragraph(paragraph, stats)
+        return stats
+
+    def apply_run_map(self, run_map: Iterable[List[Run]]) -> AnnotationStats:
+        """
+        Replace all annotations in paragraphs given as run lists.
+
+        Lets callers that keep a document's run map (see DocumentSession)
+        skip collecting the runs again.
+
+        Returns:
+            AnnotationStats with replacement counts
+        """
+        stats = AnnotationStats()
+        if self.replacements:
+            for runs in run_map:
+                self.apply_to_runs(runs, stats)
+        return stats
+
+    def apply_to_document(self, document: DocumentObject, include_tables: bool = False) -> AnnotationStats:
+        """
+        Replace all annotations in a document's paragraphs.
+
+        Args:
+            document: python-docx Document (modified in place)
+            include_tables: Also process paragraphs inside tables
+
+        Returns:
+            AnnotationStats with replacement counts
+        """
+        return self.apply(iter_document_paragraphs(document, include_tables))
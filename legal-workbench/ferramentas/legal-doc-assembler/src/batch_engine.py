@@ -3,14 +3,22 @@ Batch document processing engine for high-performance legal document generation.
 
 Features:
     - Multiprocessing for parallel rendering (configurable workers)
-    - Checkpoint/resume support for fault tolerance
+    - One warm DocumentEngine per worker process, template compiled once
+    - Checkpoint/resume support for fault tolerance (append-only journal)
     - Dry-run validation mode
-    - Streaming ZIP creation (memory-efficient)
+    - Streaming ZIP creation (documents are archived as they complete)
+    - In-memory mode: workers render to bytes and a single writer appends
+      them to the ZIP (file or response stream), no intermediate files
     - Comprehensive error reporting
     - Progress tracking with tqdm
+    - Optional PDF output: rendered documents are converted on a shared
+      ConverterPool (a few long-lived LibreOffice processes, not one per
+      document) while rendering continues
 """
 
+import io
 import json
+import multiprocessing
 import os
 import zipfile
 from copy import deepcopy
@@ -18,12 +26,14 @@ from datetime import datetime
 from functools import partial
 from multiprocessing import Pool, cpu_count
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
 import traceback
+from collections import deque
 
 from tqdm import tqdm
 
-from .engine import DocumentEngine
+from .engine import DocumentEngine, OUTPUT_FORMATS
+from .pdf_converter import ConverterPool, get_converter_pool
 from .batch_utils import (
     sanitize_filename,
     estimate_batch_time,
@@ -33,6 +43,18 @@ from .batch_utils import (
 )
 
 
+# Checkpoint journal: one JSON line per rendered document, appended as results
+# arrive (the legacy .checkpoint.json snapshot is still read on resume)
+CHECKPOINT_JOURNAL = '.checkpoint.jsonl'
+LEGACY_CHECKPOINT = '.checkpoint.json'
+
+# Upper bound for imap_unordered chunksize (keeps progress/journal granular)
+MAX_CHUNKSIZE = 32
+
+# A batch record: JSON file path or an already-loaded data dict
+BatchRecord = Union[Path, Dict[str, Any]]
+
+
 class BatchProcessor:
     """
     High-performance batch document processor using multiprocessing.
@@ -58,7 +80,10 @@ class BatchProcessor:
         self,
         max_workers: Optional[int] = None,
         auto_normalize: bool = True,
-        checkpoint_enabled: bool = True
+        checkpoint_enabled: bool = True,
+        start_method: Optional[str] = None,
+        output_format: str = "docx",
+        pdf_converter: Optional[ConverterPool] = None
     ):
         """
         Initialize batch processor.
@@ -67,7 +92,14 @@ class BatchProcessor:
             max_workers: Number of parallel workers (default: min(8, cpu_count()))
             auto_normalize: Enable automatic text normalization
             checkpoint_enabled: Enable checkpoint/resume functionality
+            start_method: multiprocessing start method for the in-memory mode
+                (default: platform default; use "spawn" inside threaded servers)
+            output_format: "docx" or "pdf"
+            pdf_converter: Converter pool for PDF output (default: process-wide pool)
         """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+
         if max_workers is None:
             # Auto-tune: use cpu_count but cap at 8 for optimal performance
             max_workers = min(8, cpu_count())
@@ -75,6 +107,9 @@ class BatchProcessor:
         self.max_workers = max_workers
         self.auto_normalize = auto_normalize
         self.checkpoint_enabled = checkpoint_enabled
+        self.start_method = start_method
+        self.output_format = output_format
+        self.pdf_converter = pdf_converter
 
     def process_batch(
         self,
@@ -85,11 +120,15 @@ class BatchProcessor:
         zip_name: Optional[str] = None,
         name_field: Optional[str] = None,
         field_types: Optional[Dict[str, str]] = None,
-        resume: bool = True
+        resume: bool = True,
+        in_memory: bool = False
     ) -> Dict[str, Any]:
         """
         Process a batch of JSON files into documents.
 
+        With in_memory=True documents are rendered straight into the ZIP
+        (no .docx files in output_dir, no checkpoint); see render_to_zip.
+
         Args:
             json_files: List of JSON file paths to process
             template_path: Path to .docx template
@@ -99,6 +138,7 @@ class BatchProcessor:
             name_field: JSON field to use for output filenames
             field_types: Optional normalization type mapping
             resume: Resume from checkpoint if exists (default: True)
+            in_memory: Render directly into the ZIP archive (default: False)
 
         Returns:
             Dictionary with processing results:
@@ -122,18 +162,34 @@ class BatchProcessor:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Checkpoint management
-        checkpoint_file = output_dir / '.checkpoint.json'
-        processed_files = set()
+        if in_memory:
+            zip_path = self._zip_path(output_dir, zip_name, template_path)
+            result_summary = self.render_to_zip(
+                records=json_files,
+                template_path=template_path,
+                zip_file=zip_path,
+                name_field=name_field,
+                field_types=field_types
+            )
+            self._write_report(output_dir / 'report.json', result_summary)
+            if result_summary['errors']:
+                self._write_errors(output_dir / 'errors.json', result_summary['errors'])
+            return result_summary
 
-        if resume and self.checkpoint_enabled and checkpoint_file.exists():
-            try:
-                with open(checkpoint_file, 'r') as f:
-                    checkpoint = json.load(f)
-                    processed_files = set(checkpoint.get('processed', []))
-                    print(f"Resuming from checkpoint: {len(processed_files)} files already processed")
-            except Exception as e:
-                print(f"Warning: Could not load checkpoint: {e}")
+        # Checkpoint management
+        journal_file = output_dir / CHECKPOINT_JOURNAL
+        legacy_checkpoint = output_dir / LEGACY_CHECKPOINT
+        processed_files: Dict[str, Optional[str]] = {}
+
+        if resume and self.checkpoint_enabled:
+            interrupted = journal_file.exists() or legacy_checkpoint.exists()
+            processed_files = self._load_checkpoint(journal_file, legacy_checkpoint)
+            if processed_files:
+                print(f"Resuming from checkpoint: {len(processed_files)} files already processed")
+            if interrupted:
+                self._remove_stale_reservations(output_dir, processed_files)
+        elif self.checkpoint_enabled and journal_file.exists():
+            journal_file.unlink()
 
         # Filter out already processed files
         files_to_process = [f for f in json_files if str(f) not in processed_files]
@@ -159,7 +215,8 @@ class BatchProcessor:
             output_dir=output_dir,
             auto_normalize=self.auto_normalize,
             name_field=name_field,
-            field_types=field_types
+            field_types=field_types,
+            output_format=self.output_format
         )
 
         # Process with multiprocessing
@@ -168,46 +225,65 @@ class BatchProcessor:
         outputs = []
         errors = []
 
-        with Pool(processes=self.max_workers) as pool:
-            results = list(
-                tqdm(
-                    pool.imap(worker_fn, files_to_process),
+        # ZIP is written as documents complete; outputs from a resumed run go first
+        zip_path = None
+        zf = None
+        if create_zip:
+            zip_path = self._zip_path(output_dir, zip_name, template_path)
+            zf = zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED)
+            for previous in processed_files.values():
+                if previous and Path(previous).exists():
+                    zf.write(previous, arcname=Path(previous).name)
+
+        journal = open(journal_file, 'a', encoding='utf-8') if self.checkpoint_enabled else None
+
+        try:
+            with Pool(
+                processes=self.max_workers,
+                initializer=_init_worker,
+                initargs=(template_path, self.auto_normalize),
+            ) as pool:
+                results = pool.imap_unordered(
+                    worker_fn,
+                    files_to_process,
+                    chunksize=self._chunksize(len(files_to_process)),
+                )
+                if self.output_format == 'pdf':
+                    results = self._iter_as_pdf(results)
+                for result in tqdm(
+                    results,
                     total=len(files_to_process),
                     desc="Rendering documents",
                     unit="doc"
-                )
-            )
-
-        # Collect results and update checkpoint
-        for result in results:
-            if result['status'] == 'success':
-                outputs.append(result['output_path'])
-                processed_files.add(result['json_file'])
-
-                # Update checkpoint after each success
-                if self.checkpoint_enabled:
-                    self._update_checkpoint(checkpoint_file, processed_files)
-            else:
-                errors.append({
-                    'json_file': result['json_file'],
-                    'error_type': result.get('error_type', 'Unknown'),
-                    'message': result.get('message', 'Unknown error'),
-                    'traceback': result.get('traceback', '')
-                })
-
-        # Create ZIP archive if requested
-        zip_path = None
-        if create_zip and outputs:
-            zip_path = self._create_zip_archive(
-                output_files=outputs,
-                output_dir=output_dir,
-                zip_name=zip_name,
-                template_path=template_path
-            )
+                ):
+                    if result['status'] == 'success':
+                        outputs.append(result['output_path'])
+                        if zf is not None:
+                            zf.write(result['output_path'], arcname=result['output_path'].name)
+                        if journal is not None:
+                            self._append_checkpoint(journal, result)
+                    else:
+                        errors.append({
+                            'json_file': result['json_file'],
+                            'error_type': result.get('error_type', 'Unknown'),
+                            'message': result.get('message', 'Unknown error'),
+                            'traceback': result.get('traceback', '')
+                        })
+        finally:
+            if journal is not None:
+                journal.close()
+            if zf is not None:
+                has_entries = bool(zf.namelist())
+                zf.close()
+                if not has_entries:
+                    zip_path.unlink()
+                    zip_path = None
 
         # Clean up checkpoint on completion
-        if self.checkpoint_enabled and checkpoint_file.exists():
-            checkpoint_file.unlink()
+        if self.checkpoint_enabled:
+            for checkpoint_file in (journal_file, legacy_checkpoint):
+                if checkpoint_file.exists():
+                    checkpoint_file.unlink()
 
         # Generate result summary
         success_count = len(outputs)
@@ -232,6 +308,216 @@ class BatchProcessor:
 
         return result_summary
 
+    def render_to_zip(
+        self,
+        records: Iterable[BatchRecord],
+        template_path: Path,
+        zip_file: Union[Path, BinaryIO],
+        name_field: Optional[str] = None,
+        field_types: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Render records in memory and write them into one ZIP archive.
+
+        Workers return .docx bytes; this process is the single ZIP writer,
+        so names are de-duplicated in memory instead of probing the disk.
+        Failed records are listed in the result and in an errors.json entry.
+
+        Args:
+            records: JSON file paths and/or data dicts
+            template_path: Path to .docx template
+            zip_file: ZIP path or writable binary stream
+            name_field: JSON field to use for output filenames
+            field_types: Optional normalization type mapping
+
+        Returns:
+            Result summary (same keys as process_batch; 'outputs' holds
+            archive names)
+        """
+        start_time = datetime.now()
+        outputs: List[str] = []
+        errors: List[Dict[str, Any]] = []
+        records = list(records)
+
+        with zipfile.ZipFile(zip_file, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for _ in tqdm(
+                self._zip_rendered(zf, records, template_path, name_field, field_types, outputs, errors),
+                total=len(records),
+                desc="Rendering documents",
+                unit="doc"
+            ):
+                pass
+
+        return self._create_result_summary(
+            start_time=start_time,
+            template_path=Path(template_path),
+            total=len(records),
+            success=len(outputs),
+            failed=len(errors),
+            skipped=0,
+            outputs=outputs,
+            errors=errors,
+            zip_path=zip_file if isinstance(zip_file, Path) else None
+        )
+
+    def iter_zip_stream(
+        self,
+        records: Iterable[BatchRecord],
+        template_path: Path,
+        name_field: Optional[str] = None,
+        field_types: Optional[Dict[str, str]] = None
+    ) -> Iterator[bytes]:
+        """
+        Render records and yield the ZIP archive bytes as documents complete.
+
+        Suitable for streaming HTTP responses: nothing is written to disk
+        and each chunk is released once the next document is archived.
+
+        Args:
+            records: JSON file paths and/or data dicts
+            template_path: Path to .docx template
+            name_field: JSON field to use for output filenames
+            field_types: Optional normalization type mapping
+
+        Yields:
+            Consecutive chunks of the ZIP file
+        """
+        sink = _ZipStreamBuffer()
+        outputs: List[str] = []
+        errors: List[Dict[str, Any]] = []
+
+        with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for _ in self._zip_rendered(zf, records, template_path, name_field, field_types, outputs, errors):
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+        # Central directory is written on close
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+
+    def _zip_rendered(
+        self,
+        zf: zipfile.ZipFile,
+        records: Iterable[BatchRecord],
+        template_path: Path,
+        name_field: Optional[str],
+        field_types: Optional[Dict[str, str]],
+        outputs: List[str],
+        errors: List[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Append rendered documents to zf as they arrive; yields each result."""
+        used_names: set = set()
+
+        results = self._iter_rendered(records, template_path, name_field, field_types)
+        if self.output_format == 'pdf':
+            results = self._iter_as_pdf(results)
+
+        for result in results:
+            if result['status'] == 'success':
+                arcname = unique_docx_name(result['filename_base'], used_names, f".{self.output_format}")
+                zf.writestr(arcname, result.pop('content'))
+                outputs.append(arcname)
+            else:
+                errors.append({
+                    'json_file': result['json_file'],
+                    'error_type': result.get('error_type', 'Unknown'),
+                    'message': result.get('message', 'Unknown error'),
+                    'traceback': result.get('traceback', '')
+                })
+            yield result
+
+        if errors:
+            zf.writestr('errors.json', json.dumps(
+                {'error_count': len(errors), 'errors': errors},
+                indent=2,
+                ensure_ascii=False
+            ))
+
+    def _iter_rendered(
+        self,
+        records: Iterable[BatchRecord],
+        template_path: Path,
+        name_field: Optional[str],
+        field_types: Optional[Dict[str, str]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Render records to bytes (in-process for one worker), unordered."""
+        worker_fn = partial(
+            _render_document_bytes,
+            template_path=template_path,
+            auto_normalize=self.auto_normalize,
+            name_field=name_field,
+            field_types=field_types
+        )
+        tasks = list(enumerate(records))
+
+        if self.max_workers <= 1:
+            for task in tasks:
+                yield worker_fn(task)
+            return
+
+        context = multiprocessing.get_context(self.start_method)
+        with context.Pool(
+            processes=self.max_workers,
+            initializer=_init_worker,
+            initargs=(template_path, self.auto_normalize),
+        ) as pool:
+            yield from pool.imap_unordered(
+                worker_fn, tasks, chunksize=self._chunksize(len(tasks))
+            )
+
+    def _iter_as_pdf(self, results: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Convert successful results to PDF on the converter pool.
+
+        Conversions run while rendering continues; at most 4 per converter
+        are queued, and results are yielded in submission order. File
+        results get their .docx replaced by the .pdf; in-memory results
+        get PDF bytes as 'content'. A failed conversion becomes an error
+        result.
+        """
+        converter = self.pdf_converter if self.pdf_converter is not None else get_converter_pool()
+        max_pending = converter.size * 4
+        pending: deque = deque()
+
+        def finish(result: Dict[str, Any], future) -> Dict[str, Any]:
+            docx_path = result.get('output_path')
+            try:
+                converted = future.result()
+            except Exception as e:
+                if docx_path is not None:
+                    docx_path.unlink(missing_ok=True)
+                    docx_path.with_suffix('.pdf').unlink(missing_ok=True)
+                return {
+                    'status': 'error',
+                    'json_file': result['json_file'],
+                    'error_type': type(e).__name__,
+                    'message': str(e),
+                    'traceback': traceback.format_exc()
+                }
+            if docx_path is not None:
+                docx_path.unlink(missing_ok=True)
+                result['output_path'] = converted
+            else:
+                result['content'] = converted
+            return result
+
+        for result in results:
+            if result['status'] != 'success':
+                yield result
+                continue
+            if 'content' in result:
+                future = converter.submit_bytes(result.pop('content'))
+            else:
+                future = converter.submit(result['output_path'], result['output_path'].with_suffix('.pdf'))
+            pending.append((result, future))
+
+            while pending and (len(pending) >= max_pending or pending[0][1].done()):
+                yield finish(*pending.popleft())
+
+        while pending:
+            yield finish(*pending.popleft())
+
     def validate_batch(
         self,
         json_files: List[Path],
@@ -331,53 +617,76 @@ class BatchProcessor:
             'template_variables': template_vars
         }
 
-    def _update_checkpoint(self, checkpoint_file: Path, processed_files: set) -> None:
-        """Update checkpoint file with processed files."""
-        try:
-            checkpoint = {
-                'timestamp': datetime.now().isoformat(),
-                'processed': sorted(list(processed_files))
-            }
-            with open(checkpoint_file, 'w') as f:
-                json.dump(checkpoint, f, indent=2)
-        except Exception as e:
-            print(f"Warning: Could not update checkpoint: {e}")
+    def _chunksize(self, count: int) -> int:
+        """imap_unordered chunksize: ~8 chunks per worker, capped at MAX_CHUNKSIZE."""
+        return max(1, min(MAX_CHUNKSIZE, count // (self.max_workers * 8)))
 
-    def _create_zip_archive(
-        self,
-        output_files: List[Path],
-        output_dir: Path,
-        zip_name: Optional[str],
-        template_path: Path
-    ) -> Path:
+    @staticmethod
+    def _load_checkpoint(journal_file: Path, legacy_checkpoint: Path) -> Dict[str, Optional[str]]:
         """
-        Create ZIP archive of output files with streaming.
-
-        Args:
-            output_files: List of output file paths
-            output_dir: Output directory
-            zip_name: Custom ZIP name or None for auto-generated
-            template_path: Template path (for naming)
+        Read processed files from the journal (and a legacy snapshot).
 
         Returns:
-            Path to created ZIP file
+            Dict mapping JSON file path to its output path (None if unknown)
         """
-        if zip_name is None:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            template_name = template_path.stem
-            zip_name = f"{template_name}_{timestamp}.zip"
+        processed: Dict[str, Optional[str]] = {}
 
-        zip_path = output_dir / zip_name
+        if legacy_checkpoint.exists():
+            try:
+                with open(legacy_checkpoint, 'r') as f:
+                    for json_file in json.load(f).get('processed', []):
+                        processed[json_file] = None
+            except Exception as e:
+                print(f"Warning: Could not load checkpoint: {e}")
+
+        if journal_file.exists():
+            with open(journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn last line from an interrupted run
+                        continue
+                    processed[entry['json_file']] = entry.get('output_path')
 
-        print(f"Creating ZIP archive: {zip_path.name}")
+        return processed
 
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for output_file in tqdm(output_files, desc="Archiving", unit="file"):
-                # Use relative path in ZIP (just filename)
-                arcname = output_file.name
-                zf.write(output_file, arcname=arcname)
+    @staticmethod
+    def _remove_stale_reservations(output_dir: Path, processed: Dict[str, Optional[str]]) -> None:
+        """
+        Delete empty output files left by a killed run.
 
-        return zip_path
+        Workers reserve their filenames (.docx, plus .pdf for PDF output)
+        with empty files before rendering; a run killed mid-render leaves
+        them behind, and the resumed run would then name that document
+        "<name>_1". Zero-length files that the journal does not list are
+        such reservations.
+        """
+        journaled = {Path(path).name for path in processed.values() if path}
+        for pattern in ('*.docx', '*.pdf'):
+            for path in output_dir.glob(pattern):
+                if path.name not in journaled and path.stat().st_size == 0:
+                    path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _append_checkpoint(journal, result: Dict[str, Any]) -> None:
+        """Append one processed document to the checkpoint journal."""
+        try:
+            journal.write(json.dumps({
+                'json_file': result['json_file'],
+                'output_path': str(result['output_path']),
+            }, ensure_ascii=False) + '\n')
+            journal.flush()
+        except Exception as e:
+            print(f"Warning: Could not update checkpoint: {e}")
+
+    @staticmethod
+    def _zip_path(output_dir: Path, zip_name: Optional[str], template_path: Path) -> Path:
+        """ZIP path for the batch (auto-generated name if zip_name is None)."""
+        if zip_name is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            zip_name = f"{template_path.stem}_{timestamp}.zip"
+        return output_dir / zip_name
 
     def _create_result_summary(
         self,
@@ -447,7 +756,93 @@ class BatchProcessor:
         print(f"Errors written to: {errors_path}")
 
 
-# === WORKER FUNCTION (must be at module level for multiprocessing) ===
+# === WORKER FUNCTIONS (must be at module level for multiprocessing) ===
+
+# Per-process engines, keyed by auto_normalize (created once per worker)
+_worker_engines: Dict[bool, DocumentEngine] = {}
+
+
+def _get_worker_engine(auto_normalize: bool) -> DocumentEngine:
+    """Engine for this worker process, created on first use."""
+    engine = _worker_engines.get(auto_normalize)
+    if engine is None:
+        engine = DocumentEngine(auto_normalize=auto_normalize)
+        _worker_engines[auto_normalize] = engine
+    return engine
+
+
+def _init_worker(template_path: Path, auto_normalize: bool) -> None:
+    """
+    Pool initializer: create the worker's engine and compile the template once.
+
+    A template that fails to compile is not fatal here (the pool would keep
+    respawning workers); each document then reports the render error.
+    """
+    engine = _get_worker_engine(auto_normalize)
+    try:
+        engine.template_cache.get(template_path, engine.jinja_env)
+    except Exception:
+        pass
+
+
+def unique_docx_name(filename_base: str, used_names: set, extension: str = ".docx") -> str:
+    """Archive name not used yet in this ZIP (single writer, no disk probing)."""
+    counter = 0
+    while True:
+        suffix = f"_{counter}" if counter else ""
+        name = f"{filename_base}{suffix}{extension}"
+        if name not in used_names:
+            used_names.add(name)
+            return name
+        counter += 1
+
+
+class _ZipStreamBuffer(io.RawIOBase):
+    """Unseekable sink for ZipFile; bytes are drained by the streaming reader."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _reserve_output_path(output_dir: Path, filename_base: str, output_format: str = "docx") -> Path:
+    """
+    Atomically claim a free output filename (workers run concurrently).
+
+    The .docx is always reserved (it is what the worker renders). For PDF
+    output the final .pdf name is reserved too, with the same stem: the
+    .docx is deleted after conversion, so reserving it alone would let a
+    later record with the same name reuse the stem and overwrite the PDF.
+
+    Returns:
+        Path of the reserved .docx
+    """
+    extensions = [".docx"] if output_format == "docx" else [".docx", f".{output_format}"]
+    counter = 0
+    while True:
+        suffix = f"_{counter}" if counter else ""
+        reserved: List[Path] = []
+        try:
+            for extension in extensions:
+                path = output_dir / f"{filename_base}{suffix}{extension}"
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                reserved.append(path)
+            return reserved[0]
+        except FileExistsError:
+            for path in reserved:
+                path.unlink(missing_ok=True)
+            counter += 1
 
 def _process_single_document(
     json_path: Path,
@@ -455,7 +850,8 @@ def _process_single_document(
     output_dir: Path,
     auto_normalize: bool,
     name_field: Optional[str],
-    field_types: Optional[Dict[str, str]]
+    field_types: Optional[Dict[str, str]],
+    output_format: str = "docx"
 ) -> Dict[str, Any]:
     """
     Worker function to process a single document.
@@ -470,6 +866,7 @@ def _process_single_document(
         auto_normalize: Enable normalization
         name_field: Field for filename
         field_types: Normalization types
+        output_format: Final format ("pdf" also reserves the .pdf name)
 
     Returns:
         Result dictionary:
@@ -499,22 +896,24 @@ def _process_single_document(
             name_field=name_field
         )
 
-        output_path = output_dir / f"{filename_base}.docx"
-
         # Handle filename conflicts
-        counter = 1
-        while output_path.exists():
-            output_path = output_dir / f"{filename_base}_{counter}.docx"
-            counter += 1
+        output_path = _reserve_output_path(output_dir, filename_base, output_format)
 
-        # Render document
-        engine = DocumentEngine(auto_normalize=auto_normalize)
-        engine.render(
-            template_path=template_path,
-            data=data,
-            output_path=output_path,
-            field_types=field_types
-        )
+        # Render document with the worker's engine (template already compiled)
+        engine = _get_worker_engine(auto_normalize)
+        try:
+            engine.render(
+                template_path=template_path,
+                data=data,
+                output_path=output_path,
+                field_types=field_types
+            )
+        except Exception:
+            # Release the reserved (empty) filenames
+            output_path.unlink(missing_ok=True)
+            if output_format != "docx":
+                output_path.with_suffix(f".{output_format}").unlink(missing_ok=True)
+            raise
 
         return {
             'status': 'success',
@@ -548,3 +947,86 @@ def _process_single_document(
             'message': str(e),
             'traceback': traceback.format_exc()
         }
+
+
+def _render_document_bytes(
+    task: tuple,
+    template_path: Path,
+    auto_normalize: bool,
+    name_field: Optional[str],
+    field_types: Optional[Dict[str, str]]
+) -> Dict[str, Any]:
+    """
+    Worker function for the in-memory mode: render one record to bytes.
+
+    Args:
+        task: (index, record) - record is a JSON file path or a data dict
+        template_path: Path to template
+        auto_normalize: Enable normalization
+        name_field: Field for filename
+        field_types: Normalization types
+
+    Returns:
+        Result dictionary:
+            {
+                'status': 'success' | 'error',
+                'json_file': str (file path, or "item_<index>" for dicts),
+                'filename_base': str (if success),
+                'content': bytes (if success),
+                'error_type': str (if error),
+                'message': str (if error),
+                'traceback': str (if error)
+            }
+    """
+    index, record = task
+    source = f"item_{index}"
+    card_id = None
+
+    try:
+        if isinstance(record, dict):
+            data = record
+        else:
+            json_path = Path(record)
+            source = str(json_path)
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if json_path.stem.startswith('card_'):
+                card_id = json_path.stem.replace('card_', '')
+
+        filename_base = create_filename_from_data(
+            data=data,
+            card_id=card_id,
+            name_field=name_field
+        )
+
+        engine = _get_worker_engine(auto_normalize)
+        content = engine.render_to_bytes(
+            template_path=template_path,
+            data=data,
+            field_types=field_types
+        )
+
+        return {
+            'status': 'success',
+            'json_file': source,
+            'filename_base': filename_base,
+            'content': content
+        }
+
+    except json.JSONDecodeError as e:
+        return {
+            'status': 'error',
+            'json_file': source,
+            'error_type': 'JSONDecodeError',
+            'message': f"Invalid JSON: {str(e)}",
+            'traceback': traceback.format_exc()
+        }
+
+    except Exception as e:
+        return {
+            'status': 'error',
+            'json_file': source,
+            'error_type': type(e).__name__,
+            'message': str(e),
+            'traceback': traceback.format_exc()
+        }
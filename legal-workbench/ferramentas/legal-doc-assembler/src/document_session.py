@@ -0,0 +1,219 @@
+"""
+Document Sessions - keep uploaded DOCX documents parsed in memory.
+
+The template builder flow (upload → patterns → save) used to re-open the
+uploaded file with python-docx at every step. A DocumentSession parses the
+upload once and keeps everything the later steps need:
+
+    - the python-docx Document (annotations are applied to it directly,
+      after taking the session out of the store)
+    - the run map: each body paragraph's runs, hyperlinks included
+    - the builder text layout: non-empty paragraphs joined by "\\n\\n",
+      with the offset of each paragraph in that text
+    - detected patterns, once computed
+
+DocumentSessionStore holds sessions by id with TTL eviction (since last
+access) and a memory cap (least recently used sessions go first).
+
+Usage:
+    store = DocumentSessionStore(ttl_seconds=3600, max_bytes=256 * 1024 * 1024)
+    session = store.open(content)
+    store.get(session.session_id).text_content
+"""
+
+import io
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from docx import Document
+from docx.document import Document as DocumentObject
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+
+from .annotation_engine import paragraph_runs
+
+PARAGRAPH_SEPARATOR = "\n\n"
+
+
+def estimate_docx_size(content: bytes) -> int:
+    """Approximate in-memory size of a parsed DOCX (uncompressed package size)."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as zf:
+            return len(content) + sum(info.file_size for info in zf.infolist())
+    except zipfile.BadZipFile:
+        return len(content)
+
+
+@dataclass
+class DocumentSession:
+    """One uploaded document, parsed once."""
+
+    session_id: str
+    document: DocumentObject
+    paragraphs: List[Paragraph]     # Body paragraphs, document order
+    runs: List[List[Run]]           # Run map, parallel to paragraphs
+    text_paragraphs: List[int]      # Indices of the non-empty paragraphs
+    texts: List[str]                # Their texts (the pieces of text_content)
+    offsets: List[int]              # Start of each non-empty paragraph in text_content
+    text_content: str
+    metadata: Dict[str, Any]
+    size_bytes: int
+    patterns: Optional[List[Any]] = None  # Detected patterns (filled by the caller)
+    last_access: float = field(default_factory=time.monotonic)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def from_bytes(cls, content: bytes, session_id: Optional[str] = None) -> "DocumentSession":
+        """
+        Parse a DOCX upload.
+
+        Args:
+            content: DOCX file bytes
+            session_id: Id to use (default: new UUID)
+
+        Raises:
+            Exception: Whatever python-docx raises for invalid files
+        """
+        document = Document(io.BytesIO(content))
+        paragraphs = list(document.paragraphs)
+        runs = [paragraph_runs(paragraph) for paragraph in paragraphs]
+
+        text_paragraphs: List[int] = []
+        offsets: List[int] = []
+        texts: List[str] = []
+        position = 0
+        for index, paragraph in enumerate(paragraphs):
+            text = paragraph.text
+            if not text.strip():
+                continue
+            text_paragraphs.append(index)
+            offsets.append(position)
+            texts.append(text)
+            position += len(text) + len(PARAGRAPH_SEPARATOR)
+
+        text_content = PARAGRAPH_SEPARATOR.join(texts)
+        metadata = {
+            "paragraphs": len(texts),
+            "word_count": len(text_content.split()),
+            "char_count": len(text_content),
+            "sections": len(document.sections),
+            "tables": len(document.tables),
+        }
+
+        return cls(
+            session_id=session_id or str(uuid4()),
+            document=document,
+            paragraphs=paragraphs,
+            runs=runs,
+            text_paragraphs=text_paragraphs,
+            texts=texts,
+            offsets=offsets,
+            text_content=text_content,
+            metadata=metadata,
+            size_bytes=estimate_docx_size(content),
+        )
+
+
+class DocumentSessionStore:
+    """
+    In-memory, thread-safe store of DocumentSessions.
+
+    Features:
+        - TTL eviction (counted from the last access)
+        - Memory cap on the estimated size of all sessions (LRU eviction)
+        - Session count cap
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_sessions: int = 100,
+    ):
+        """
+        Args:
+            ttl_seconds: Sessions unused for this long are dropped
+            max_bytes: Cap on the summed estimated size of all sessions
+            max_sessions: Cap on the number of sessions
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_sessions = max(1, max_sessions)
+        self._sessions: "OrderedDict[str, DocumentSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+
+    def open(self, content: bytes, session_id: Optional[str] = None) -> DocumentSession:
+        """
+        Parse a DOCX upload and keep it as a new session.
+
+        Args:
+            content: DOCX file bytes
+            session_id: Id to use (default: new UUID); replaces an existing session
+
+        Returns:
+            The new DocumentSession
+        """
+        session = DocumentSession.from_bytes(content, session_id)
+        with self._lock:
+            self._pop(session.session_id)
+            self._sessions[session.session_id] = session
+            self.total_bytes += session.size_bytes
+            self._evict(keep=session.session_id)
+        return session
+
+    def get(self, session_id: str) -> Optional[DocumentSession]:
+        """Session by id (refreshing its TTL), or None if unknown or expired."""
+        with self._lock:
+            self._evict()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_access = time.monotonic()
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def take(self, session_id: str) -> Optional[DocumentSession]:
+        """
+        Remove and return a session (None if unknown or expired).
+
+        Used before modifying the session's Document: only one caller can
+        take a session, so a concurrent or retried caller re-parses instead
+        of seeing a half-annotated document.
+        """
+        with self._lock:
+            self._evict()
+            session = self._sessions.get(session_id)
+            self._pop(session_id)
+            return session
+
+    def discard(self, session_id: str) -> None:
+        """Drop a session (e.g. once its template has been saved)."""
+        with self._lock:
+            self._pop(session_id)
+
+    def _pop(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self.total_bytes -= session.size_bytes
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Drop expired sessions, then least recently used ones over the caps."""
+        deadline = time.monotonic() - self.ttl_seconds
+        for session_id in [sid for sid, s in self._sessions.items() if s.last_access <= deadline]:
+            if session_id != keep:
+                self._pop(session_id)
+
+        for session_id in list(self._sessions):
+            if len(self._sessions) <= self.max_sessions and self.total_bytes <= self.max_bytes:
+                break
+            if session_id != keep:
+                self._pop(session_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 from docx import Document
+from docx.document import Document as DocumentObject
 from docx.text.paragraph import Paragraph
 from docx.table import Table
 import re
@@ -40,8 +41,16 @@ class DocxParser:
     3. Preserve formatting information for preview
     """
 
-    def __init__(self, file_path: str | Path):
+    def __init__(self, file_path: str | Path, document: Optional[DocumentObject] = None):
+        """
+        Args:
+            file_path: Path to the DOCX file
+            document: Already loaded Document for file_path (skips parsing)
+        """
         self.file_path = Path(file_path)
+        if document is not None:
+            self.document = document
+            return
         if not self.file_path.exists():
             raise FileNotFoundError(f"DOCX file not found: {file_path}")
         self.document = Document(str(self.file_path))
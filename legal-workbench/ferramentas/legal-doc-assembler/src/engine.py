@@ -5,30 +5,29 @@ Uses docxtpl with Jinja2 and custom normalization filters.
 Fault-tolerant: undefined variables remain visible in output.
 """
 
+import io
 import json
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import jinja2
 from jinja2 import DebugUndefined
-from docxtpl import DocxTemplate
 from rich.console import Console
 from rich.table import Table
 
+from .pdf_converter import ConverterPool, get_converter_pool
+from .template_cache import CachedDocxTemplate, TemplateCache, get_template_cache
 from .normalizers import (
-    normalize_name,
-    normalize_address,
-    format_cpf,
-    format_cnpj,
-    format_cep,
-    format_oab,
+    get_normalization_engine,
     normalize_whitespace,
-    normalize_punctuation,
     normalize_all,
 )
 
 console = Console()
 
+OUTPUT_FORMATS = ("docx", "pdf")
+
 
 class DocumentEngine:
     """
@@ -39,6 +38,10 @@ class DocumentEngine:
         - Fault-tolerant: undefined variables show {{ var_name }} in output
         - Custom filters for Brazilian document formatting
         - Automatic text normalization
+        - Templates are parsed and compiled once (TemplateCache) and
+          re-rendered from the cache until the file changes
+        - Optional PDF output through a pool of long-lived LibreOffice
+          converters (ConverterPool)
 
     Usage:
         engine = DocumentEngine()
@@ -49,15 +52,28 @@ class DocumentEngine:
         )
     """
 
-    def __init__(self, auto_normalize: bool = True):
+    # Shared by all instances in the process; compiled templates are bound to it
+    _shared_jinja_env: Optional[jinja2.Environment] = None
+
+    def __init__(
+        self,
+        auto_normalize: bool = True,
+        template_cache: Optional[TemplateCache] = None,
+        pdf_converter: Optional[ConverterPool] = None,
+    ):
         """
         Initialize the document engine.
 
         Args:
             auto_normalize: If True, automatically apply text normalization
                 to string values in data dict.
+            template_cache: Compiled template cache (default: process-wide cache)
+            pdf_converter: Converter pool for PDF output (default: process-wide
+                pool, started on the first PDF)
         """
         self.auto_normalize = auto_normalize
+        self.template_cache = template_cache if template_cache is not None else get_template_cache()
+        self.pdf_converter = pdf_converter
         self._setup_jinja_env()
 
     def _setup_jinja_env(self) -> jinja2.Environment:
@@ -65,28 +81,39 @@ class DocumentEngine:
         Configure Jinja2 environment with:
             - DebugUndefined: keeps {{ var }} visible if undefined
             - Custom filters for Brazilian formatting
-        """
-        self.jinja_env = jinja2.Environment(
-            undefined=DebugUndefined,
-            autoescape=False,  # Don't escape for docx
-        )
 
-        # Register custom filters
-        self.jinja_env.filters['nome'] = normalize_name
-        self.jinja_env.filters['endereco'] = normalize_address
-        self.jinja_env.filters['cpf'] = format_cpf
-        self.jinja_env.filters['cnpj'] = format_cnpj
-        self.jinja_env.filters['cep'] = format_cep
-        self.jinja_env.filters['oab'] = format_oab
-        self.jinja_env.filters['texto'] = lambda x: normalize_punctuation(
-            normalize_whitespace(x)
-        )
-        self.jinja_env.filters['valor'] = self._format_valor
-        self.jinja_env.filters['data'] = lambda x: x  # Pass through
-        self.jinja_env.filters['telefone'] = lambda x: x  # Pass through
+        The filters are stateless, so the environment is built once per
+        process and shared, letting engines reuse each other's compiled templates.
+        """
+        if DocumentEngine._shared_jinja_env is None:
+            env = jinja2.Environment(
+                undefined=DebugUndefined,
+                autoescape=False,  # Don't escape for docx
+            )
 
+            # Register custom filters (memoized: the same values repeat
+            # across the records of a batch)
+            normalization = get_normalization_engine()
+            env.filters['nome'] = normalization.normalizer('name')
+            env.filters['endereco'] = normalization.normalizer('address')
+            env.filters['cpf'] = normalization.normalizer('cpf')
+            env.filters['cnpj'] = normalization.normalizer('cnpj')
+            env.filters['cep'] = normalization.normalizer('cep')
+            env.filters['oab'] = normalization.normalizer('oab')
+            env.filters['texto'] = normalization.normalizer('text')
+            env.filters['valor'] = self._format_valor
+            env.filters['data'] = lambda x: x  # Pass through
+            env.filters['telefone'] = lambda x: x  # Pass through
+
+            DocumentEngine._shared_jinja_env = env
+
+        self.jinja_env = DocumentEngine._shared_jinja_env
         return self.jinja_env
 
+    def _load_template(self, template_path: Path) -> CachedDocxTemplate:
+        """Fresh document cloned from the cached, pre-compiled template."""
+        return self.template_cache.get(template_path, self.jinja_env).new_document()
+
     @staticmethod
     def _format_valor(value: str) -> str:
         """Format currency value to Brazilian format."""
@@ -150,12 +177,23 @@ class DocumentEngine:
 
         return result
 
+    @staticmethod
+    def _check_output_format(output_format: str) -> None:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown output format: {output_format} (expected one of {', '.join(OUTPUT_FORMATS)})"
+            )
+
+    def _get_pdf_converter(self) -> ConverterPool:
+        return self.pdf_converter if self.pdf_converter is not None else get_converter_pool()
+
     def render(
         self,
         template_path: str | Path,
         data: Dict[str, Any],
         output_path: str | Path,
         field_types: Optional[Dict[str, str]] = None,
+        output_format: str = "docx",
     ) -> Path:
         """
         Render a document from template and data.
@@ -163,8 +201,9 @@ class DocumentEngine:
         Args:
             template_path: Path to .docx template file
             data: Dictionary with template variables
-            output_path: Path for output .docx file
+            output_path: Path for output file
             field_types: Optional dict mapping field names to normalization types
+            output_format: "docx" or "pdf" (converted on the converter pool)
 
         Returns:
             Path to the generated document
@@ -172,7 +211,9 @@ class DocumentEngine:
         Raises:
             FileNotFoundError: If template doesn't exist
             ValueError: If template is invalid
+            PdfConversionError: If PDF conversion fails
         """
+        self._check_output_format(output_format)
         template_path = Path(template_path)
         output_path = Path(output_path)
 
@@ -185,7 +226,7 @@ class DocumentEngine:
 
         # Load template with custom Jinja environment
         try:
-            doc = DocxTemplate(template_path)
+            doc = self._load_template(template_path)
             doc.render(processed_data, self.jinja_env)
         except Exception as e:
             raise ValueError(f"Error rendering template: {e}")
@@ -193,13 +234,63 @@ class DocumentEngine:
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Save document
-        doc.save(output_path)
+        # Save document (PDF: via a temporary .docx next to the output)
+        if output_format == "pdf":
+            with tempfile.TemporaryDirectory(dir=output_path.parent) as work_dir:
+                docx_path = Path(work_dir) / f"{output_path.stem}.docx"
+                doc.save(docx_path)
+                self._get_pdf_converter().convert(docx_path, output_path)
+        else:
+            doc.save(output_path)
 
         console.print(f"[green]✔[/green] Document saved: {output_path}")
 
         return output_path
 
+    def render_to_bytes(
+        self,
+        template_path: str | Path,
+        data: Dict[str, Any],
+        field_types: Optional[Dict[str, str]] = None,
+        output_format: str = "docx",
+    ) -> bytes:
+        """
+        Render a document in memory and return its bytes.
+
+        Args:
+            template_path: Path to .docx template file
+            data: Dictionary with template variables
+            field_types: Optional dict mapping field names to normalization types
+            output_format: "docx" or "pdf" (converted on the converter pool)
+
+        Returns:
+            Content of the rendered .docx (or PDF)
+
+        Raises:
+            FileNotFoundError: If template doesn't exist
+            ValueError: If template is invalid
+            PdfConversionError: If PDF conversion fails
+        """
+        self._check_output_format(output_format)
+        template_path = Path(template_path)
+
+        if not template_path.exists():
+            raise FileNotFoundError(f"Template not found: {template_path}")
+
+        processed_data = self._preprocess_data(data, field_types)
+
+        try:
+            doc = self._load_template(template_path)
+            doc.render(processed_data, self.jinja_env)
+        except Exception as e:
+            raise ValueError(f"Error rendering template: {e}")
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        if output_format == "pdf":
+            return self._get_pdf_converter().convert_bytes(buffer.getvalue())
+        return buffer.getvalue()
+
     def render_from_json(
         self,
         template_path: str | Path,
@@ -246,9 +337,9 @@ class DocumentEngine:
         if not template_path.exists():
             raise FileNotFoundError(f"Template not found: {template_path}")
 
-        doc = DocxTemplate(template_path)
-        # Use our Jinja2 environment which has custom filters registered
-        variables = doc.get_undeclared_template_variables(self.jinja_env)
+        # Collected with our Jinja2 environment (custom filters registered)
+        # when the template is compiled
+        variables = self.template_cache.get(template_path, self.jinja_env).variables
 
         return sorted(list(variables))
 
@@ -313,7 +404,7 @@ class DocumentEngine:
 
         # Load and render template (in memory only)
         try:
-            doc = DocxTemplate(template_path)
+            doc = self._load_template(template_path)
             doc.render(processed_data, self.jinja_env)
         except Exception as e:
             raise ValueError(f"Error rendering template: {e}")
@@ -8,11 +8,18 @@ This module provides deterministic text normalization for:
 - Address formatting (logradouro expansions, number indicators)
 - Document formatting (CPF, CNPJ, CEP, OAB)
 - Punctuation normalization
+
+All patterns are compiled once at import; ordered pattern lists whose rules
+cannot interact are merged into a single alternation (one scan per value).
+NormalizationEngine adds per-field-type memoization and column/batch APIs for
+data that repeats the same names and addresses across many records.
 """
 
 import re
+import threading
 import unicodedata
-from typing import Any, Callable, Dict, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 # === CONSTANTS ===
 
@@ -62,6 +69,89 @@ HONORIFIC_PATTERNS = [
 ]
 
 
+def _merge_patterns(
+    patterns: List[Tuple[str, str]],
+    flags: int = re.IGNORECASE
+) -> Tuple[re.Pattern, Callable[[re.Match], str]]:
+    """
+    Merge an ordered (pattern, replacement) list into one alternation.
+
+    Each pattern becomes a numbered group; earlier patterns win at the same
+    position, matching the order of the original sequential substitutions.
+    Only valid for lists whose replacements cannot be matched by later
+    patterns (true for ADDRESS_EXPANSIONS and HONORIFIC_PATTERNS).
+    """
+    regex = re.compile('|'.join(f'({pattern})' for pattern, _ in patterns), flags)
+    replacements = [replacement for _, replacement in patterns]
+    return regex, lambda match: replacements[match.lastindex - 1]
+
+
+# === PRECOMPILED PATTERNS ===
+
+_SPACE_RUN_RE = re.compile(r' +')
+_ORDINAL_RE = re.compile(r'^\d+[ºª]$')
+_ABBREVIATION_PERIOD_RE = re.compile(r'^[A-Z]{1,3}\.$')
+_NON_DIGIT_RE = re.compile(r'\D')
+
+_ADDRESS_TYPE_RE, _ADDRESS_TYPE_REPL = _merge_patterns(ADDRESS_EXPANSIONS)
+_HONORIFIC_RE, _HONORIFIC_REPL = _merge_patterns(HONORIFIC_PATTERNS)
+
+# S/N variations → s/nº. Separate passes like _ADDRESS_UNIT_SUBS: one merged
+# alternation resolves overlapping forms differently ("S.N.S N" → "s/nº S nº")
+_WITHOUT_NUMBER_SUBS = [
+    re.compile(r'\bS/?N[ºo]?\b', re.IGNORECASE),
+    re.compile(r'\bS\.\s*N\.', re.IGNORECASE),
+    re.compile(r'\bS\s+N\b', re.IGNORECASE),
+]
+
+# Number indicator and unit rules. Applied in order: later rules see the
+# output of earlier ones, so they are kept as separate passes.
+_ADDRESS_UNIT_SUBS = [
+    (re.compile(r'\b[Nn][°ºoO.]?\s*'), 'nº '),
+    (re.compile(r'\bNUM\.?\s*', re.IGNORECASE), 'nº '),
+    (re.compile(r'\bNO\.?\s*', re.IGNORECASE), 'nº '),
+    (re.compile(r'\bAPTO?\.?\s*', re.IGNORECASE), 'Apto. '),
+    (re.compile(r'\bAPT\.?\s*', re.IGNORECASE), 'Apto. '),
+    (re.compile(r'\bAP\.?\s*', re.IGNORECASE), 'Apto. '),
+    (re.compile(r'\bBLOCO\s+', re.IGNORECASE), 'Bloco '),
+    (re.compile(r'\bBL\.?\s*', re.IGNORECASE), 'Bloco '),
+    (re.compile(r'\bSL\.?\s*', re.IGNORECASE), 'Sala '),
+    (re.compile(r'\bSALA\s+', re.IGNORECASE), 'Sala '),
+    (re.compile(r'\bCJ\.?\s*', re.IGNORECASE), 'Conjunto '),
+    (re.compile(r'\bCONJ\.?\s*', re.IGNORECASE), 'Conjunto '),
+    (re.compile(r'\bLJ\.?\s*', re.IGNORECASE), 'Loja '),
+    (re.compile(r'\bLOJA\s+', re.IGNORECASE), 'Loja '),
+    (re.compile(r'\bSOB\.?\s*', re.IGNORECASE), 'Sobreloja '),
+]
+
+# Address tokens kept exactly as written by the expansions above
+_ADDRESS_FORMATTED_TOKENS = frozenset({
+    'Apto.', 'Bloco', 'Sala', 'Conjunto', 'Loja', 'Sobreloja',
+    'Rua', 'Avenida', 'Travessa', 'Alameda', 'Praça', 'Largo',
+    'Vila', 'Estrada', 'Rodovia',
+})
+
+_SPACE_BEFORE_PUNCT_RE = re.compile(r'\s+([.,;:!?])')
+_LONG_ELLIPSIS_RE = re.compile(r'\.{4,}')
+_DOUBLE_DOT_RE = re.compile(r'(?<!\.)\.\.(?!\.)')
+_REPEATED_COMMA_RE = re.compile(r',+')
+_REPEATED_SEMICOLON_RE = re.compile(r';+')
+_REPEATED_COLON_RE = re.compile(r':+')
+_MISSING_SPACE_AFTER_PUNCT_RE = re.compile(r'([.,;:!?])([A-ZÀ-Ú])')
+_QUOTES_TABLE = str.maketrans({
+    '\u201c': '"',  # Left double quotation mark
+    '\u201d': '"',  # Right double quotation mark
+    '\u00ab': '"',  # Left-pointing double angle quotation mark
+    '\u00bb': '"',  # Right-pointing double angle quotation mark
+    '\u2018': "'",  # Left single quotation mark
+    '\u2019': "'",  # Right single quotation mark
+})
+
+_OAB_NUMBER_UF_RE = re.compile(r'^(\d+)\s*/?([A-Z]{2})$')
+_OAB_PREFIXED_RE = re.compile(r'^OAB\s*/?([A-Z]{2})\s*(\d+)$')
+_OAB_UF_NUMBER_RE = re.compile(r'^([A-Z]{2})\s*/?(\d+)$')
+
+
 # === WHITESPACE FUNCTIONS ===
 
 def normalize_whitespace(text: Optional[str]) -> Optional[str]:
@@ -93,7 +183,7 @@ def normalize_whitespace(text: Optional[str]) -> Optional[str]:
     # Replace non-breaking space (U+00A0) and tabs with regular space
     text = text.replace('\u00a0', ' ').replace('\t', ' ')
     # Collapse multiple spaces to single
-    text = re.sub(r' +', ' ', text)
+    text = _SPACE_RUN_RE.sub(' ', text)
     # Strip leading/trailing
     return text.strip()
 
@@ -183,11 +273,11 @@ def normalize_name(text: Optional[str]) -> Optional[str]:
             result.append(word.upper())
 
         # Check for ordinals (1º, 2ª, 10º)
-        elif re.match(r'^\d+[ºª]$', word):
+        elif _ORDINAL_RE.match(word):
             result.append(word)
 
         # Check for already formatted abbreviations with period
-        elif re.match(r'^[A-Z]{1,3}\.$', word):
+        elif _ABBREVIATION_PERIOD_RE.match(word):
             result.append(word)
 
         # Default: Capitalize first letter, lowercase rest
@@ -222,11 +312,8 @@ def normalize_honorific(text: Optional[str]) -> Optional[str]:
     if not text:
         return text
 
-    # Apply honorific expansions
-    for pattern, replacement in HONORIFIC_PATTERNS:
-        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-
-    return text
+    # Apply honorific expansions (single merged pass)
+    return _HONORIFIC_RE.sub(_HONORIFIC_REPL, text)
 
 
 # === ADDRESS FUNCTIONS ===
@@ -261,33 +348,16 @@ def normalize_address(text: Optional[str]) -> Optional[str]:
     if not text:
         return text
 
-    # Apply address type expansions
-    for pattern, replacement in ADDRESS_EXPANSIONS:
-        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    # Apply address type expansions (single merged pass)
+    text = _ADDRESS_TYPE_RE.sub(_ADDRESS_TYPE_REPL, text)
 
     # S/N variations → s/nº (MUST be before number indicator standardization)
-    text = re.sub(r'\bS/?N[ºo]?\b', 's/nº', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bS\.\s*N\.', 's/nº', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bS\s+N\b', 's/nº', text, flags=re.IGNORECASE)
-
-    # Number indicator standardization (various forms → "nº ")
-    text = re.sub(r'\b[Nn][°ºoO.]?\s*', 'nº ', text)
-    text = re.sub(r'\bNUM\.?\s*', 'nº ', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bNO\.?\s*', 'nº ', text, flags=re.IGNORECASE)
-
-    # Apartment/Unit standardization
-    text = re.sub(r'\bAPTO?\.?\s*', 'Apto. ', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bAPT\.?\s*', 'Apto. ', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bAP\.?\s*', 'Apto. ', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bBLOCO\s+', 'Bloco ', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bBL\.?\s*', 'Bloco ', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bSL\.?\s*', 'Sala ', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bSALA\s+', 'Sala ', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bCJ\.?\s*', 'Conjunto ', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bCONJ\.?\s*', 'Conjunto ', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bLJ\.?\s*', 'Loja ', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bLOJA\s+', 'Loja ', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bSOB\.?\s*', 'Sobreloja ', text, flags=re.IGNORECASE)
+    for regex in _WITHOUT_NUMBER_SUBS:
+        text = regex.sub('s/nº', text)
+
+    # Number indicator and apartment/unit standardization
+    for regex, replacement in _ADDRESS_UNIT_SUBS:
+        text = regex.sub(replacement, text)
 
     # Clean up multiple spaces that may have been introduced
     text = normalize_whitespace(text)
@@ -306,9 +376,7 @@ def normalize_address(text: Optional[str]) -> Optional[str]:
         elif part[0].isdigit():
             result.append(part)
         # Already properly formatted (Apto., Bloco, etc.)
-        elif part in ('Apto.', 'Bloco', 'Sala', 'Conjunto', 'Loja', 'Sobreloja',
-                      'Rua', 'Avenida', 'Travessa', 'Alameda', 'Praça', 'Largo',
-                      'Vila', 'Estrada', 'Rodovia'):
+        elif part in _ADDRESS_FORMATTED_TOKENS:
             result.append(part)
         # Capitalize others
         elif part.islower() or part.isupper():
@@ -346,7 +414,7 @@ def format_cpf(cpf: Optional[str]) -> Optional[str]:
         return None
 
     # Extract only digits
-    digits = re.sub(r'\D', '', str(cpf))
+    digits = _NON_DIGIT_RE.sub('', str(cpf))
 
     # Must be exactly 11 digits
     if len(digits) != 11:
@@ -379,7 +447,7 @@ def format_cnpj(cnpj: Optional[str]) -> Optional[str]:
         return None
 
     # Extract only digits
-    digits = re.sub(r'\D', '', str(cnpj))
+    digits = _NON_DIGIT_RE.sub('', str(cnpj))
 
     # Must be exactly 14 digits
     if len(digits) != 14:
@@ -417,7 +485,7 @@ def format_cep(cep: Optional[str]) -> Optional[str]:
         cep_str = str(cep)
 
     # Extract only digits
-    digits = re.sub(r'\D', '', cep_str)
+    digits = _NON_DIGIT_RE.sub('', cep_str)
 
     # Must be exactly 8 digits
     if len(digits) != 8:
@@ -451,17 +519,17 @@ def format_oab(oab: Optional[str]) -> Optional[str]:
     oab_str = str(oab).upper().strip()
 
     # Try pattern: digits + UF
-    match = re.match(r'^(\d+)\s*/?([A-Z]{2})$', oab_str)
+    match = _OAB_NUMBER_UF_RE.match(oab_str)
     if match:
         number, uf = match.groups()
     else:
         # Try pattern: OAB/UF + digits
-        match = re.match(r'^OAB\s*/?([A-Z]{2})\s*(\d+)$', oab_str)
+        match = _OAB_PREFIXED_RE.match(oab_str)
         if match:
             uf, number = match.groups()
         else:
             # Try pattern: UF + digits
-            match = re.match(r'^([A-Z]{2})\s*/?(\d+)$', oab_str)
+            match = _OAB_UF_NUMBER_RE.match(oab_str)
             if match:
                 uf, number = match.groups()
             else:
@@ -509,39 +577,211 @@ def normalize_punctuation(text: Optional[str]) -> Optional[str]:
     text = str(text)
 
     # Remove space before punctuation
-    text = re.sub(r'\s+([.,;:!?])', r'\1', text)
+    text = _SPACE_BEFORE_PUNCT_RE.sub(r'\1', text)
 
     # Collapse multiple punctuation (preserve ...)
-    text = re.sub(r'\.{4,}', '...', text)  # 4+ dots → ellipsis
-    text = re.sub(r'(?<!\.)\.\.(?!\.)', '.', text)  # exactly 2 dots → 1
-    text = re.sub(r',+', ',', text)
-    text = re.sub(r';+', ';', text)
-    text = re.sub(r':+', ':', text)
+    text = _LONG_ELLIPSIS_RE.sub('...', text)  # 4+ dots → ellipsis
+    text = _DOUBLE_DOT_RE.sub('.', text)  # exactly 2 dots → 1
+    text = _REPEATED_COMMA_RE.sub(',', text)
+    text = _REPEATED_SEMICOLON_RE.sub(';', text)
+    text = _REPEATED_COLON_RE.sub(':', text)
 
     # Add space after punctuation if followed by letter (not for abbreviations)
     # But skip things like "Dr.", "nº", etc.
-    text = re.sub(r'([.,;:!?])([A-ZÀ-Ú])', r'\1 \2', text)
-
-    # Standardize quotes to straight double quotes
-    # Curly/smart double quotes: " " « »
-    text = text.replace('\u201c', '"')  # Left double quotation mark
-    text = text.replace('\u201d', '"')  # Right double quotation mark
-    text = text.replace('\u00ab', '"')  # Left-pointing double angle quotation mark
-    text = text.replace('\u00bb', '"')  # Right-pointing double angle quotation mark
+    text = _MISSING_SPACE_AFTER_PUNCT_RE.sub(r'\1 \2', text)
 
-    # Smart single quotes: ' '
-    text = text.replace('\u2018', "'")  # Left single quotation mark
-    text = text.replace('\u2019', "'")  # Right single quotation mark
+    # Standardize curly/angle quotes to straight quotes
+    text = text.translate(_QUOTES_TABLE)
 
     return text
 
 
 # === COMPOSITE FUNCTIONS ===
 
+def normalize_text(text: Optional[str]) -> Optional[str]:
+    """Whitespace + punctuation normalization (field type 'text')."""
+    return normalize_punctuation(normalize_whitespace(text))
+
+
+# Field type → normalizer ('text' is the default for unknown types)
+FIELD_NORMALIZERS: Dict[str, Callable[[Any], Any]] = {
+    'name': normalize_name,
+    'address': normalize_address,
+    'cpf': format_cpf,
+    'cnpj': format_cnpj,
+    'cep': format_cep,
+    'oab': format_oab,
+    'text': normalize_text,
+    'raw': lambda x: x,  # No-op
+}
+
+# Values that are memoized; anything else (lists, dicts) is normalized directly
+_MEMOIZABLE_TYPES = (str, int, float)
+
+_MISSING = object()
+
+
+class NormalizationEngine:
+    """
+    Memoized normalization by field type.
+
+    Batch data repeats the same party names, addresses and courts across
+    thousands of records; each distinct value is normalized once per type.
+
+    Features:
+        - One LRU cache per field type (values are only reused within a type)
+        - normalize_column: normalize a column of values in one call
+        - normalize_records: column-wise normalization of many records
+
+    Usage:
+        engine = NormalizationEngine()
+        engine.normalize("MARIA DA SILVA", "name")
+        engine.normalize_column(names, "name")
+        engine.normalize_records(rows, {"nome": "name", "cpf": "cpf"})
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialize the engine.
+
+        Args:
+            cache_size: Maximum memoized values per field type (0 disables
+                memoization)
+        """
+        self.cache_size = cache_size
+        self._caches: Dict[str, Callable[[Any], Any]] = {}
+        self._normalizers: Dict[str, Callable[[Any], Any]] = {
+            field_type: self._memoize(field_type, func)
+            for field_type, func in FIELD_NORMALIZERS.items()
+        }
+
+    def _memoize(self, field_type: str, func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        if field_type == 'raw':
+            return func
+
+        cached = lru_cache(maxsize=self.cache_size, typed=True)(func)
+        self._caches[field_type] = cached
+
+        def normalize(value: Any) -> Any:
+            if value is None:
+                return None
+            if isinstance(value, _MEMOIZABLE_TYPES):
+                return cached(value)
+            return func(value)
+
+        normalize.__name__ = func.__name__
+        normalize.__doc__ = func.__doc__
+        return normalize
+
+    def normalizer(self, field_type: str) -> Callable[[Any], Any]:
+        """
+        Memoized normalizer for a field type (usable as a Jinja filter).
+
+        Args:
+            field_type: 'name', 'address', 'cpf', 'cnpj', 'cep', 'oab',
+                'text' or 'raw'; unknown types fall back to 'text'
+        """
+        return self._normalizers.get(field_type, self._normalizers['text'])
+
+    def normalize(self, value: Any, field_type: str = 'text') -> Any:
+        """Normalize one value as field_type (None stays None)."""
+        return self.normalizer(field_type)(value)
+
+    def normalize_column(self, values: Iterable[Any], field_type: str = 'text') -> List[Any]:
+        """
+        Normalize a column of values of the same field type.
+
+        Repeated values within the column are normalized once, even when
+        the column has more distinct values than cache_size.
+
+        Args:
+            values: Values to normalize
+            field_type: Field type of every value
+
+        Returns:
+            Normalized values, in input order
+        """
+        normalize = self.normalizer(field_type)
+        seen: Dict[Tuple[type, Any], Any] = {}
+        result = []
+
+        for value in values:
+            if isinstance(value, _MEMOIZABLE_TYPES):
+                key = (type(value), value)
+                normalized = seen.get(key, _MISSING)
+                if normalized is _MISSING:
+                    normalized = seen[key] = normalize(value)
+            else:
+                normalized = normalize(value)
+            result.append(normalized)
+
+        return result
+
+    def normalize_record(self, data: Dict[str, Any], field_types: Dict[str, str]) -> Dict[str, Any]:
+        """Normalize one record (same rules as normalize_all)."""
+        return {
+            field: self.normalize(value, field_types.get(field, 'text'))
+            for field, value in data.items()
+        }
+
+    def normalize_records(
+        self,
+        records: List[Dict[str, Any]],
+        field_types: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Normalize many records column by column.
+
+        Args:
+            records: Records to normalize (not modified)
+            field_types: Field name → type mapping (default 'text')
+
+        Returns:
+            New records with normalized values, keys in their original order
+        """
+        fields = dict.fromkeys(field for record in records for field in record)
+        columns = {
+            field: iter(self.normalize_column(
+                (record[field] for record in records if field in record),
+                field_types.get(field, 'text')
+            ))
+            for field in fields
+        }
+        return [{field: next(columns[field]) for field in record} for record in records]
+
+    def cache_info(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters and current size per field type."""
+        return {
+            field_type: cached.cache_info()._asdict()
+            for field_type, cached in self._caches.items()
+        }
+
+    def clear_cache(self) -> None:
+        """Drop all memoized values."""
+        for cached in self._caches.values():
+            cached.cache_clear()
+
+
+_default_engine: Optional[NormalizationEngine] = None
+_default_engine_lock = threading.Lock()
+
+
+def get_normalization_engine() -> NormalizationEngine:
+    """Process-wide memoized engine used by normalize_all and the Jinja filters."""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = NormalizationEngine()
+        return _default_engine
+
+
 def normalize_all(data: Dict[str, Any], field_types: Dict[str, str]) -> Dict[str, Any]:
     """
     Normalize all fields in a dictionary based on their types.
 
+    Uses the process-wide NormalizationEngine, so values repeated across
+    calls (e.g. the same party in many batch records) are normalized once.
+
     Args:
         data: Dictionary with field values
         field_types: Dictionary mapping field names to types:
@@ -563,26 +803,4 @@ def normalize_all(data: Dict[str, Any], field_types: Dict[str, str]) -> Dict[str
         >>> normalize_all(data, types)
         {'nome': 'Maria da Silva', 'cpf': '123.456.789-01'}
     """
-    result = {}
-
-    normalizers: Dict[str, Callable[[Any], Any]] = {
-        'name': normalize_name,
-        'address': normalize_address,
-        'cpf': format_cpf,
-        'cnpj': format_cnpj,
-        'cep': format_cep,
-        'oab': format_oab,
-        'text': lambda x: normalize_punctuation(normalize_whitespace(x)),
-        'raw': lambda x: x,  # No-op
-    }
-
-    for field, value in data.items():
-        field_type = field_types.get(field, 'text')  # Default to text normalization
-        normalizer = normalizers.get(field_type, normalizers['text'])
-
-        if value is not None:
-            result[field] = normalizer(value)
-        else:
-            result[field] = None
-
-    return result
+    return get_normalization_engine().normalize_record(data, field_types)
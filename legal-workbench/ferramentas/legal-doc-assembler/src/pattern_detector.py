@@ -3,10 +3,15 @@ Pattern Detector for Template Creation.
 
 Automatically detects Brazilian legal patterns (CPF, CNPJ, OAB, CEP, currency)
 in text and suggests Jinja2 field replacements.
+
+All pattern types are compiled into one alternation, so a document is
+scanned once (instead of once per type) and overlaps are resolved by the
+scan itself: the leftmost match wins, and at the same position the type
+listed first wins.
 """
 
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from dataclasses import dataclass
 
 
@@ -89,16 +94,54 @@ class PatternDetector:
         }
     }
 
-    def __init__(self, patterns: Optional[Dict] = None):
+    def __init__(
+        self,
+        patterns: Optional[Dict] = None,
+        flags: int = re.IGNORECASE,
+        include_defaults: bool = True
+    ):
         """
         Initialize detector with optional custom patterns.
 
         Args:
             patterns: Dict of pattern definitions to override/extend defaults
+                ('regex' required; 'filter' and 'description' optional).
+                Regexes must not use numbered backreferences.
+            flags: Regex flags for every pattern
+            include_defaults: Start from the built-in PATTERNS
         """
-        self.patterns = {**self.PATTERNS}
+        self.patterns = {**self.PATTERNS} if include_defaults else {}
         if patterns:
             self.patterns.update(patterns)
+        self.flags = flags
+
+        self._compiled = {
+            pattern_type: re.compile(pattern_def['regex'], flags)
+            for pattern_type, pattern_def in self.patterns.items()
+        }
+        self._scanner, self._group_types = self._build_scanner()
+
+    def _build_scanner(self) -> Tuple[re.Pattern, Dict[str, str]]:
+        """Compile all pattern types into one alternation of named groups."""
+        group_types = {f"p{i}": pattern_type for i, pattern_type in enumerate(self.patterns)}
+        scanner = re.compile(
+            '|'.join(
+                f"(?P<{group}>{self.patterns[pattern_type]['regex']})"
+                for group, pattern_type in group_types.items()
+            ),
+            self.flags
+        )
+        return scanner, group_types
+
+    def _make_match(self, pattern_type: str, value: str, start: int, end: int) -> PatternMatch:
+        return PatternMatch(
+            type=pattern_type,
+            value=value,
+            start=start,
+            end=end,
+            suggested_field=self.suggest_field_name(pattern_type, value),
+            filter=self.patterns[pattern_type].get('filter', '')
+        )
 
     def detect_pattern(self, text: str, pattern_type: str) -> List[PatternMatch]:
         """
@@ -114,50 +157,63 @@ class PatternDetector:
         if pattern_type not in self.patterns:
             raise ValueError(f"Unknown pattern type: {pattern_type}")
 
-        pattern_def = self.patterns[pattern_type]
-        regex = pattern_def['regex']
-        matches = []
+        return [
+            self._make_match(pattern_type, match.group(0), match.start(), match.end())
+            for match in self._compiled[pattern_type].finditer(text)
+        ]
 
-        for match in re.finditer(regex, text, re.IGNORECASE):
-            matches.append(PatternMatch(
-                type=pattern_type,
-                value=match.group(0),
-                start=match.start(),
-                end=match.end(),
-                suggested_field=self.suggest_field_name(pattern_type, match.group(0)),
-                filter=pattern_def['filter']
-            ))
+    def iter_detect(
+        self,
+        paragraphs: Iterable[str],
+        separator: str = "\n\n"
+    ) -> Iterator[PatternMatch]:
+        """
+        Detect all pattern types paragraph by paragraph, in one pass each.
 
-        return matches
+        Matches are yielded as each paragraph is scanned, with offsets into
+        separator.join(paragraphs); matches never span paragraphs.
 
-    def detect_all(self, text: str) -> List[Dict[str, Any]]:
+        Args:
+            paragraphs: Paragraph texts (any iterable, consumed lazily)
+            separator: Text joining the paragraphs in the offset space
+
+        Yields:
+            Non-overlapping PatternMatch objects in document order
         """
-        Detect all supported patterns in text.
+        offset = 0
+        for paragraph in paragraphs:
+            for match in self._scanner.finditer(paragraph):
+                yield self._make_match(
+                    self._group_types[match.lastgroup],
+                    match.group(0),
+                    offset + match.start(),
+                    offset + match.end()
+                )
+            offset += len(paragraph) + len(separator)
+
+    def detect(self, text: str) -> List[PatternMatch]:
+        """
+        Detect all pattern types in text with a single scan.
 
         Args:
             text: Text to search
 
         Returns:
-            List of match dicts sorted by position
+            Non-overlapping PatternMatch objects sorted by position
         """
-        all_matches = []
+        return list(self.iter_detect([text]))
 
-        for pattern_type in self.patterns:
-            matches = self.detect_pattern(text, pattern_type)
-            all_matches.extend([m.to_dict() for m in matches])
-
-        # Sort by start position
-        all_matches.sort(key=lambda x: x['start'])
+    def detect_all(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Detect all supported patterns in text.
 
-        # Remove overlapping matches (keep first/longer)
-        filtered = []
-        last_end = -1
-        for match in all_matches:
-            if match['start'] >= last_end:
-                filtered.append(match)
-                last_end = match['end']
+        Args:
+            text: Text to search
 
-        return filtered
+        Returns:
+            List of match dicts sorted by position
+        """
+        return [match.to_dict() for match in self.detect(text)]
 
     def suggest_field_name(self, pattern_type: str, value: str) -> str:
         """
@@ -0,0 +1,427 @@
+"""
+PDF Converter Pool - DOCX → PDF on long-lived headless LibreOffice processes.
+
+`soffice --convert-to pdf` starts a full LibreOffice for every document
+(seconds of startup, hundreds of MB). ConverterPool instead keeps a few
+headless LibreOffice processes running and feeds them conversions through
+a request queue:
+
+    - one worker thread per converter process takes jobs from the queue
+    - converters start on first use and are recycled every
+      max_conversions documents (LibreOffice grows over time)
+    - idle converters are health-checked every health_check_interval
+      seconds; a watchdog kills conversions running past
+      conversion_timeout
+    - a failed conversion restarts its converter and is retried
+
+Converting a 5,000-document batch therefore starts `processes` LibreOffice
+instances (plus restarts), not 5,000.
+
+SofficeConverter talks to LibreOffice through its Python UNO bridge, which
+is an optional dependency (LibreOffice + python3-uno); it is only imported
+when a converter starts.
+
+Usage:
+    pool = ConverterPool(processes=2)
+    pool.convert("contrato.docx", "contrato.pdf")
+    pdf_bytes = pool.convert_bytes(docx_bytes)
+    pool.shutdown()
+"""
+
+import atexit
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Union
+from uuid import uuid4
+
+
+class PdfConversionError(RuntimeError):
+    """A document could not be converted to PDF."""
+
+
+class SofficeConverter:
+    """
+    One headless LibreOffice process, driven over a UNO pipe.
+
+    Each converter uses its own temporary user profile, so several can run
+    side by side.
+    """
+
+    def __init__(self, binary: Optional[str] = None, startup_timeout: float = 60.0):
+        """
+        Args:
+            binary: soffice executable (default: soffice/libreoffice on PATH)
+            startup_timeout: Seconds to wait for LibreOffice to accept connections
+        """
+        self.binary = binary or shutil.which("soffice") or shutil.which("libreoffice")
+        self.startup_timeout = startup_timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._profile_dir: Optional[str] = None
+        self._desktop = None
+
+    def start(self) -> None:
+        """Launch LibreOffice and connect to it."""
+        try:
+            import uno
+            from com.sun.star.connection import NoConnectException
+        except ImportError as e:
+            raise PdfConversionError(
+                "PDF output requires LibreOffice and its Python UNO bridge (python3-uno)"
+            ) from e
+        if not self.binary:
+            raise PdfConversionError("LibreOffice (soffice) not found on PATH")
+
+        pipe_name = f"doc_assembler_{uuid4().hex}"
+        self._profile_dir = tempfile.mkdtemp(prefix="soffice-profile-")
+        self._process = subprocess.Popen(
+            [
+                self.binary,
+                "--headless", "--invisible", "--nologo", "--nodefault",
+                "--norestore", "--nolockcheck",
+                f"-env:UserInstallation={Path(self._profile_dir).as_uri()}",
+                f"--accept=pipe,name={pipe_name};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            if self._process.poll() is not None:
+                self.stop()
+                raise PdfConversionError("LibreOffice exited during startup")
+            try:
+                context = resolver.resolve(
+                    f"uno:pipe,name={pipe_name};urp;StarOffice.ComponentContext"
+                )
+                break
+            except NoConnectException as e:
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise PdfConversionError("LibreOffice did not start in time") from e
+                time.sleep(0.25)
+
+        self._desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    @staticmethod
+    def _properties(**values):
+        import uno
+
+        properties = []
+        for name, value in values.items():
+            prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+            prop.Name = name
+            prop.Value = value
+            properties.append(prop)
+        return tuple(properties)
+
+    def convert(self, source: Path, target: Path) -> None:
+        """Convert source (.docx) to target (.pdf)."""
+        import uno
+
+        document = self._desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(Path(source).resolve())),
+            "_blank",
+            0,
+            self._properties(Hidden=True, ReadOnly=True),
+        )
+        if document is None:
+            raise PdfConversionError(f"LibreOffice could not open {source}")
+        try:
+            document.storeToURL(
+                uno.systemPathToFileUrl(str(Path(target).resolve())),
+                self._properties(FilterName="writer_pdf_Export"),
+            )
+        finally:
+            document.close(True)
+
+    def healthy(self) -> bool:
+        """Process alive and answering UNO calls."""
+        if self._process is None or self._process.poll() is not None:
+            return False
+        try:
+            self._desktop.getFrames()
+            return True
+        except Exception:
+            return False
+
+    def kill(self) -> None:
+        """Kill the process right away (unblocks a hung conversion)."""
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+
+    def stop(self) -> None:
+        """Shut LibreOffice down and remove its profile."""
+        if self._desktop is not None:
+            try:
+                self._desktop.terminate()
+            except Exception:
+                pass
+            self._desktop = None
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+            self._process = None
+        if self._profile_dir is not None:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+
+
+@dataclass
+class _Job:
+    future: Future
+    source: Optional[Path] = None       # File job: source and target paths
+    target: Optional[Path] = None
+    content: Optional[bytes] = None     # Bytes job: .docx content in, PDF bytes out
+
+
+@dataclass
+class _Slot:
+    """State of one worker thread, shared with the watchdog."""
+    converter: Optional[object] = None
+    busy_since: Optional[float] = None
+    timed_out: bool = False
+    thread: Optional[threading.Thread] = field(default=None, repr=False)
+
+
+class ConverterPool:
+    """
+    Pool of long-lived DOCX → PDF converters fed by a request queue.
+
+    Features:
+        - Bounded number of converter processes, started on demand
+        - Health checks of idle converters, watchdog for hung conversions
+        - Restart on failure (with retry) and periodic recycling
+
+    Converters are created by converter_factory and need start(),
+    convert(source, target), healthy(), kill() and stop().
+    """
+
+    def __init__(
+        self,
+        processes: int = 2,
+        converter_factory: Callable[[], object] = SofficeConverter,
+        max_conversions: int = 500,
+        conversion_timeout: float = 120.0,
+        health_check_interval: float = 30.0,
+        retries: int = 1,
+    ):
+        """
+        Initialize the pool (converters start on the first conversion).
+
+        Args:
+            processes: Converter processes (= concurrent conversions)
+            converter_factory: Creates a converter (default: SofficeConverter)
+            max_conversions: Conversions before a converter is recycled
+            conversion_timeout: Seconds before a conversion is killed
+            health_check_interval: Idle seconds between health checks
+            retries: Attempts on a fresh converter after a failure
+        """
+        self.size = max(1, processes)
+        self.converter_factory = converter_factory
+        self.max_conversions = max_conversions
+        self.conversion_timeout = conversion_timeout
+        self.health_check_interval = health_check_interval
+        self.retries = retries
+
+        self.starts = 0
+        self.restarts = 0
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._closed = False
+        self._stop_watchdog = threading.Event()
+        self._slots: List[_Slot] = [_Slot() for _ in range(self.size)]
+
+        for slot in self._slots:
+            slot.thread = threading.Thread(target=self._worker, args=(slot,), daemon=True)
+            slot.thread.start()
+        self._watchdog = threading.Thread(target=self._watch, daemon=True)
+        self._watchdog.start()
+
+    # === SUBMISSION ===
+
+    def _submit(self, job: _Job) -> Future:
+        if self._closed:
+            raise RuntimeError("ConverterPool is shut down")
+        self._queue.put(job)
+        return job.future
+
+    def submit(self, source: Union[str, Path], target: Union[str, Path]) -> Future:
+        """Queue a file conversion; the future resolves to the target Path."""
+        return self._submit(_Job(Future(), source=Path(source), target=Path(target)))
+
+    def submit_bytes(self, content: bytes) -> Future:
+        """Queue an in-memory conversion; the future resolves to PDF bytes."""
+        return self._submit(_Job(Future(), content=content))
+
+    def convert(
+        self,
+        source: Union[str, Path],
+        target: Union[str, Path],
+        timeout: Optional[float] = None
+    ) -> Path:
+        """
+        Convert a .docx file to PDF (blocks until done).
+
+        Raises:
+            PdfConversionError: If the conversion failed on every attempt
+        """
+        return self.submit(source, target).result(timeout)
+
+    def convert_bytes(self, content: bytes, timeout: Optional[float] = None) -> bytes:
+        """
+        Convert .docx bytes to PDF bytes (blocks until done).
+
+        Raises:
+            PdfConversionError: If the conversion failed on every attempt
+        """
+        return self.submit_bytes(content).result(timeout)
+
+    # === WORKERS ===
+
+    def _start_converter(self, slot: _Slot) -> None:
+        converter = self.converter_factory()
+        converter.start()
+        slot.converter = converter
+        self.starts += 1
+
+    def _discard_converter(self, slot: _Slot) -> None:
+        converter, slot.converter = slot.converter, None
+        if converter is not None:
+            try:
+                converter.stop()
+            except Exception:
+                converter.kill()
+
+    def _run_job(self, converter, job: _Job):
+        if job.content is None:
+            converter.convert(job.source, job.target)
+            return job.target
+
+        work_dir = Path(tempfile.mkdtemp(prefix="docx-pdf-"))
+        try:
+            source = work_dir / "document.docx"
+            target = work_dir / "document.pdf"
+            source.write_bytes(job.content)
+            converter.convert(source, target)
+            return target.read_bytes()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _worker(self, slot: _Slot) -> None:
+        conversions = 0
+        while True:
+            try:
+                job = self._queue.get(timeout=self.health_check_interval)
+            except queue.Empty:
+                if slot.converter is not None and not slot.converter.healthy():
+                    self._discard_converter(slot)
+                    self.restarts += 1
+                continue
+
+            if job is None:
+                break
+            if not job.future.set_running_or_notify_cancel():
+                continue
+
+            error: Optional[BaseException] = None
+            for _ in range(self.retries + 1):
+                try:
+                    if slot.converter is None:
+                        self._start_converter(slot)
+                        conversions = 0
+                    slot.busy_since = time.monotonic()
+                    result = self._run_job(slot.converter, job)
+                except Exception as e:
+                    error = e
+                    if slot.timed_out:
+                        error = PdfConversionError(
+                            f"Conversion timed out after {self.conversion_timeout}s"
+                        )
+                    if slot.converter is not None:
+                        self._discard_converter(slot)
+                        self.restarts += 1
+                else:
+                    conversions += 1
+                    job.future.set_result(result)
+                    error = None
+                    break
+                finally:
+                    slot.busy_since = None
+                    slot.timed_out = False
+
+            if error is not None:
+                if isinstance(error, PdfConversionError):
+                    job.future.set_exception(error)
+                else:
+                    job.future.set_exception(PdfConversionError(f"{type(error).__name__}: {error}"))
+
+            # Recycle long-running converters
+            if slot.converter is not None and conversions >= self.max_conversions:
+                self._discard_converter(slot)
+
+        self._discard_converter(slot)
+
+    def _watch(self) -> None:
+        """Kill converters whose current conversion exceeds conversion_timeout."""
+        interval = min(1.0, self.conversion_timeout / 4)
+        while not self._stop_watchdog.wait(interval):
+            now = time.monotonic()
+            for slot in self._slots:
+                busy_since = slot.busy_since
+                if busy_since is not None and now - busy_since > self.conversion_timeout:
+                    converter = slot.converter
+                    if converter is not None and not slot.timed_out:
+                        slot.timed_out = True
+                        converter.kill()
+
+    # === LIFECYCLE ===
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Finish queued conversions, then stop every converter."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._slots:
+            self._queue.put(None)
+        if wait:
+            for slot in self._slots:
+                slot.thread.join()
+        self._stop_watchdog.set()
+
+    def __enter__(self) -> "ConverterPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+
+_default_pool: Optional[ConverterPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_converter_pool() -> ConverterPool:
+    """Process-wide converter pool shared by DocumentEngine and BatchProcessor."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ConverterPool()
+            # Converters run in their own sessions; stop them with the process
+            atexit.register(_default_pool.shutdown)
+        return _default_pool
@@ -0,0 +1,225 @@
+"""
+Render Pool - run document rendering off an asyncio event loop.
+
+docxtpl rendering is CPU-bound; called from an ``async def`` handler it
+blocks the event loop and every concurrent request queues behind it.
+RenderPool runs renders on a process pool (one warm DocumentEngine and
+compiled-template cache per worker process) and exposes awaitable methods.
+
+Usage:
+    pool = RenderPool(max_workers=2)
+    content = await pool.render_bytes(template_path, data)
+    async for result in pool.iter_render_records(records, template_path):
+        ...
+    pool.shutdown()
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+from .batch_engine import BatchRecord, _get_worker_engine, _render_document_bytes
+
+
+# === WORKER FUNCTIONS (module level so they can be pickled) ===
+
+def _render_file(
+    template_path: Path,
+    data: Dict[str, Any],
+    output_path: Path,
+    field_types: Optional[Dict[str, str]],
+    auto_normalize: bool
+) -> Path:
+    return _get_worker_engine(auto_normalize).render(
+        template_path=template_path,
+        data=data,
+        output_path=output_path,
+        field_types=field_types
+    )
+
+
+def _render_bytes(
+    template_path: Path,
+    data: Dict[str, Any],
+    field_types: Optional[Dict[str, str]],
+    auto_normalize: bool
+) -> bytes:
+    return _get_worker_engine(auto_normalize).render_to_bytes(
+        template_path=template_path,
+        data=data,
+        field_types=field_types
+    )
+
+
+def _extract_text(
+    template_path: Path,
+    data: Dict[str, Any],
+    field_types: Optional[Dict[str, str]],
+    auto_normalize: bool
+) -> Dict[str, Any]:
+    return _get_worker_engine(auto_normalize).extract_rendered_text(
+        template_path=template_path,
+        data=data,
+        field_types=field_types
+    )
+
+
+class RenderPool:
+    """
+    Process pool for rendering documents from async code.
+
+    Features:
+        - Awaitable single-document render/preview
+        - Bounded, unordered streaming of batch results
+        - Worker processes keep their engine and compiled templates
+        - A crashed worker (BrokenProcessPool) rebuilds the pool; the
+          affected renders are retried once
+    """
+
+    def __init__(self, max_workers: int = 2, start_method: str = "spawn"):
+        """
+        Initialize the pool (processes start on first use).
+
+        Args:
+            max_workers: Number of render processes
+            start_method: multiprocessing start method ("spawn" is safe in
+                threaded servers)
+        """
+        self.max_workers = max(1, max_workers)
+        self.start_method = start_method
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method)
+        )
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a broken executor (once, however many callers saw it break)."""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = self._new_executor()
+            self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            return await loop.run_in_executor(executor, partial(fn, *args))
+        except BrokenProcessPool:
+            self._restart(executor)
+            return await loop.run_in_executor(self._executor, partial(fn, *args))
+
+    async def render_file(
+        self,
+        template_path: Path,
+        data: Dict[str, Any],
+        output_path: Path,
+        field_types: Optional[Dict[str, str]] = None,
+        auto_normalize: bool = True
+    ) -> Path:
+        """Render a document to output_path (see DocumentEngine.render)."""
+        return await self._run(_render_file, template_path, data, output_path, field_types, auto_normalize)
+
+    async def render_bytes(
+        self,
+        template_path: Path,
+        data: Dict[str, Any],
+        field_types: Optional[Dict[str, str]] = None,
+        auto_normalize: bool = True
+    ) -> bytes:
+        """Render a document in memory (see DocumentEngine.render_to_bytes)."""
+        return await self._run(_render_bytes, template_path, data, field_types, auto_normalize)
+
+    async def extract_text(
+        self,
+        template_path: Path,
+        data: Dict[str, Any],
+        field_types: Optional[Dict[str, str]] = None,
+        auto_normalize: bool = True
+    ) -> Dict[str, Any]:
+        """Rendered text preview (see DocumentEngine.extract_rendered_text)."""
+        return await self._run(_extract_text, template_path, data, field_types, auto_normalize)
+
+    async def iter_render_records(
+        self,
+        records: Iterable[BatchRecord],
+        template_path: Path,
+        name_field: Optional[str] = None,
+        field_types: Optional[Dict[str, str]] = None,
+        auto_normalize: bool = True,
+        max_pending: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Render records to bytes, yielding results as they complete.
+
+        At most max_pending renders are queued at once (default: 2 per
+        worker) so a large batch does not pickle every record up front.
+
+        Yields:
+            Result dicts from the batch worker ('status', 'json_file',
+            'filename_base', 'content' or error fields)
+        """
+        loop = asyncio.get_running_loop()
+        worker_fn = partial(
+            _render_document_bytes,
+            template_path=template_path,
+            auto_normalize=auto_normalize,
+            name_field=name_field,
+            field_types=field_types
+        )
+        max_pending = max_pending or self.max_workers * 2
+        tasks = iter(enumerate(records))
+        # future -> (task, executor it ran on, retried already)
+        pending: Dict[asyncio.Future, tuple] = {}
+
+        def submit(task, retried: bool = False) -> None:
+            executor = self._executor
+            try:
+                future = loop.run_in_executor(executor, worker_fn, task)
+            except BrokenProcessPool:
+                self._restart(executor)
+                executor = self._executor
+                future = loop.run_in_executor(executor, worker_fn, task)
+            pending[future] = (task, executor, retried)
+
+        def submit_next() -> bool:
+            task = next(tasks, None)
+            if task is None:
+                return False
+            submit(task)
+            return True
+
+        while len(pending) < max_pending and submit_next():
+            pass
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                task, executor, retried = pending.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    if retried:
+                        raise
+                    self._restart(executor)
+                    submit(task, retried=True)
+                    continue
+                submit_next()
+                yield result
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor = self._executor
+        executor.shutdown(wait=wait, cancel_futures=True)
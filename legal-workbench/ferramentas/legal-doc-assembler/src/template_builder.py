@@ -16,7 +16,9 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from docx import Document
+from docx.document import Document as DocumentObject
 
+from .annotation_engine import AnnotationEngine
 from .docx_parser import DocxParser
 from .pattern_detector import PatternDetector
 
@@ -55,17 +57,21 @@ class TemplateBuilder:
     - Save template with metadata
     """
 
-    def __init__(self, source_path: str | Path):
+    def __init__(self, source_path: str | Path, document: Optional[DocumentObject] = None):
         """
         Initialize builder with source DOCX.
 
         Args:
             source_path: Path to source DOCX file
+            document: Already loaded Document for source_path (skips parsing
+                for preview; it is never modified)
         """
         self.source_path = Path(source_path)
-        self.parser = DocxParser(source_path)
+        self.parser = DocxParser(source_path, document=document)
         self.detector = PatternDetector()
-        self.document = Document(str(source_path))
+        # Working copy that receives the replacements, loaded on first use so
+        # the parser (preview, structure) keeps reading the original
+        self._document: Optional[DocumentObject] = None
 
         # Track replacements
         self.replacements: List[FieldReplacement] = []
@@ -74,6 +80,13 @@ class TemplateBuilder:
         self._original_text = self.parser.get_full_text()
         self._modified_text = self._original_text
 
+    @property
+    def document(self) -> DocumentObject:
+        """Document the replacements are applied to (separate from the parser's)."""
+        if self._document is None:
+            self._document = Document(str(self.source_path))
+        return self._document
+
     def get_full_text(self) -> str:
         """Get full document text for preview."""
         return self._original_text
@@ -245,25 +258,8 @@ class TemplateBuilder:
             }
 
     def _apply_replacements_to_document(self) -> None:
-        """Apply all replacements to the actual DOCX document."""
-        for para in self.document.paragraphs:
-            for replacement in self.replacements:
-                if replacement.original_text in para.text:
-                    # Replace in each run
-                    for run in para.runs:
-                        if replacement.original_text in run.text:
-                            run.text = run.text.replace(
-                                replacement.original_text,
-                                replacement.jinja_template
-                            )
-                    # Handle text split across runs
-                    if replacement.original_text in para.text:
-                        full_text = para.text.replace(
-                            replacement.original_text,
-                            replacement.jinja_template
-                        )
-                        # Clear existing runs and add new
-                        for run in para.runs:
-                            run.text = ""
-                        if para.runs:
-                            para.runs[0].text = full_text
+        """Apply all replacements to the actual DOCX document (run-aware, one pass)."""
+        replacements: Dict[str, str] = {}
+        for replacement in self.replacements:
+            replacements.setdefault(replacement.original_text, replacement.jinja_template)
+        AnnotationEngine(replacements).apply_to_document(self.document)
@@ -0,0 +1,226 @@
+"""
+Template Cache - Parse-once, render-many for .docx templates.
+
+Building a DocxTemplate for every render unzips the .docx, serializes
+document.xml, runs docxtpl's regex preprocessing (patch_xml) and compiles the
+result with Jinja before any data is applied. For batch stamping from one
+template that work is identical on every call.
+
+TemplateCache keeps, per template file:
+    - the raw .docx bytes (each render parses its own in-memory clone)
+    - the patched, compiled Jinja templates for body, headers and footers
+    - the undeclared template variables
+
+Entries are keyed by (resolved path, mtime, size) and the Jinja environment,
+so editing the template invalidates it; the least recently used entry is
+evicted when the cache is full.
+"""
+
+import io
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+import jinja2
+from jinja2 import meta
+from docxtpl import DocxTemplate
+
+DEFAULT_CACHE_SIZE = 32
+
+# Same paragraph split docxtpl applies before compiling (render_xml_part)
+_PARAGRAPH_RE = re.compile(r"<w:p([ >])")
+_PARAGRAPH_RESTORE_RE = re.compile(r"\n<w:p([ >])")
+
+
+@dataclass
+class CompiledTemplate:
+    """Pre-processed template: compiled XML parts plus the source bytes."""
+
+    path: Path
+    key: Tuple[str, int, int]
+    data: bytes
+    jinja_env: jinja2.Environment
+    body: jinja2.Template
+    # relKey -> (compiled template, encoding)
+    headers: Dict[str, Tuple[jinja2.Template, str]] = field(default_factory=dict)
+    footers: Dict[str, Tuple[jinja2.Template, str]] = field(default_factory=dict)
+    variables: Set[str] = field(default_factory=set)
+
+    def new_document(self) -> "CachedDocxTemplate":
+        """Fresh, independent document to render into."""
+        return CachedDocxTemplate(self)
+
+
+class CachedDocxTemplate(DocxTemplate):
+    """DocxTemplate that renders from pre-compiled XML parts."""
+
+    def __init__(self, compiled: CompiledTemplate):
+        super().__init__(io.BytesIO(compiled.data))
+        self.compiled = compiled
+
+    def build_xml(self, context, jinja_env=None):
+        return self._render_compiled(self.compiled.body, self.docx._part, context)
+
+    def build_headers_footers_xml(self, context, uri, jinja_env=None):
+        parts = self.compiled.headers if uri == self.HEADER_URI else self.compiled.footers
+        for relKey, part in self.get_headers_footers(uri):
+            template, encoding = parts[relKey]
+            xml = self._render_compiled(template, part, context)
+            yield relKey, xml.encode(encoding)
+
+    def _render_compiled(self, template: jinja2.Template, part, context) -> str:
+        # Post-processing from DocxTemplate.render_xml_part
+        self.current_rendering_part = part
+        dst_xml = template.render(context)
+        dst_xml = _PARAGRAPH_RESTORE_RE.sub(r"<w:p\1", dst_xml)
+        dst_xml = (
+            dst_xml.replace("{_{", "{{")
+            .replace("}_}", "}}")
+            .replace("{_%", "{%")
+            .replace("%_}", "%}")
+        )
+        return self.resolve_listing(dst_xml)
+
+
+def _file_key(path: Path) -> Tuple[str, int, int]:
+    stat = path.stat()
+    return (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def compile_template(path: str | Path, jinja_env: jinja2.Environment) -> CompiledTemplate:
+    """
+    Parse and compile a .docx template.
+
+    Raises:
+        FileNotFoundError: If template doesn't exist
+        jinja2.TemplateSyntaxError: If the template has invalid Jinja syntax
+    """
+    path = Path(path)
+    key = _file_key(path)
+    data = path.read_bytes()
+
+    tpl = DocxTemplate(io.BytesIO(data))
+    tpl.init_docx()
+
+    def prepare(xml: str) -> str:
+        return _PARAGRAPH_RE.sub(r"\n<w:p\1", tpl.patch_xml(xml))
+
+    sources = [prepare(tpl.get_xml())]
+    body = jinja_env.from_string(sources[0])
+
+    parts: Dict[str, Dict[str, Tuple[jinja2.Template, str]]] = {}
+    for uri in (tpl.HEADER_URI, tpl.FOOTER_URI):
+        compiled_parts = parts.setdefault(uri, {})
+        for relKey, part in tpl.get_headers_footers(uri):
+            xml = tpl.get_part_xml(part)
+            encoding = tpl.get_headers_footers_encoding(xml)
+            source = prepare(xml)
+            sources.append(source)
+            compiled_parts[relKey] = (jinja_env.from_string(source), encoding)
+
+    variables: Set[str] = set()
+    for source in sources:
+        variables |= meta.find_undeclared_variables(jinja_env.parse(source))
+
+    return CompiledTemplate(
+        path=path,
+        key=key,
+        data=data,
+        jinja_env=jinja_env,
+        body=body,
+        headers=parts[tpl.HEADER_URI],
+        footers=parts[tpl.FOOTER_URI],
+        variables=variables,
+    )
+
+
+class TemplateCache:
+    """
+    Thread-safe LRU cache of compiled templates.
+
+    Usage:
+        cache = TemplateCache(maxsize=16)
+        doc = cache.get(template_path, jinja_env).new_document()
+        doc.render(data, jinja_env)
+        doc.save(output_path)
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of compiled templates kept in memory
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[Any, ...], CompiledTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str | Path, jinja_env: jinja2.Environment) -> CompiledTemplate:
+        """
+        Return the compiled template, compiling it on a miss or after the file changed.
+
+        Raises:
+            FileNotFoundError: If template doesn't exist
+        """
+        path = Path(path)
+        file_key = _file_key(path)
+        key = (file_key[0], id(jinja_env))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.key == file_key and entry.jinja_env is jinja_env:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        compiled = compile_template(path, jinja_env)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def invalidate(self, path: Optional[str | Path] = None) -> None:
+        """Drop one template (all Jinja environments) or the whole cache."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            resolved = str(Path(path).resolve())
+            for key in [k for k in self._entries if k[0] == resolved]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache: Optional[TemplateCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_template_cache() -> TemplateCache:
+    """Process-wide template cache shared by DocumentEngine instances."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TemplateCache()
+        return _default_cache
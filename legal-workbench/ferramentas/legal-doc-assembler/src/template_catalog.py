@@ -0,0 +1,368 @@
+"""
+Template Catalog - in-memory index of the templates in a directory.
+
+Listing a templates directory used to glob the disk and json.load every
+metadata file on every call. TemplateCatalog keeps the parsed entries in
+memory and refreshes them by mtime diff:
+
+    - every call stats the indexed directories (one stat per directory);
+      only a changed directory mtime triggers a rescan
+    - a rescan stats the files and re-reads only new or changed ones
+    - a full rescan also runs every rescan_interval seconds, to catch
+      files edited in place (which do not touch the directory mtime)
+
+Search uses a tag index and a trigram index over name, description and
+tags (case- and accent-insensitive substring search), so listing and
+search cost O(results) instead of O(files on disk).
+
+Usage:
+    catalog = TemplateCatalog("templates/", sort_key=lambda e: e.created_at, reverse=True)
+    catalog.entries()
+    catalog.search("locação", tags=["contrato"])
+"""
+
+import json
+import os
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Directory mtimes this close to the scan time are not trusted: a file
+# created in the same timestamp tick would not change the mtime again
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def fold_text(text: str) -> str:
+    """Lowercase and strip accents ("Locação" → "locacao") for search."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+@dataclass
+class CatalogEntry:
+    """One indexed template."""
+
+    key: str                        # Relative path without suffix ("sub/peticao")
+    docx_path: Path
+    meta_path: Optional[Path]
+    metadata: Dict[str, Any]
+    size_bytes: int
+    mtime_ns: int
+    search_fields: Tuple[str, ...] = field(default=(), repr=False)
+
+    @property
+    def name(self) -> str:
+        return self.metadata.get('name') or self.docx_path.stem
+
+    @property
+    def description(self) -> str:
+        return self.metadata.get('description') or ''
+
+    @property
+    def tags(self) -> List[str]:
+        return list(self.metadata.get('tags') or [])
+
+    @property
+    def created_at(self) -> str:
+        return self.metadata.get('created_at') or ''
+
+
+class TemplateCatalog:
+    """
+    Indexed, self-refreshing catalog of a templates directory.
+
+    Features:
+        - mtime-diff refresh (unchanged files are never re-read)
+        - Tag index and trigram full-text index
+        - Cached sort order; listing returns entries without touching disk
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        with_metadata: bool = True,
+        require_docx: bool = True,
+        recursive: bool = False,
+        sort_key: Optional[Callable[[CatalogEntry], Any]] = None,
+        reverse: bool = False,
+        rescan_interval: float = 30.0,
+    ):
+        """
+        Initialize the catalog (the directory is scanned on first use).
+
+        Args:
+            root: Templates directory
+            with_metadata: Index {name}.json metadata files; if False, index
+                .docx files directly (metadata is empty)
+            require_docx: With metadata, skip entries without {name}.docx
+            recursive: Include subdirectories
+            sort_key: Order of entries() and search() (default: by key)
+            reverse: Reverse the sort order
+            rescan_interval: Seconds between full rescans (in-place edits)
+        """
+        self.root = Path(root)
+        self.with_metadata = with_metadata
+        self.require_docx = require_docx
+        self.recursive = recursive
+        self.sort_key = sort_key or (lambda entry: entry.key)
+        self.reverse = reverse
+        self.rescan_interval = rescan_interval
+
+        self._lock = threading.RLock()
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._files: Dict[str, Tuple[int, int]] = {}  # rel path -> (mtime_ns, size)
+        self._dir_mtimes: Dict[str, int] = {}
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._by_trigram: Dict[str, Set[str]] = {}
+        self._ordered: Optional[List[CatalogEntry]] = None
+        self._rank: Dict[str, int] = {}
+        self._last_scan = 0.0
+        self._racy = True
+        self.scans = 0
+
+    # === REFRESH ===
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Bring the index up to date with the directory.
+
+        Args:
+            force: Rescan even if no directory changed
+
+        Returns:
+            True if a rescan ran
+        """
+        with self._lock:
+            if not force and not self._needs_scan():
+                return False
+            self._scan()
+            return True
+
+    def _needs_scan(self) -> bool:
+        if self._racy or time.monotonic() - self._last_scan >= self.rescan_interval:
+            return True
+        for rel_dir, mtime_ns in self._dir_mtimes.items():
+            try:
+                if os.stat(self.root / rel_dir).st_mtime_ns != mtime_ns:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _scan(self) -> None:
+        files: Dict[str, Tuple[int, int]] = {}
+        dir_mtimes: Dict[str, int] = {}
+        suffixes = ('.json', '.docx') if self.with_metadata else ('.docx',)
+
+        pending = ['']
+        while pending:
+            rel_dir = pending.pop()
+            directory = self.root / rel_dir
+            try:
+                dir_mtimes[rel_dir] = os.stat(directory).st_mtime_ns
+                with os.scandir(directory) as it:
+                    for item in it:
+                        rel = f"{rel_dir}/{item.name}" if rel_dir else item.name
+                        if item.is_dir(follow_symlinks=False):
+                            if self.recursive:
+                                pending.append(rel)
+                        elif item.name.endswith(suffixes) and not item.name.startswith('~$'):
+                            stat = item.stat()
+                            files[rel] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+
+        # Keys whose files were added, removed or modified
+        changed = {
+            self._key(rel)
+            for rel in files.keys() | self._files.keys()
+            if files.get(rel) != self._files.get(rel)
+        }
+        for key in changed:
+            self._load(key, files)
+
+        now_ns = time.time_ns()
+        self._files = files
+        self._dir_mtimes = dir_mtimes
+        self._racy = any(now_ns - mtime < RACY_WINDOW_NS for mtime in dir_mtimes.values())
+        self._last_scan = time.monotonic()
+        self.scans += 1
+
+    @staticmethod
+    def _key(rel_path: str) -> str:
+        return rel_path.rsplit('.', 1)[0]
+
+    def _load(self, key: str, files: Dict[str, Tuple[int, int]]) -> None:
+        """(Re)build the entry for key from the scanned file table."""
+        self._remove(key)
+
+        docx_rel = f"{key}.docx"
+        docx_stat = files.get(docx_rel)
+
+        if self.with_metadata:
+            meta_rel = f"{key}.json"
+            if meta_rel not in files or (self.require_docx and docx_stat is None):
+                return
+            meta_path = self.root / meta_rel
+            try:
+                with open(meta_path, encoding='utf-8') as f:
+                    metadata = json.load(f)
+            except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+                return
+            if not isinstance(metadata, dict):
+                return
+        else:
+            if docx_stat is None:
+                return
+            meta_path = None
+            metadata = {}
+
+        mtime_ns, size = docx_stat or files[f"{key}.json"]
+        entry = CatalogEntry(
+            key=key,
+            docx_path=self.root / docx_rel,
+            meta_path=meta_path,
+            metadata=metadata,
+            size_bytes=size if docx_stat else 0,
+            mtime_ns=mtime_ns,
+        )
+        self._add(entry)
+
+    def _add(self, entry: CatalogEntry) -> None:
+        tags = [tag for tag in entry.tags if isinstance(tag, str)]
+        entry.search_fields = tuple(
+            fold_text(text) for text in [str(entry.name), str(entry.description), *tags]
+        )
+        self._entries[entry.key] = entry
+
+        for tag in tags:
+            self._by_tag.setdefault(tag, set()).add(entry.key)
+        for gram in set().union(*(_trigrams(text) for text in entry.search_fields)):
+            self._by_trigram.setdefault(gram, set()).add(entry.key)
+        self._ordered = None
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            if not isinstance(tag, str):
+                continue
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+        for gram in set().union(*(_trigrams(text) for text in entry.search_fields)):
+            keys = self._by_trigram.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_trigram[gram]
+        self._ordered = None
+
+    def discard(self, key: str) -> None:
+        """Drop an entry right away (e.g. after deleting its files)."""
+        with self._lock:
+            self._remove(key)
+            for suffix in ('.json', '.docx'):
+                self._files.pop(f"{key}{suffix}", None)
+
+    def reload(self, key: str) -> Optional[CatalogEntry]:
+        """Re-read one entry right away (e.g. after saving its files)."""
+        with self._lock:
+            for suffix in ('.json', '.docx'):
+                rel = f"{key}{suffix}"
+                try:
+                    stat = os.stat(self.root / rel)
+                    self._files[rel] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    self._files.pop(rel, None)
+            self._load(key, self._files)
+            return self._entries.get(key)
+
+    # === QUERIES ===
+
+    def _order(self) -> List[CatalogEntry]:
+        if self._ordered is None:
+            self._ordered = sorted(self._entries.values(), key=self.sort_key, reverse=self.reverse)
+            self._rank = {entry.key: i for i, entry in enumerate(self._ordered)}
+        return self._ordered
+
+    def entries(self) -> List[CatalogEntry]:
+        """All entries, in catalog order."""
+        with self._lock:
+            self.refresh()
+            return list(self._order())
+
+    def get(self, key: str) -> Optional[CatalogEntry]:
+        """Entry by key (relative path without suffix), or None."""
+        with self._lock:
+            self.refresh()
+            return self._entries.get(key)
+
+    def search(
+        self,
+        query: str = '',
+        tags: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[CatalogEntry]:
+        """
+        Search entries by name, description or tags.
+
+        Args:
+            query: Substring to find (case- and accent-insensitive); empty
+                matches everything
+            tags: Keep only entries with at least one of these tags
+            limit: Maximum number of results
+
+        Returns:
+            Matching entries, in catalog order
+        """
+        with self._lock:
+            self.refresh()
+            self._order()
+
+            candidates: Optional[Set[str]] = None
+            if tags:
+                candidates = set().union(*(self._by_tag.get(tag, set()) for tag in tags))
+
+            needle = fold_text(query)
+            if len(needle) >= 3:
+                for gram in sorted(_trigrams(needle), key=lambda g: len(self._by_trigram.get(g, ()))):
+                    keys = self._by_trigram.get(gram, set())
+                    candidates = keys if candidates is None else candidates & keys
+                    if not candidates:
+                        return []
+
+            if candidates is None:
+                pool = self._ordered
+            else:
+                pool = sorted((self._entries[key] for key in candidates), key=lambda e: self._rank[e.key])
+
+            results = []
+            for entry in pool:
+                if needle and not any(needle in text for text in entry.search_fields):
+                    continue
+                results.append(entry)
+                if limit is not None and len(results) >= limit:
+                    break
+            return results
+
+    def tags(self) -> List[str]:
+        """All tags in the catalog, sorted."""
+        with self._lock:
+            self.refresh()
+            return sorted(self._by_tag)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.refresh()
+            return len(self._entries)
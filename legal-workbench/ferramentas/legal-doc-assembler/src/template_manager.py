@@ -2,10 +2,11 @@
 Template Manager for listing, searching, and managing saved templates.
 """
 
-import json
+import copy
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+
+from .template_catalog import CatalogEntry, TemplateCatalog
 
 
 class TemplateManager:
@@ -15,6 +16,9 @@ class TemplateManager:
     Templates consist of:
     - {name}.docx: The template file with Jinja2 variables
     - {name}.json: Metadata (fields, description, tags, etc.)
+
+    Metadata is served from an in-memory TemplateCatalog that only re-reads
+    files that changed on disk.
     """
 
     def __init__(self, templates_dir: str | Path):
@@ -26,6 +30,19 @@ class TemplateManager:
         """
         self.templates_dir = Path(templates_dir)
         self.templates_dir.mkdir(parents=True, exist_ok=True)
+        self.catalog = TemplateCatalog(
+            self.templates_dir,
+            sort_key=lambda entry: entry.created_at,
+            reverse=True,  # Newest first
+        )
+
+    @staticmethod
+    def _to_dict(entry: CatalogEntry) -> Dict[str, Any]:
+        """Deep copy of the entry's metadata with file paths (safe to modify)."""
+        meta = copy.deepcopy(entry.metadata)
+        meta['docx_path'] = str(entry.docx_path)
+        meta['meta_path'] = str(entry.meta_path)
+        return meta
 
     def list_templates(self) -> List[Dict[str, Any]]:
         """
@@ -34,30 +51,7 @@ class TemplateManager:
         Returns:
             List of template metadata dicts, sorted by creation date (newest first)
         """
-        templates = []
-
-        for meta_path in self.templates_dir.glob('*.json'):
-            try:
-                with open(meta_path, encoding='utf-8') as f:
-                    meta = json.load(f)
-
-                # Check if DOCX exists
-                docx_path = meta_path.with_suffix('.docx')
-                if docx_path.exists():
-                    meta['docx_path'] = str(docx_path)
-                    meta['meta_path'] = str(meta_path)
-                    templates.append(meta)
-
-            except (json.JSONDecodeError, KeyError):
-                continue
-
-        # Sort by creation date (newest first)
-        templates.sort(
-            key=lambda t: t.get('created_at', ''),
-            reverse=True
-        )
-
-        return templates
+        return [self._to_dict(entry) for entry in self.catalog.entries()]
 
     def get_template(self, safe_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -69,20 +63,8 @@ class TemplateManager:
         Returns:
             Template metadata dict or None if not found
         """
-        meta_path = self.templates_dir / f"{safe_name}.json"
-        docx_path = self.templates_dir / f"{safe_name}.docx"
-
-        if not meta_path.exists() or not docx_path.exists():
-            return None
-
-        try:
-            with open(meta_path, encoding='utf-8') as f:
-                meta = json.load(f)
-            meta['docx_path'] = str(docx_path)
-            meta['meta_path'] = str(meta_path)
-            return meta
-        except (json.JSONDecodeError, KeyError):
-            return None
+        entry = self.catalog.get(safe_name)
+        return self._to_dict(entry) if entry is not None else None
 
     def search(
         self,
@@ -93,33 +75,13 @@ class TemplateManager:
         Search templates by name, description, or tags.
 
         Args:
-            query: Search query (case-insensitive)
+            query: Search query (case- and accent-insensitive)
             tags: Optional list of tags to filter by
 
         Returns:
             List of matching template metadata dicts
         """
-        query_lower = query.lower()
-        results = []
-
-        for template in self.list_templates():
-            # Search in name and description
-            name_match = query_lower in template.get('name', '').lower()
-            desc_match = query_lower in template.get('description', '').lower()
-            tag_match = any(
-                query_lower in tag.lower()
-                for tag in template.get('tags', [])
-            )
-
-            if name_match or desc_match or tag_match:
-                # Additional tag filter if specified
-                if tags:
-                    template_tags = set(template.get('tags', []))
-                    if not set(tags).intersection(template_tags):
-                        continue
-                results.append(template)
-
-        return results
+        return [self._to_dict(entry) for entry in self.catalog.search(query, tags=tags)]
 
     def delete_template(self, safe_name: str) -> bool:
         """
@@ -144,6 +106,8 @@ class TemplateManager:
             docx_path.unlink()
             deleted = True
 
+        self.catalog.discard(safe_name)
+
         return deleted
 
     def get_all_tags(self) -> List[str]:
@@ -153,10 +117,7 @@ class TemplateManager:
         Returns:
             Sorted list of unique tags
         """
-        tags = set()
-        for template in self.list_templates():
-            tags.update(template.get('tags', []))
-        return sorted(tags)
+        return self.catalog.tags()
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -165,16 +126,16 @@ class TemplateManager:
         Returns:
             Dict with counts and stats
         """
-        templates = self.list_templates()
+        entries = self.catalog.entries()
 
         total_fields = sum(
-            len(t.get('fields', []))
-            for t in templates
+            len(entry.metadata.get('fields', []))
+            for entry in entries
         )
 
         return {
-            'total_templates': len(templates),
+            'total_templates': len(entries),
             'total_fields': total_fields,
-            'tags': self.get_all_tags(),
-            'most_recent': templates[0]['name'] if templates else None
+            'tags': self.catalog.tags(),
+            'most_recent': entries[0].metadata['name'] if entries else None
         }
@@ -0,0 +1,66 @@
+# tests/test_annotation_engine.py
+"""Tests for the run-aware annotation engine."""
+import re
+import random
+
+from docx import Document
+
+from src.annotation_engine import AhoCorasick, AnnotationEngine
+
+
+def test_aho_corasick_matches_regex_oracle():
+    """All occurrences (overlaps included) match a regex lookahead scan."""
+    rng = random.Random(0)
+    for _ in range(500):
+        patterns = ["".join(rng.choice("ab c") for _ in range(rng.randint(1, 4))) for _ in range(5)]
+        text = "".join(rng.choice("ab c") for _ in range(40))
+        automaton = AhoCorasick(patterns)
+
+        expected = sorted(
+            (m.start(), m.start() + len(p), i)
+            for i, p in enumerate(automaton.patterns)
+            for m in re.finditer(f"(?={re.escape(p)})", text)
+        )
+        assert sorted(automaton.iter_matches(text)) == expected
+
+
+def test_leftmost_longest_non_overlapping():
+    automaton = AhoCorasick(["Silva", "João da Silva", "da"])
+    matches = automaton.find("Sr. João da Silva e Maria da Silva")
+    found = [automaton.patterns[i] for _, _, i in matches]
+    assert found == ["João da Silva", "da", "Silva"]
+
+
+def test_replacement_across_runs_keeps_formatting():
+    """Text split across runs is replaced without collapsing the paragraph."""
+    doc = Document()
+    para = doc.add_paragraph()
+    para.add_run("Cliente: ")
+    bold = para.add_run("João ")
+    bold.bold = True
+    para.add_run("da Silva")
+    tail = para.add_run(", CPF 123.456.789-01")
+    tail.italic = True
+
+    stats = AnnotationEngine({
+        "João da Silva": "{{ nome }}",
+        "123.456.789-01": "{{ cpf }}",
+    }).apply_to_document(doc)
+
+    assert para.text == "Cliente: {{ nome }}, CPF {{ cpf }}"
+    assert [r.text for r in para.runs] == ["Cliente: ", "{{ nome }}", "", ", CPF {{ cpf }}"]
+    assert para.runs[1].bold and para.runs[3].italic
+    assert stats.replacements == 2
+    assert stats.runs_rewritten == 3
+
+
+def test_untouched_paragraphs_and_tables():
+    doc = Document()
+    doc.add_paragraph("Sem campos aqui")
+    cell_para = doc.add_table(rows=1, cols=1).cell(0, 0).paragraphs[0]
+    cell_para.text = "Autor: Maria"
+
+    engine = AnnotationEngine({"Maria": "{{ autor }}"})
+    assert engine.apply_to_document(doc).replacements == 0
+    assert engine.apply_to_document(doc, include_tables=True).counts == {"Maria": 1}
+    assert cell_para.text == "Autor: {{ autor }}"
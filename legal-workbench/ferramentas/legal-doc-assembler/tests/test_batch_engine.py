@@ -104,3 +104,189 @@ def test_batch_processing_with_errors(sample_json_files, sample_template, tmp_pa
         assert results['failed'] == 1
         assert len(results['errors']) == 1
         assert results['errors'][0]['error_type'] == 'JSONDecodeError'
+
+def test_batch_resume_from_journal(sample_json_files, tmp_path):
+    """Retoma a partir do journal: só renderiza o que falta e o ZIP inclui tudo."""
+    from docx import Document
+    import zipfile
+
+    template_path = tmp_path / "real_template.docx"
+    doc = Document()
+    doc.add_paragraph("Nome: {{ nome }}")
+    doc.save(template_path)
+
+    extra = tmp_path / "card3.json"
+    extra.write_text(json.dumps({"nome": "Ana Souza"}), encoding='utf-8')
+    files = sample_json_files + [extra]
+
+    output_dir = tmp_path / "output_resume"
+    output_dir.mkdir()
+    previous_output = output_dir / "Joao_Silva.docx"
+    shutil.copy(template_path, previous_output)
+    journal = output_dir / ".checkpoint.jsonl"
+    journal.write_text(
+        json.dumps({"json_file": str(files[0]), "output_path": str(previous_output)})
+        + "\n" + '{"json_file": "torn',
+        encoding='utf-8'
+    )
+
+    processor = BatchProcessor(max_workers=2, checkpoint_enabled=True)
+    results = processor.process_batch(
+        json_files=files,
+        template_path=template_path,
+        output_dir=output_dir,
+        create_zip=True,
+        zip_name="lote.zip"
+    )
+
+    assert results['skipped'] == 1
+    assert results['success'] == 2
+    assert not journal.exists()
+    with zipfile.ZipFile(results['zip_path']) as zf:
+        assert sorted(zf.namelist()) == ["Ana_Souza.docx", "Joao_Silva.docx", "Maria_Santos.docx"]
+
+
+def test_batch_resume_removes_stale_reservations(sample_json_files, tmp_path):
+    """Retomada: .docx vazios reservados por um run morto não viram "<nome>_1.docx"."""
+    template_path = _real_template(tmp_path)
+    output_dir = tmp_path / "output_killed"
+    output_dir.mkdir()
+    previous_output = output_dir / "Joao_Silva.docx"
+    shutil.copy(template_path, previous_output)
+    stale = output_dir / "Maria_Santos.docx"
+    stale.touch()
+    (output_dir / ".checkpoint.jsonl").write_text(
+        json.dumps({"json_file": str(sample_json_files[0]), "output_path": str(previous_output)}) + "\n",
+        encoding='utf-8'
+    )
+
+    processor = BatchProcessor(max_workers=1, checkpoint_enabled=True)
+    results = processor.process_batch(
+        json_files=sample_json_files,
+        template_path=template_path,
+        output_dir=output_dir,
+        create_zip=False
+    )
+
+    assert results['success'] == 1
+    assert [Path(p).name for p in results['outputs']] == ["Maria_Santos.docx"]
+    assert stale.stat().st_size > 0
+    assert sorted(p.name for p in output_dir.glob("*.docx")) == ["Joao_Silva.docx", "Maria_Santos.docx"]
+
+
+def _real_template(tmp_path):
+    from docx import Document
+
+    template_path = tmp_path / "mem_template.docx"
+    doc = Document()
+    doc.add_paragraph("Nome: {{ nome }}")
+    doc.save(template_path)
+    return template_path
+
+
+def test_batch_in_memory_zip(sample_json_files, tmp_path):
+    """Modo em memória: nenhum .docx intermediário, tudo dentro do ZIP."""
+    import zipfile
+
+    template_path = _real_template(tmp_path)
+    output_dir = tmp_path / "output_mem"
+
+    processor = BatchProcessor(max_workers=2, checkpoint_enabled=False)
+    results = processor.process_batch(
+        json_files=sample_json_files,
+        template_path=template_path,
+        output_dir=output_dir,
+        zip_name="lote.zip",
+        in_memory=True
+    )
+
+    assert results['success'] == 2
+    assert list(output_dir.glob("*.docx")) == []
+    with zipfile.ZipFile(results['zip_path']) as zf:
+        assert sorted(zf.namelist()) == ["Joao_Silva.docx", "Maria_Santos.docx"]
+
+
+def test_iter_zip_stream(tmp_path):
+    """ZIP em streaming a partir de dicts, com nomes únicos e errors.json."""
+    import io
+    import zipfile
+    from docx import Document
+
+    template_path = _real_template(tmp_path)
+    records = [{"nome": "Ana"}, {"nome": "Ana"}, "nao_existe.json"]
+
+    processor = BatchProcessor(max_workers=1)
+    stream = b"".join(processor.iter_zip_stream(records, template_path))
+
+    with zipfile.ZipFile(io.BytesIO(stream)) as zf:
+        assert sorted(zf.namelist()) == ["Ana.docx", "Ana_1.docx", "errors.json"]
+        doc = Document(io.BytesIO(zf.read("Ana_1.docx")))
+        assert doc.paragraphs[0].text == "Nome: Ana"
+        assert json.loads(zf.read("errors.json"))['error_count'] == 1
+
+
+def test_render_pool_async(tmp_path):
+    """RenderPool: render em processo separado, aguardável do event loop."""
+    import asyncio
+    import io
+    from docx import Document
+    from src.render_pool import RenderPool
+
+    template_path = _real_template(tmp_path)
+    pool = RenderPool(max_workers=1)
+
+    async def run():
+        content = await pool.render_bytes(template_path, {"nome": "Ana"})
+        preview = await pool.extract_text(template_path, {"nome": "Bia"})
+        results = [
+            result async for result in pool.iter_render_records(
+                [{"nome": "Caio"}, {"nome": "Davi"}, "nao_existe.json"], template_path
+            )
+        ]
+        return content, preview, results
+
+    try:
+        content, preview, results = asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+    assert Document(io.BytesIO(content)).paragraphs[0].text == "Nome: Ana"
+    assert preview['full_text'] == "Nome: Bia"
+    assert sorted(r['status'] for r in results) == ["error", "success", "success"]
+
+
+def test_render_pool_recovers_from_broken_pool(tmp_path):
+    """RenderPool: worker morto (BrokenProcessPool) recria o pool e repete o render."""
+    import asyncio
+    import io
+    from docx import Document
+    from src.render_pool import RenderPool
+
+    template_path = _real_template(tmp_path)
+    pool = RenderPool(max_workers=1)
+
+    def kill_workers():
+        for process in list(pool._executor._processes.values()):
+            process.kill()
+            process.join()
+
+    async def run():
+        await pool.render_bytes(template_path, {"nome": "Ana"})
+        kill_workers()
+        content = await pool.render_bytes(template_path, {"nome": "Bia"})
+        kill_workers()
+        results = [
+            result async for result in pool.iter_render_records(
+                [{"nome": "Caio"}, {"nome": "Davi"}], template_path
+            )
+        ]
+        return content, results
+
+    try:
+        content, results = asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+    assert Document(io.BytesIO(content)).paragraphs[0].text == "Nome: Bia"
+    assert [r['status'] for r in results] == ["success", "success"]
+    assert pool.restarts == 2
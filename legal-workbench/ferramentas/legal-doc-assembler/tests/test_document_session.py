@@ -0,0 +1,73 @@
+# tests/test_document_session.py
+"""Tests for the parse-once document session store."""
+import io
+
+from docx import Document
+
+from src.annotation_engine import AnnotationEngine
+from src.document_session import DocumentSession, DocumentSessionStore
+
+
+def _docx_bytes(*paragraphs):
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def test_session_text_layout_and_offsets():
+    """Non-empty paragraphs are joined by blank lines, with their offsets."""
+    session = DocumentSession.from_bytes(_docx_bytes("Autor: João", "", "CPF 123.456.789-01"))
+
+    assert session.text_content == "Autor: João\n\nCPF 123.456.789-01"
+    assert session.texts == ["Autor: João", "CPF 123.456.789-01"]
+    assert session.text_paragraphs == [0, 2]
+    assert session.offsets == [0, 13]
+    assert session.metadata["paragraphs"] == 2
+    assert len(session.runs) == len(session.paragraphs) == 3
+
+
+def test_run_map_annotations_apply_to_session_document():
+    session = DocumentSession.from_bytes(_docx_bytes("Autor: João da Silva"))
+    stats = AnnotationEngine({"João da Silva": "{{ nome }}"}).apply_run_map(session.runs)
+
+    assert stats.replacements == 1
+    assert session.document.paragraphs[0].text == "Autor: {{ nome }}"
+
+
+def test_store_ttl_eviction():
+    store = DocumentSessionStore(ttl_seconds=0)
+    session = store.open(_docx_bytes("Texto"))
+
+    assert store.get(session.session_id) is None
+    assert len(store) == 0
+    assert store.total_bytes == 0
+
+
+def test_store_memory_cap_evicts_least_recently_used():
+    content = _docx_bytes("Texto")
+    first = DocumentSession.from_bytes(content)
+    store = DocumentSessionStore(max_bytes=first.size_bytes * 2)
+
+    a = store.open(content)
+    b = store.open(content)
+    store.get(a.session_id)           # a is now the most recently used
+    c = store.open(content)
+
+    assert store.get(b.session_id) is None
+    assert store.get(a.session_id) is a
+    assert store.get(c.session_id) is c
+    assert store.total_bytes <= store.max_bytes
+
+
+def test_store_take_removes_session():
+    """A taken session is owned by the caller: later lookups miss it."""
+    store = DocumentSessionStore()
+    session = store.open(_docx_bytes("Texto"))
+
+    assert store.take(session.session_id) is session
+    assert store.take(session.session_id) is None
+    assert store.get(session.session_id) is None
+    assert store.total_bytes == 0
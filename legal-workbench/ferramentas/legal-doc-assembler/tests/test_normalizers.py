@@ -1,5 +1,8 @@
 # tests/test_normalizers.py
 """Unit tests for normalizers module."""
+import json
+from pathlib import Path
+
 import pytest
 from src.normalizers import (
     normalize_whitespace,
@@ -13,8 +16,12 @@ from src.normalizers import (
     normalize_punctuation,
     normalize_all,
     is_roman_numeral,
+    NormalizationEngine,
+    FIELD_NORMALIZERS,
 )
 
+GOLDEN_PATH = Path(__file__).parent / "fixtures" / "normalizers_golden.json"
+
 
 class TestNormalizeWhitespace:
     """Tests for normalize_whitespace function."""
@@ -286,6 +293,10 @@ class TestNormalizeAddress:
         assert "s/nº" in normalize_address("RUA B S/Nº")
         assert "s/nº" in normalize_address("RUA C S.N.")
 
+    def test_sn_forms_applied_in_sequence(self):
+        """Overlapping S/N forms resolve as three sequential passes."""
+        assert normalize_address("S.N.S N") == "s/nº S nº"
+
     def test_full_address(self):
         result = normalize_address("AV. BRASIL N 500 AP 201 BL A")
         assert "Avenida" in result
@@ -555,6 +566,54 @@ class TestNormalizeAll:
         assert result["cep"] == "01310-100"
 
 
+
+class TestNormalizationEngine:
+    """Tests for the memoized NormalizationEngine."""
+
+    def test_matches_plain_normalizers(self):
+        engine = NormalizationEngine()
+        assert engine.normalize("MARIA DA SILVA", "name") == normalize_name("MARIA DA SILVA")
+        assert engine.normalize("AV. BRASIL N 100", "address") == normalize_address("AV. BRASIL N 100")
+        assert engine.normalize(1310100, "cep") == format_cep(1310100)
+        assert engine.normalize(None, "name") is None
+        assert engine.normalize("  a  .B", "unknown") == "a. B"
+
+    def test_memoized_per_field_type(self):
+        engine = NormalizationEngine()
+        for _ in range(3):
+            engine.normalize("JOÃO DA SILVA", "name")
+        engine.normalize("JOÃO DA SILVA", "text")
+
+        info = engine.cache_info()
+        assert info["name"]["misses"] == 1
+        assert info["name"]["hits"] == 2
+        assert info["text"]["misses"] == 1
+
+    def test_unhashable_values_not_cached(self):
+        engine = NormalizationEngine()
+        assert engine.normalize(["a"], "text") == "['a']"
+        assert engine.cache_info()["text"]["currsize"] == 0
+
+    def test_normalize_column(self):
+        engine = NormalizationEngine(cache_size=0)
+        column = ["MARIA DA SILVA", None, "MARIA DA SILVA", "joao de souza"]
+        assert engine.normalize_column(column, "name") == [
+            "Maria da Silva", None, "Maria da Silva", "Joao de Souza"
+        ]
+
+    def test_normalize_records_matches_normalize_all(self):
+        engine = NormalizationEngine()
+        types = {"nome": "name", "cpf": "cpf", "codigo": "raw"}
+        records = [
+            {"nome": "MARIA DA SILVA", "cpf": "12345678901", "obs": " a ,b "},
+            {"cpf": "98765432100", "nome": "MARIA DA SILVA", "codigo": "X  1"},
+        ]
+        result = engine.normalize_records(records, types)
+
+        assert result == [normalize_all(record, types) for record in records]
+        assert list(result[1]) == ["cpf", "nome", "codigo"]
+
+
 class TestUTF8Characters:
     """Tests for UTF-8 Brazilian Portuguese character handling."""
 
@@ -581,3 +640,28 @@ class TestUTF8Characters:
         assert normalize_name(text.upper()) is not None
         result = normalize_name(text.upper())
         assert "João" in result or "JOÃO" in text.upper()
+
+
+class TestGoldenOutputs:
+    """
+    Outputs recorded with the normalizers before their regexes were
+    precompiled and merged (dataset values plus fuzzed abbreviations,
+    S/N forms, punctuation and digits).
+    """
+
+    @pytest.fixture(scope="class")
+    def golden(self):
+        return json.loads(GOLDEN_PATH.read_text(encoding="utf-8"))
+
+    @pytest.mark.parametrize("field_type", ["name", "address", "cpf", "cnpj", "cep", "oab", "text"])
+    def test_matches_golden(self, golden, field_type):
+        pairs = golden[field_type]
+        engine = NormalizationEngine()
+        for value, expected in pairs:
+            assert FIELD_NORMALIZERS[field_type](value) == expected, value
+            assert engine.normalize(value, field_type) == expected, value
+
+        batched = NormalizationEngine().normalize_records(
+            [{"value": value} for value, _ in pairs], {"value": field_type}
+        )
+        assert [record["value"] for record in batched] == [expected for _, expected in pairs]
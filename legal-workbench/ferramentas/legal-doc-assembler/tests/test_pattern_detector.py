@@ -69,3 +69,35 @@ def test_suggest_field_name():
     assert detector.suggest_field_name('cpf', '123.456.789-01') == 'cpf'
     assert detector.suggest_field_name('cnpj', '12.345.678/0001-99') == 'cnpj'
     assert detector.suggest_field_name('valor', 'R$ 1.234,56') == 'valor'
+
+def test_detect_all_single_pass_no_overlaps():
+    """A single scan should return every pattern type, without overlaps."""
+    text = "OAB/SP 123.456 e CPF 123.456.789-01 em 10/01/2025 OAB/RJ 654.321"
+    detector = PatternDetector()
+    matches = detector.detect_all(text)
+
+    assert [m['type'] for m in matches] == ['oab', 'cpf', 'data', 'oab']
+    for previous, current in zip(matches[:-1], matches[1:], strict=True):
+        assert previous['end'] <= current['start']
+    for m in matches:
+        assert text[m['start']:m['end']] == m['value']
+
+def test_iter_detect_paragraph_offsets():
+    """Incremental detection should use offsets of the joined text."""
+    paragraphs = ["CPF 123.456.789-01", "", "CEP 01310-100"]
+    detector = PatternDetector()
+    matches = list(detector.iter_detect(paragraphs))
+    text = "\n\n".join(paragraphs)
+
+    assert [m.type for m in matches] == ['cpf', 'cep']
+    assert [text[m.start:m.end] for m in matches] == ['123.456.789-01', '01310-100']
+
+def test_custom_pattern_set():
+    """Custom patterns can replace the defaults (filter is optional)."""
+    detector = PatternDetector(
+        {"email": {"regex": r'[\w.]+@[\w.]+\.\w{2,}'}},
+        include_defaults=False
+    )
+    matches = detector.detect("Contato: a.b@c.com.br, CPF 123.456.789-01")
+
+    assert [(m.type, m.value, m.filter) for m in matches] == [('email', 'a.b@c.com.br', '')]
@@ -0,0 +1,173 @@
+# tests/test_pdf_converter.py
+"""Tests for the pooled PDF converter (with an in-process fake converter)."""
+import io
+import threading
+import zipfile
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+from src.batch_engine import BatchProcessor
+from src.engine import DocumentEngine
+from src.pdf_converter import ConverterPool, PdfConversionError
+
+
+class FakeConverter:
+    """Stands in for SofficeConverter: "converts" by prefixing a PDF header."""
+
+    instances = []
+
+    def __init__(self, fail_converts=0, hang=False):
+        self.fail_converts = fail_converts
+        self.hang = hang
+        self.alive = False
+        self.killed = threading.Event()
+        self.conversions = 0
+        FakeConverter.instances.append(self)
+
+    def start(self):
+        self.alive = True
+
+    def convert(self, source, target):
+        if self.hang:
+            self.killed.wait(5)
+            raise RuntimeError("converter killed")
+        if self.fail_converts:
+            self.fail_converts -= 1
+            raise RuntimeError("converter crashed")
+        self.conversions += 1
+        Path(target).write_bytes(b"%PDF-fake\n" + Path(source).read_bytes())
+
+    def healthy(self):
+        return self.alive
+
+    def kill(self):
+        self.alive = False
+        self.killed.set()
+
+    def stop(self):
+        self.alive = False
+
+
+@pytest.fixture(autouse=True)
+def _reset_instances():
+    FakeConverter.instances = []
+
+
+def _real_template(tmp_path):
+    template_path = tmp_path / "template.docx"
+    doc = Document()
+    doc.add_paragraph("Nome: {{ nome }}")
+    doc.save(template_path)
+    return template_path
+
+
+def test_many_conversions_reuse_converters():
+    """A large queue is served by `processes` converters, not one per document."""
+    with ConverterPool(processes=2, converter_factory=FakeConverter) as pool:
+        futures = [pool.submit_bytes(f"doc {i}".encode()) for i in range(50)]
+        results = [future.result(5) for future in futures]
+
+    assert results[7] == b"%PDF-fake\ndoc 7"
+    assert pool.starts == 2
+    assert sum(c.conversions for c in FakeConverter.instances) == 50
+
+
+def test_failed_conversion_restarts_and_retries(tmp_path):
+    factory_calls = []
+
+    def factory():
+        factory_calls.append(1)
+        return FakeConverter(fail_converts=1 if len(factory_calls) == 1 else 0)
+
+    source = tmp_path / "a.docx"
+    source.write_bytes(b"conteudo")
+    with ConverterPool(processes=1, converter_factory=factory) as pool:
+        target = pool.convert(source, tmp_path / "a.pdf", timeout=5)
+
+    assert target.read_bytes() == b"%PDF-fake\nconteudo"
+    assert pool.restarts == 1
+    assert FakeConverter.instances[0].alive is False
+
+
+def test_hung_conversion_is_killed_by_watchdog():
+    pool = ConverterPool(
+        processes=1,
+        converter_factory=lambda: FakeConverter(hang=True),
+        conversion_timeout=0.2,
+        retries=0,
+    )
+    try:
+        with pytest.raises(PdfConversionError, match="timed out"):
+            pool.convert_bytes(b"x", timeout=5)
+        assert FakeConverter.instances[0].killed.is_set()
+    finally:
+        pool.shutdown()
+
+
+def test_unhealthy_idle_converter_is_replaced():
+    with ConverterPool(processes=1, converter_factory=FakeConverter, health_check_interval=0.05) as pool:
+        pool.convert_bytes(b"a", timeout=5)
+        FakeConverter.instances[0].alive = False    # LibreOffice died while idle
+        for _ in range(100):
+            if pool.restarts:
+                break
+            threading.Event().wait(0.02)
+        pool.convert_bytes(b"b", timeout=5)
+
+    assert pool.restarts == 1
+    assert pool.starts == 2
+
+
+def test_engine_render_pdf(tmp_path):
+    template_path = _real_template(tmp_path)
+    output_dir = tmp_path / "out"
+
+    with ConverterPool(processes=1, converter_factory=FakeConverter) as pool:
+        engine = DocumentEngine(pdf_converter=pool)
+        output = engine.render(template_path, {"nome": "Ana"}, output_dir / "ana.pdf", output_format="pdf")
+
+    assert output.read_bytes().startswith(b"%PDF-fake")
+    assert [p.name for p in output_dir.iterdir()] == ["ana.pdf"]
+    with pytest.raises(ValueError):
+        engine.render(template_path, {"nome": "Ana"}, output_dir / "ana.odt", output_format="odt")
+
+
+def test_batch_zip_stream_pdf(tmp_path):
+    template_path = _real_template(tmp_path)
+    records = [{"nome": "Ana"}, {"nome": "Ana"}, {"nome": "Bia"}]
+
+    with ConverterPool(processes=2, converter_factory=FakeConverter) as pool:
+        processor = BatchProcessor(max_workers=1, output_format="pdf", pdf_converter=pool)
+        stream = b"".join(processor.iter_zip_stream(records, template_path))
+
+    with zipfile.ZipFile(io.BytesIO(stream)) as zf:
+        assert sorted(zf.namelist()) == ["Ana.pdf", "Ana_1.pdf", "Bia.pdf"]
+        assert zf.read("Bia.pdf").startswith(b"%PDF-fake")
+
+
+def test_batch_files_pdf_duplicate_names(tmp_path):
+    """Same filename_base in PDF file mode: every record keeps its own PDF."""
+    template_path = _real_template(tmp_path)
+    json_files = []
+    for index in range(6):
+        path = tmp_path / f"record_{index}.json"
+        path.write_text('{"nome": "Ana"}', encoding="utf-8")
+        json_files.append(path)
+    output_dir = tmp_path / "out"
+
+    with ConverterPool(processes=2, converter_factory=FakeConverter) as pool:
+        processor = BatchProcessor(
+            max_workers=2, output_format="pdf", pdf_converter=pool, checkpoint_enabled=False
+        )
+        results = processor.process_batch(
+            json_files=json_files, template_path=template_path, output_dir=output_dir, create_zip=False
+        )
+
+    pdfs = sorted(p.name for p in output_dir.glob("*.pdf"))
+    assert results["success"] == 6
+    assert pdfs == ["Ana.pdf"] + [f"Ana_{i}.pdf" for i in range(1, 6)]
+    assert sorted(Path(p).name for p in results["outputs"]) == pdfs
+    assert not list(output_dir.glob("*.docx"))
+    assert all((output_dir / name).read_bytes().startswith(b"%PDF-fake") for name in pdfs)
@@ -78,3 +78,16 @@ def test_builder_saves_template(sample_docx, templates_dir):
     assert meta['name'] == "contrato_teste"
     assert len(meta['fields']) == 2
     assert 'nome' in [f['name'] for f in meta['fields']]
+
+def test_builder_preview_unchanged_after_save(sample_docx, templates_dir):
+    """Saving a template must not change what the preview reads."""
+    source = Document(sample_docx)
+    builder = TemplateBuilder(sample_docx, document=source)
+    before = builder.get_paragraphs()
+    builder.add_field_replacement("João da Silva", "nome", "nome")
+
+    assert builder.save_template(templates_dir, "preview")['success'] is True
+    assert builder.get_paragraphs() == before
+    assert source.paragraphs[0].text == "Cliente: João da Silva"
+    saved = Document(str(templates_dir / "preview.docx"))
+    assert saved.paragraphs[0].text == "Cliente: {{ nome | nome }}"
@@ -0,0 +1,107 @@
+# tests/test_template_cache.py
+"""Tests for the compiled template cache."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+from docx import Document
+from docxtpl import DocxTemplate
+
+from src.engine import DocumentEngine
+from src.template_cache import TemplateCache
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test outputs."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+def make_template(path: Path, body: str, header: str = "Processo {{ processo }}") -> Path:
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = header
+    doc.add_paragraph(body)
+    doc.add_paragraph("{% for item in itens %}{{ item }};{% endfor %}")
+    doc.save(path)
+    return path
+
+
+def document_text(path: Path) -> str:
+    doc = Document(path)
+    header = "\n".join(p.text for p in doc.sections[0].header.paragraphs)
+    return header + "\n" + "\n".join(p.text for p in doc.paragraphs)
+
+
+@pytest.fixture
+def template(temp_dir):
+    return make_template(temp_dir / "peticao.docx", "Autor: {{ nome|nome }}")
+
+
+DATA = {"nome": "joão da silva", "processo": "0001234-56", "itens": ["a", "b"]}
+
+
+class TestTemplateCache:
+    """Tests for TemplateCache and DocumentEngine integration."""
+
+    def test_output_matches_uncached_docxtpl(self, temp_dir, template):
+        engine = DocumentEngine(template_cache=TemplateCache())
+        cached_out = engine.render(template, DATA, temp_dir / "cached.docx")
+
+        plain = DocxTemplate(template)
+        plain.render(engine._preprocess_data(DATA), engine.jinja_env)
+        plain.save(temp_dir / "plain.docx")
+
+        assert document_text(cached_out) == document_text(temp_dir / "plain.docx")
+        assert "Processo 0001234-56" in document_text(cached_out)
+        assert "Autor: João da Silva" in document_text(cached_out)
+
+    def test_parse_once_render_many(self, temp_dir, template):
+        cache = TemplateCache()
+        engine = DocumentEngine(template_cache=cache)
+
+        for i in range(5):
+            out = engine.render(template, {**DATA, "processo": str(i)}, temp_dir / f"out_{i}.docx")
+            assert f"Processo {i}" in document_text(out)
+
+        # Variables come from the same compiled entry
+        assert engine.get_template_variables(template) == ["itens", "nome", "processo"]
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hits"] == 5
+
+    def test_engines_share_process_cache(self, template):
+        first, second = DocumentEngine(), DocumentEngine()
+
+        assert first.template_cache is second.template_cache
+        assert first.jinja_env is second.jinja_env
+
+    def test_invalidated_when_file_changes(self, temp_dir, template):
+        cache = TemplateCache()
+        engine = DocumentEngine(template_cache=cache)
+        engine.render(template, DATA, temp_dir / "v1.docx")
+
+        make_template(template, "Réu: {{ reu }}")
+        stat = template.stat()
+        os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        out = engine.render(template, {**DATA, "reu": "Empresa X"}, temp_dir / "v2.docx")
+        assert "Réu: Empresa X" in document_text(out)
+        assert cache.stats()["misses"] == 2
+
+    def test_lru_eviction(self, temp_dir):
+        cache = TemplateCache(maxsize=2)
+        engine = DocumentEngine(template_cache=cache)
+        paths = [make_template(temp_dir / f"t{i}.docx", f"T{i} {{{{ nome }}}}") for i in range(3)]
+
+        engine.get_template_variables(paths[0])
+        engine.get_template_variables(paths[1])
+        engine.get_template_variables(paths[0])  # t0 most recently used
+        engine.get_template_variables(paths[2])  # evicts t1
+
+        assert len(cache) == 2
+        engine.get_template_variables(paths[0])
+        assert cache.stats()["misses"] == 3
+        engine.get_template_variables(paths[1])
+        assert cache.stats()["misses"] == 4
@@ -85,3 +85,47 @@ def test_delete_template(templates_dir):
     templates = manager.list_templates()
     assert len(templates) == 1
     assert templates[0]['safe_name'] == 'procuracao'
+
+def test_search_accents_and_tags(templates_dir):
+    """Search ignores case/accents and matches inside words; tags filter."""
+    manager = TemplateManager(templates_dir)
+
+    assert [t['safe_name'] for t in manager.search('LOCAÇÃO')] == ['contrato_locacao']
+    assert [t['safe_name'] for t in manager.search('curaç')] == ['procuracao']
+    assert manager.search('', tags=['procuracao'])[0]['safe_name'] == 'procuracao'
+    assert manager.search('contrato', tags=['procuracao']) == []
+    assert manager.get_all_tags() == ['contrato', 'locacao', 'procuracao']
+    assert manager.get_stats()['most_recent'] == 'Procuração'
+
+def test_catalog_mtime_refresh(templates_dir):
+    """Unchanged directory is not rescanned; changes are picked up."""
+    import os
+    from src.template_catalog import TemplateCatalog
+
+    old = 1_600_000_000
+    os.utime(templates_dir, (old, old))
+    catalog = TemplateCatalog(templates_dir, rescan_interval=3600)
+
+    assert len(catalog.entries()) == 2
+    assert len(catalog.entries()) == 2
+    assert catalog.scans == 1
+
+    meta = {'name': 'Substabelecimento', 'tags': ['procuracao'], 'created_at': '2025-01-12'}
+    (templates_dir / 'substabelecimento.json').write_text(json.dumps(meta))
+    (templates_dir / 'substabelecimento.docx').write_bytes(b'')
+
+    assert catalog.get('substabelecimento').name == 'Substabelecimento'
+    assert catalog.scans == 2
+    assert {e.key for e in catalog.search('', tags=['procuracao'])} == {'procuracao', 'substabelecimento'}
+
+def test_returned_metadata_is_detached_from_catalog(templates_dir):
+    """Mutating a returned dict (including its lists) must not change the cached entry."""
+    manager = TemplateManager(templates_dir)
+    template = manager.get_template('contrato_locacao')
+    template['tags'].append('editado')
+    template['fields'][0]['filter'] = 'texto'
+
+    fresh = manager.get_template('contrato_locacao')
+    assert fresh['tags'] == ['contrato', 'locacao']
+    assert fresh['fields'][0]['filter'] == 'nome'
+    assert manager.search('', tags=['editado']) == []
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark da deteccao de colunas (ColumnLayoutDetector).
+
+Compara:
+1. Varredura escalar de referencia (loop por pixel, implementacao original)
+2. Deteccao vetorizada por pagina (detect)
+3. Deteccao em lote com projecoes empilhadas (detect_batch)
+
+As fixtures sinteticas de tests/synthetic_columns.py sao o oraculo de
+corretude: antes de medir tempo, o script verifica que as tres variantes
+produzem as mesmas fronteiras.
+
+Execução:
+    cd ferramentas/legal-text-extractor
+    source .venv/bin/activate
+    python scripts/benchmark_column_detection.py --pages 200 --dpi 300
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Adiciona o diretório raiz ao PYTHONPATH
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.image_cleaner import ColumnLayoutDetector
+from tests.synthetic_columns import (
+    create_single_column_image,
+    create_three_column_image,
+    create_two_column_image,
+    oracle_fixture_images,
+    reference_find_column_boundaries,
+)
+
+# Pagina A4 em pixels por DPI
+A4_INCHES = (8.27, 11.69)
+
+
+def build_pages(n_pages: int, dpi: int) -> list[np.ndarray]:
+    """Gera paginas A4 sinteticas alternando 1, 2 e 3 colunas."""
+    width = int(A4_INCHES[0] * dpi)
+    height = int(A4_INCHES[1] * dpi)
+    factories = [
+        lambda: create_single_column_image(width=width, height=height),
+        lambda: create_two_column_image(width=width, height=height, gap_width=dpi // 3),
+        lambda: create_three_column_image(width=width, height=height, gap_width=dpi // 4),
+    ]
+    np.random.seed(0)
+    return [factories[i % len(factories)]() for i in range(n_pages)]
+
+
+def normalized_profiles(detector: ColumnLayoutDetector, pages: list[np.ndarray]):
+    """Pre-computa perfis normalizados (isola o custo da busca de vales)."""
+    profiles = []
+    for page in pages:
+        binary = detector._binarize(page)
+        width = binary.shape[1]
+        smoothed = detector._smooth_projection(
+            detector._compute_vertical_projection(binary), width
+        )
+        if smoothed.max() > 0:
+            profiles.append((smoothed / smoothed.max(), width))
+    return profiles
+
+
+def check_oracle(detector: ColumnLayoutDetector) -> None:
+    """Garante equivalencia com a referencia escalar nas fixtures de teste."""
+    fixtures = oracle_fixture_images()
+    for normalized, width in normalized_profiles(detector, fixtures):
+        expected = reference_find_column_boundaries(detector.config, normalized, width)
+        actual = detector._find_column_boundaries(normalized, width)
+        assert [(b.x_start, b.x_end) for b in actual] == [
+            (b.x_start, b.x_end) for b in expected
+        ], "Vectorized boundaries diverge from reference scan"
+
+    for image, layout in zip(fixtures, detector.detect_batch(fixtures)):
+        assert layout.to_dict() == detector.detect(image).to_dict(), (
+            "detect_batch diverges from detect"
+        )
+    print("Oraculo OK: fixtures de synthetic_columns.py conferem\n")
+
+
+def timed(label: str, fn, n_pages: int) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<38} {elapsed * 1000:9.1f} ms  ({elapsed * 1000 / n_pages:.2f} ms/pag)")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=100, help="Numero de paginas")
+    parser.add_argument("--dpi", type=int, default=300, help="Resolucao simulada")
+    args = parser.parse_args()
+
+    detector = ColumnLayoutDetector()
+    check_oracle(detector)
+
+    pages = build_pages(args.pages, args.dpi)
+    profiles = normalized_profiles(detector, pages)
+    print(f"{args.pages} paginas A4 @ {args.dpi} DPI ({pages[0].shape[1]} px de largura)\n")
+
+    print("Busca de vales (perfis pre-computados):")
+    scalar = timed(
+        "referencia escalar (loop por pixel)",
+        lambda: [reference_find_column_boundaries(detector.config, n, w) for n, w in profiles],
+        len(profiles),
+    )
+    vector = timed(
+        "vetorizada (_find_column_boundaries)",
+        lambda: [detector._find_column_boundaries(n, w) for n, w in profiles],
+        len(profiles),
+    )
+    print(f"  speedup: {scalar / vector:.1f}x\n")
+
+    print("Deteccao completa (binarizacao + projecao + vales):")
+    single = timed("detect() por pagina", lambda: [detector.detect(p) for p in pages], len(pages))
+    batch = timed("detect_batch()", lambda: detector.detect_batch(pages), len(pages))
+    print(f"  speedup: {single / batch:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
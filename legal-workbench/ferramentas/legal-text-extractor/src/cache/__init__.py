@@ -0,0 +1,32 @@
+"""
+Cache - Reaproveitamento de extrações entre jobs
+
+Usage:
+    from src.cache import PageCache, hash_pdf_pages
+
+    cache = PageCache(db_path=Path("data/page_cache.db"))
+    hashes = hash_pdf_pages(pdf_path)
+
+    text = cache.get(hashes[0], "pdfplumber", options)
+    if text is None:
+        text = extract_page(...)
+        cache.put(hashes[0], "pdfplumber", text, options)
+
+    print(cache.stats())
+"""
+
+from .page_cache import (
+    CACHE_VERSION,
+    PageCache,
+    PageCacheStats,
+    PageContentHasher,
+    hash_pdf_pages,
+)
+
+__all__ = [
+    "CACHE_VERSION",
+    "PageCache",
+    "PageCacheStats",
+    "PageContentHasher",
+    "hash_pdf_pages",
+]
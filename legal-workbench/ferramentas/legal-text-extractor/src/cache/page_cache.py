@@ -0,0 +1,405 @@
+"""
+Page Cache - Cache persistente de texto extraído por página
+
+Autos judiciais são reenviados com frequência com poucas páginas novas
+(petição anexada ao mesmo processo). O cache guarda o texto de cada página
+sob a chave:
+
+    sha256(hash do conteúdo da página + engine + opções normalizadas)
+
+O hash do conteúdo cobre o content stream da página e os recursos que ele
+referencia (fontes, imagens, forms), além de MediaBox/CropBox/Rotate. Páginas
+idênticas em PDFs diferentes geram a mesma chave; a posição da página no
+arquivo não participa.
+
+Armazenamento: SQLite (WAL) com despejo LRU por tamanho total em bytes.
+Seguro para múltiplos processos (workers Celery) compartilhando o arquivo.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando a semântica de extração mudar (invalida entradas antigas)
+CACHE_VERSION = 1
+
+# Chaves que apontam para cima na árvore (página pai, página da anotação)
+_SKIP_KEYS = frozenset({"Parent", "P", "Annots", "B", "Thumb"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_cache (
+    key TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    text TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_page_cache_lru ON page_cache(last_access);
+CREATE TABLE IF NOT EXISTS page_cache_meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO page_cache_meta (name, value) VALUES
+    ('total_bytes', 0), ('hits', 0), ('misses', 0), ('evictions', 0);
+"""
+
+
+# =============================================================================
+# HASH DE CONTEÚDO
+# =============================================================================
+
+
+class PageContentHasher:
+    """
+    Calcula hashes de conteúdo das páginas de um documento pdfminer.
+
+    Digests de objetos indiretos são memorizados por objid: fontes e imagens
+    compartilhadas entre páginas são hasheadas uma única vez por documento.
+    Streams entram pelo rawdata (sem descompressão).
+    """
+
+    def __init__(self) -> None:
+        self._memo: dict[int, bytes] = {}
+        self._visiting: set[int] = set()
+
+    def hash_page(self, page_obj) -> str:
+        """
+        Hash hexadecimal de uma página (pdfminer PDFPage).
+
+        Args:
+            page_obj: pdfplumber ``page.page_obj``
+
+        Returns:
+            sha256 hex do conteúdo visual da página
+        """
+        digest = hashlib.sha256()
+        digest.update(self._digest([float(v) for v in page_obj.mediabox]))
+        digest.update(self._digest([float(v) for v in page_obj.cropbox]))
+        digest.update(self._digest(int(page_obj.rotate or 0)))
+        digest.update(self._digest(page_obj.contents or []))
+        digest.update(self._digest(page_obj.resources or {}))
+        return digest.hexdigest()
+
+    def _digest(self, obj: Any) -> bytes:
+        from pdfminer.pdftypes import PDFObjRef, PDFStream
+        from pdfminer.psparser import PSLiteral
+
+        if isinstance(obj, PDFObjRef):
+            objid = obj.objid
+            if objid in self._memo:
+                return self._memo[objid]
+            if objid in self._visiting:
+                # Ciclo (ex: forms que se referenciam)
+                return b"cycle:%d" % objid
+            self._visiting.add(objid)
+            try:
+                result = self._digest(obj.resolve())
+            finally:
+                self._visiting.discard(objid)
+            self._memo[objid] = result
+            return result
+
+        hasher = hashlib.sha256()
+        if isinstance(obj, PDFStream):
+            objid = obj.objid
+            if objid is not None and objid in self._memo:
+                return self._memo[objid]
+            hasher.update(b"s")
+            hasher.update(self._digest(
+                {k: v for k, v in obj.attrs.items() if k not in ("Length", "DL")}
+            ))
+            data = obj.rawdata if obj.rawdata is not None else obj.get_data()
+            hasher.update(hashlib.sha256(data).digest())
+            result = hasher.digest()
+            if objid is not None:
+                self._memo[objid] = result
+            return result
+
+        if isinstance(obj, dict):
+            hasher.update(b"d")
+            for key in sorted(obj, key=str):
+                if key in _SKIP_KEYS:
+                    continue
+                hasher.update(str(key).encode("utf-8", "surrogatepass"))
+                hasher.update(self._digest(obj[key]))
+        elif isinstance(obj, (list, tuple)):
+            hasher.update(b"l")
+            for item in obj:
+                hasher.update(self._digest(item))
+        elif isinstance(obj, PSLiteral):
+            hasher.update(b"n" + str(obj.name).encode("utf-8", "surrogatepass"))
+        elif isinstance(obj, bytes):
+            hasher.update(b"b" + obj)
+        else:
+            hasher.update(b"v" + repr(obj).encode("utf-8", "surrogatepass"))
+        return hasher.digest()
+
+
+def hash_pdf_pages(pdf_path: Path) -> list[str]:
+    """
+    Hash de conteúdo de todas as páginas de um PDF (ordem do documento).
+
+    Args:
+        pdf_path: Caminho do PDF
+
+    Returns:
+        Lista de sha256 hex, um por página
+    """
+    import pdfplumber
+
+    hasher = PageContentHasher()
+    with pdfplumber.open(pdf_path) as pdf:
+        return [hasher.hash_page(page.page_obj) for page in pdf.pages]
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+
+@dataclass
+class PageCacheStats:
+    """Contadores da sessão (instância atual)."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class PageCache:
+    """
+    Cache persistente de texto por página com despejo LRU limitado em bytes.
+
+    Example:
+        >>> cache = PageCache(Path("data/page_cache.db"), max_bytes=256 * 1024**2)
+        >>> hashes = hash_pdf_pages(Path("processo.pdf"))
+        >>> text = cache.get(hashes[0], "pdfplumber", {"safe_bbox": bbox})
+        >>> if text is None:
+        ...     text = extract(...)
+        ...     cache.put(hashes[0], "pdfplumber", text, {"safe_bbox": bbox})
+        >>> cache.stats()["session"]["hit_rate"]
+    """
+
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, db_path: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Inicializa o cache.
+
+        Args:
+            db_path: Caminho do banco SQLite
+            max_bytes: Tamanho máximo do texto armazenado (bytes UTF-8).
+                Ao exceder, remove as entradas acessadas há mais tempo.
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes deve ser > 0")
+
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.session = PageCacheStats()
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+        logger.info(f"PageCache initialized at {self.db_path} (max {max_bytes} bytes)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(content_hash: str, engine: str, options: Optional[dict] = None) -> str:
+        """
+        Chave do cache: conteúdo + engine + opções normalizadas.
+
+        Opções são serializadas em JSON com chaves ordenadas; floats de bbox
+        são arredondados para evitar variação de ponto flutuante.
+        """
+        normalized = json.dumps(
+            _normalize_options(options or {}), sort_keys=True, separators=(",", ":")
+        )
+        raw = f"v{CACHE_VERSION}|{content_hash}|{engine}|{normalized}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(
+        self, content_hash: str, engine: str, options: Optional[dict] = None
+    ) -> Optional[str]:
+        """
+        Recupera texto da página, atualizando a posição LRU.
+
+        Returns:
+            Texto em cache ou None (miss)
+        """
+        key = self.make_key(content_hash, engine, options)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT text FROM page_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                conn.execute(
+                    "UPDATE page_cache_meta SET value = value + 1 WHERE name = 'misses'"
+                )
+                self.session.misses += 1
+                return None
+
+            conn.execute(
+                "UPDATE page_cache SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                (now, key),
+            )
+            conn.execute(
+                "UPDATE page_cache_meta SET value = value + 1 WHERE name = 'hits'"
+            )
+            self.session.hits += 1
+            return row[0]
+
+    def put(
+        self,
+        content_hash: str,
+        engine: str,
+        text: str,
+        options: Optional[dict] = None,
+    ) -> None:
+        """Armazena texto da página e despeja entradas antigas se necessário."""
+        key = self.make_key(content_hash, engine, options)
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.debug(f"PageCache: entry larger than max_bytes skipped ({size} bytes)")
+            return
+
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            old = conn.execute(
+                "SELECT size_bytes FROM page_cache WHERE key = ?", (key,)
+            ).fetchone()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO page_cache
+                    (key, content_hash, engine, text, size_bytes, created_at, last_access, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+                """,
+                (key, content_hash, engine, text, size, now, now),
+            )
+            delta = size - (old[0] if old else 0)
+            conn.execute(
+                "UPDATE page_cache_meta SET value = value + ? WHERE name = 'total_bytes'",
+                (delta,),
+            )
+            self.session.writes += 1
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Remove entradas LRU até o total caber em max_bytes."""
+        total = conn.execute(
+            "SELECT value FROM page_cache_meta WHERE name = 'total_bytes'"
+        ).fetchone()[0]
+        evicted = 0
+        while total > self.max_bytes:
+            rows = conn.execute(
+                "SELECT key, size_bytes FROM page_cache ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                total = 0
+                break
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM page_cache WHERE key = ?", (key,))
+                total -= size
+                evicted += 1
+
+        if evicted:
+            conn.execute(
+                "UPDATE page_cache_meta SET value = ? WHERE name = 'total_bytes'", (total,)
+            )
+            conn.execute(
+                "UPDATE page_cache_meta SET value = value + ? WHERE name = 'evictions'",
+                (evicted,),
+            )
+            self.session.evictions += evicted
+            logger.debug(f"PageCache: evicted {evicted} entries")
+
+    def stats(self) -> dict:
+        """
+        Métricas do cache.
+
+        Returns:
+            Dict com:
+            - session: contadores desta instância (hits, misses, hit_rate, ...)
+            - lifetime: contadores acumulados no banco (todos os processos)
+            - entries / total_bytes / max_bytes
+        """
+        with self._connect() as conn:
+            meta = dict(conn.execute("SELECT name, value FROM page_cache_meta").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM page_cache").fetchone()[0]
+
+        lookups = meta["hits"] + meta["misses"]
+        return {
+            "session": self.session.as_dict(),
+            "lifetime": {
+                "hits": meta["hits"],
+                "misses": meta["misses"],
+                "evictions": meta["evictions"],
+                "hit_rate": round(meta["hits"] / lookups, 4) if lookups else 0.0,
+            },
+            "entries": entries,
+            "total_bytes": meta["total_bytes"],
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self) -> None:
+        """Remove todas as entradas (mantém contadores acumulados)."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM page_cache")
+            conn.execute("UPDATE page_cache_meta SET value = 0 WHERE name = 'total_bytes'")
+
+
+def _normalize_options(value: Any) -> Any:
+    """Converte opções para JSON estável (Paths -> str, floats arredondados, 10.0 == 10)."""
+    if isinstance(value, dict):
+        return {str(k): _normalize_options(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_options(v) for v in value]
+    if isinstance(value, float):
+        value = round(value, 2)
+        return int(value) if value.is_integer() else value
+    if isinstance(value, Path):
+        return str(value)
+    return value
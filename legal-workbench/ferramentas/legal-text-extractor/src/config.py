@@ -62,6 +62,16 @@ class LayoutConfig:
     # Se gap encontrado nessa zona, assume que é separação texto/tarja
     gap_search_zone_percent: float = 0.30  # últimos 30%
 
+    # --- QUALIDADE RASTER (thumbnail) ---
+    # DPI da thumbnail usada para estimar contraste/ruído/marca d'água
+    quality_thumbnail_dpi: int = 72
+
+    # Processos do pré-passe de qualidade (None = os.cpu_count())
+    quality_max_workers: int | None = None
+
+    # Abaixo deste número de páginas raster, o pré-passe roda em processo único
+    quality_parallel_min_pages: int = 8
+
 
 LAYOUT_CONFIG = LayoutConfig()
 
@@ -89,6 +99,12 @@ class VisionConfig:
     # Qualidade JPEG (se output_format == "jpg")
     jpeg_quality: int = 95
 
+    # Modo de desempenho: denoise apenas nos tiles com conteudo, em paralelo
+    # (resultado identico; tiles uniformes sao pulados)
+    performance_mode: bool = False
+    tile_size: int = 512
+    max_workers: int | None = None  # None = cv2.getNumThreads()
+
 
 VISION_CONFIG = VisionConfig()
 
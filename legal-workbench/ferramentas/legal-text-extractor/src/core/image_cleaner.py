@@ -14,10 +14,12 @@ Author: Pedro Giudice
 Date: 2025-11-25
 Updated: 2026-01-07 - Added multi-column layout detection
 Updated: 2026-01-07 - Added StampSegmenter integration for HSV-based stamp detection
+Updated: 2026-10-18 - Added performance mode (downscaled proxy + parallel tiles)
 """
 
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Sequence, NamedTuple, TYPE_CHECKING, Optional
@@ -26,9 +28,20 @@ import cv2
 import numpy as np
 from PIL import Image
 
+from .tiling import (
+    PerformanceConfig,
+    StageTimer,
+    apply_tiled,
+    is_uniform,
+    make_proxy,
+    proxy_stride,
+)
+
 if TYPE_CHECKING:
     from .stamp_segmenter import StampSegmentationResult, StampRegion
 
+logger = logging.getLogger(__name__)
+
 
 # =============================================================================
 # MULTI-COLUMN LAYOUT DETECTION
@@ -238,21 +251,8 @@ class ColumnLayoutDetector:
         Raises:
             ValueError: If image is empty or has invalid dimensions
         """
-        if image is None or image.size == 0:
-            raise ValueError("Image is empty or None")
-
-        # Convert to grayscale if needed
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = image.copy()
-
-        height, width = gray.shape
-
-        # Binarize image (text = dark = 0, background = light = 255)
-        _, binary = cv2.threshold(
-            gray, self.config.text_threshold, 255, cv2.THRESH_BINARY_INV
-        )
+        binary = self._binarize(image)
+        height, width = binary.shape
 
         # Compute vertical projection profile
         projection = self._compute_vertical_projection(binary)
@@ -270,8 +270,97 @@ class ColumnLayoutDetector:
         # Find column boundaries (valleys in the projection)
         boundaries = self._find_column_boundaries(normalized, width)
 
+        return self._build_layout(projection, height, normalized, boundaries)
+
+    def detect_batch(self, images: Sequence[np.ndarray]) -> list[LayoutMetadata]:
+        """
+        Detect column layout for many pages at once.
+
+        Pages with the same width have their projection profiles stacked
+        into a 2D array, so smoothing and valley detection run as single
+        vectorized operations per width group. Results are identical to
+        calling detect() on each page.
+
+        Args:
+            images: Sequence of grayscale or BGR images
+
+        Returns:
+            List of LayoutMetadata, in the same order as images
+
+        Raises:
+            ValueError: If any image is empty or None
+        """
+        # Only projections (one row per page) are kept, never the full
+        # binarized pages: column densities are derived from the projection
+        projections: list[np.ndarray] = []
+        heights: list[int] = []
+        for image in images:
+            binary = self._binarize(image)
+            projections.append(self._compute_vertical_projection(binary))
+            heights.append(binary.shape[0])
+
+        results: list[Optional[LayoutMetadata]] = [None] * len(projections)
+
+        # Group page indices by width (projection length)
+        groups: dict[int, list[int]] = {}
+        for idx, projection in enumerate(projections):
+            groups.setdefault(projection.shape[0], []).append(idx)
+
+        for width, indices in groups.items():
+            stacked = np.stack([projections[i] for i in indices])
+            smoothed = self._smooth_projection(stacked, width)
+
+            peaks = smoothed.max(axis=1, keepdims=True)
+            has_text = peaks[:, 0] > 0
+            normalized = np.divide(
+                smoothed, peaks, out=np.zeros_like(smoothed), where=peaks > 0
+            )
+            all_boundaries = self._find_column_boundaries_batch(normalized, width)
+
+            for row, idx in enumerate(indices):
+                if not has_text[row]:
+                    results[idx] = self._create_single_column_layout(width, heights[idx])
+                    continue
+                results[idx] = self._build_layout(
+                    stacked[row], heights[idx], normalized[row], all_boundaries[row]
+                )
+
+        return results  # type: ignore[return-value]
+
+    def _binarize(self, image: np.ndarray) -> np.ndarray:
+        """
+        Convert to grayscale (if needed) and binarize (text = 255).
+
+        Raises:
+            ValueError: If image is empty or None
+        """
+        if image is None or image.size == 0:
+            raise ValueError("Image is empty or None")
+
+        # Convert to grayscale if needed
+        if len(image.shape) == 3:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = image
+
+        # Binarize image (text = dark = 0, background = light = 255)
+        _, binary = cv2.threshold(
+            gray, self.config.text_threshold, 255, cv2.THRESH_BINARY_INV
+        )
+        return binary
+
+    def _build_layout(
+        self,
+        projection: np.ndarray,
+        height: int,
+        normalized: np.ndarray,
+        boundaries: list[ColumnBoundary],
+    ) -> LayoutMetadata:
+        """Create column regions and confidence for detected boundaries."""
+        width = projection.shape[0]
+
         # Validate and create column regions
-        columns = self._create_column_regions(boundaries, width, binary)
+        columns = self._create_column_regions(boundaries, width, projection, height)
 
         # Calculate overall confidence
         confidence = self._calculate_confidence(columns, boundaries, normalized)
@@ -299,9 +388,11 @@ class ColumnLayoutDetector:
         Returns:
             1D array of shape (width,) with projection values
         """
-        # Sum along vertical axis (axis=0) to get horizontal density
-        projection = np.sum(binary, axis=0).astype(np.float64)
-        return projection
+        # Sum along vertical axis to get horizontal density.
+        # cv2.reduce with an int32 accumulator is ~8x faster than np.sum on
+        # uint8 (which widens to uint64); exact for heights < 8M px
+        projection = cv2.reduce(binary, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S)
+        return projection.ravel().astype(np.float64)
 
     def _smooth_projection(self, projection: np.ndarray, width: int) -> np.ndarray:
         """
@@ -311,27 +402,29 @@ class ColumnLayoutDetector:
         produces cleaner column boundaries.
 
         Args:
-            projection: Raw vertical projection profile
+            projection: Raw vertical projection profile, either 1D (width,)
+                or a stack of profiles (pages, width)
             width: Page width (used to adapt kernel size)
 
         Returns:
-            Smoothed projection profile
+            Smoothed projection profile (same shape as input)
         """
         kernel_size = self.config.projection_smoothing_kernel
         if kernel_size % 2 == 0:
             kernel_size += 1
 
         # Ensure kernel size is not larger than array
-        kernel_size = min(kernel_size, len(projection) - 1)
+        kernel_size = min(kernel_size, projection.shape[-1] - 1)
         if kernel_size < 3:
             return projection
 
         # Use OpenCV's Gaussian blur for smooth results
         sigma = kernel_size / 4.0
-        # GaussianBlur needs 2D input, so reshape
-        projection_2d = projection.reshape(1, -1)
+        # GaussianBlur needs 2D input; a (kernel_size, 1) kernel blurs each
+        # row independently, so stacked profiles are smoothed in one call
+        projection_2d = projection.reshape(-1, projection.shape[-1])
         smoothed_2d = cv2.GaussianBlur(projection_2d, (kernel_size, 1), sigma)
-        return smoothed_2d.flatten()
+        return smoothed_2d.reshape(projection.shape)
 
     def _find_column_boundaries(
         self, normalized: np.ndarray, width: int
@@ -348,65 +441,99 @@ class ColumnLayoutDetector:
         Returns:
             List of ColumnBoundary objects
         """
+        return self._find_column_boundaries_batch(normalized.reshape(1, -1), width)[0]
+
+    def _find_column_boundaries_batch(
+        self, normalized: np.ndarray, width: int
+    ) -> list[list[ColumnBoundary]]:
+        """
+        Vectorized valley detection over a stack of projection profiles.
+
+        Steps (no per-pixel Python loop):
+        1. Threshold mask of low-density positions inside the edge margins
+        2. Run-length encoding of the mask via np.diff on a padded copy
+        3. Discard runs narrower than min_gap or still open at the margin
+        4. Minimum per run via np.minimum.reduceat -> valley depth/confidence
+
+        Args:
+            normalized: Normalized profiles, shape (pages, width), 0.0-1.0
+            width: Page width in pixels
+
+        Returns:
+            One list of ColumnBoundary objects per profile row
+        """
         # Calculate edge margins to ignore
         margin = int(width * self.config.edge_margin_ratio)
         min_gap = self.config.get_min_gap_width(width)
-
-        # Find valleys using a simple local minimum approach
-        # (avoiding scipy dependency for simplicity)
-        boundaries = []
         threshold = 1.0 - self.config.valley_prominence  # Valley threshold
 
-        # Scan for regions where projection drops below threshold
-        in_valley = False
-        valley_start = 0
-
-        for i in range(margin, width - margin):
-            is_low = normalized[i] < threshold
-
-            if is_low and not in_valley:
-                # Start of a valley
-                in_valley = True
-                valley_start = i
-            elif not is_low and in_valley:
-                # End of a valley
-                in_valley = False
-                valley_end = i
-
-                gap_width = valley_end - valley_start
-
-                # Check if gap is wide enough
-                if gap_width >= min_gap:
-                    # Find the deepest point in the valley
-                    valley_slice = normalized[valley_start:valley_end]
-                    min_idx = np.argmin(valley_slice)
-                    min_val = valley_slice[min_idx]
-
-                    # Calculate confidence based on how deep the valley is
-                    confidence = (1.0 - min_val) / self.config.valley_prominence
-                    confidence = min(confidence, 1.0)
-
-                    boundaries.append(ColumnBoundary(
-                        x_start=valley_start,
-                        x_end=valley_end,
-                        width=gap_width,
-                        confidence=confidence,
-                    ))
+        n_rows = normalized.shape[0]
+        results: list[list[ColumnBoundary]] = [[] for _ in range(n_rows)]
+
+        region = normalized[:, margin:width - margin]
+        if region.shape[1] == 0:
+            return results
+
+        # Pad with a non-valley column on both sides so every run has a
+        # rising (+1) and falling (-1) edge in the diff
+        mask = region < threshold
+        padded = np.zeros((n_rows, mask.shape[1] + 2), dtype=np.int8)
+        padded[:, 1:-1] = mask
+        edges = np.diff(padded, axis=1)
+
+        # np.nonzero is row-major, so starts and ends pair up run by run
+        start_rows, starts = np.nonzero(edges == 1)
+        _, ends = np.nonzero(edges == -1)
+
+        # Runs still open at the right margin never closed in the scan;
+        # they are page borders, not column gaps
+        valid = (ends - starts >= min_gap) & (ends < mask.shape[1])
+        if not valid.any():
+            return results
+
+        rows = start_rows[valid]
+        starts = starts[valid] + margin
+        ends = ends[valid] + margin
+
+        # Deepest point per run: reduceat over the flattened profiles with
+        # interleaved [start, end) offsets; even slots hold the run minima
+        flat = normalized.ravel()
+        offsets = np.empty(starts.size * 2, dtype=np.intp)
+        offsets[0::2] = rows * width + starts
+        offsets[1::2] = rows * width + ends
+        minima = np.minimum.reduceat(flat, offsets)[0::2]
+
+        # Confidence based on how deep the valley is
+        confidences = np.minimum(
+            (1.0 - minima) / self.config.valley_prominence, 1.0
+        )
+
+        for row, x_start, x_end, confidence in zip(
+            rows.tolist(), starts.tolist(), ends.tolist(), confidences.tolist()
+        ):
+            results[row].append(ColumnBoundary(
+                x_start=x_start,
+                x_end=x_end,
+                width=x_end - x_start,
+                confidence=confidence,
+            ))
 
         # Limit to max_columns - 1 boundaries
         max_boundaries = self.config.max_columns - 1
-        if len(boundaries) > max_boundaries:
-            # Keep the most confident boundaries
-            boundaries = sorted(boundaries, key=lambda b: b.confidence, reverse=True)[:max_boundaries]
-            boundaries = sorted(boundaries, key=lambda b: b.x_start)
+        for row, boundaries in enumerate(results):
+            if len(boundaries) > max_boundaries:
+                # Keep the most confident boundaries
+                boundaries = sorted(boundaries, key=lambda b: b.confidence, reverse=True)[:max_boundaries]
+                results[row] = sorted(boundaries, key=lambda b: b.x_start)
 
-        return boundaries
+        return results
 
     def _create_column_regions(
         self,
         boundaries: list[ColumnBoundary],
         width: int,
-        binary: np.ndarray,
+        projection: np.ndarray,
+        height: int,
     ) -> list[ColumnRegion]:
         """
         Create column regions from detected boundaries.
@@ -414,14 +541,16 @@ class ColumnLayoutDetector:
         Args:
             boundaries: List of column boundaries
             width: Page width
-            binary: Binarized image for density calculation
+            projection: Raw vertical projection (density source)
+            height: Page height
 
         Returns:
             List of ColumnRegion objects
         """
         if not boundaries:
             # Single column layout
-            total_density = np.sum(binary) / (binary.size * 255) if binary.size > 0 else 0.0
+            total_size = width * height
+            total_density = float(projection.sum() / (total_size * 255)) if total_size > 0 else 0.0
             return [ColumnRegion(
                 index=0,
                 x_start=0,
@@ -434,17 +563,17 @@ class ColumnLayoutDetector:
 
         # First column: from start to first boundary
         first_end = boundaries[0].x_start
-        columns.append(self._create_column(0, 0, first_end, binary))
+        columns.append(self._create_column(0, 0, first_end, projection, height))
 
         # Middle columns: between boundaries
         for i in range(len(boundaries) - 1):
             col_start = boundaries[i].x_end
             col_end = boundaries[i + 1].x_start
-            columns.append(self._create_column(i + 1, col_start, col_end, binary))
+            columns.append(self._create_column(i + 1, col_start, col_end, projection, height))
 
         # Last column: from last boundary to end
         last_start = boundaries[-1].x_end
-        columns.append(self._create_column(len(boundaries), last_start, width, binary))
+        columns.append(self._create_column(len(boundaries), last_start, width, projection, height))
 
         # Filter out columns that are too narrow
         min_width = int(width * self.config.min_column_width_ratio)
@@ -457,17 +586,18 @@ class ColumnLayoutDetector:
         return columns
 
     def _create_column(
-        self, index: int, x_start: int, x_end: int, binary: np.ndarray
+        self, index: int, x_start: int, x_end: int, projection: np.ndarray, height: int
     ) -> ColumnRegion:
         """Create a ColumnRegion with calculated text density."""
         width = x_end - x_start
         if width <= 0:
             return ColumnRegion(index=index, x_start=x_start, x_end=x_end, width=0, text_density=0.0)
 
-        # Calculate text density in this column region
-        column_slice = binary[:, x_start:x_end]
-        if column_slice.size > 0:
-            density = np.sum(column_slice) / (column_slice.size * 255)
+        # Text density in this column region: the projection already holds
+        # the per-X sum of the binarized column, so no 2D slice is needed
+        column_size = width * height
+        if column_size > 0:
+            density = projection[x_start:x_end].sum() / (column_size * 255)
         else:
             density = 0.0
 
@@ -697,6 +827,10 @@ class CleaningOptions:
     # Configuracao CLAHE para scans escuros
     clahe: CLAHEConfig = field(default_factory=CLAHEConfig)
 
+    # Modo de desempenho (deteccao em proxy reduzido + tiles paralelos)
+    # Se None, usa o pipeline de pagina inteira
+    performance: PerformanceConfig | None = None
+
     def __post_init__(self):
         """Valida parâmetros."""
         if not 0 <= self.watermark_threshold <= 255:
@@ -777,6 +911,15 @@ DEFAULT_STAMP_COLORS: list[tuple[np.ndarray, np.ndarray]] = [
 ]
 
 
+class FastCleaningResult(NamedTuple):
+    """Resultado de ImageCleaner.process_image_fast()."""
+    image: Image.Image
+    mode: CleaningMode
+    proxy_stride: int
+    tiles_processed: int
+    timings: dict[str, float]  # ms por etapa + "total"
+
+
 class ImageCleaner:
     """
     Cleaner de imagens para pré-processamento de OCR.
@@ -787,6 +930,7 @@ class ImageCleaner:
     - remove_color_stamps(): Remove carimbos coloridos (HSV segmentation)
     - remove_speckles(): Remove ruído pontual (morphological opening)
     - process_image(): Orquestrador inteligente (auto-detecção de modo)
+    - process_image_fast(): Modo de desempenho (proxy + tiles paralelos)
 
     Example:
         >>> cleaner = ImageCleaner()
@@ -803,6 +947,7 @@ class ImageCleaner:
         despeckle_kernel_size: int = 3,
         stamp_colors: list[tuple[np.ndarray, np.ndarray]] | None = None,
         clahe_config: CLAHEConfig | None = None,
+        performance: PerformanceConfig | None = None,
     ):
         """
         Inicializa o cleaner com parâmetros configuráveis.
@@ -818,6 +963,8 @@ class ImageCleaner:
                 Se None, usa DEFAULT_STAMP_COLORS.
             clahe_config: Configuracao do CLAHE para scans escuros.
                 Se None, usa configuracao padrao (CLAHEConfig()).
+            performance: Ativa o modo de desempenho em process_image()
+                (ver process_image_fast). Se None, processa a pagina inteira.
         """
         self.watermark_threshold = watermark_threshold
         self.adaptive_block_size = adaptive_block_size
@@ -825,6 +972,7 @@ class ImageCleaner:
         self.despeckle_kernel_size = despeckle_kernel_size
         self.stamp_colors = stamp_colors or DEFAULT_STAMP_COLORS
         self.clahe_config = clahe_config or CLAHEConfig()
+        self.performance = performance
 
     @classmethod
     def from_options(cls, options: CleaningOptions) -> "ImageCleaner":
@@ -848,6 +996,7 @@ class ImageCleaner:
             despeckle_kernel_size=options.despeckle_kernel,
             stamp_colors=options.custom_stamp_colors,
             clahe_config=options.clahe,
+            performance=options.performance,
         )
 
     @staticmethod
@@ -1375,6 +1524,9 @@ class ImageCleaner:
             >>> dark_cleaner = ImageCleaner.from_options(PRESET_DARK_SCAN)
             >>> clean = dark_cleaner.process_image(img, mode="scanned", force_clahe=True)
         """
+        if self.performance is not None:
+            return self.process_image_fast(image_pil, mode, force_clahe).image
+
         # Converte PIL -> Numpy (OpenCV usa BGR, PIL usa RGB)
         img_np = np.array(image_pil)
 
@@ -1446,6 +1598,199 @@ class ImageCleaner:
 
         return result_pil
 
+    def process_image_fast(
+        self,
+        image_pil: Image.Image,
+        mode: str | CleaningMode = "auto",
+        force_clahe: bool = False,
+        config: PerformanceConfig | None = None,
+    ) -> FastCleaningResult:
+        """
+        Modo de desempenho para scans em alta resolucao (300 DPI).
+
+        Mesmos pipelines de process_image(), com tres diferencas:
+        1. Deteccoes (detect_mode, analyze_darkness, has_speckle_noise e
+           mascara de carimbos) rodam em proxy amostrado por passo inteiro
+        2. Filtros caros rodam so nos tiles que precisam: remocao de carimbo
+           apenas onde o proxy encontrou cor; threshold/despeckle pulam tiles
+           uniformes (margens em branco)
+        3. Tiles rodam em paralelo com cv2.setNumThreads(1) durante a secao
+
+        Os tiles usam halo >= raio de cada filtro, entao o resultado e
+        identico ao de process_image() sempre que o proxy detecta os mesmos
+        modos/carimbos. CLAHE continua na pagina inteira (depende do grid
+        global de histogramas).
+
+        Args:
+            image_pil: Imagem PIL (RGB ou grayscale)
+            mode: "auto", "digital", ou "scanned"
+            force_clahe: Se True, aplica CLAHE independente da analise de escuridao.
+            config: Parametros do modo. Se None, usa self.performance ou padrao.
+
+        Returns:
+            FastCleaningResult com imagem, modo usado, tiles e tempos por etapa
+
+        Example:
+            >>> cleaner = ImageCleaner(performance=PerformanceConfig(tile_size=512))
+            >>> result = cleaner.process_image_fast(img)
+            >>> result.timings["threshold_despeckle"]
+        """
+        config = config or self.performance or PerformanceConfig()
+        timer = StageTimer()
+        tiles_processed = 0
+
+        with timer.stage("convert"):
+            img_np = np.array(image_pil)
+            if len(img_np.shape) == 2:
+                gray = img_np
+                img_bgr = None
+            else:
+                img_bgr = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
+                gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+            stride = proxy_stride(gray.shape, config.proxy_max_side)
+            gray_proxy = make_proxy(gray, stride)
+
+        if isinstance(mode, str):
+            mode = CleaningMode(mode.lower())
+
+        if mode == CleaningMode.AUTO:
+            with timer.stage("detect_mode"):
+                mode = self.detect_mode(gray_proxy)
+
+        if mode == CleaningMode.DIGITAL:
+            with timer.stage("watermark"):
+                result = self.remove_gray_watermarks(gray, self.watermark_threshold)
+
+            with timer.stage("speckle_check"):
+                noisy = self.has_speckle_noise(make_proxy(result, stride))
+
+            if noisy:
+                kernel = self.despeckle_kernel_size | 1
+                with timer.stage("despeckle"):
+                    result, tiles_processed = apply_tiled(
+                        result,
+                        lambda region: cv2.medianBlur(region, kernel),
+                        halo=kernel // 2,
+                        tile_size=config.tile_size,
+                        max_workers=config.max_workers,
+                        select=lambda region, _: not is_uniform(region),
+                    )
+
+        else:  # SCANNED
+            result = gray
+
+            if self.clahe_config.enabled:
+                with timer.stage("analyze_darkness"):
+                    metrics = self.analyze_darkness(
+                        gray_proxy,
+                        dark_threshold=self.clahe_config.dark_threshold,
+                        dark_percentile=self.clahe_config.dark_percentile,
+                    )
+
+                if force_clahe or metrics["is_dark"]:
+                    with timer.stage("clahe"):
+                        result = self.apply_clahe(
+                            result,
+                            clip_limit=self.clahe_config.clip_limit,
+                            tile_grid_size=self.clahe_config.tile_grid_size,
+                        )
+                    # BGR reconstruido de cinza nao tem saturacao: sem carimbos
+                    img_bgr = None
+
+            if img_bgr is not None:
+                result, stamp_tiles = self._remove_color_stamps_tiled(
+                    img_bgr, result, stride, config, timer
+                )
+                tiles_processed += stamp_tiles
+
+            block_size = self.adaptive_block_size | 1
+            kernel = self.despeckle_kernel_size | 1
+
+            def threshold_despeckle(region: np.ndarray) -> np.ndarray:
+                binary = self.clean_dirty_scan(region, block_size, self.adaptive_c)
+                return cv2.medianBlur(binary, kernel)
+
+            # Tile uniforme: threshold gaussiano vira constante (255 se C > 0)
+            # e a mediana de uma constante e ela mesma
+            with timer.stage("threshold_despeckle"):
+                result, threshold_tiles = apply_tiled(
+                    result,
+                    threshold_despeckle,
+                    halo=block_size // 2 + kernel // 2,
+                    tile_size=config.tile_size,
+                    max_workers=config.max_workers,
+                    select=lambda region, _: not is_uniform(region),
+                    fill=255 if self.adaptive_c > 0 else 0,
+                )
+                tiles_processed += threshold_tiles
+
+        with timer.stage("convert"):
+            result_pil = Image.fromarray(result, mode="L")
+
+        timings = timer.as_dict()
+        logger.debug(
+            "process_image_fast mode=%s stride=%d tiles=%d timings=%s",
+            mode.value, stride, tiles_processed, timings,
+        )
+        return FastCleaningResult(
+            image=result_pil,
+            mode=mode,
+            proxy_stride=stride,
+            tiles_processed=tiles_processed,
+            timings=timings,
+        )
+
+    def _remove_color_stamps_tiled(
+        self,
+        img_bgr: np.ndarray,
+        gray: np.ndarray,
+        stride: int,
+        config: PerformanceConfig,
+        timer: StageTimer,
+    ) -> tuple[np.ndarray, int]:
+        """
+        Equivalente a remove_color_stamps() restrito aos tiles com cor.
+
+        A mascara HSV e calculada primeiro no proxy; so os tiles proximos a
+        pixels coloridos recebem HSV + inRange + dilatacao em alta resolucao.
+        Pintar de branco no BGR e depois converter equivale a pintar 255 no
+        cinza, entao os demais tiles reaproveitam `gray` sem custo.
+        """
+        # Alcance da dilatacao 5x5 com 2 iteracoes = 4 px
+        halo = 4
+
+        with timer.stage("stamp_mask"):
+            hsv_proxy = cv2.cvtColor(make_proxy(img_bgr, stride), cv2.COLOR_BGR2HSV)
+            proxy_mask = np.zeros(hsv_proxy.shape[:2], dtype=np.uint8)
+            for lower, upper in self.stamp_colors:
+                proxy_mask |= cv2.inRange(hsv_proxy, lower, upper)
+
+        if not proxy_mask.any():
+            return gray, 0
+
+        reach = -(-(halo + config.stamp_margin_px) // stride)
+        proxy_mask = cv2.dilate(proxy_mask, np.ones((2 * reach + 1, 2 * reach + 1), np.uint8))
+
+        def has_stamp(_region: np.ndarray, rect) -> bool:
+            return bool(proxy_mask[
+                rect.y0 // stride:-(-rect.y1 // stride),
+                rect.x0 // stride:-(-rect.x1 // stride),
+            ].any())
+
+        def clean_tile(region: np.ndarray) -> np.ndarray:
+            return self.remove_color_stamps(np.ascontiguousarray(region), self.stamp_colors)
+
+        with timer.stage("stamp_removal"):
+            return apply_tiled(
+                img_bgr,
+                clean_tile,
+                halo=halo,
+                tile_size=config.tile_size,
+                max_workers=config.max_workers,
+                select=has_stamp,
+                out=gray.copy(),
+            )
+
     def process_image_with_layout(
         self,
         image_pil: Image.Image,
@@ -12,7 +12,7 @@ Componentes:
 
 from .definitions import TaxonomyLoader, LegalTaxonomy, get_taxonomy, reload_taxonomy
 from .cleaning_rules import CLEANING_PATTERNS, CleaningRules
-from .cleaner_advanced import AdvancedCleaner
+from .cleaner_advanced import AdvancedCleaner, StreamingCleaner
 from .segmenter import DocumentSegmenter
 from .boundary_config import (
     BoundaryConfig,
@@ -39,6 +39,7 @@ __all__ = [
     "CLEANING_PATTERNS",
     "CleaningRules",
     "AdvancedCleaner",
+    "StreamingCleaner",
     # Segmentacao
     "DocumentSegmenter",
     # Boundary Detection
@@ -14,7 +14,7 @@ from __future__ import annotations
 import re
 import unicodedata
 from dataclasses import dataclass, field
-from typing import TypedDict
+from typing import Callable, Iterable, Iterator, TypedDict
 
 from .cleaning_rules import CleaningRules, RULE_ORDER
 
@@ -229,6 +229,22 @@ class AdvancedCleaner:
 
         return "\n".join(result_parts)
 
+    def clean_stream(
+        self, pages: Iterable[str], context_chars: int = 500
+    ) -> Iterator[str]:
+        """
+        Limpa paginas incrementalmente, a medida que chegam da extracao.
+
+        Args:
+            pages: Iteravel de textos de paginas (ex: generator)
+            context_chars: Contexto maximo retido entre paginas
+
+        Yields:
+            Blocos de texto limpo, prontos para concatenacao direta
+        """
+        streamer = StreamingCleaner(clean_fn=self.clean_page, context_chars=context_chars)
+        yield from streamer.stream(pages)
+
     def get_summary_stats(self, stats_list: list[CleaningStats]) -> dict:
         """
         Calcula estatisticas agregadas de limpeza.
@@ -277,3 +293,163 @@ class AdvancedCleaner:
             "total_rules_applied": total_rules,
             "most_common_patterns": sorted_patterns[:10],
         }
+
+
+# Caracteres finais de linha que permitem corte seguro entre blocos: fim de
+# sentenca. Letras, virgula, ponto-e-virgula e hifen indicam continuacao
+# (fix_hyphenated_words / fix_broken_sentences); digitos podem ser numero de
+# pagina isolado (remove_page_numbers precisa da quebra seguinte).
+_SAFE_BREAK_CHARS = frozenset(".:!?)]\"'\u00bb")
+
+
+@dataclass
+class StreamingCleaner:
+    """
+    Limpeza incremental pagina a pagina com contexto limitado entre paginas.
+
+    Regras como fix_hyphenated_words e fix_broken_sentences atravessam
+    quebras de pagina. Em vez de concatenar o documento inteiro, o final de
+    cada pagina (ate context_chars) e retido e prefixado a pagina seguinte.
+    O corte e feito preferencialmente apos fim de sentenca, de modo que o
+    resultado equivale a limpeza do texto combinado. Memoria de pico: uma
+    pagina + contexto.
+    """
+
+    clean_fn: Callable[[str], str]
+    context_chars: int = 500
+    page_separator: str = "\n\n"
+
+    _carry: str = field(default="", repr=False)
+    _emitted: bool = field(default=False, repr=False)
+    _last_char: str = field(default="", repr=False)
+    pages_fed: int = field(default=0, repr=False)
+    peak_buffer_chars: int = field(default=0, repr=False)
+
+    def feed(self, page_text: str) -> str:
+        """
+        Recebe o texto de uma pagina e retorna o trecho que ja pode ser emitido.
+
+        Args:
+            page_text: Texto bruto da pagina
+
+        Returns:
+            Texto limpo (pode ser vazio se tudo ficou retido como contexto)
+        """
+        self.pages_fed += 1
+        if not page_text:
+            return ""
+
+        if self._carry:
+            buffer = self._carry + self.page_separator + page_text
+        else:
+            buffer = page_text
+        self.peak_buffer_chars = max(self.peak_buffer_chars, len(buffer))
+
+        split = self._find_split(buffer)
+        self._carry = buffer[split:]
+        return self._emit(buffer[:split])
+
+    def flush(self) -> str:
+        """
+        Limpa e retorna o contexto retido. Chamar apos a ultima pagina.
+
+        Returns:
+            Texto limpo restante
+        """
+        remaining, self._carry = self._carry, ""
+        return self._emit(remaining)
+
+    def stream(self, pages: Iterable[str]) -> Iterator[str]:
+        """
+        Limpa um iteravel de paginas, emitindo blocos nao vazios.
+
+        Args:
+            pages: Iteravel de textos de paginas
+
+        Yields:
+            Blocos de texto limpo (incluindo separadores entre blocos)
+        """
+        for page_text in pages:
+            chunk = self.feed(page_text)
+            if chunk:
+                yield chunk
+        chunk = self.flush()
+        if chunk:
+            yield chunk
+
+    def _emit(self, raw: str) -> str:
+        """
+        Limpa um trecho e prefixa o separador entre blocos.
+
+        O ultimo caractere ja emitido e reinserido antes do trecho durante a
+        limpeza, para que regras ancoradas em quebra de linha (ex: numero de
+        pagina isolado logo apos o corte) vejam o mesmo contexto que veriam
+        no texto combinado. O separador resultante vem da propria limpeza.
+        """
+        if not raw.strip():
+            # So espaco em branco: devolve ao contexto para o proximo bloco
+            self._carry = raw + self._carry
+            return ""
+
+        anchor = self._last_char
+        cleaned = self.clean_fn(anchor + raw)
+        if anchor and cleaned.startswith(anchor):
+            cleaned = cleaned[len(anchor):]
+        body = cleaned.lstrip()
+        if not body:
+            return ""
+        self._last_char = raw.rstrip()[-1]
+
+        if not self._emitted:
+            self._emitted = True
+            return body
+
+        leading = cleaned[: len(cleaned) - len(body)]
+        newlines = leading.count("\n")
+        if newlines > 1:
+            separator = "\n\n"
+        elif newlines == 1:
+            separator = "\n"
+        else:
+            separator = " " if leading else ""
+        return separator + body
+
+    def _find_split(self, buffer: str) -> int:
+        """
+        Escolhe o ponto de corte entre texto emitido e contexto retido.
+
+        Prioridade dentro da janela final de context_chars:
+        1. Fim de sentenca seguido de quebra de paragrafo
+        2. Fim de sentenca seguido de quebra de linha
+        3. Espaco dentro de uma linha
+        4. Corte fixo em len - context_chars
+
+        O espaco em branco no corte fica no contexto retido.
+
+        Returns:
+            Indice de corte (buffer[:idx] e emitido, buffer[idx:] retido)
+        """
+        window_start = max(0, len(buffer) - self.context_chars)
+        if window_start == 0:
+            return 0
+
+        line_break = None
+        idx = buffer.rfind("\n", window_start)
+        while idx != -1:
+            start = len(buffer[:idx].rstrip())
+            if start > 0 and buffer[start - 1] in _SAFE_BREAK_CHARS:
+                if buffer.count("\n", start, idx + 2) > 1:
+                    return start
+                if line_break is None:
+                    line_break = start
+            idx = buffer.rfind("\n", window_start, start)
+        if line_break is not None:
+            return line_break
+
+        idx = buffer.rfind(" ", window_start)
+        while idx != -1:
+            if buffer[idx - 1] not in "\n " and buffer[idx + 1 : idx + 2] not in ("\n", " ", ""):
+                return idx
+            idx = buffer.rfind(" ", window_start, idx)
+
+        return window_start
@@ -0,0 +1,264 @@
+"""
+Raster Quality - Estimativa de qualidade de paginas escaneadas via thumbnail.
+
+Metricas calculadas em uma renderizacao de baixa resolucao (~72 DPI) da
+safe_bbox, baratas o suficiente para rodar em todas as paginas RASTER_NEEDED
+antes de escolher o engine (tesseract vs marker):
+
+1. contrast_score: separacao tinta/papel pelo limiar de Otsu
+   (percentil baixo da tinta vs mediana do papel, normalizada 0-1)
+2. noise_level: desvio padrao do ruido no papel (estimador de Immerkaer,
+   Laplaciano 3x3), normalizado 0-1
+3. sharpness: variancia do Laplaciano na pagina (foco/borrado)
+4. has_watermark: camada cinza intermediaria longe do texto (marca d'agua
+   semi-transparente) ou camada cinza com pico no espectro de Fourier
+   (marca d'agua repetida em mosaico)
+
+As paginas sao renderizadas com pypdfium2 (ja dependencia do pdfplumber).
+estimate_pages() distribui paginas entre processos; cada processo abre o PDF
+uma vez, pois o pdfium nao e thread-safe.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Sequence
+
+import cv2
+import numpy as np
+
+# Kernel do estimador de ruido de Immerkaer (1996): anula bordas lineares
+_NOISE_KERNEL = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+
+# Desvio padrao de ruido considerado "maximo" (noise_level = 1.0)
+NOISE_SIGMA_SCALE = 20.0
+
+# Desvio padrao abaixo do qual a pagina e considerada em branco
+BLANK_STD = 2.0
+
+# Fracao minima de pixels em areas solidas da faixa cinza para marca d'agua
+GRAY_LAYER_RATIO = 0.015
+
+# Pico espectral / mediana da camada cinza para considerar padrao periodico
+# (vale a partir de PERIODIC_MIN_RATIO de pixels na camada)
+PERIODIC_PEAK_RATIO = 100.0
+PERIODIC_MIN_RATIO = 0.005
+
+
+def compute_raster_quality(gray: np.ndarray) -> dict:
+    """
+    Calcula metricas de qualidade de uma thumbnail em escala de cinza.
+
+    Args:
+        gray: Imagem grayscale (np.ndarray uint8, shape HxW), ja recortada
+            na safe_bbox.
+
+    Returns:
+        Dict com metricas:
+        {
+            "contrast_score": float (0.0-1.0),
+            "noise_level": float (0.0-1.0),
+            "sharpness": float (variancia do Laplaciano),
+            "gray_layer_ratio": float,
+            "periodicity": float,
+            "has_watermark": bool,
+            "is_blank": bool
+        }
+    """
+    if gray.ndim != 2:
+        raise ValueError("Input deve ser grayscale (2D array)")
+
+    # Estatisticas de intensidade via histograma (evita ordenar a imagem)
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    total = hist.sum()
+    mean = float((hist * levels).sum() / total) if total else 0.0
+    std = math.sqrt(float((hist * (levels - mean) ** 2).sum() / total)) if total else 0.0
+
+    if gray.size == 0 or std < BLANK_STD:
+        # Pagina em branco: OCR trivial, nao vale o engine pesado
+        return {
+            "contrast_score": 1.0,
+            "noise_level": 0.0,
+            "sharpness": 0.0,
+            "gray_layer_ratio": 0.0,
+            "periodicity": 0.0,
+            "has_watermark": False,
+            "is_blank": True,
+        }
+
+    # 1. Contraste: tinta (percentil baixo da classe escura, ignora o
+    # anti-aliasing) vs papel (mediana da classe clara), separados por Otsu
+    otsu, _ = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    ink_mask = gray <= otsu
+    split = int(otsu) + 1
+    ink_level = _hist_quantile(hist[:split], 0.10, offset=0, default=0.0)
+    paper_level = _hist_quantile(hist[split:], 0.50, offset=split, default=255.0)
+    contrast_score = max(0.0, min(1.0, (paper_level - ink_level) / 255.0))
+
+    # 2. Ruido: Immerkaer restrito ao papel (sem bordas de texto)
+    residual = np.abs(cv2.filter2D(gray.astype(np.float32), -1, _NOISE_KERNEL))
+    near_ink = cv2.dilate(ink_mask.astype(np.uint8), np.ones((3, 3), np.uint8)).astype(bool)
+    paper_mask = ~near_ink
+    if paper_mask.sum() > 0.05 * gray.size:
+        sigma = math.sqrt(math.pi / 2) * float(residual[paper_mask].mean()) / 6.0
+    else:
+        sigma = math.sqrt(math.pi / 2) * float(residual.mean()) / 6.0
+    noise_level = min(1.0, sigma / NOISE_SIGMA_SCALE)
+
+    # 3. Nitidez
+    _, laplacian_std = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_32F))
+    sharpness = float(laplacian_std[0, 0]) ** 2
+
+    # 4a. Camada cinza: pixels entre tinta e papel, longe do texto
+    # (o anti-aliasing das letras fica colado aos pixels de tinta)
+    spread = paper_level - ink_level
+    band = (
+        (gray > ink_level + 0.35 * spread)
+        & (gray < paper_level - max(0.08 * spread, 3.0 * sigma))
+        & paper_mask
+    )
+    band_ratio = float(band.mean())
+    # Abertura 3x3 mantem so areas solidas (halo de texto borrado e fino)
+    solid = cv2.morphologyEx(band.astype(np.uint8), cv2.MORPH_OPEN, np.ones((3, 3), np.uint8))
+    gray_layer_ratio = float(solid.mean())
+
+    # 4b. Periodicidade da camada cinza (marca d'agua fina repetida em mosaico)
+    periodicity = _periodicity(band.astype(np.float32)) if band.any() else 0.0
+
+    has_watermark = gray_layer_ratio > GRAY_LAYER_RATIO or (
+        band_ratio > PERIODIC_MIN_RATIO and periodicity > PERIODIC_PEAK_RATIO
+    )
+
+    return {
+        "contrast_score": round(contrast_score, 4),
+        "noise_level": round(noise_level, 4),
+        "sharpness": round(sharpness, 2),
+        "gray_layer_ratio": round(gray_layer_ratio, 4),
+        "periodicity": round(periodicity, 2),
+        "has_watermark": bool(has_watermark),
+        "is_blank": False,
+    }
+
+
+def _hist_quantile(hist: np.ndarray, q: float, offset: int, default: float) -> float:
+    """Quantil (menor nivel com acumulado >= q) de um trecho do histograma."""
+    total = hist.sum()
+    if total == 0:
+        return default
+    return float(offset + int(np.searchsorted(np.cumsum(hist), q * total)))
+
+
+def _periodicity(layer: np.ndarray) -> float:
+    """Razao pico/mediana do espectro de uma camada, fora das baixas frequencias."""
+    height, width = layer.shape
+    size_y, size_x = cv2.getOptimalDFTSize(height), cv2.getOptimalDFTSize(width)
+    padded = np.zeros((size_y, size_x), dtype=np.float32)
+    padded[:height, :width] = layer - float(layer.mean())
+
+    spectrum = np.abs(np.fft.rfft2(padded))
+    # Frequencias normalizadas (ciclos/pixel) para independer do tamanho
+    fy = np.fft.fftfreq(size_y)[:, None]
+    fx = np.fft.rfftfreq(size_x)[None, :]
+    radius = np.sqrt(fy ** 2 + fx ** 2)
+    values = spectrum[(radius > 0.01) & (radius < 0.25)]
+    if values.size == 0:
+        return 0.0
+    median = float(np.median(values))
+    if median <= 0:
+        return 0.0
+    return float(values.max()) / median
+
+
+def render_thumbnail(pdf, page_index: int, safe_bbox: Sequence[float], dpi: int) -> np.ndarray:
+    """
+    Renderiza a safe_bbox de uma pagina em grayscale com pypdfium2.
+
+    Args:
+        pdf: pypdfium2.PdfDocument aberto
+        page_index: Indice da pagina (0-indexed)
+        safe_bbox: [x0, top, x1, bottom] em pontos (coordenadas do pdfplumber)
+        dpi: Resolucao da thumbnail
+
+    Returns:
+        np.ndarray uint8 HxW
+    """
+    page = pdf[page_index]
+    try:
+        page_width, page_height = page.get_size()
+        x0, top, x1, bottom = safe_bbox
+        # crop do pdfium: quanto remover de cada lado (esq, baixo, dir, cima)
+        crop = (
+            max(0.0, x0),
+            max(0.0, page_height - bottom),
+            max(0.0, page_width - x1),
+            max(0.0, top),
+        )
+        bitmap = page.render(scale=dpi / 72.0, crop=crop, grayscale=True)
+        image = bitmap.to_numpy()
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return np.ascontiguousarray(image)
+    finally:
+        page.close()
+
+
+def _estimate_chunk(
+    pdf_path: str, jobs: list[tuple[int, list[float]]], dpi: int
+) -> dict[int, dict]:
+    """Worker: abre o PDF uma vez e mede um lote de paginas (1-indexed)."""
+    import pypdfium2 as pdfium
+
+    results = {}
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        for page_num, safe_bbox in jobs:
+            thumbnail = render_thumbnail(pdf, page_num - 1, safe_bbox, dpi)
+            results[page_num] = compute_raster_quality(thumbnail)
+    finally:
+        pdf.close()
+    return results
+
+
+def estimate_pages(
+    pdf_path: Path,
+    jobs: Sequence[tuple[int, list[float]]],
+    dpi: int = 72,
+    max_workers: int | None = None,
+    parallel_min_pages: int = 4,
+) -> dict[int, dict]:
+    """
+    Pre-passe de qualidade para varias paginas, em paralelo.
+
+    Args:
+        pdf_path: Caminho do PDF
+        jobs: Lista de (page_num 1-indexed, safe_bbox)
+        dpi: Resolucao das thumbnails
+        max_workers: Processos (None = os.cpu_count())
+        parallel_min_pages: Abaixo disso, roda no processo atual
+            (spawn de processos custa mais que renderizar poucas paginas)
+
+    Returns:
+        Dict page_num -> metricas de compute_raster_quality()
+    """
+    jobs = [(page_num, list(bbox)) for page_num, bbox in jobs]
+    if not jobs:
+        return {}
+
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1 or len(jobs) < parallel_min_pages:
+        return _estimate_chunk(str(pdf_path), jobs, dpi)
+
+    # Lotes contiguos: cada processo abre o PDF uma unica vez
+    chunk_size = math.ceil(len(jobs) / workers)
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+    results: dict[int, dict] = {}
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        futures = [pool.submit(_estimate_chunk, str(pdf_path), chunk, dpi) for chunk in chunks]
+        for future in futures:
+            results.update(future.result())
+    return results
@@ -0,0 +1,234 @@
+"""
+Tiling - Execucao de filtros OpenCV por blocos (tiles) com halo.
+
+Primitivas compartilhadas pelos caminhos rapidos do ImageCleaner e do
+VisionProcessor:
+1. Proxy reduzido para heuristicas baseadas em histograma
+2. Particao da pagina em tiles com halo (borda extra) para filtros de vizinhanca
+3. Execucao paralela dos tiles selecionados, ajustando cv2.setNumThreads
+   para nao competir com o paralelismo interno do OpenCV
+4. Cronometragem por etapa (StageTimer)
+
+Com halo >= raio do filtro, o resultado de cada tile e identico ao do filtro
+aplicado na pagina inteira (bordas da imagem continuam usando o mesmo
+BORDER_REPLICATE/REFLECT, pois o recorte e limitado a imagem).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, NamedTuple
+
+import cv2
+import numpy as np
+
+
+@dataclass
+class PerformanceConfig:
+    """
+    Configuracao do modo de desempenho (proxy reduzido + tiles paralelos).
+
+    Attributes:
+        proxy_max_side: Maior lado do proxy usado nas deteccoes (px).
+            O proxy e amostrado por passo inteiro (sem interpolacao), o que
+            preserva a distribuicao do histograma da pagina.
+        tile_size: Lado de cada tile processado em alta resolucao (px).
+        max_workers: Threads para tiles. None = cv2.getNumThreads().
+        stamp_margin_px: Margem extra ao mapear a mascara de carimbos do proxy
+            para tiles em alta resolucao (compensa a amostragem).
+    """
+
+    proxy_max_side: int = 1024
+    tile_size: int = 512
+    max_workers: int | None = None
+    stamp_margin_px: int = 16
+
+    def __post_init__(self):
+        """Valida parametros."""
+        if self.proxy_max_side < 64:
+            raise ValueError("proxy_max_side deve ser >= 64")
+        if self.tile_size < 32:
+            raise ValueError("tile_size deve ser >= 32")
+        if self.max_workers is not None and self.max_workers < 1:
+            raise ValueError("max_workers deve ser >= 1")
+
+
+@dataclass
+class StageTimer:
+    """Acumula tempos por etapa (ms), na ordem de execucao."""
+
+    stages: dict[str, float] = field(default_factory=dict)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Cronometra um bloco; chamadas repetidas acumulam no mesmo nome."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.stages.values())
+
+    def as_dict(self) -> dict[str, float]:
+        """Tempos arredondados + total, para logs e metadados."""
+        result = {name: round(ms, 3) for name, ms in self.stages.items()}
+        result["total"] = round(self.total_ms, 3)
+        return result
+
+
+class TileRect(NamedTuple):
+    """Tile da grade: nucleo [y0:y1, x0:x1] e recorte com halo [hy0:hy1, hx0:hx1]."""
+
+    y0: int
+    y1: int
+    x0: int
+    x1: int
+    hy0: int
+    hy1: int
+    hx0: int
+    hx1: int
+
+    @property
+    def core_in_halo(self) -> tuple[slice, slice]:
+        """Slices do nucleo relativos ao recorte com halo."""
+        return (
+            slice(self.y0 - self.hy0, self.y1 - self.hy0),
+            slice(self.x0 - self.hx0, self.x1 - self.hx0),
+        )
+
+
+def proxy_stride(shape: tuple[int, ...], max_side: int) -> int:
+    """Passo de amostragem para que o maior lado fique <= max_side."""
+    return max(1, -(-max(shape[:2]) // max_side))
+
+
+def make_proxy(image: np.ndarray, stride: int) -> np.ndarray:
+    """Amostra a imagem por passo inteiro (contigua, pronta para OpenCV)."""
+    if stride == 1:
+        return image
+    return np.ascontiguousarray(image[::stride, ::stride])
+
+
+def iter_tiles(shape: tuple[int, ...], tile_size: int, halo: int) -> list[TileRect]:
+    """Particiona HxW em tiles com halo limitado as bordas da imagem."""
+    height, width = shape[:2]
+    tiles = []
+    for y0 in range(0, height, tile_size):
+        y1 = min(y0 + tile_size, height)
+        for x0 in range(0, width, tile_size):
+            x1 = min(x0 + tile_size, width)
+            tiles.append(TileRect(
+                y0, y1, x0, x1,
+                max(0, y0 - halo), min(height, y1 + halo),
+                max(0, x0 - halo), min(width, x1 + halo),
+            ))
+    return tiles
+
+
+def is_uniform(region: np.ndarray) -> bool:
+    """True se todos os pixels do recorte tem o mesmo valor."""
+    low, high, _, _ = cv2.minMaxLoc(region if region.ndim == 2 else region.reshape(-1, 1))
+    return low == high
+
+
+def resolve_workers(max_workers: int | None) -> int:
+    """Threads para tiles: por padrao, o mesmo orcamento do OpenCV."""
+    if max_workers is not None:
+        return max_workers
+    return max(1, min(cv2.getNumThreads(), os.cpu_count() or 1))
+
+
+_threads_lock = threading.Lock()
+_threads_depth = 0
+_threads_saved = 0
+
+
+@contextmanager
+def opencv_single_threaded() -> Iterator[None]:
+    """
+    Desliga o paralelismo interno do OpenCV enquanto tiles rodam em threads.
+
+    cv2.setNumThreads e global ao processo; o contador permite secoes
+    aninhadas/concorrentes e restaura o valor original so na ultima saida.
+    """
+    global _threads_depth, _threads_saved
+    with _threads_lock:
+        if _threads_depth == 0:
+            _threads_saved = cv2.getNumThreads()
+            cv2.setNumThreads(1)
+        _threads_depth += 1
+    try:
+        yield
+    finally:
+        with _threads_lock:
+            _threads_depth -= 1
+            if _threads_depth == 0:
+                cv2.setNumThreads(_threads_saved)
+
+
+def apply_tiled(
+    image: np.ndarray,
+    fn: Callable[[np.ndarray], np.ndarray],
+    *,
+    halo: int,
+    tile_size: int = 512,
+    max_workers: int | None = None,
+    select: Callable[[np.ndarray, TileRect], bool] | None = None,
+    out: np.ndarray | None = None,
+    fill: int | None = None,
+) -> tuple[np.ndarray, int]:
+    """
+    Aplica `fn` tile a tile e monta o resultado.
+
+    Args:
+        image: Imagem de entrada (2D ou HxWxC).
+        fn: Filtro aplicado ao recorte com halo; deve retornar array 2D com
+            o mesmo HxW do recorte.
+        halo: Borda extra (px) >= raio de influencia do filtro.
+        tile_size: Lado do tile (px).
+        max_workers: Threads (None = resolve_workers()). 1 = serial, sem
+            alterar cv2.setNumThreads.
+        select: Predicado (recorte, rect) -> bool. Tiles nao selecionados
+            mantem o conteudo de `out`.
+        out: Saida pre-inicializada (2D). Se None, usa `fill` ou copia de `image`.
+        fill: Valor inicial da saida quando `out` e None.
+
+    Returns:
+        Tupla (saida, numero de tiles processados).
+    """
+    if out is None:
+        if fill is not None:
+            out = np.full(image.shape[:2], fill, dtype=np.uint8)
+        else:
+            out = image.copy()
+
+    selected = []
+    for rect in iter_tiles(image.shape, tile_size, halo):
+        region = image[rect.hy0:rect.hy1, rect.hx0:rect.hx1]
+        if select is None or select(region, rect):
+            selected.append((rect, region))
+
+    def run(item: tuple[TileRect, np.ndarray]) -> None:
+        rect, region = item
+        # Regioes de tiles distintos nao se sobrepoem no nucleo: escrita segura
+        out[rect.y0:rect.y1, rect.x0:rect.x1] = fn(region)[rect.core_in_halo]
+
+    workers = min(resolve_workers(max_workers), len(selected))
+    if workers <= 1:
+        for item in selected:
+            run(item)
+    else:
+        with opencv_single_threaded(), ThreadPoolExecutor(max_workers=workers) as pool:
+            # list() propaga excecoes dos workers
+            list(pool.map(run, selected))
+
+    return out, len(selected)
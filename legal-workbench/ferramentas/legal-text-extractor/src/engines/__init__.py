@@ -12,12 +12,24 @@ Architecture (Marker-only):
   - paginate_output: Preserves page references
   - drop_repeated_text: Removes headers/footers noise
 
+- ChunkedMarkerExtractor: page_range windows with resumable checkpoints
+  (MarkerEngine.extract_chunked, Celery worker for large filings)
+
+- LocalChunkPool: page windows in parallel over warm worker processes
+  (MarkerEngine.extract_parallel; Marker or Tesseract workers)
+
+- MarkerModelRegistry: Process-wide, reference-counted Marker models
+  (shared by MarkerEngine and PipelineOrchestrator)
+
 - CleanerEngine: Post-processing for judicial system artifacts
 """
 
 from .base import ExtractionEngine, ExtractionResult
 from .cleaning_engine import CleanerEngine, DetectionResult, get_cleaner
+from .marker_chunked import ChunkedMarkerExtractor, ChunkProgress, ChunkedResult
 from .marker_engine import MarkerEngine, MarkerConfig
+from .marker_pool import LocalChunkPool, MarkerChunkWorker, TesseractChunkWorker
+from .model_registry import MarkerModelRegistry, get_marker_registry
 
 __all__ = [
     # Base interfaces
@@ -27,6 +39,14 @@ __all__ = [
     # Primary extraction engine
     "MarkerEngine",
     "MarkerConfig",
+    "ChunkedMarkerExtractor",
+    "ChunkProgress",
+    "ChunkedResult",
+    "LocalChunkPool",
+    "MarkerChunkWorker",
+    "TesseractChunkWorker",
+    "MarkerModelRegistry",
+    "get_marker_registry",
 
     # Post-processing
     "CleanerEngine",
@@ -0,0 +1,352 @@
+"""
+Chunked local Marker extraction - page_range windows with resumable checkpoints.
+
+Converting a 500+ page filing in one Marker call keeps every page's layout,
+OCR and render state alive at once and is a single all-or-nothing unit of
+work (MARKER_TIMEOUT / OOM lose everything). This module runs the document as
+consecutive page_range windows through ONE warm converter instead:
+
+- Bounded memory: only one window's render state is alive at a time
+- Streaming: each finished window is written to disk (atomic rename), the
+  final text is assembled by streaming the chunk files
+- Progress: a callback receives ChunkProgress after every window
+- Resumable: a manifest records finished windows; rerunning with the same
+  work_dir and the same PDF/settings skips them (e.g. after a worker restart)
+
+Like model_registry, this module depends only on the standard library so
+the docker text-extractor service can ship it as a standalone file.
+
+Example:
+    >>> with get_marker_registry().lease() as models:
+    ...     converter = PdfConverter(artifact_dict=models, config=config_dict)
+    ...     extractor = ChunkedMarkerExtractor(page_range_converter(converter), chunk_size=50)
+    ...     result = extractor.run(pdf_path, total_pages, work_dir=Path("/tmp/job-123"))
+    >>> result.output_path.read_text()
+"""
+
+import gc
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+OUTPUT_NAME = "output.md"
+
+# Converts one window: (pdf_path, 0-indexed page list) -> text
+ChunkConverter = Callable[[str, list[int]], str]
+
+
+@dataclass
+class ChunkProgress:
+    """Progress after a window finishes (or is skipped on resume)."""
+
+    chunk: int
+    total_chunks: int
+    pages_done: int
+    total_pages: int
+    page_range: tuple[int, int]
+    chunk_seconds: float
+    resumed: bool = False
+
+    @property
+    def percent(self) -> float:
+        return round(100.0 * self.pages_done / self.total_pages, 1) if self.total_pages else 100.0
+
+
+@dataclass
+class ChunkedResult:
+    """Outcome of a chunked extraction."""
+
+    output_path: Path
+    total_pages: int
+    total_chunks: int
+    resumed_chunks: int
+    chars: int
+    processing_seconds: float
+
+
+def plan_chunks(total_pages: int, chunk_size: int) -> list[list[int]]:
+    """
+    Split pages into consecutive windows.
+
+    Args:
+        total_pages: Number of pages in the PDF
+        chunk_size: Pages per window
+
+    Returns:
+        List of 0-indexed page lists
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+    return [
+        list(range(start, min(start + chunk_size, total_pages)))
+        for start in range(0, total_pages, chunk_size)
+    ]
+
+
+def file_sha256(path: Path, block_size: int = 1024 * 1024) -> str:
+    """sha256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def keep_checkpoint_for_retry(
+    error: Optional[BaseException],
+    retries: int,
+    max_retries: Optional[int],
+    retry_on: tuple[type[BaseException], ...],
+) -> bool:
+    """
+    Whether a failed run will be retried, so its work_dir must survive.
+
+    Args:
+        error: Exception that ended the run (None on success)
+        retries: Retries already done for this task
+        max_retries: Retry budget (None = unlimited)
+        retry_on: Exception types the task retries automatically
+
+    Returns:
+        True when the checkpoint (and the input PDF) are needed by the retry
+    """
+    if error is None or not isinstance(error, retry_on):
+        return False
+    return max_retries is None or retries < max_retries
+
+
+def page_range_converter(
+    converter,
+    text_fn: Optional[Callable[[object], str]] = None,
+) -> ChunkConverter:
+    """
+    Adapt a warm marker PdfConverter to a ChunkConverter.
+
+    Marker reads page_range from the converter config when it builds the
+    document provider, so one converter (and its processors) is reused for
+    every window by updating that key.
+
+    Args:
+        converter: marker PdfConverter built with a dict config
+        text_fn: rendered -> text (default: rendered.markdown)
+    """
+    if text_fn is None:
+        text_fn = lambda rendered: rendered.markdown  # noqa: E731
+    if converter.config is None:
+        converter.config = {}
+
+    def convert(pdf_path: str, pages: list[int]) -> str:
+        converter.config["page_range"] = pages
+        try:
+            return text_fn(converter(pdf_path)) or ""
+        finally:
+            converter.config.pop("page_range", None)
+
+    return convert
+
+
+class ChunkCheckpoint:
+    """
+    On-disk state of a chunked extraction (manifest + one file per window).
+
+    The manifest stores a fingerprint (PDF hash + settings); a mismatch
+    discards previous chunk files instead of mixing two documents. ``state``
+    holds run decisions that are not part of the fingerprint (e.g. a chunk
+    size picked from free memory); it is saved with the manifest and restored
+    on resume so the chunk plan stays the same.
+    """
+
+    def __init__(self, work_dir: Path, fingerprint: dict):
+        self.work_dir = Path(work_dir)
+        self.fingerprint = fingerprint
+        self.completed: set[int] = set()
+        self.state: dict = {}
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.work_dir / MANIFEST_NAME
+
+    def chunk_path(self, index: int) -> Path:
+        return self.work_dir / f"chunk_{index:05d}.md"
+
+    def load(self) -> set[int]:
+        """Load finished windows (resets the directory on fingerprint mismatch)."""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.completed = set()
+        self.state = {}
+        if self.manifest_path.exists():
+            try:
+                manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                manifest = {}
+            if manifest.get("fingerprint") == self.fingerprint:
+                self.completed = {
+                    index for index in manifest.get("completed", [])
+                    if self.chunk_path(index).exists()
+                }
+                self.state = manifest.get("state", {})
+            else:
+                logger.info(f"Chunk checkpoint mismatch in {self.work_dir}, starting over")
+                self._reset()
+        return self.completed
+
+    def mark_done(self, index: int, text: str) -> None:
+        """Persist a finished window, then record it in the manifest."""
+        _atomic_write(self.chunk_path(index), text)
+        self.completed.add(index)
+        manifest = {
+            "fingerprint": self.fingerprint,
+            "completed": sorted(self.completed),
+            "state": self.state,
+        }
+        _atomic_write(self.manifest_path, json.dumps(manifest))
+
+    def assemble(self, total_chunks: int, output_path: Path, separator: str = "\n\n") -> int:
+        """
+        Stream chunk files into the final output.
+
+        Returns:
+            Number of characters written
+        """
+        chars = 0
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            for index in range(total_chunks):
+                text = self.chunk_path(index).read_text(encoding="utf-8")
+                if index and text:
+                    chars += out.write(separator)
+                chars += out.write(text)
+        os.replace(tmp_path, output_path)
+        return chars
+
+    def cleanup(self) -> None:
+        """Remove checkpoint files; drops work_dir if nothing else is in it."""
+        self._reset()
+        try:
+            self.work_dir.rmdir()
+        except OSError:
+            pass  # holds the assembled output (or other files)
+
+    def _reset(self) -> None:
+        for path in self.work_dir.glob("chunk_*.md"):
+            path.unlink()
+        if self.manifest_path.exists():
+            self.manifest_path.unlink()
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+class ChunkedMarkerExtractor:
+    """
+    Run a PDF through a ChunkConverter window by window.
+
+    Example:
+        >>> extractor = ChunkedMarkerExtractor(convert_chunk, chunk_size=50)
+        >>> result = extractor.run(pdf_path, 620, work_dir, progress_callback=print)
+    """
+
+    def __init__(self, convert_chunk: ChunkConverter, chunk_size: int = 50):
+        """
+        Args:
+            convert_chunk: (pdf_path, 0-indexed pages) -> text for that window
+            chunk_size: Pages per window
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be > 0")
+        self.convert_chunk = convert_chunk
+        self.chunk_size = chunk_size
+
+    def run(
+        self,
+        pdf_path: Path,
+        total_pages: int,
+        work_dir: Path,
+        progress_callback: Optional[Callable[[ChunkProgress], None]] = None,
+        settings: Optional[dict] = None,
+        output_path: Optional[Path] = None,
+    ) -> ChunkedResult:
+        """
+        Extract all windows (skipping ones already checkpointed) and assemble.
+
+        Args:
+            pdf_path: PDF to convert
+            total_pages: Page count of the PDF
+            work_dir: Checkpoint directory (reuse it to resume)
+            progress_callback: Called with ChunkProgress after each window
+            settings: Extra values that must match to resume (e.g. Marker config)
+            output_path: Final text file (default: work_dir/output.md)
+
+        Returns:
+            ChunkedResult; chunk files are removed once the output is assembled
+        """
+        start = time.perf_counter()
+        pdf_path = Path(pdf_path)
+        work_dir = Path(work_dir)
+        output_path = Path(output_path) if output_path else work_dir / OUTPUT_NAME
+
+        chunks = plan_chunks(total_pages, self.chunk_size)
+        fingerprint = {
+            "pdf_sha256": file_sha256(pdf_path),
+            "total_pages": total_pages,
+            "chunk_size": self.chunk_size,
+            "settings": settings or {},
+        }
+        checkpoint = ChunkCheckpoint(work_dir, fingerprint)
+        completed = set(checkpoint.load())
+        if completed:
+            logger.info(
+                f"Resuming {pdf_path.name}: {len(completed)}/{len(chunks)} chunks already done"
+            )
+
+        pages_done = 0
+        for index, pages in enumerate(chunks):
+            chunk_start = time.perf_counter()
+            resumed = index in completed
+            if not resumed:
+                logger.info(
+                    f"Marker chunk {index + 1}/{len(chunks)}: "
+                    f"pages {pages[0] + 1}-{pages[-1] + 1}"
+                )
+                text = self.convert_chunk(str(pdf_path), pages)
+                checkpoint.mark_done(index, text)
+                del text
+                gc.collect()
+
+            pages_done += len(pages)
+            if progress_callback:
+                progress_callback(ChunkProgress(
+                    chunk=index + 1,
+                    total_chunks=len(chunks),
+                    pages_done=pages_done,
+                    total_pages=total_pages,
+                    page_range=(pages[0], pages[-1]),
+                    chunk_seconds=round(time.perf_counter() - chunk_start, 2),
+                    resumed=resumed,
+                ))
+
+        chars = checkpoint.assemble(len(chunks), output_path)
+        checkpoint.cleanup()
+
+        return ChunkedResult(
+            output_path=output_path,
+            total_pages=total_pages,
+            total_chunks=len(chunks),
+            resumed_chunks=len(completed),
+            chars=chars,
+            processing_seconds=round(time.perf_counter() - start, 2),
+        )
@@ -19,6 +19,18 @@ Performance Monitoring (2026-01-17):
 - Memory tracking helps diagnose OOM issues
 - The "10% hang" typically occurs during create_model_dict() - model loading
 
+Chunked mode (extract_chunked):
+- Large filings run as page_range windows through one warm converter,
+  with per-window progress and checkpoints that survive restarts
+
+Parallel mode (extract_parallel):
+- Page windows fan out over local worker processes, each with its own warm
+  models (CPU counterpart of modal_worker's T4 fan-out)
+
+Model sharing:
+- Models come from the process-wide MarkerModelRegistry, so every
+  MarkerEngine (and the orchestrator) reuses a single loaded copy
+
 REQUIREMENTS:
 - High RAM: ~10GB minimum (WSL2 or native)
 - GPU: Optional but recommended for speed
@@ -26,10 +38,11 @@ REQUIREMENTS:
 """
 
 import logging
+import tempfile
 import time
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
 
 try:
     import marker
@@ -41,6 +54,9 @@ except ImportError:
     MARKER_AVAILABLE = False
 
 from .base import ExtractionEngine, ExtractionResult
+from .marker_chunked import ChunkedMarkerExtractor, ChunkProgress, page_range_converter
+from .marker_pool import LocalChunkPool, MarkerChunkWorker
+from .model_registry import MarkerModelRegistry, get_marker_registry
 
 # Import monitoring (graceful fallback if not available)
 try:
@@ -94,6 +110,9 @@ class MarkerConfig:
     # LLM enhancement (disabled by default - Step 04 handles this)
     use_llm: bool = False
 
+    # Chunked mode (extract_chunked): pages per page_range window
+    chunk_size: int = 50
+
 
 class MarkerEngine(ExtractionEngine):
     """
@@ -126,6 +145,7 @@ class MarkerEngine(ExtractionEngine):
         config: Optional[MarkerConfig] = None,
         use_gpu: bool = False,
         low_memory_mode: bool = False,
+        registry: Optional[MarkerModelRegistry] = None,
     ):
         """
         Inicializa Marker engine.
@@ -134,11 +154,11 @@ class MarkerEngine(ExtractionEngine):
             config: Configuração customizada (usa defaults otimizados se None)
             use_gpu: Usar GPU se disponível (padrão: False)
             low_memory_mode: Ignorar verificação de RAM (use com cautela)
+            registry: Registro de modelos (padrão: registro global do processo)
         """
         self.config = config or MarkerConfig()
         self.use_gpu = use_gpu
-        self._models = None
-        self._converter = None
+        self.registry = registry or get_marker_registry()
 
         # Low memory mode bypasses RAM check
         if low_memory_mode:
@@ -165,109 +185,58 @@ class MarkerEngine(ExtractionEngine):
             logger.warning(f"Marker indisponível: {reason}")
         return ok
 
-    def _init_converter(self):
-        """
-        Inicializa converter com configuracao otimizada (lazy loading).
+    def _config_dict(self) -> dict:
+        """Dict de configuracao do Marker a partir de MarkerConfig."""
+        config_dict = {
+            "output_format": self.config.output_format,
+            "paginate_output": self.config.paginate_output,
+            "disable_image_extraction": self.config.disable_image_extraction,
+            "disable_links": self.config.disable_links,
+            "drop_repeated_text": self.config.drop_repeated_text,
+            "keep_pageheader_in_output": self.config.keep_pageheader_in_output,
+            "keep_pagefooter_in_output": self.config.keep_pagefooter_in_output,
+        }
 
-        NOTA: Este metodo e onde ocorre o "travamento em 10%".
-        O create_model_dict() carrega modelos pesados (Surya, Texify).
-        Spans detalhados ajudam a identificar exatamente onde trava.
-        """
-        if self._converter is not None:
-            return
-
-        init_start = time.time()
-        logger.info("=" * 60)
-        logger.info("Marker: INICIANDO CARREGAMENTO DE MODELOS")
-        logger.info("  (Primeira execucao pode demorar varios minutos)")
-        logger.info("=" * 60)
+        if self.config.force_ocr:
+            config_dict["force_ocr"] = True
 
-        track_memory("marker.init_start")
+        if self.config.strip_existing_ocr:
+            config_dict["strip_existing_ocr"] = True
 
-        # Build config dict from MarkerConfig
-        with start_span("marker.build_config", "Building configuration dict") as span:
-            config_dict = {
-                "output_format": self.config.output_format,
-                "paginate_output": self.config.paginate_output,
-                "disable_image_extraction": self.config.disable_image_extraction,
-                "disable_links": self.config.disable_links,
-                "drop_repeated_text": self.config.drop_repeated_text,
-                "keep_pageheader_in_output": self.config.keep_pageheader_in_output,
-                "keep_pagefooter_in_output": self.config.keep_pagefooter_in_output,
-            }
+        if self.config.use_llm:
+            config_dict["use_llm"] = True
 
-            if self.config.force_ocr:
-                config_dict["force_ocr"] = True
+        return config_dict
 
-            if self.config.strip_existing_ocr:
-                config_dict["strip_existing_ocr"] = True
+    def _build_converter(self, models):
+        """
+        Cria converter com configuracao otimizada sobre modelos do registro.
 
-            if self.config.use_llm:
-                config_dict["use_llm"] = True
+        NOTA: O "travamento em 10%" ocorre no primeiro lease do registro,
+        quando create_model_dict() carrega modelos pesados (Surya, Texify).
+        Montar o converter sobre modelos ja carregados e barato, por isso
+        ele nao e mantido entre extracoes (permite o descarte por ociosidade).
 
+        Args:
+            models: artifact_dict obtido via self.registry.lease()
+        """
+        # Build config dict from MarkerConfig
+        with start_span("marker.build_config", "Building configuration dict") as span:
+            config_dict = self._config_dict()
             span.set_data("config_keys", list(config_dict.keys()))
             logger.info(f"  Config: {len(config_dict)} opcoes definidas")
 
-        # Create config parser
-        with start_span("marker.config_parser", "Creating ConfigParser") as span:
-            logger.info("[1/4] Criando ConfigParser...")
-            config_parser = ConfigParser(config_dict)
-            span.set_data("status", "success")
-            logger.info("  ConfigParser criado")
-
-        track_memory("marker.after_config_parser")
-
-        # CRITICAL: This is where the "10% hang" typically occurs
-        # Models are downloaded/loaded from disk here
-        with start_span(
-            "marker.create_model_dict",
-            "Loading ML models (Surya, Texify) - THIS IS THE SLOW PART"
-        ) as span:
-            logger.info("[2/4] Carregando modelos ML (Surya, Texify)...")
-            logger.info("  ATENCAO: Este passo pode demorar 1-5 minutos na primeira vez")
-            logger.info("  (Modelos sao baixados/carregados do disco)")
-
-            model_start = time.time()
-            self._models = create_model_dict()
-            model_time = time.time() - model_start
-
-            span.set_data("model_count", len(self._models) if self._models else 0)
-            span.set_data("load_time_seconds", round(model_time, 2))
-
-            if self._models:
-                model_names = list(self._models.keys())
-                logger.info(f"  Modelos carregados ({model_time:.1f}s): {model_names}")
-                span.set_data("model_names", model_names)
-            else:
-                logger.warning("  AVISO: Nenhum modelo carregado!")
-
-        track_memory("marker.after_model_load")
-
-        # Get processors
-        with start_span("marker.get_processors", "Getting processor list") as span:
-            logger.info("[3/4] Obtendo lista de processadores...")
-            processor_list = config_parser.get_processors()
-            renderer = config_parser.get_renderer()
-            span.set_data("processor_count", len(processor_list) if processor_list else 0)
-            logger.info(f"  Processadores: {len(processor_list) if processor_list else 0}")
-
-        # Create converter
         with start_span("marker.create_converter", "Creating PdfConverter") as span:
-            logger.info("[4/4] Criando PdfConverter...")
-            self._converter = PdfConverter(
+            config_parser = ConfigParser(config_dict)
+            converter = PdfConverter(
                 config=config_parser.generate_config_dict(),
-                artifact_dict=self._models,
-                processor_list=processor_list,
-                renderer=renderer,
+                artifact_dict=models,
+                processor_list=config_parser.get_processors(),
+                renderer=config_parser.get_renderer(),
             )
             span.set_data("status", "success")
 
-        track_memory("marker.init_complete")
-
-        total_time = time.time() - init_start
-        logger.info("=" * 60)
-        logger.info(f"Marker: MODELOS CARREGADOS COM SUCESSO ({total_time:.1f}s)")
-        logger.info("=" * 60)
+        return converter
 
     def extract(self, pdf_path: Path) -> ExtractionResult:
         """
@@ -297,31 +266,39 @@ class MarkerEngine(ExtractionEngine):
 
             track_memory("marker.extract_start")
 
-            # Initialize converter (lazy loading) - this is where 10% hang occurs
-            with start_span("marker.init", "Initialize converter (model loading)"):
-                self._init_converter()
-
             # Get file info for context
             file_size_mb = pdf_path.stat().st_size / (1024 * 1024)
             logger.info(f"Marker: Processando {pdf_path.name} ({file_size_mb:.2f} MB)...")
             extract_span.set_data("file_size_mb", round(file_size_mb, 2))
 
-            track_memory("marker.before_convert")
+            # Lease shared models (first lease loads them - this is where 10% hang occurs)
+            with start_span("marker.init", "Lease models from registry") as init_span:
+                models = self.registry.acquire()
+                init_span.set_data("registry", self.registry.stats())
+
+            try:
+                converter = self._build_converter(models)
 
-            # Convert PDF - the main processing
-            with start_span(
-                "marker.convert",
-                "PDF conversion (layout + text extraction)",
-                file_size_mb=round(file_size_mb, 2)
-            ) as convert_span:
-                logger.info("  Convertendo PDF (layout detection + text extraction)...")
-                convert_start = time.time()
+                track_memory("marker.before_convert")
 
-                rendered = self._converter(str(pdf_path))
+                # Convert PDF - the main processing
+                with start_span(
+                    "marker.convert",
+                    "PDF conversion (layout + text extraction)",
+                    file_size_mb=round(file_size_mb, 2)
+                ) as convert_span:
+                    logger.info("  Convertendo PDF (layout detection + text extraction)...")
+                    convert_start = time.time()
 
-                convert_time = time.time() - convert_start
-                convert_span.set_data("convert_time_seconds", round(convert_time, 2))
-                logger.info(f"  Conversao concluida em {convert_time:.1f}s")
+                    rendered = converter(str(pdf_path))
+
+                    convert_time = time.time() - convert_start
+                    convert_span.set_data("convert_time_seconds", round(convert_time, 2))
+                    logger.info(f"  Conversao concluida em {convert_time:.1f}s")
+            finally:
+                converter = None
+                models = None
+                self.registry.release()
 
             track_memory("marker.after_convert")
 
@@ -369,6 +346,7 @@ class MarkerEngine(ExtractionEngine):
                     "ocr_pages": ocr_pages,
                     "extraction_time_seconds": round(total_time, 2),
                     "file_size_mb": round(file_size_mb, 2),
+                    "model_registry": self.registry.stats(),
                     "config": {
                         "disable_image_extraction": self.config.disable_image_extraction,
                         "paginate_output": self.config.paginate_output,
@@ -377,6 +355,159 @@ class MarkerEngine(ExtractionEngine):
                 },
             )
 
+    def extract_chunked(
+        self,
+        pdf_path: Path,
+        work_dir: Optional[Path] = None,
+        chunk_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[ChunkProgress], None]] = None,
+    ) -> ExtractionResult:
+        """
+        Extrai PDF em janelas de paginas (page_range) com checkpoint em disco.
+
+        Indicado para autos com centenas de paginas: memoria limitada a uma
+        janela, progresso por janela e retomada a partir da ultima janela
+        concluida quando chamado de novo com o mesmo work_dir.
+
+        Args:
+            pdf_path: Caminho do PDF
+            work_dir: Diretorio de checkpoint (padrao: temp/marker-chunks/<nome>)
+            chunk_size: Paginas por janela (padrao: config.chunk_size)
+            progress_callback: Recebe ChunkProgress apos cada janela
+
+        Returns:
+            ExtractionResult (metadata inclui output_path e chunks retomados)
+
+        Raises:
+            RuntimeError: Se Marker nao estiver disponivel
+        """
+        if not self.is_available():
+            raise RuntimeError("Marker nao esta disponivel. Verifique instalacao e RAM.")
+
+        import pdfplumber
+
+        with pdfplumber.open(pdf_path) as pdf:
+            total_pages = len(pdf.pages)
+
+        chunk_size = chunk_size or self.config.chunk_size
+        work_dir = Path(work_dir) if work_dir else (
+            Path(tempfile.gettempdir()) / "marker-chunks" / pdf_path.stem
+        )
+        logger.info(
+            f"Marker (chunked): {pdf_path.name}, {total_pages} paginas, "
+            f"janelas de {chunk_size}, checkpoint em {work_dir}"
+        )
+
+        with start_span("marker.extract_chunked", f"Chunked extract: {pdf_path.name}") as span:
+            with self.registry.lease() as models:
+                converter = self._build_converter(models)
+                extractor = ChunkedMarkerExtractor(
+                    page_range_converter(converter), chunk_size=chunk_size
+                )
+                result = extractor.run(
+                    pdf_path,
+                    total_pages,
+                    work_dir,
+                    progress_callback=progress_callback,
+                    settings={"config": vars(self.config)},
+                )
+                del converter, extractor
+
+            span.set_data("total_chunks", result.total_chunks)
+            span.set_data("resumed_chunks", result.resumed_chunks)
+
+        full_text = result.output_path.read_text(encoding="utf-8")
+        return ExtractionResult(
+            text=full_text,
+            pages=total_pages,
+            engine_used=self.name,
+            confidence=0.95,
+            metadata={
+                "markdown": full_text,
+                "chunked": True,
+                "chunk_size": chunk_size,
+                "total_chunks": result.total_chunks,
+                "resumed_chunks": result.resumed_chunks,
+                "output_path": str(result.output_path),
+                "extraction_time_seconds": result.processing_seconds,
+                "model_registry": self.registry.stats(),
+            },
+        )
+
+    def extract_parallel(
+        self,
+        pdf_path: Path,
+        processes: Optional[int] = None,
+        work_dir: Optional[Path] = None,
+        chunk_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[dict], None]] = None,
+    ) -> ExtractionResult:
+        """
+        Extrai PDF em paralelo: janelas de paginas em N processos locais.
+
+        Equivalente local (CPU) do fan-out T4 do modal_worker: cada processo
+        carrega os modelos uma vez e processa as janelas que pegar da fila.
+        Cada processo precisa de ~MARKER_WORKER_MEMORY_MB de RAM.
+
+        Args:
+            pdf_path: Caminho do PDF
+            processes: Processos (padrao: suggest_processes(), limitado pela RAM)
+            work_dir: Diretorio de checkpoint (padrao: temp/marker-pool/<nome>)
+            chunk_size: Paginas por janela (padrao: config.chunk_size)
+            progress_callback: Recebe eventos no formato de extract_pdf_chunked
+
+        Returns:
+            ExtractionResult (metadata inclui workers e estatisticas por janela)
+
+        Raises:
+            RuntimeError: Se Marker nao estiver disponivel
+        """
+        if not self.is_available():
+            raise RuntimeError("Marker nao esta disponivel. Verifique instalacao e RAM.")
+
+        import pdfplumber
+
+        with pdfplumber.open(pdf_path) as pdf:
+            total_pages = len(pdf.pages)
+
+        work_dir = Path(work_dir) if work_dir else (
+            Path(tempfile.gettempdir()) / "marker-pool" / pdf_path.stem
+        )
+        config_dict = self._config_dict()
+        pool = LocalChunkPool(
+            MarkerChunkWorker(config_dict),
+            processes=processes,
+            chunk_size=chunk_size or self.config.chunk_size,
+        )
+        logger.info(
+            f"Marker (paralelo): {pdf_path.name}, {total_pages} paginas, "
+            f"{pool.processes} processos, checkpoint em {work_dir}"
+        )
+
+        with start_span("marker.extract_parallel", f"Parallel extract: {pdf_path.name}") as span:
+            data = pool.extract(
+                pdf_path,
+                total_pages,
+                work_dir,
+                progress_callback=progress_callback,
+                settings={"config": config_dict},
+            )
+            span.set_data("workers_used", data["workers_used"])
+            span.set_data("total_chunks", data["total_chunks"])
+
+        full_text = data.pop("text")
+        return ExtractionResult(
+            text=full_text,
+            pages=total_pages,
+            engine_used=self.name,
+            confidence=0.95,
+            metadata={
+                "markdown": full_text,
+                "extraction_time_seconds": data["processing_time"],
+                **data,
+            },
+        )
+
     def extract_with_options(
         self,
         pdf_path: Path,
@@ -407,8 +538,11 @@ class MarkerEngine(ExtractionEngine):
             keep_pagefooter_in_output=self.config.keep_pagefooter_in_output,
             force_ocr=force_ocr,
             use_llm=use_llm,
+            chunk_size=self.config.chunk_size,
         )
 
-        # Create new engine with custom config
-        custom_engine = MarkerEngine(config=custom_config, use_gpu=self.use_gpu)
+        # Create new engine with custom config (same loaded models)
+        custom_engine = MarkerEngine(
+            config=custom_config, use_gpu=self.use_gpu, registry=self.registry
+        )
         return custom_engine.extract(pdf_path)
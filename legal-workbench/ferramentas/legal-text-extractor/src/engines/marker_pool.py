@@ -0,0 +1,331 @@
+"""
+Local multiprocessing chunk pool - the CPU counterpart of modal_worker's T4 fan-out.
+
+modal_worker.extract_pdf_parallel splits a PDF into page chunks and maps
+them over warm T4 containers. LocalChunkPool does the same on one on-prem box:
+
+- One warm engine per worker process: the worker factory runs once in each
+  process (pool initializer), e.g. loading Marker models into that process's
+  MarkerModelRegistry, and then serves every chunk sent to that process
+- Work stealing: chunks are submitted one by one to a ProcessPoolExecutor,
+  so an idle process takes the next pending chunk and a slow (scanned) chunk
+  does not hold back the others. The chunk size is reduced when needed so
+  each process gets at least MIN_CHUNKS_PER_WORKER chunks; the checkpoint
+  keeps that size, so a resumed run reuses the same plan
+- Crash safety: a worker killed mid-chunk (e.g. by the OOM killer) breaks the
+  executor and raises BrokenProcessPool instead of hanging the run; finished
+  chunks stay checkpointed
+- Ordered reassembly: chunks finish in any order, are checkpointed by index
+  (ChunkCheckpoint, so an interrupted run resumes) and are streamed to the
+  output in page order
+- Progress: same event schema as modal_worker.extract_pdf_chunked
+  ({"type": "progress", ...} events, then one {"type": "result", "data": ...})
+
+Like marker_chunked, this module depends only on the standard library (psutil
+is optional) so the docker text-extractor service can ship it as a standalone file.
+
+Example:
+    >>> pool = LocalChunkPool(MarkerChunkWorker(config_dict), processes=4)
+    >>> for event in pool.iter_extract(pdf_path, total_pages, work_dir):
+    ...     if event["type"] == "progress":
+    ...         print(f"{event['percent']}% - {event['message']}")
+    ...     else:
+    ...         text = event["data"]["text"]
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    from .marker_chunked import ChunkCheckpoint, ChunkConverter, file_sha256, page_range_converter, plan_chunks
+except ImportError:  # standalone copy (docker text-extractor)
+    from marker_chunked import ChunkCheckpoint, ChunkConverter, file_sha256, page_range_converter, plan_chunks
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Each process should get at least this many chunks so work can be rebalanced
+MIN_CHUNKS_PER_WORKER = 2
+# Resident memory of one warm Marker process (models + one page window)
+MARKER_WORKER_MEMORY_MB = 6000
+
+PAGE_SEPARATOR = "-" * 48
+
+# Per-process engine, created by the pool initializer
+_worker_convert: Optional[ChunkConverter] = None
+
+
+def suggest_processes(memory_per_worker_mb: float = MARKER_WORKER_MEMORY_MB) -> int:
+    """CPU count, capped by available memory when psutil is installed."""
+    cpus = os.cpu_count() or 1
+    if not PSUTIL_AVAILABLE:
+        return cpus
+    available_mb = psutil.virtual_memory().available / (1024 ** 2)
+    return max(1, min(cpus, int(available_mb // memory_per_worker_mb)))
+
+
+def balanced_chunk_size(total_pages: int, chunk_size: int, processes: int) -> int:
+    """Shrink chunk_size so every process gets MIN_CHUNKS_PER_WORKER chunks."""
+    target_chunks = max(processes, 1) * MIN_CHUNKS_PER_WORKER
+    return max(1, min(chunk_size, math.ceil(total_pages / target_chunks)))
+
+
+class MarkerChunkWorker:
+    """
+    Worker factory: one warm Marker converter per process.
+
+    Picklable (only holds the config dict); the models are loaded in the
+    worker process and held by its registry for the lifetime of the pool.
+    """
+
+    def __init__(self, config: dict):
+        self.config = dict(config)
+
+    def __call__(self) -> ChunkConverter:
+        from marker.config.parser import ConfigParser
+        from marker.converters.pdf import PdfConverter
+
+        try:
+            from .model_registry import get_marker_registry
+        except ImportError:
+            from model_registry import get_marker_registry
+
+        # Held until the process exits: the whole point is a warm worker
+        models = get_marker_registry().acquire()
+        parser = ConfigParser(dict(self.config))
+        converter = PdfConverter(
+            config=parser.generate_config_dict(),
+            artifact_dict=models,
+            processor_list=parser.get_processors(),
+            renderer=parser.get_renderer(),
+        )
+        return page_range_converter(converter)
+
+
+class TesseractChunkWorker:
+    """Worker factory: Tesseract OCR on rasterized pages (no models to warm up)."""
+
+    def __init__(self, lang: str = "por", dpi: int = 300, psm: int = 3):
+        self.lang = lang
+        self.dpi = dpi
+        self.psm = psm
+
+    def __call__(self) -> ChunkConverter:
+        import pytesseract
+        from pdf2image import convert_from_path
+
+        def convert(pdf_path: str, pages: list[int]) -> str:
+            texts = []
+            for page in pages:
+                images = convert_from_path(
+                    pdf_path, dpi=self.dpi, first_page=page + 1, last_page=page + 1
+                )
+                text = (
+                    pytesseract.image_to_string(images[0], lang=self.lang, config=f"--psm {self.psm}")
+                    if images else ""
+                )
+                # Same page separator as Marker paginate_output
+                texts.append(f"{{{page}}}{PAGE_SEPARATOR}\n\n{text.strip()}")
+            return "\n\n".join(texts)
+
+        return convert
+
+
+def _init_worker(worker_factory: Callable[[], ChunkConverter]) -> None:
+    global _worker_convert
+    _worker_convert = worker_factory()
+
+
+def _run_chunk(task: tuple[int, str, list[int]]) -> dict:
+    chunk_id, pdf_path, pages = task
+    start = time.perf_counter()
+    text = _worker_convert(pdf_path, pages)
+    return {
+        "chunk_id": chunk_id,
+        "text": text,
+        "pages": len(pages),
+        "page_range": [pages[0], pages[-1]],
+        "chars": len(text),
+        "time": round(time.perf_counter() - start, 2),
+        "pid": os.getpid(),
+    }
+
+
+def _progress(chunk: int, total_chunks: int, pages_done: int, total_pages: int, message: str) -> dict:
+    # 5-95% like extract_pdf_chunked; the result event marks completion
+    percent = int((pages_done / total_pages) * 90) + 5 if total_pages else 95
+    return {
+        "type": "progress",
+        "chunk": chunk,
+        "total_chunks": total_chunks,
+        "percent": percent,
+        "pages_processed": pages_done,
+        "total_pages": total_pages,
+        "message": message,
+    }
+
+
+class LocalChunkPool:
+    """
+    Process pool that extracts page chunks in parallel on warm engines.
+
+    Example:
+        >>> pool = LocalChunkPool(TesseractChunkWorker(), processes=8, chunk_size=20)
+        >>> data = pool.extract(pdf_path, total_pages, work_dir)
+    """
+
+    def __init__(
+        self,
+        worker_factory: Callable[[], ChunkConverter],
+        processes: Optional[int] = None,
+        chunk_size: int = 50,
+        start_method: str = "spawn",
+    ):
+        """
+        Args:
+            worker_factory: Picklable callable run once per process, returning
+                the ChunkConverter that process uses for all its chunks
+            processes: Worker processes (default: suggest_processes())
+            chunk_size: Maximum pages per chunk
+            start_method: multiprocessing start method ("spawn" is safe with
+                torch/threads; "fork" starts faster)
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be > 0")
+        self.worker_factory = worker_factory
+        self.processes = processes or suggest_processes()
+        self.chunk_size = chunk_size
+        self.start_method = start_method
+
+    def iter_extract(
+        self,
+        pdf_path: Path,
+        total_pages: int,
+        work_dir: Path,
+        settings: Optional[dict] = None,
+        output_path: Optional[Path] = None,
+    ) -> Iterator[dict]:
+        """
+        Extract all chunks, yielding extract_pdf_chunked-style events.
+
+        Args:
+            pdf_path: PDF to convert
+            total_pages: Page count of the PDF
+            work_dir: Checkpoint directory (reuse it to resume)
+            settings: Extra values that must match to resume (e.g. Marker config)
+            output_path: Final text file (default: work_dir/output.md)
+
+        Yields:
+            {"type": "progress", ...} after each finished chunk, then
+            {"type": "result", "data": {...}}
+        """
+        start = time.perf_counter()
+        pdf_path = Path(pdf_path)
+        work_dir = Path(work_dir)
+        output_path = Path(output_path) if output_path else work_dir / "output.md"
+
+        checkpoint = ChunkCheckpoint(work_dir, {
+            "pdf_sha256": file_sha256(pdf_path),
+            "total_pages": total_pages,
+            "chunk_size": self.chunk_size,
+            "settings": settings or {},
+        })
+        completed = set(checkpoint.load())
+        # The balanced size depends on the process count (free memory at
+        # start), so a resumed run keeps the size its chunks were cut with
+        chunk_size = checkpoint.state.get("chunk_size") or balanced_chunk_size(
+            total_pages, self.chunk_size, self.processes
+        )
+        checkpoint.state["chunk_size"] = chunk_size
+        chunks = plan_chunks(total_pages, chunk_size)
+        total_chunks = len(chunks)
+        pending = [
+            (index, str(pdf_path), pages)
+            for index, pages in enumerate(chunks)
+            if index not in completed
+        ]
+        pages_done = sum(len(chunks[index]) for index in completed)
+        processes = max(1, min(self.processes, len(pending)))
+
+        yield _progress(
+            len(completed), total_chunks, pages_done, total_pages,
+            f"Starting {processes} workers for {len(pending)} chunks of ~{chunk_size} pages"
+            + (f" ({len(completed)} resumed)" if completed else ""),
+        )
+
+        chunk_stats = []
+        if pending:
+            executor = ProcessPoolExecutor(
+                processes,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(self.worker_factory,),
+            )
+            try:
+                futures = [executor.submit(_run_chunk, task) for task in pending]
+                for future in as_completed(futures):
+                    result = future.result()
+                    checkpoint.mark_done(result["chunk_id"], result.pop("text"))
+                    chunk_stats.append(result)
+                    pages_done += result["pages"]
+                    first, last = result["page_range"]
+                    yield _progress(
+                        len(checkpoint.completed), total_chunks, pages_done, total_pages,
+                        f"Chunk {result['chunk_id'] + 1}/{total_chunks} "
+                        f"(pages {first + 1}-{last + 1}) done in {result['time']:.1f}s",
+                    )
+            except BaseException:
+                # Failed chunk, dead worker or closed generator: drop queued chunks
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown()
+
+        chars = checkpoint.assemble(total_chunks, output_path)
+        checkpoint.cleanup()
+        chunk_stats.sort(key=lambda stat: stat["chunk_id"])
+
+        yield {
+            "type": "result",
+            "data": {
+                "text": output_path.read_text(encoding="utf-8"),
+                "output_path": str(output_path),
+                "pages": total_pages,
+                "chars": chars,
+                "processing_time": round(time.perf_counter() - start, 2),
+                "chunked": True,
+                "total_chunks": total_chunks,
+                "chunk_size": chunk_size,
+                "resumed_chunks": len(completed),
+                "workers_used": processes if pending else 0,
+                "mode": "local-multiprocess",
+                "chunk_stats": chunk_stats,
+            },
+        }
+
+    def extract(
+        self,
+        pdf_path: Path,
+        total_pages: int,
+        work_dir: Path,
+        progress_callback: Optional[Callable[[dict], Any]] = None,
+        settings: Optional[dict] = None,
+        output_path: Optional[Path] = None,
+    ) -> dict:
+        """Run iter_extract to completion; returns the result event's data."""
+        for event in self.iter_extract(pdf_path, total_pages, work_dir, settings, output_path):
+            if event["type"] == "result":
+                return event["data"]
+            if progress_callback:
+                progress_callback(event)
+        raise RuntimeError("Chunk pool finished without a result")
@@ -0,0 +1,312 @@
+"""
+Marker Model Registry - one copy of the Surya/Texify models per process.
+
+Loading the Marker models (create_model_dict) takes minutes on CPU and
+several GB of RAM. Before this registry, the pipeline orchestrator,
+MarkerEngine and the Celery worker each held their own copy.
+
+Features:
+- Lazy: models load on the first lease (or on warmup)
+- Thread-safe: concurrent first leases wait for a single load
+- Reference-counted: models are never unloaded while leased
+- Idle unload: optional timeout after the last lease is released
+- Warmup: load at startup, blocking or in a background thread
+- Metrics: load time, process RSS and RSS growth attributed to the models
+
+Configuration (environment, read by get_marker_registry()):
+- MARKER_IDLE_UNLOAD_SECONDS: idle timeout, 0 = keep loaded (default)
+- MARKER_WARMUP: "true" to load at startup (see warmup_from_env())
+
+This module depends only on the standard library (psutil is optional) so
+the docker text-extractor service can ship it as a standalone file.
+
+Example:
+    >>> registry = get_marker_registry()
+    >>> with registry.lease() as artifact_dict:
+    ...     converter = PdfConverter(artifact_dict=artifact_dict)
+    ...     rendered = converter(str(pdf_path))
+    >>> registry.stats()["last_load_seconds"]
+"""
+
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _default_loader() -> dict:
+    """Load Marker artifacts (Surya layout/OCR, Texify, ...)."""
+    from marker.models import create_model_dict
+
+    return create_model_dict()
+
+
+def resident_memory_mb() -> float:
+    """Current process RSS in MB (0.0 if it cannot be measured)."""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss / (1024 ** 2)
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 ** 2)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class MarkerModelRegistry:
+    """
+    Lazily loaded, reference-counted holder for Marker model artifacts.
+
+    Use lease() around every conversion; do not keep the artifact dict (or a
+    PdfConverter built from it) after the lease ends, otherwise an idle
+    unload cannot free the memory.
+    """
+
+    def __init__(
+        self,
+        loader: Optional[Callable[[], Any]] = None,
+        idle_unload_seconds: float = 0.0,
+    ):
+        """
+        Initialize registry (does not load models).
+
+        Args:
+            loader: Callable returning the artifact dict (default: create_model_dict)
+            idle_unload_seconds: Unload after this long without leases (0 = never)
+        """
+        if idle_unload_seconds < 0:
+            raise ValueError("idle_unload_seconds must be >= 0")
+
+        self._loader = loader or _default_loader
+        self.idle_unload_seconds = idle_unload_seconds
+
+        self._lock = threading.RLock()
+        self._artifacts: Any = None
+        self._refcount = 0
+        self._idle_timer: Optional[threading.Timer] = None
+        self._last_release = time.monotonic()
+
+        # Metrics
+        self.generation = 0
+        self.loads = 0
+        self.unloads = 0
+        self.last_load_seconds = 0.0
+        self.total_load_seconds = 0.0
+        self.model_resident_mb = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._artifacts is not None
+
+    @property
+    def refcount(self) -> int:
+        return self._refcount
+
+    def acquire(self) -> Any:
+        """
+        Take a reference, loading the models if needed.
+
+        Every acquire() must be paired with release(); prefer lease().
+
+        Returns:
+            Marker artifact dict
+        """
+        with self._lock:
+            self._cancel_idle_timer()
+            if self._artifacts is None:
+                self._load()
+            self._refcount += 1
+            return self._artifacts
+
+    def release(self) -> None:
+        """Drop a reference; arms the idle timer when the last one goes."""
+        with self._lock:
+            if self._refcount == 0:
+                raise RuntimeError("release() without matching acquire()")
+            self._refcount -= 1
+            if self._refcount == 0:
+                self._last_release = time.monotonic()
+                self._arm_idle_timer()
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        """Context manager around acquire()/release()."""
+        artifacts = self.acquire()
+        try:
+            yield artifacts
+        finally:
+            self.release()
+
+    def warmup(self, background: bool = False) -> Optional[threading.Thread]:
+        """
+        Load the models ahead of the first job.
+
+        The idle timeout (if any) starts counting once warmup finishes.
+
+        Args:
+            background: Load in a daemon thread and return it immediately
+
+        Returns:
+            The loader thread when background=True, else None
+        """
+        def _warm() -> None:
+            try:
+                with self.lease():
+                    pass
+            except Exception as e:
+                logger.error(f"Marker model warmup failed: {e}")
+                if not background:
+                    raise
+
+        if not background:
+            _warm()
+            return None
+
+        thread = threading.Thread(target=_warm, name="marker-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def unload(self) -> bool:
+        """
+        Unload the models if no lease is active.
+
+        Returns:
+            True if models were unloaded
+        """
+        with self._lock:
+            if self._artifacts is None or self._refcount > 0:
+                return False
+            self._cancel_idle_timer()
+            rss_before = resident_memory_mb()
+            self._artifacts = None
+            self.unloads += 1
+            _free_memory()
+            logger.info(
+                f"Marker models unloaded (freed ~{rss_before - resident_memory_mb():.0f} MB)"
+            )
+            return True
+
+    def stats(self) -> dict:
+        """
+        Registry metrics.
+
+        Returns:
+            Dict with loaded, refcount, generation, loads, unloads,
+            last_load_seconds, total_load_seconds, model_resident_mb (RSS
+            growth during the last load), process_resident_mb and
+            idle_seconds (0 while leased or unloaded)
+        """
+        with self._lock:
+            idle = 0.0
+            if self._artifacts is not None and self._refcount == 0:
+                idle = time.monotonic() - self._last_release
+            return {
+                "loaded": self.loaded,
+                "refcount": self._refcount,
+                "generation": self.generation,
+                "loads": self.loads,
+                "unloads": self.unloads,
+                "last_load_seconds": round(self.last_load_seconds, 2),
+                "total_load_seconds": round(self.total_load_seconds, 2),
+                "model_resident_mb": round(self.model_resident_mb, 1),
+                "process_resident_mb": round(resident_memory_mb(), 1),
+                "idle_seconds": round(idle, 1),
+                "idle_unload_seconds": self.idle_unload_seconds,
+            }
+
+    def _load(self) -> None:
+        logger.info("Loading Marker models (may take several minutes on CPU)...")
+        rss_before = resident_memory_mb()
+        start = time.perf_counter()
+        artifacts = self._loader()
+        elapsed = time.perf_counter() - start
+
+        self._artifacts = artifacts
+        self.generation += 1
+        self.loads += 1
+        self.last_load_seconds = elapsed
+        self.total_load_seconds += elapsed
+        self.model_resident_mb = max(0.0, resident_memory_mb() - rss_before)
+        logger.info(
+            f"Marker models loaded in {elapsed:.1f}s "
+            f"(+{self.model_resident_mb:.0f} MB resident)"
+        )
+
+    def _arm_idle_timer(self) -> None:
+        if self.idle_unload_seconds <= 0 or self._artifacts is None:
+            return
+        self._cancel_idle_timer()
+        timer = threading.Timer(self.idle_unload_seconds, self._on_idle_timeout)
+        timer.daemon = True
+        timer.start()
+        self._idle_timer = timer
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _on_idle_timeout(self) -> None:
+        with self._lock:
+            # A lease taken (and released) while this timer waited for the
+            # lock re-armed a newer timer: leave the unload to that one
+            idle = time.monotonic() - self._last_release
+            if self._refcount > 0 or idle < self.idle_unload_seconds:
+                return
+            self._idle_timer = None
+            if self._artifacts is not None:
+                logger.info(
+                    f"Marker models idle for {self.idle_unload_seconds:.0f}s, unloading"
+                )
+                self.unload()
+
+
+def _free_memory() -> None:
+    """Collect garbage and release cached GPU memory if torch is loaded."""
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+# =============================================================================
+# PROCESS-WIDE INSTANCE
+# =============================================================================
+
+_registry: Optional[MarkerModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_marker_registry() -> MarkerModelRegistry:
+    """
+    Get the process-wide registry (created on first call from environment).
+
+    Returns:
+        Shared MarkerModelRegistry
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            idle = float(os.getenv("MARKER_IDLE_UNLOAD_SECONDS", "0"))
+            _registry = MarkerModelRegistry(idle_unload_seconds=idle)
+        return _registry
+
+
+def warmup_from_env(background: bool = True) -> Optional[threading.Thread]:
+    """Warm up the shared registry when MARKER_WARMUP=true."""
+    if os.getenv("MARKER_WARMUP", "false").lower() != "true":
+        return None
+    logger.info("MARKER_WARMUP enabled: loading Marker models at startup")
+    return get_marker_registry().warmup(background=background)
@@ -3,6 +3,7 @@ Exporter para formato texto simples (.txt).
 """
 
 from pathlib import Path
+from typing import Iterable
 
 from ..core.cleaner import CleaningResult
 from .base import BaseExporter
@@ -53,6 +54,37 @@ class TextExporter(BaseExporter):
         except Exception as e:
             raise IOError(f"Erro ao escrever arquivo {output_path}: {e}")
 
+    def export_stream(self, chunks: Iterable[str], output_path: Path) -> int:
+        """
+        Exporta texto incrementalmente, bloco a bloco.
+
+        Usado pelo pipeline em modo streaming: cada bloco limpo e escrito
+        assim que produzido, sem montar o documento inteiro em memoria.
+        O cabeçalho não é suportado (estatísticas só existem ao final).
+
+        Args:
+            chunks: Iterável de blocos de texto (ex: StreamingCleaner.stream)
+            output_path: Caminho do arquivo de saída
+
+        Returns:
+            Número de caracteres escritos
+
+        Raises:
+            IOError: Se não conseguir escrever arquivo
+        """
+        self._ensure_parent_dir(output_path)
+
+        written = 0
+        try:
+            with output_path.open("w", encoding="utf-8") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    written += len(chunk)
+        except OSError as e:
+            raise IOError(f"Erro ao escrever arquivo {output_path}: {e}")
+
+        return written
+
     def _generate_header(self, result: CleaningResult) -> str:
         """Gera cabeçalho com metadados"""
         stats = result.stats
@@ -1,6 +1,14 @@
 """Módulo de integração com Gemini."""
 
 from .client import GeminiClient, GeminiConfig, GeminiResponse
+from .async_enhancer import (
+    AsyncChunkEnhancer,
+    ChunkCache,
+    CliBackend,
+    EnhancementResult,
+    StubBackend,
+    split_chunks,
+)
 from .schemas import (
     PecaType,
     SectionClassification,
@@ -13,6 +21,12 @@ __all__ = [
     "GeminiClient",
     "GeminiConfig",
     "GeminiResponse",
+    "AsyncChunkEnhancer",
+    "ChunkCache",
+    "CliBackend",
+    "EnhancementResult",
+    "StubBackend",
+    "split_chunks",
     "PecaType",
     "SectionClassification",
     "ClassificationResult",
@@ -0,0 +1,419 @@
+"""
+Async Enhancer - Processamento Gemini em chunks, concorrente e com cache.
+
+Em vez de mandar o documento inteiro numa única chamada lenta (que falha
+por inteiro), o texto é dividido em fronteiras de página/seção e cada chunk
+vira uma chamada independente:
+
+- Concorrência limitada por semáforo + rate limit (chamadas por minuto)
+- Cache por hash do chunk (modelo + prompt + conteúdo) em SQLite
+- Retry com backoff apenas dos chunks que falharam
+- Chunk que esgota as tentativas mantém o texto original (ou levanta erro
+  em modo strict)
+
+Backends:
+- CliBackend: Gemini CLI via subprocess assíncrono (mesmo formato do GeminiClient)
+- GenaiBackend: SDK google-generativeai (generate_content_async)
+- StubBackend: local e determinístico, para testes
+
+Este módulo usa apenas a biblioteca padrão (SDK/CLI são opcionais) para que
+o serviço docker text-extractor possa copiá-lo como arquivo avulso.
+
+Example:
+    >>> enhancer = AsyncChunkEnhancer(CliBackend(), prompt, concurrency=4)
+    >>> result = enhancer.enhance_sync(texto)
+    >>> print(result.text, result.failed)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Fronteiras preferidas para cortar chunks, em ordem
+_BOUNDARIES = re.compile(
+    r"^(?:"
+    r"## \[\[PAGE_\d+\]\]"     # Step 03: ## [[PAGE_001]] [TYPE: ...]
+    r"|\{\d+\}-{8,}"            # Marker paginate_output: {12}-----
+    r"|#{1,3} "                  # Títulos markdown (seções)
+    r")",
+    re.MULTILINE,
+)
+
+
+class ChunkBackend(Protocol):
+    """Backend que processa um chunk (levanta exceção em caso de falha)."""
+
+    name: str
+
+    async def generate(self, prompt: str, chunk: str) -> str:
+        ...
+
+
+def split_chunks(text: str, max_chars: int) -> list[str]:
+    """
+    Divide texto em chunks de até max_chars em fronteiras de página/seção.
+
+    Unidades (páginas/seções) maiores que max_chars são cortadas em
+    parágrafos. A concatenação dos chunks reproduz o texto original.
+
+    Args:
+        text: Texto completo
+        max_chars: Tamanho máximo de cada chunk
+
+    Returns:
+        Lista de chunks (vazia se text for vazio)
+    """
+    if max_chars <= 0:
+        raise ValueError("max_chars deve ser > 0")
+    if not text:
+        return []
+
+    starts = [m.start() for m in _BOUNDARIES.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = starts + [len(text)]
+    units = []
+    for a, b in zip(bounds, bounds[1:]):
+        units.extend(_split_oversized(text[a:b], max_chars))
+
+    chunks: list[str] = []
+    current = ""
+    for unit in units:
+        if current and len(current) + len(unit) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += unit
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_oversized(unit: str, max_chars: int) -> list[str]:
+    pieces = []
+    while len(unit) > max_chars:
+        cut = unit.rfind("\n\n", 0, max_chars)
+        cut = cut + 2 if cut > 0 else max_chars
+        pieces.append(unit[:cut])
+        unit = unit[cut:]
+    if unit:
+        pieces.append(unit)
+    return pieces
+
+
+class RateLimiter:
+    """Espaça o início das chamadas para respeitar chamadas/minuto."""
+
+    def __init__(self, calls_per_minute: float):
+        self.interval = 60.0 / calls_per_minute if calls_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ChunkCache:
+    """Cache SQLite de respostas por hash do chunk."""
+
+    def __init__(self, db_path: Path | str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunk_cache ("
+            " key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(namespace: str, prompt: str, chunk: str) -> str:
+        digest = hashlib.sha256()
+        for part in (namespace, prompt, chunk):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM chunk_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, response: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO chunk_cache (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class StubBackend:
+    """
+    Backend local para testes.
+
+    Args:
+        transform: chunk -> resposta (padrão: identidade)
+        fail_times: Quantas vezes cada chunk falha antes de responder
+        latency: Atraso simulado por chamada (segundos)
+    """
+
+    name = "stub"
+
+    def __init__(
+        self,
+        transform: Optional[Callable[[str], str]] = None,
+        fail_times: int = 0,
+        latency: float = 0.0,
+    ):
+        self.transform = transform or (lambda chunk: chunk)
+        self.fail_times = fail_times
+        self.latency = latency
+        self.calls: list[str] = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._failures: dict[str, int] = {}
+
+    async def generate(self, prompt: str, chunk: str) -> str:
+        self.calls.append(chunk)
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            failures = self._failures.get(chunk, 0)
+            if failures < self.fail_times:
+                self._failures[chunk] = failures + 1
+                raise RuntimeError("falha simulada")
+            return self.transform(chunk)
+        finally:
+            self._in_flight -= 1
+
+
+class CliBackend:
+    """Gemini CLI via subprocess assíncrono (stdin = prompt + documento)."""
+
+    def __init__(self, model: str = "gemini-2.5-flash", timeout_seconds: int = 300):
+        self.model = model
+        self.timeout_seconds = timeout_seconds
+        self.name = f"cli:{model}"
+
+    async def generate(self, prompt: str, chunk: str) -> str:
+        process = await asyncio.create_subprocess_exec(
+            "gemini", "-m", self.model,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        full_input = f"{prompt}\n\n---\n\nDOCUMENTO:\n\n{chunk}"
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(full_input.encode("utf-8")),
+                timeout=self.timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        if process.returncode != 0:
+            raise RuntimeError(stderr.decode("utf-8", "replace").strip() or "Erro desconhecido")
+        return stdout.decode("utf-8").strip()
+
+
+class GenaiBackend:
+    """SDK google-generativeai (generate_content_async)."""
+
+    def __init__(self, api_key: str, model: str = "gemini-2.5-flash"):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self._model = genai.GenerativeModel(model)
+        self.name = f"genai:{model}"
+
+    async def generate(self, prompt: str, chunk: str) -> str:
+        response = await self._model.generate_content_async(f"{prompt}\n\n{chunk}")
+        return response.text
+
+
+@dataclass
+class EnhancementResult:
+    """Resultado de um processamento em chunks."""
+
+    text: str
+    chunks: int
+    cached: int = 0
+    calls: int = 0
+    failed: list[int] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+class AsyncChunkEnhancer:
+    """
+    Processa chunks concorrentemente com cache e retry por chunk.
+
+    Example:
+        >>> enhancer = AsyncChunkEnhancer(StubBackend(str.upper), "Corrija o texto")
+        >>> enhancer.enhance_sync("## [[PAGE_001]]\\nabc").text
+        '## [[PAGE_001]]\\nABC'
+    """
+
+    def __init__(
+        self,
+        backend: ChunkBackend,
+        prompt: str,
+        cache: Optional[ChunkCache] = None,
+        max_chars: int = 12000,
+        concurrency: int = 4,
+        calls_per_minute: float = 60,
+        max_retries: int = 2,
+        backoff_seconds: float = 1.0,
+        strict: bool = False,
+    ):
+        """
+        Args:
+            backend: Backend que processa cada chunk
+            prompt: Instrução enviada com cada chunk
+            cache: Cache de respostas (None desativa)
+            max_chars: Tamanho máximo de chunk
+            concurrency: Chamadas simultâneas
+            calls_per_minute: Rate limit (0 desativa)
+            max_retries: Novas tentativas por chunk
+            backoff_seconds: Espera base entre tentativas (dobra a cada falha)
+            strict: Levanta RuntimeError se algum chunk falhar
+        """
+        self.backend = backend
+        self.prompt = prompt
+        self.cache = cache
+        self.max_chars = max_chars
+        self.concurrency = concurrency
+        self.calls_per_minute = calls_per_minute
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.strict = strict
+
+    async def map_chunks(
+        self,
+        chunks: list[str],
+        prompt: Optional[str] = None,
+        on_chunk: Optional[Callable[[int, int], Awaitable[None] | None]] = None,
+    ) -> tuple[list[Optional[str]], EnhancementResult]:
+        """
+        Processa chunks já divididos.
+
+        Args:
+            chunks: Chunks a processar
+            prompt: Sobrescreve o prompt padrão
+            on_chunk: Chamado com (concluídos, total) após cada chunk
+
+        Returns:
+            (respostas na ordem dos chunks, None para chunks que falharam; estatísticas)
+        """
+        prompt = prompt if prompt is not None else self.prompt
+        start = time.perf_counter()
+        stats = EnhancementResult(text="", chunks=len(chunks))
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        limiter = RateLimiter(self.calls_per_minute)
+        done = 0
+
+        async def process(index: int, chunk: str) -> Optional[str]:
+            key = None
+            if self.cache is not None:
+                key = ChunkCache.make_key(self.backend.name, prompt, chunk)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    stats.cached += 1
+                    return await finish(cached)
+
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    await asyncio.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+                async with semaphore:
+                    await limiter.wait()
+                    stats.calls += 1
+                    try:
+                        response = await self.backend.generate(prompt, chunk)
+                    except Exception as e:
+                        logger.warning(
+                            f"Chunk {index + 1}/{len(chunks)} falhou "
+                            f"(tentativa {attempt + 1}): {e}"
+                        )
+                        continue
+                if key is not None:
+                    self.cache.put(key, response)
+                return await finish(response)
+
+            stats.failed.append(index)
+            return await finish(None)
+
+        async def finish(response: Optional[str]) -> Optional[str]:
+            nonlocal done
+            done += 1
+            if on_chunk is not None:
+                maybe = on_chunk(done, len(chunks))
+                if asyncio.iscoroutine(maybe):
+                    await maybe
+            return response
+
+        responses = await asyncio.gather(*(process(i, c) for i, c in enumerate(chunks)))
+        stats.failed.sort()
+        stats.seconds = round(time.perf_counter() - start, 2)
+        if stats.failed and self.strict:
+            raise RuntimeError(f"Chunks falharam após retries: {stats.failed}")
+        return list(responses), stats
+
+    async def enhance(
+        self,
+        text: str,
+        on_chunk: Optional[Callable[[int, int], Awaitable[None] | None]] = None,
+    ) -> EnhancementResult:
+        """
+        Divide, processa e remonta o texto na ordem original.
+
+        Chunks que falharam mantêm o texto original.
+        """
+        chunks = split_chunks(text, self.max_chars)
+        responses, stats = await self.map_chunks(chunks, on_chunk=on_chunk)
+        stats.text = "\n\n".join(
+            (response if response is not None else chunk).strip()
+            for chunk, response in zip(chunks, responses)
+        )
+        logger.info(
+            f"Enhancer: {stats.chunks} chunks, {stats.cached} do cache, "
+            f"{stats.calls} chamadas, {len(stats.failed)} falhas em {stats.seconds:.1f}s"
+        )
+        return stats
+
+    def enhance_sync(self, text: str) -> EnhancementResult:
+        """Versão síncrona de enhance (cria o event loop)."""
+        return asyncio.run(self.enhance(text))
+
+    def map_chunks_sync(
+        self, chunks: list[str], prompt: Optional[str] = None
+    ) -> tuple[list[Optional[str]], EnhancementResult]:
+        """Versão síncrona de map_chunks."""
+        return asyncio.run(self.map_chunks(chunks, prompt=prompt))
@@ -18,9 +18,13 @@ Features:
 - Feedback loop for continuous improvement
 - Per-page extraction with progress callbacks (Streamlit integration)
 - Generator mode for lazy/streaming consumption
+- Streaming mode: page-wise cleaning written straight to an exporter
+- Optional persistent page cache: unchanged pages (same content hash,
+  engine and options) skip extraction across jobs
 """
 
 import logging
+import os
 from pathlib import Path
 from typing import Optional, Callable, Generator, Iterator
 from dataclasses import dataclass, field
@@ -55,13 +59,21 @@ from src.context.signature import (
     PageSignatureInput,
     infer_pattern_type,
 )
-from src.engines import EngineSelector, get_selector
+from src.cache import PageCache, hash_pdf_pages
 from src.engines.base import ExtractionResult
+from src.engines.model_registry import get_marker_registry
+from src.core.intelligence.cleaner_advanced import AdvancedCleaner, StreamingCleaner
+from src.exporters.text import TextExporter
 from src.steps.step_01_layout import LayoutAnalyzer
-from src.config import PageType, PageComplexity, COMPLEXITY_ENGINE_MAP
+from src.config import EXTRACT_CONFIG, PageType, PageComplexity, COMPLEXITY_ENGINE_MAP
 
 logger = logging.getLogger(__name__)
 
+# Per-page OCR settings (also part of the tesseract page cache key)
+TESSERACT_DPI = 300
+TESSERACT_LANG = EXTRACT_CONFIG.tesseract_lang
+TESSERACT_PSM = EXTRACT_CONFIG.tesseract_psm
+
 
 @dataclass
 class PipelineResult:
@@ -95,7 +107,7 @@ class PipelineOrchestrator:
     Integrates:
     - LayoutAnalyzer: Analyzes PDF structure
     - ContextStore: Learns and suggests patterns (optional)
-    - EngineSelector: Selects best extraction engine
+    - PageCache: Reuses text of pages seen in earlier jobs (optional)
     - Extraction engines: Extracts text
 
     Workflow:
@@ -113,6 +125,8 @@ class PipelineOrchestrator:
         self,
         context_db_path: Optional[Path] = None,
         caso_info: Optional[dict] = None,
+        page_cache_path: Optional[Path] = None,
+        page_cache_max_bytes: int = PageCache.DEFAULT_MAX_BYTES,
     ):
         """
         Initialize pipeline orchestrator.
@@ -122,6 +136,8 @@ class PipelineOrchestrator:
             caso_info: Case information dict with keys:
                 - numero_cnj: CNJ process number
                 - sistema: System name ('pje', 'eproc', etc)
+            page_cache_path: Path to PageCache database (None = no page cache)
+            page_cache_max_bytes: Size bound for cached text (LRU eviction)
         """
         # Initialize ContextStore if db_path provided
         self.context_store: Optional[ContextStore] = None
@@ -144,11 +160,16 @@ class PipelineOrchestrator:
         # Initialize LayoutAnalyzer
         self.layout_analyzer = LayoutAnalyzer()
 
-        # Initialize EngineSelector
-        self.engine_selector: EngineSelector = get_selector()
+        # Persistent page cache (keyed by page content hash + engine + options)
+        self.page_cache: Optional[PageCache] = None
+        if page_cache_path is not None:
+            self.page_cache = PageCache(page_cache_path, max_bytes=page_cache_max_bytes)
+            logger.info(f"PageCache enabled: {page_cache_path}")
 
         # Cache for Marker results (Marker processes entire PDF at once)
-        # Key: pdf_path.resolve(), Value: dict with 'pages' list of text per page
+        # Key: pdf_path.resolve(), Value: dict with 'pages' list of text per page.
+        # Entries are dropped when the PDF finishes; cross-job reuse goes
+        # through self.page_cache.
         self._marker_cache: dict[Path, dict] = {}
 
     def clear_marker_cache(self, pdf_path: Optional[Path] = None) -> None:
@@ -207,6 +228,9 @@ class PipelineOrchestrator:
             total_pages = layout["total_pages"]
             logger.info(f"Layout analyzed: {total_pages} pages")
 
+            page_hashes = self._hash_pages(pdf_path, warnings)
+            cache_hits = 0
+
             # 2. Process each page
             page_texts = []
             for idx, page_data in enumerate(layout["pages"]):
@@ -221,8 +245,11 @@ class PipelineOrchestrator:
                     )
 
                 try:
-                    page_result = self._process_page(pdf_path, page_data, layout)
+                    page_result = self._process_page(
+                        pdf_path, page_data, layout, page_hashes.get(page_num)
+                    )
                     page_texts.append(page_result["text"])
+                    cache_hits += page_result["cache_hit"]
 
                     # Learn from result if ContextStore active
                     if page_result.get("observation"):
@@ -234,6 +261,8 @@ class PipelineOrchestrator:
                     warnings.append(warning)
                     page_texts.append("")  # Empty text for failed page
 
+            self.clear_marker_cache(pdf_path)
+
             # 3. Combine text
             final_text = self._combine_page_texts(page_texts)
 
@@ -252,6 +281,7 @@ class PipelineOrchestrator:
                     "doc_id": layout["doc_id"],
                     "learning_enabled": self.context_store is not None,
                     "caso_id": self.caso.id if self.caso else None,
+                    **self._page_cache_metadata(cache_hits, total_pages),
                 },
                 patterns_learned=patterns_learned,
                 processing_time_ms=int(processing_time),
@@ -261,6 +291,7 @@ class PipelineOrchestrator:
 
         except Exception as e:
             logger.error(f"Pipeline failed: {e}", exc_info=True)
+            self.clear_marker_cache(pdf_path)
             processing_time = (datetime.now() - start_time).total_seconds() * 1000
 
             return PipelineResult(
@@ -276,6 +307,7 @@ class PipelineOrchestrator:
         self,
         pdf_path: Path,
         progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        collect_text: bool = True,
     ) -> Generator[dict, None, PipelineResult]:
         """
         Process a PDF yielding results page-by-page for streaming consumption.
@@ -289,6 +321,8 @@ class PipelineOrchestrator:
         Args:
             pdf_path: Path to PDF file
             progress_callback: Optional callback (same as process())
+            collect_text: If False, page texts are not retained and the final
+                PipelineResult.text is empty (consumer owns the text stream)
 
         Yields:
             dict with keys:
@@ -296,6 +330,7 @@ class PipelineOrchestrator:
                 - total_pages: Total pages in document
                 - text: Extracted text for this page
                 - engine_used: Engine that was used
+                - cache_hit: Whether the text came from the page cache
                 - success: Whether this page succeeded
                 - error: Error message if failed (optional)
 
@@ -325,6 +360,9 @@ class PipelineOrchestrator:
             total_pages = layout["total_pages"]
             logger.info(f"Layout analyzed: {total_pages} pages")
 
+            page_hashes = self._hash_pages(pdf_path, warnings)
+            cache_hits = 0
+
             # 2. Process and yield each page
             for idx, page_data in enumerate(layout["pages"]):
                 page_num = page_data["page_num"]
@@ -338,8 +376,12 @@ class PipelineOrchestrator:
                     )
 
                 try:
-                    page_result = self._process_page(pdf_path, page_data, layout)
-                    page_texts.append(page_result["text"])
+                    page_result = self._process_page(
+                        pdf_path, page_data, layout, page_hashes.get(page_num)
+                    )
+                    if collect_text:
+                        page_texts.append(page_result["text"])
+                    cache_hits += page_result["cache_hit"]
 
                     # Learn from result if ContextStore active
                     if page_result.get("observation"):
@@ -350,7 +392,8 @@ class PipelineOrchestrator:
                         "page_num": page_num,
                         "total_pages": total_pages,
                         "text": page_result["text"],
-                        "engine_used": page_data.get("recommended_engine", "pdfplumber"),
+                        "engine_used": page_result["engine_used"],
+                        "cache_hit": page_result["cache_hit"],
                         "success": True,
                     }
 
@@ -358,7 +401,8 @@ class PipelineOrchestrator:
                     warning = f"Failed to process page {page_num}: {e}"
                     logger.warning(warning)
                     warnings.append(warning)
-                    page_texts.append("")  # Empty text for failed page
+                    if collect_text:
+                        page_texts.append("")  # Empty text for failed page
 
                     # Yield failure info for this page
                     yield {
@@ -370,9 +414,13 @@ class PipelineOrchestrator:
                         "error": str(e),
                     }
 
+            self.clear_marker_cache(pdf_path)
+
             # 3. Combine and clean text
-            final_text = self._combine_page_texts(page_texts)
-            final_text = self._clean_text(final_text)
+            final_text = ""
+            if collect_text:
+                final_text = self._combine_page_texts(page_texts)
+                final_text = self._clean_text(final_text)
 
             # Calculate processing time
             processing_time = (datetime.now() - start_time).total_seconds() * 1000
@@ -386,6 +434,7 @@ class PipelineOrchestrator:
                     "doc_id": layout["doc_id"],
                     "learning_enabled": self.context_store is not None,
                     "caso_id": self.caso.id if self.caso else None,
+                    **self._page_cache_metadata(cache_hits, total_pages),
                 },
                 patterns_learned=patterns_learned,
                 processing_time_ms=int(processing_time),
@@ -395,6 +444,7 @@ class PipelineOrchestrator:
 
         except Exception as e:
             logger.error(f"Pipeline failed: {e}", exc_info=True)
+            self.clear_marker_cache(pdf_path)
             processing_time = (datetime.now() - start_time).total_seconds() * 1000
 
             return PipelineResult(
@@ -406,11 +456,78 @@ class PipelineOrchestrator:
                 warnings=[f"Pipeline failure: {e}"],
             )
 
+    def process_streaming(
+        self,
+        pdf_path: Path,
+        output_path: Path,
+        exporter: Optional[TextExporter] = None,
+        cleaner: Optional[AdvancedCleaner] = None,
+        context_chars: int = 500,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    ) -> PipelineResult:
+        """
+        Process a PDF cleaning pages incrementally and writing to the exporter.
+
+        Pages flow from process_generator() through a StreamingCleaner into
+        exporter.export_stream(), so peak memory is one page plus the bounded
+        cross-page context instead of several copies of the whole document.
+
+        Args:
+            pdf_path: Path to PDF file
+            output_path: Destination file for the cleaned text
+            exporter: Exporter with export_stream() (default: TextExporter)
+            cleaner: AdvancedCleaner for full rule-based cleaning.
+                If None, applies the same light cleanup as process().
+            context_chars: Max chars retained across page breaks
+            progress_callback: Optional callback (same as process())
+
+        Returns:
+            PipelineResult with empty text; output location and character
+            count are in metadata["output_path"] / metadata["chars_written"].
+            The text is written to a temporary file next to output_path and
+            renamed only on success: a failed run leaves no partial output.
+        """
+        exporter = exporter or TextExporter()
+        clean_fn = cleaner.clean_page if cleaner is not None else self._clean_text
+        streamer = StreamingCleaner(clean_fn=clean_fn, context_chars=context_chars)
+
+        generator = self.process_generator(
+            pdf_path, progress_callback=progress_callback, collect_text=False
+        )
+        outcome: list[PipelineResult] = []
+
+        def page_texts() -> Iterator[str]:
+            while True:
+                try:
+                    page = next(generator)
+                except StopIteration as stop:
+                    outcome.append(stop.value)
+                    return
+                yield page["text"]
+
+        output_path = Path(output_path)
+        partial_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.partial")
+        try:
+            chars_written = exporter.export_stream(streamer.stream(page_texts()), partial_path)
+            result = outcome[0]
+            if result.success:
+                os.replace(partial_path, output_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+
+        if not result.success:
+            return result
+        result.metadata["output_path"] = str(output_path)
+        result.metadata["chars_written"] = chars_written
+        result.metadata["peak_buffer_chars"] = streamer.peak_buffer_chars
+        return result
+
     def _process_page(
         self,
         pdf_path: Path,
         page_data: dict,
         layout: dict,
+        content_hash: Optional[str] = None,
     ) -> dict:
         """
         Process a single page.
@@ -419,11 +536,14 @@ class PipelineOrchestrator:
             pdf_path: Path to PDF
             page_data: Page data from layout analysis
             layout: Full layout dict (for page dimensions)
+            content_hash: Page content hash (enables the page cache)
 
         Returns:
             Dict with:
             - text: Extracted text
             - observation: ObservationResult (if learning enabled)
+            - engine_used: Engine selected for the page
+            - cache_hit: True if the text came from the page cache
         """
         page_num = page_data["page_num"]
         logger.debug(f"Processing page {page_num}")
@@ -457,8 +577,22 @@ class PipelineOrchestrator:
         # Select engine (considering hint)
         engine_name = self._select_engine_for_page(page_data, hint)
 
-        # Extract text for this page using the selected engine
-        text = self._extract_page_text(pdf_path, page_num, engine_name, page_data)
+        # Reuse text from an identical page extracted in an earlier job
+        text = None
+        use_cache = self.page_cache is not None and content_hash is not None
+        if use_cache:
+            cache_options = self._page_cache_options(engine_name, page_data)
+            text = self.page_cache.get(content_hash, engine_name, cache_options)
+        cache_hit = text is not None
+
+        if not cache_hit:
+            # Extract text for this page using the selected engine
+            text = self._extract_page_text(pdf_path, page_num, engine_name, page_data)
+            # Empty text usually means a failed extraction: don't pin it
+            if use_cache and text:
+                self.page_cache.put(content_hash, engine_name, text, cache_options)
+        else:
+            logger.debug(f"Page {page_num}: page cache hit ({engine_name})")
 
         # Create ObservationResult
         observation = self._create_observation(
@@ -481,6 +615,54 @@ class PipelineOrchestrator:
         return {
             "text": text,
             "observation": observation,
+            "engine_used": engine_name,
+            "cache_hit": cache_hit,
+        }
+
+    def _hash_pages(self, pdf_path: Path, warnings: list[str]) -> dict[int, str]:
+        """
+        Compute content hashes for all pages (only when the page cache is on).
+
+        Returns:
+            Dict page_num (1-indexed) -> content hash. Empty if the cache is
+            disabled or hashing fails (pages are then extracted normally).
+        """
+        if self.page_cache is None:
+            return {}
+        try:
+            hashes = hash_pdf_pages(pdf_path)
+        except Exception as e:
+            warning = f"Page hashing failed, page cache bypassed: {e}"
+            logger.warning(warning)
+            warnings.append(warning)
+            return {}
+        return {page_num: digest for page_num, digest in enumerate(hashes, 1)}
+
+    @staticmethod
+    def _page_cache_options(engine_name: str, page_data: dict) -> dict:
+        """
+        Options that change the extracted text for an engine.
+
+        pdfplumber crops to safe_bbox; tesseract and marker read the full
+        page, so their text depends only on the page content.
+        """
+        if engine_name == "pdfplumber":
+            return {"safe_bbox": page_data.get("safe_bbox")}
+        if engine_name == "tesseract":
+            return {"dpi": TESSERACT_DPI, "lang": TESSERACT_LANG, "psm": TESSERACT_PSM}
+        return {}
+
+    def _page_cache_metadata(self, cache_hits: int, total_pages: int) -> dict:
+        """Page cache figures for PipelineResult.metadata."""
+        if self.page_cache is None:
+            return {}
+        return {
+            "page_cache": {
+                "hits": cache_hits,
+                "pages": total_pages,
+                "hit_rate": round(cache_hits / total_pages, 4) if total_pages else 0.0,
+                "stats": self.page_cache.stats(),
+            }
         }
 
     def _compute_page_signature(self, page_data: dict) -> SignatureVector:
@@ -662,7 +844,7 @@ class PipelineOrchestrator:
         # Convert only the specific page (first_page and last_page are 1-indexed)
         images = convert_from_path(
             pdf_path,
-            dpi=300,
+            dpi=TESSERACT_DPI,
             first_page=page_num,
             last_page=page_num,
         )
@@ -673,7 +855,9 @@ class PipelineOrchestrator:
 
         # Extract text from the single page image
         image = images[0]
-        text = pytesseract.image_to_string(image, lang="por", config="--psm 3")
+        text = pytesseract.image_to_string(
+            image, lang=TESSERACT_LANG, config=f"--psm {TESSERACT_PSM}"
+        )
         return text or ""
 
     def _extract_page_marker(
@@ -704,11 +888,12 @@ class PipelineOrchestrator:
 
             try:
                 from marker.converters.pdf import PdfConverter
-                from marker.models import create_model_dict
 
-                models = create_model_dict()
-                converter = PdfConverter(artifact_dict=models)
-                rendered = converter(str(pdf_path))
+                # Models are shared process-wide (loaded once, refcounted)
+                with get_marker_registry().lease() as models:
+                    converter = PdfConverter(artifact_dict=models)
+                    rendered = converter(str(pdf_path))
+                    del converter
 
                 # Split markdown by pages if possible
                 # Marker output format varies; this is a best-effort split
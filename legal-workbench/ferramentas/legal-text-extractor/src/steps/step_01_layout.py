@@ -10,6 +10,8 @@ Algoritmo:
 3. Detecta picos de densidade nos extremos (tarja lateral)
 4. Define safe_bbox excluindo zonas de ruído
 5. Classifica tipo de página baseado em quantidade de texto extraível
+6. Para páginas RASTER_NEEDED, mede qualidade em thumbnail de baixa resolução
+   (pré-passe paralelo) e classifica complexidade/engine recomendado
 
 Output: outputs/{doc_id}/layout.json
 """
@@ -19,6 +21,7 @@ import sys
 from pathlib import Path
 from typing import Literal
 
+import numpy as np
 import pdfplumber
 
 # Adiciona o diretório raiz ao PYTHONPATH quando executado como script
@@ -36,6 +39,7 @@ from src.config import (
     RasterQualityThresholds,
     get_output_dir,
 )
+from src.core.raster_quality import compute_raster_quality, estimate_pages
 
 
 class LayoutAnalyzer:
@@ -100,8 +104,29 @@ class LayoutAnalyzer:
                 raise ValueError(f"PDF vazio: {pdf_path}")
 
             for page_num, page in enumerate(pdf.pages, start=1):
-                page_data = self._analyze_page(page, page_num)
-                pages_data.append(page_data)
+                pages_data.append(self._analyze_page_layout(page, page_num))
+
+        # Pré-passe paralelo: thumbnails apenas das páginas RASTER_NEEDED
+        raster_pages = [
+            p for p in pages_data if p["type"] == PageType.RASTER_NEEDED
+        ]
+        quality_by_page = estimate_pages(
+            pdf_path,
+            [(p["page_num"], p["safe_bbox"]) for p in raster_pages],
+            dpi=self.config.quality_thumbnail_dpi,
+            max_workers=self.config.quality_max_workers,
+            parallel_min_pages=self.config.quality_parallel_min_pages,
+        )
+
+        for page_data in pages_data:
+            quality_metrics = None
+            if page_data["type"] == PageType.RASTER_NEEDED:
+                quality_metrics = self._with_char_density(
+                    quality_by_page[page_data["page_num"]],
+                    page_data["safe_bbox"],
+                    page_data["char_count"],
+                )
+            self._apply_classification(page_data, quality_metrics)
 
         layout = {
             "doc_id": doc_id,
@@ -115,6 +140,10 @@ class LayoutAnalyzer:
         """
         Analisa uma página individual do PDF.
 
+        analyze() usa as mesmas etapas, mas mede a qualidade raster de todas
+        as páginas em um pré-passe paralelo; este método renderiza a
+        thumbnail da própria página.
+
         Args:
             page: Objeto Page do pdfplumber
             page_num: Número da página (1-indexed)
@@ -134,6 +163,28 @@ class LayoutAnalyzer:
                 "char_count": int
             }
         """
+        page_data = self._analyze_page_layout(page, page_num)
+
+        quality_metrics = None
+        if page_data["type"] == PageType.RASTER_NEEDED:
+            quality_metrics = self._estimate_raster_quality(
+                page, page_data["safe_bbox"], page_data["char_count"]
+            )
+
+        self._apply_classification(page_data, quality_metrics)
+        return page_data
+
+    def _analyze_page_layout(self, page, page_num: int) -> dict:
+        """
+        Etapa geométrica da análise: tarja, safe_bbox, contagem e tipo.
+
+        Args:
+            page: Objeto Page do pdfplumber
+            page_num: Número da página (1-indexed)
+
+        Returns:
+            Dict base da página (sem complexidade/engine)
+        """
         chars = page.chars
         page_width = page.width
         page_height = page.height
@@ -180,14 +231,22 @@ class LayoutAnalyzer:
         if has_tarja and tarja_x_cut is not None:
             page_data["tarja_x_cut"] = tarja_x_cut
 
-        # === NOVA FUNCIONALIDADE: Classificação de complexidade ===
+        return page_data
 
-        # Estimar qualidade para páginas RASTER
-        quality_metrics = None
-        if page_type == PageType.RASTER_NEEDED:
-            quality_metrics = self._estimate_raster_quality(
-                page, safe_bbox, char_count
-            )
+    def _apply_classification(
+        self, page_data: dict, quality_metrics: dict | None
+    ) -> None:
+        """
+        Completa page_data com complexidade, engine e necessidade de limpeza.
+
+        Args:
+            page_data: Dict de _analyze_page_layout (modificado in-place)
+            quality_metrics: Métricas raster (None para páginas NATIVE)
+        """
+        has_tarja = page_data["has_tarja"]
+
+        if quality_metrics is not None:
+            page_data["quality_metrics"] = quality_metrics
 
         # Classificar complexidade
         complexity = self._classify_complexity(page_data, quality_metrics)
@@ -222,8 +281,6 @@ class LayoutAnalyzer:
         if cleaning_reasons:
             page_data["cleaning_reason"] = cleaning_reasons
 
-        return page_data
-
     def _detect_tarja(
         self, chars: list, page_width: float
     ) -> tuple[bool, float | None]:
@@ -387,7 +444,11 @@ class LayoutAnalyzer:
         self, page, safe_bbox: list, char_count: int
     ) -> dict:
         """
-        Estima qualidade de uma página rasterizada.
+        Estima qualidade de uma página rasterizada a partir de thumbnail.
+
+        Renderiza a safe_bbox em baixa resolução (quality_thumbnail_dpi) e
+        mede contraste de histograma, ruído, variância do Laplaciano e marca
+        d'água (ver src.core.raster_quality).
 
         Args:
             page: Objeto Page do pdfplumber
@@ -399,36 +460,36 @@ class LayoutAnalyzer:
             {
                 "contrast_score": float (0.0-1.0),
                 "noise_level": float (0.0-1.0),
+                "sharpness": float,
                 "char_density": float,
-                "has_watermark": bool
+                "has_watermark": bool,
+                ...
             }
         """
-        # NOTA: Esta é uma implementação placeholder que retorna valores default
-        # Para implementação completa, seria necessário:
-        # 1. Renderizar página como imagem (via pdf2image ou similar)
-        # 2. Calcular histograma de intensidade -> contrast_score
-        # 3. Calcular variância local de pixels -> noise_level
-        # 4. Detectar padrões repetitivos -> has_watermark
-
-        # Por enquanto, usa heurística baseada apenas em char_count
+        x0, top, x1, bottom = safe_bbox
+        bbox = (
+            max(x0, page.bbox[0]),
+            max(top, page.bbox[1]),
+            min(x1, page.bbox[2]),
+            min(bottom, page.bbox[3]),
+        )
+        image = page.crop(bbox).to_image(
+            resolution=self.config.quality_thumbnail_dpi
+        ).original
+        gray = np.asarray(image.convert("L"))
+
+        return self._with_char_density(
+            compute_raster_quality(gray), safe_bbox, char_count
+        )
+
+    @staticmethod
+    def _with_char_density(
+        quality_metrics: dict, safe_bbox: list, char_count: int
+    ) -> dict:
+        """Acrescenta char_density (chars por ponto²) às métricas de imagem."""
         bbox_area = (safe_bbox[2] - safe_bbox[0]) * (safe_bbox[3] - safe_bbox[1])
         char_density = char_count / bbox_area if bbox_area > 0 else 0.0
-
-        # Heurística simples: páginas com poucos chars podem ser degradadas
-        if char_density < 0.0001:  # Muito poucos chars
-            return {
-                "contrast_score": 0.3,  # Baixo contraste presumido
-                "noise_level": 0.7,     # Alto ruído presumido
-                "char_density": char_density,
-                "has_watermark": False  # Não detectável sem análise de imagem
-            }
-        else:
-            return {
-                "contrast_score": 0.85,  # Contraste razoável presumido
-                "noise_level": 0.3,      # Baixo ruído presumido
-                "char_density": char_density,
-                "has_watermark": False
-            }
+        return {**quality_metrics, "char_density": char_density}
 
     def _classify_complexity(
         self, page_data: dict, quality_metrics: dict | None = None
@@ -9,6 +9,10 @@ Este módulo reimplementa o Step 04 usando Gemini 2.5 Flash para:
 Pipeline:
     final.md → Gemini (classificação) → Gemini (limpeza) → Outputs
 
+Documentos maiores que chunk_max_chars são divididos em fronteiras de
+página e enviados em chunks concorrentes (AsyncChunkEnhancer), com cache por
+chunk e retry apenas dos chunks que falharam.
+
 Uso CLI:
     python -m src.steps.step_04_classify --input-md outputs/doc/final.md
 
@@ -33,6 +37,7 @@ import typer
 # Imports relativos para compatibilidade
 try:
     from src.gemini import GeminiClient, GeminiConfig
+    from src.gemini.async_enhancer import AsyncChunkEnhancer, ChunkBackend, ChunkCache, CliBackend, split_chunks
     from src.gemini.prompts import build_classification_prompt, build_cleaning_prompt
     from src.gemini.schemas import (
         ClassificationResult,
@@ -47,6 +52,7 @@ except ImportError:
     from pathlib import Path as _Path
     sys.path.insert(0, str(_Path(__file__).parent.parent.parent))
     from src.gemini import GeminiClient, GeminiConfig
+    from src.gemini.async_enhancer import AsyncChunkEnhancer, ChunkBackend, ChunkCache, CliBackend, split_chunks
     from src.gemini.prompts import build_classification_prompt, build_cleaning_prompt
     from src.gemini.schemas import (
         ClassificationResult,
@@ -58,6 +64,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Header de página do Step 03, com o número capturado (mantido no split)
+_PAGE_HEADER = re.compile(r"^(?=## \[\[PAGE_(\d+)\]\])", re.MULTILINE)
+
 
 class ProcessingOutput(TypedDict):
     """Output completo do processamento."""
@@ -85,6 +94,14 @@ class BibliotecarioConfig:
     # Validação
     min_confidence: float = 0.3
 
+    # Chunking (documentos grandes)
+    chunk_max_chars: int = 120_000
+    max_concurrency: int = 4
+    calls_per_minute: float = 30
+    chunk_cache_path: Path | None = field(
+        default_factory=lambda: Path.home() / ".cache" / "legal-text-extractor" / "gemini_chunks.db"
+    )
+
 
 @dataclass
 class GeminiBibliotecario:
@@ -106,6 +123,8 @@ class GeminiBibliotecario:
 
     config: BibliotecarioConfig = field(default_factory=BibliotecarioConfig)
     _client: GeminiClient | None = field(default=None, repr=False)
+    _backend: ChunkBackend | None = field(default=None, repr=False)
+    _cache: ChunkCache | None = field(default=None, repr=False)
 
     def __post_init__(self) -> None:
         """Inicializa cliente Gemini."""
@@ -114,6 +133,11 @@ class GeminiBibliotecario:
             timeout_seconds=self.config.timeout_seconds,
         )
         self._client = GeminiClient(config=gemini_config)
+        if self._backend is None:
+            self._backend = CliBackend(
+                model=self.config.model,
+                timeout_seconds=self.config.timeout_seconds,
+            )
 
     def process(
         self,
@@ -196,23 +220,27 @@ class GeminiBibliotecario:
 
         prompt = build_classification_prompt(doc_id)
 
-        response = self._client.process_file(
-            file_path=input_path,
-            prompt=prompt,
-            output_format="json",
-        )
+        text = input_path.read_text(encoding="utf-8")
+        if len(text) > self.config.chunk_max_chars:
+            data = self._classify_chunked(text, prompt)
+        else:
+            response = self._client.process_file(
+                file_path=input_path,
+                prompt=prompt,
+                output_format="json",
+            )
 
-        if not response.success:
-            raise RuntimeError(f"Gemini falhou na classificação: {response.error}")
+            if not response.success:
+                raise RuntimeError(f"Gemini falhou na classificação: {response.error}")
 
-        # Parse e valida JSON
-        try:
-            data = json.loads(response.text)
-            logger.debug(f"JSON parseado: {len(data.get('sections', []))} seções")
-        except json.JSONDecodeError as e:
-            logger.error(f"Output não é JSON válido: {e}")
-            logger.error(f"Response text (primeiros 500 chars): {response.text[:500]}")
-            raise ValueError(f"Gemini retornou JSON inválido: {e}")
+            # Parse e valida JSON
+            try:
+                data = json.loads(response.text)
+                logger.debug(f"JSON parseado: {len(data.get('sections', []))} seções")
+            except json.JSONDecodeError as e:
+                logger.error(f"Output não é JSON válido: {e}")
+                logger.error(f"Response text (primeiros 500 chars): {response.text[:500]}")
+                raise ValueError(f"Gemini retornou JSON inválido: {e}")
 
         # Converte para Pydantic models
         try:
@@ -273,14 +301,20 @@ class GeminiBibliotecario:
 
         prompt = build_cleaning_prompt(classification_summary)
 
-        response = self._client.process_file(
-            file_path=input_path,
-            prompt=prompt,
-            output_format="json",
-        )
+        text = input_path.read_text(encoding="utf-8")
+        if len(text) > self.config.chunk_max_chars:
+            data = self._clean_chunked(text, prompt, classification)
+        else:
+            response = self._client.process_file(
+                file_path=input_path,
+                prompt=prompt,
+                output_format="json",
+            )
+            data = response.text if response.success else None
+            if not response.success:
+                logger.warning(f"Gemini falhou na limpeza: {response.error}")
 
-        if not response.success:
-            logger.warning(f"Gemini falhou na limpeza: {response.error}")
+        if data is None:
             # Retorna resultado vazio mas não falha todo o processo
             return CleaningResult(
                 doc_id=classification.doc_id,
@@ -291,7 +325,8 @@ class GeminiBibliotecario:
             )
 
         try:
-            data = json.loads(response.text)
+            if isinstance(data, str):
+                data = json.loads(data)
 
             sections = []
             for s in data.get("sections", []):
@@ -327,6 +362,189 @@ class GeminiBibliotecario:
                 reduction_percent=0.0,
             )
 
+    def _enhancer(self, prompt: str) -> AsyncChunkEnhancer:
+        """Cria enhancer em chunks (cache aberto sob demanda)."""
+        if self._cache is None and self.config.chunk_cache_path is not None:
+            self._cache = ChunkCache(self.config.chunk_cache_path)
+        return AsyncChunkEnhancer(
+            backend=self._backend,
+            prompt=prompt,
+            cache=self._cache,
+            max_chars=self.config.chunk_max_chars,
+            concurrency=self.config.max_concurrency,
+            calls_per_minute=self.config.calls_per_minute,
+        )
+
+    def _map_json_chunks(self, text: str, prompt: str) -> list[dict | None]:
+        """
+        Envia chunks do documento concorrentemente e parseia cada resposta JSON.
+
+        Returns:
+            Um dict por chunk, na ordem do documento (None se o chunk falhou)
+        """
+        chunks = split_chunks(text, self.config.chunk_max_chars)
+        responses, stats = self._enhancer(prompt).map_chunks_sync(chunks)
+        logger.info(
+            f"[Step 04] {stats.chunks} chunks ({stats.cached} do cache, "
+            f"{len(stats.failed)} falhas) em {stats.seconds:.1f}s"
+        )
+
+        parsed: list[dict | None] = []
+        for index, response in enumerate(responses):
+            if response is None:
+                parsed.append(None)
+                continue
+            try:
+                try:
+                    parsed.append(json.loads(response))
+                except json.JSONDecodeError:
+                    parsed.append(json.loads(GeminiClient._extract_json(response)))
+            except json.JSONDecodeError as e:
+                logger.warning(f"Chunk {index + 1}: JSON inválido: {e}")
+                parsed.append(None)
+        return parsed
+
+    def _classify_chunked(self, text: str, prompt: str) -> dict:
+        """
+        Classificação em chunks de páginas.
+
+        Seções de chunks vizinhos com o mesmo tipo e páginas contíguas são
+        unidas (a peça atravessou a fronteira do chunk); section_ids são
+        renumerados na ordem do documento.
+
+        Raises:
+            RuntimeError: Se algum chunk falhar (classificação é obrigatória)
+        """
+        parsed = self._map_json_chunks(text, prompt)
+        failed = [i + 1 for i, data in enumerate(parsed) if data is None]
+        if failed:
+            raise RuntimeError(f"Gemini falhou na classificação dos chunks {failed}")
+
+        sections: list[dict] = []
+        for data in parsed:
+            chunk_sections = sorted(data.get("sections", []), key=lambda s: s["start_page"])
+            for position, s in enumerate(chunk_sections):
+                previous = sections[-1] if sections else None
+                if (
+                    position == 0
+                    and previous is not None
+                    and previous["type"] == s["type"]
+                    and s["start_page"] <= previous["end_page"] + 1
+                ):
+                    previous["end_page"] = max(previous["end_page"], s["end_page"])
+                    previous["confidence"] = min(
+                        previous.get("confidence", 0.5), s.get("confidence", 0.5)
+                    )
+                    continue
+                sections.append(dict(s))
+
+        for section_id, s in enumerate(sections, start=1):
+            s["section_id"] = section_id
+
+        return {
+            "total_pages": max(
+                [data.get("total_pages", 0) for data in parsed]
+                + [s["end_page"] for s in sections]
+            ),
+            "sections": sections,
+            "summary": parsed[0].get("summary", "Documento jurídico"),
+        }
+
+    def _clean_chunked(
+        self, text: str, prompt: str, classification: ClassificationResult
+    ) -> dict | None:
+        """
+        Limpeza em chunks de páginas.
+
+        Conteúdo da mesma seção vindo de chunks diferentes é concatenado.
+        Chunks que falharam entram com o texto original, distribuído nas
+        seções da classificação pelas páginas (limpeza é opcional, mas não
+        pode perder texto).
+
+        Returns:
+            Dados no formato da resposta de limpeza (None se todos falharam)
+        """
+        chunks = split_chunks(text, self.config.chunk_max_chars)
+        parsed = self._map_json_chunks(text, prompt)
+        failed = [i + 1 for i, data in enumerate(parsed) if data is None]
+        if len(failed) == len(parsed):
+            return None
+        if failed:
+            logger.warning(f"[Step 04] Chunks {failed} sem limpeza, mantendo texto original")
+        parsed = [
+            data if data is not None else self._uncleaned_chunk(chunk, classification)
+            for chunk, data in zip(chunks, parsed, strict=True)
+        ]
+
+        by_id: dict[int, dict] = {}
+        for data in parsed:
+            for s in data.get("sections", []):
+                merged = by_id.get(s["section_id"])
+                if merged is None:
+                    by_id[s["section_id"]] = {
+                        **s,
+                        "content": s.get("content", ""),
+                        "noise_removed": list(s.get("noise_removed", [])),
+                    }
+                else:
+                    merged["content"] = f"{merged['content']}\n\n{s.get('content', '')}".strip()
+                    merged["noise_removed"].extend(s.get("noise_removed", []))
+
+        original = sum(data.get("total_chars_original", 0) for data in parsed)
+        cleaned = sum(data.get("total_chars_cleaned", 0) for data in parsed)
+        return {
+            "sections": [by_id[section_id] for section_id in sorted(by_id)],
+            "total_chars_original": original,
+            "total_chars_cleaned": cleaned,
+            "reduction_percent": (
+                round(max(original - cleaned, 0) / original * 100, 2) if original else 0.0
+            ),
+        }
+
+    @staticmethod
+    def _uncleaned_chunk(chunk: str, classification: ClassificationResult) -> dict:
+        """
+        Resposta de limpeza equivalente para um chunk que falhou.
+
+        Cada página do chunk vai, sem alterações, para a seção que a contém
+        (texto antes do primeiro header fica com a primeira página).
+        """
+        sections = classification.sections
+        parts = _PAGE_HEADER.split(chunk)
+        # split com grupo: [prefixo, página, texto, página, texto, ...]
+        pages = [(int(parts[i]), parts[i + 1]) for i in range(1, len(parts), 2)]
+        if pages:
+            pages[0] = (pages[0][0], parts[0] + pages[0][1])
+        else:
+            pages = [(sections[0].start_page if sections else 1, parts[0])]
+
+        by_id: dict[int, dict] = {}
+        for page, page_text in pages:
+            section = next(
+                (s for s in sections if s.start_page <= page <= s.end_page),
+                None,
+            ) or next(
+                (s for s in reversed(sections) if s.start_page <= page),
+                sections[0] if sections else None,
+            )
+            if section is None:
+                continue
+            entry = by_id.setdefault(section.section_id, {
+                "section_id": section.section_id,
+                "type": section.type.value,
+                "content": "",
+                "noise_removed": [],
+            })
+            entry["content"] += page_text
+
+        for entry in by_id.values():
+            entry["content"] = entry["content"].strip()
+        return {
+            "sections": list(by_id.values()),
+            "total_chars_original": len(chunk),
+            "total_chars_cleaned": len(chunk),
+        }
+
     def _generate_outputs(
         self,
         output_path: Path,
@@ -0,0 +1,165 @@
+"""
+Imagens sintéticas de layout em colunas compartilhadas pelos testes e
+pelo benchmark de detecção de colunas.
+
+Inclui a varredura escalar de referência (oráculo de corretude da busca
+de vales vetorizada) e o corpus de fixtures usado pelo oráculo.
+"""
+
+import numpy as np
+
+from src.core.image_cleaner import ColumnBoundary, ColumnDetectionConfig
+
+
+def create_single_column_image(width: int = 600, height: int = 800) -> np.ndarray:
+    """
+    Creates a synthetic single-column document image.
+
+    The image has text-like patterns (dark pixels) distributed
+    across the full width, simulating a single-column layout.
+    """
+    # White background
+    image = np.ones((height, width), dtype=np.uint8) * 255
+
+    # Add text-like horizontal lines across the full width
+    margin = int(width * 0.1)
+    for y in range(50, height - 50, 20):
+        # Random line length but always spanning most of the width
+        line_start = margin + np.random.randint(0, 20)
+        line_end = width - margin - np.random.randint(0, 20)
+        image[y : y + 2, line_start:line_end] = 0  # Black text line
+
+    return image
+
+
+def create_two_column_image(
+    width: int = 600, height: int = 800, gap_width: int = 60
+) -> np.ndarray:
+    """
+    Creates a synthetic two-column document image.
+
+    The image has two distinct text regions separated by a clear gap,
+    simulating a two-column newspaper-style layout.
+    """
+    # White background
+    image = np.ones((height, width), dtype=np.uint8) * 255
+
+    # Calculate column positions
+    margin = int(width * 0.05)
+    col1_start = margin
+    col1_end = (width - gap_width) // 2
+    col2_start = col1_end + gap_width
+    col2_end = width - margin
+
+    # Add text-like horizontal lines in each column
+    for y in range(50, height - 50, 20):
+        # Left column
+        line_start = col1_start + np.random.randint(0, 10)
+        line_end = col1_end - np.random.randint(0, 10)
+        if line_end > line_start:
+            image[y : y + 2, line_start:line_end] = 0
+
+        # Right column
+        line_start = col2_start + np.random.randint(0, 10)
+        line_end = col2_end - np.random.randint(0, 10)
+        if line_end > line_start:
+            image[y : y + 2, line_start:line_end] = 0
+
+    return image
+
+
+def create_three_column_image(
+    width: int = 900, height: int = 800, gap_width: int = 50
+) -> np.ndarray:
+    """
+    Creates a synthetic three-column document image.
+    """
+    # White background
+    image = np.ones((height, width), dtype=np.uint8) * 255
+
+    # Calculate column positions
+    margin = int(width * 0.03)
+    col_width = (width - 2 * margin - 2 * gap_width) // 3
+
+    col1_start = margin
+    col1_end = col1_start + col_width
+    col2_start = col1_end + gap_width
+    col2_end = col2_start + col_width
+    col3_start = col2_end + gap_width
+    col3_end = width - margin
+
+    # Add text-like horizontal lines in each column
+    for y in range(50, height - 50, 18):
+        for col_start, col_end in [
+            (col1_start, col1_end),
+            (col2_start, col2_end),
+            (col3_start, col3_end),
+        ]:
+            line_start = col_start + np.random.randint(0, 8)
+            line_end = col_end - np.random.randint(0, 8)
+            if line_end > line_start:
+                image[y : y + 2, line_start:line_end] = 0
+
+    return image
+
+
+def create_empty_image(width: int = 600, height: int = 800) -> np.ndarray:
+    """Creates a blank white image with no text."""
+    return np.ones((height, width), dtype=np.uint8) * 255
+
+
+def create_noisy_image(width: int = 600, height: int = 800) -> np.ndarray:
+    """Creates an image with random noise (no clear column structure)."""
+    image = np.ones((height, width), dtype=np.uint8) * 255
+    # Add random noise
+    noise = np.random.randint(0, 50, (height, width), dtype=np.uint8)
+    image = np.clip(image.astype(np.int16) - noise, 0, 255).astype(np.uint8)
+    return image
+
+
+def reference_find_column_boundaries(
+    config: ColumnDetectionConfig, normalized: np.ndarray, width: int
+) -> list[ColumnBoundary]:
+    """
+    Scalar reference scan (original per-pixel loop), used as correctness oracle
+    for the vectorized implementation.
+    """
+    margin = int(width * config.edge_margin_ratio)
+    min_gap = config.get_min_gap_width(width)
+    threshold = 1.0 - config.valley_prominence
+
+    boundaries = []
+    in_valley = False
+    valley_start = 0
+    for i in range(margin, width - margin):
+        is_low = normalized[i] < threshold
+        if is_low and not in_valley:
+            in_valley = True
+            valley_start = i
+        elif not is_low and in_valley:
+            in_valley = False
+            gap_width = i - valley_start
+            if gap_width >= min_gap:
+                min_val = normalized[valley_start:i].min()
+                confidence = min((1.0 - min_val) / config.valley_prominence, 1.0)
+                boundaries.append(ColumnBoundary(valley_start, i, gap_width, confidence))
+
+    max_boundaries = config.max_columns - 1
+    if len(boundaries) > max_boundaries:
+        boundaries = sorted(boundaries, key=lambda b: b.confidence, reverse=True)[:max_boundaries]
+        boundaries = sorted(boundaries, key=lambda b: b.x_start)
+    return boundaries
+
+
+def oracle_fixture_images() -> list[np.ndarray]:
+    """All synthetic fixtures from this module, used as the oracle corpus."""
+    np.random.seed(1234)
+    return [
+        create_single_column_image(),
+        create_two_column_image(),
+        create_two_column_image(width=1200, height=1600, gap_width=100),
+        create_three_column_image(),
+        create_empty_image(),
+        create_noisy_image(),
+        create_two_column_image(width=600, height=800, gap_width=20),
+    ]
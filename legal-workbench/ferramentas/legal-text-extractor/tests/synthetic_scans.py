@@ -0,0 +1,91 @@
+"""
+Scans sintéticos compartilhados pelos testes (raster quality, page cache).
+
+Gera páginas A4 em grayscale com texto, variações de papel/tinta/ruído e
+marcas d'água, e as grava como PDF só-imagem.
+"""
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+A4_POINTS = (595, 842)
+_ALPHABET = list("abcdefghijlmnopqrstuv")
+
+
+def create_text_scan(
+    paper: int = 250,
+    ink: int = 20,
+    noise: float = 0.0,
+    blur: float = 0.0,
+    seed: int = 0,
+    dpi: int = 72,
+) -> np.ndarray:
+    """Página A4 em grayscale com linhas de palavras (simula scan)."""
+    rng = np.random.default_rng(seed)
+    scale = dpi / 72
+    height, width = int(A4_POINTS[1] * scale), int(A4_POINTS[0] * scale)
+    image = np.full((height, width), paper, dtype=np.uint8)
+
+    y = int(60 * scale)
+    while y < height - 60 * scale:
+        x = int(50 * scale)
+        while x < width - 80 * scale:
+            size = int(rng.integers(2, 9))
+            word = "".join(rng.choice(_ALPHABET, size))
+            cv2.putText(
+                image, word, (x, y), cv2.FONT_HERSHEY_SIMPLEX,
+                0.4 * scale, ink, max(1, int(scale)), cv2.LINE_AA,
+            )
+            x += int((size * 8 + 6) * scale)
+        y += int(14 * scale)
+
+    result = image.astype(np.float32)
+    if blur:
+        result = cv2.GaussianBlur(result, (0, 0), blur * scale)
+    if noise:
+        result += rng.normal(0, noise, result.shape)
+    return np.clip(result, 0, 255).astype(np.uint8)
+
+
+def add_watermark(image: np.ndarray, tiled: bool, value: int = 210) -> np.ndarray:
+    """Marca d'água cinza em diagonal: 'COPIA' em mosaico ou 'SIGILO' grande."""
+    height, width = image.shape
+    scale = width / A4_POINTS[0]
+    layer = np.zeros_like(image)
+    if tiled:
+        for y in range(0, height, int(90 * scale)):
+            for x in range(-width, width, int(140 * scale)):
+                cv2.putText(
+                    layer, "COPIA", (x + y, y), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.9 * scale, 255, max(2, int(2 * scale)),
+                )
+    else:
+        cv2.putText(
+            layer, "SIGILO", (int(40 * scale), int(450 * scale)),
+            cv2.FONT_HERSHEY_SIMPLEX, 4 * scale, 255, int(25 * scale),
+        )
+    rotation = cv2.getRotationMatrix2D((width / 2, height / 2), 35, 1)
+    layer = cv2.warpAffine(layer, rotation, (width, height))
+
+    result = image.copy()
+    mask = (layer > 0) & (image > value)
+    result[mask] = value
+    return result
+
+
+SCAN_KINDS = {
+    "clean": lambda seed: create_text_scan(noise=3, seed=seed),
+    "dirty": lambda seed: create_text_scan(paper=200, ink=70, noise=8, seed=seed),
+    "degraded": lambda seed: create_text_scan(paper=150, ink=90, noise=20, seed=seed),
+    "watermark": lambda seed: add_watermark(create_text_scan(noise=3, seed=seed), tiled=True),
+}
+
+
+def write_scan_pdf(pages: list[np.ndarray], path: Path, dpi: int = 72) -> Path:
+    """Salva páginas como PDF só-imagem (sem camada de texto)."""
+    images = [Image.fromarray(page) for page in pages]
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=dpi)
+    return path
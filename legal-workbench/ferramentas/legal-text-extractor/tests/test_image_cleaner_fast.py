@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Testes para o modo de desempenho do ImageCleaner (proxy reduzido + tiles).
+
+Valida que:
+1. Tiles com halo reproduzem exatamente os filtros de pagina inteira
+2. process_image_fast() equivale a process_image() nos modos digital/scanned
+3. Carimbos fora dos tiles detectados no proxy nao custam HSV em alta resolucao
+4. Tempos por etapa sao reportados
+
+Execucao:
+    cd ferramentas/legal-text-extractor
+    source .venv/bin/activate
+    python -m pytest tests/test_image_cleaner_fast.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+# Adiciona o diretorio raiz ao PYTHONPATH
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import VisionConfig
+from src.core.image_cleaner import (
+    CleaningMode,
+    CleaningOptions,
+    ImageCleaner,
+    PerformanceConfig,
+)
+from src.core.tiling import StageTimer, apply_tiled, is_uniform, iter_tiles, proxy_stride
+from src.steps.step_02_vision import VisionProcessor
+
+
+# =============================================================================
+# Test Fixtures - Paginas Sinteticas
+# =============================================================================
+
+
+def create_scanned_page(seed: int = 0, stamps: bool = True) -> np.ndarray:
+    """Pagina RGB amarelada com linhas de texto, ruido e carimbos coloridos."""
+    rng = np.random.default_rng(seed)
+    page = np.full((1400, 1000, 3), (190, 186, 178), dtype=np.uint8)
+    for y in range(120, 1200, 40):
+        x_end = int(rng.integers(500, 880))
+        page[y:y + 14, 100:x_end] = int(rng.integers(20, 80))
+    noise = rng.integers(-12, 12, page.shape[:2] + (1,))
+    page = np.clip(page.astype(int) + noise, 0, 255).astype(np.uint8)
+    # Margem inferior limpa (tiles uniformes)
+    page[1250:] = 255
+    if stamps:
+        cv2.circle(page, (760, 300), 70, (30, 60, 200), 6)  # azul (RGB)
+        cv2.rectangle(page, (150, 900), (420, 990), (200, 30, 30), 5)  # vermelho
+    return page
+
+
+def create_digital_page() -> np.ndarray:
+    """Pagina digital: texto preto, marca d'agua cinza e fundo branco."""
+    page = np.full((1200, 900), 255, dtype=np.uint8)
+    page[300:700, 200:700] = 215  # marca d'agua
+    for y in range(100, 1100, 36):
+        page[y:y + 12, 80:820] = 0
+    return page
+
+
+# =============================================================================
+# Tiling
+# =============================================================================
+
+
+class TestTiling:
+    """Primitivas de tiles com halo"""
+
+    def test_tiles_cover_image_without_overlap(self):
+        coverage = np.zeros((1000, 730), dtype=np.int32)
+        for rect in iter_tiles(coverage.shape, 256, halo=15):
+            coverage[rect.y0:rect.y1, rect.x0:rect.x1] += 1
+            assert rect.hy0 >= 0 and rect.hx1 <= 730
+        assert (coverage == 1).all()
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_adaptive_threshold_matches_full_page(self, max_workers):
+        gray = cv2.cvtColor(create_scanned_page(stamps=False), cv2.COLOR_RGB2GRAY)
+
+        def threshold(region):
+            return cv2.adaptiveThreshold(
+                region, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 15
+            )
+
+        tiled, processed = apply_tiled(
+            gray, threshold, halo=15, tile_size=200, max_workers=max_workers
+        )
+        assert processed == len(iter_tiles(gray.shape, 200, 15))
+        np.testing.assert_array_equal(tiled, threshold(gray))
+
+    def test_uniform_tiles_are_skipped(self):
+        image = np.full((600, 600), 255, dtype=np.uint8)
+        image[10:40, 10:40] = 0
+        tiled, processed = apply_tiled(
+            image,
+            lambda region: cv2.medianBlur(region, 3),
+            halo=1,
+            tile_size=100,
+            select=lambda region, _: not is_uniform(region),
+        )
+        assert processed == 1
+        np.testing.assert_array_equal(tiled, cv2.medianBlur(image, 3))
+
+    def test_opencv_threads_restored(self):
+        before = cv2.getNumThreads()
+        image = np.random.default_rng(1).integers(0, 255, (400, 400), dtype=np.uint8)
+        apply_tiled(image, lambda r: cv2.medianBlur(r, 3), halo=1, tile_size=100, max_workers=3)
+        assert cv2.getNumThreads() == before
+
+    def test_proxy_stride(self):
+        assert proxy_stride((3508, 2480), 1024) == 4
+        assert proxy_stride((800, 600), 1024) == 1
+
+    def test_stage_timer_accumulates(self):
+        timer = StageTimer()
+        with timer.stage("a"):
+            pass
+        with timer.stage("a"):
+            pass
+        timings = timer.as_dict()
+        assert set(timings) == {"a", "total"}
+        assert timings["total"] >= timings["a"] >= 0
+
+
+# =============================================================================
+# ImageCleaner.process_image_fast
+# =============================================================================
+
+
+class TestProcessImageFast:
+    """Equivalencia com o pipeline de pagina inteira"""
+
+    @pytest.fixture
+    def config(self):
+        return PerformanceConfig(proxy_max_side=256, tile_size=256, max_workers=2)
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_scanned_matches_full_pipeline(self, config, seed):
+        image = Image.fromarray(create_scanned_page(seed))
+        cleaner = ImageCleaner()
+
+        expected = np.array(cleaner.process_image(image, mode="scanned"))
+        result = cleaner.process_image_fast(image, mode="scanned", config=config)
+
+        np.testing.assert_array_equal(np.array(result.image), expected)
+        assert result.mode == CleaningMode.SCANNED
+        assert result.proxy_stride == 6
+
+    def test_auto_mode_detected_on_proxy(self, config):
+        cleaner = ImageCleaner()
+        for page in (create_scanned_page(), create_digital_page()):
+            image = Image.fromarray(page)
+            fast = cleaner.process_image_fast(image, config=config)
+            assert fast.mode == cleaner.detect_mode(
+                cv2.cvtColor(np.array(image.convert("RGB")), cv2.COLOR_RGB2BGR)
+            )
+            np.testing.assert_array_equal(
+                np.array(fast.image), np.array(cleaner.process_image(image))
+            )
+
+    def test_dark_scan_uses_clahe(self, config):
+        page = (create_scanned_page(stamps=False) * 0.3).astype(np.uint8)
+        image = Image.fromarray(page)
+        cleaner = ImageCleaner()
+
+        result = cleaner.process_image_fast(image, mode="scanned", config=config)
+
+        assert "clahe" in result.timings
+        assert "stamp_removal" not in result.timings
+        np.testing.assert_array_equal(
+            np.array(result.image), np.array(cleaner.process_image(image, mode="scanned"))
+        )
+
+    def test_stamp_removal_limited_to_stamp_tiles(self, config):
+        image = Image.fromarray(create_scanned_page())
+        result = ImageCleaner().process_image_fast(image, mode="scanned", config=config)
+        clean = ImageCleaner().process_image_fast(
+            Image.fromarray(create_scanned_page(stamps=False)), mode="scanned", config=config
+        )
+
+        total_tiles = len(iter_tiles((1400, 1000), 256, 0))
+        stamp_tiles = result.tiles_processed - clean.tiles_processed
+        assert 0 < stamp_tiles < total_tiles / 2
+        assert "stamp_removal" not in clean.timings
+
+    def test_reports_stage_timings(self, config):
+        result = ImageCleaner().process_image_fast(
+            Image.fromarray(create_scanned_page()), mode="auto", config=config
+        )
+        for stage in ("detect_mode", "stamp_mask", "stamp_removal", "threshold_despeckle"):
+            assert stage in result.timings
+        assert result.timings["total"] >= result.timings["threshold_despeckle"]
+
+    def test_process_image_delegates_in_performance_mode(self):
+        options = CleaningOptions(performance=PerformanceConfig(tile_size=256))
+        cleaner = ImageCleaner.from_options(options)
+        image = Image.fromarray(create_scanned_page())
+
+        assert cleaner.performance is options.performance
+        np.testing.assert_array_equal(
+            np.array(cleaner.process_image(image, mode="scanned")),
+            np.array(ImageCleaner().process_image(image, mode="scanned")),
+        )
+
+
+# =============================================================================
+# VisionProcessor (step_02)
+# =============================================================================
+
+
+class TestVisionTiledDenoise:
+    """Denoise por tiles no pipeline do Saneador"""
+
+    def test_tiled_denoise_matches_full_page(self):
+        page = cv2.cvtColor(create_scanned_page(stamps=False), cv2.COLOR_RGB2BGR)
+        full = VisionProcessor(VisionConfig()).apply_pipeline_timed(page)
+        tiled = VisionProcessor(
+            VisionConfig(performance_mode=True, tile_size=256, max_workers=2)
+        ).apply_pipeline_timed(page)
+
+        np.testing.assert_array_equal(tiled.image, full.image)
+        assert tiled.tiles_processed < len(iter_tiles(page.shape, 256, 0))
+        assert {"binarize", "denoise", "total"} <= set(tiled.timings)
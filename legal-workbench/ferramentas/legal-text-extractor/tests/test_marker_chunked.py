@@ -0,0 +1,190 @@
+"""
+Tests for chunked local Marker extraction (page_range windows).
+
+Uses a fake converter (marker-pdf is not required) to check:
+1. Window planning and ordered, streamed assembly
+2. Progress callback per window
+3. Resume after a crash skips finished windows
+4. Checkpoints from another PDF or other settings are discarded
+5. An autoretried task keeps its checkpoint and the retry resumes from it
+6. page_range_converter reuses one converter and restores its config
+"""
+
+import shutil
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Setup path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.engines.marker_chunked import (
+    ChunkedMarkerExtractor,
+    keep_checkpoint_for_retry,
+    plan_chunks,
+    page_range_converter,
+)
+
+
+def fake_convert(calls: list, fail_at: int = None):
+    """ChunkConverter that renders page markers and can crash on a window."""
+
+    def convert(pdf_path: str, pages: list[int]) -> str:
+        if fail_at is not None and pages[0] == fail_at:
+            raise RuntimeError("worker killed")
+        calls.append(pages)
+        return "\n".join(f"{{{page}}}---- page {page + 1}" for page in pages)
+
+    return convert
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "autos.pdf"
+    path.write_bytes(b"%PDF-1.4 fake content")
+    return path
+
+
+def expected_text(total_pages: int, chunk_size: int) -> str:
+    return "\n\n".join(
+        "\n".join(f"{{{page}}}---- page {page + 1}" for page in chunk)
+        for chunk in plan_chunks(total_pages, chunk_size)
+    )
+
+
+class TestPlanChunks:
+    def test_windows_cover_all_pages(self):
+        chunks = plan_chunks(23, 10)
+        assert [len(c) for c in chunks] == [10, 10, 3]
+        assert sum(chunks, []) == list(range(23))
+
+    def test_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            plan_chunks(10, 0)
+
+
+class TestChunkedMarkerExtractor:
+    def test_extracts_and_assembles_in_order(self, tmp_path, pdf_path):
+        calls, progress = [], []
+        extractor = ChunkedMarkerExtractor(fake_convert(calls), chunk_size=10)
+        result = extractor.run(pdf_path, 23, tmp_path / "work", progress_callback=progress.append)
+
+        assert result.total_chunks == 3
+        assert result.resumed_chunks == 0
+        assert result.output_path.read_text() == expected_text(23, 10)
+        assert result.chars == len(expected_text(23, 10))
+        assert [p.percent for p in progress] == [43.5, 87.0, 100.0]
+        assert not list((tmp_path / "work").glob("chunk_*"))
+
+    def test_resume_after_crash(self, tmp_path, pdf_path):
+        work_dir = tmp_path / "work"
+        calls = []
+        crashing = ChunkedMarkerExtractor(fake_convert(calls, fail_at=20), chunk_size=10)
+        with pytest.raises(RuntimeError):
+            crashing.run(pdf_path, 35, work_dir)
+        assert calls == [list(range(0, 10)), list(range(10, 20))]
+
+        calls.clear()
+        progress = []
+        result = ChunkedMarkerExtractor(fake_convert(calls), chunk_size=10).run(
+            pdf_path, 35, work_dir, progress_callback=progress.append
+        )
+        assert [c[0] for c in calls] == [20, 30]
+        assert result.resumed_chunks == 2
+        assert [p.resumed for p in progress] == [True, True, False, False]
+        assert result.output_path.read_text() == expected_text(35, 10)
+
+    def test_checkpoint_of_other_pdf_discarded(self, tmp_path, pdf_path):
+        work_dir = tmp_path / "work"
+        with pytest.raises(RuntimeError):
+            ChunkedMarkerExtractor(fake_convert([], fail_at=10), chunk_size=10).run(
+                pdf_path, 20, work_dir
+            )
+
+        pdf_path.write_bytes(b"%PDF-1.4 other document")
+        calls = []
+        result = ChunkedMarkerExtractor(fake_convert(calls), chunk_size=10).run(
+            pdf_path, 20, work_dir
+        )
+        assert len(calls) == 2
+        assert result.resumed_chunks == 0
+
+    def test_settings_change_discards_checkpoint(self, tmp_path, pdf_path):
+        work_dir = tmp_path / "work"
+        with pytest.raises(RuntimeError):
+            ChunkedMarkerExtractor(fake_convert([], fail_at=10), chunk_size=10).run(
+                pdf_path, 20, work_dir, settings={"force_ocr": False}
+            )
+        calls = []
+        ChunkedMarkerExtractor(fake_convert(calls), chunk_size=10).run(
+            pdf_path, 20, work_dir, settings={"force_ocr": True}
+        )
+        assert len(calls) == 2
+
+
+RETRYABLE = (RuntimeError, ConnectionError, TimeoutError)
+
+
+def run_with_retries(pdf_path, total_pages, work_dir, converters, max_retries=3):
+    """Mimic extract_pdf under Celery autoretry: one converter per attempt."""
+    for retries, convert in enumerate(converters):
+        try:
+            return ChunkedMarkerExtractor(convert, chunk_size=10).run(pdf_path, total_pages, work_dir)
+        except Exception as e:
+            if not keep_checkpoint_for_retry(e, retries, max_retries, RETRYABLE):
+                shutil.rmtree(work_dir, ignore_errors=True)
+                raise
+
+
+class TestRetryCheckpoint:
+    def test_retry_resumes_from_manifest(self, tmp_path, pdf_path):
+        work_dir = tmp_path / "work"
+        first, second = [], []
+        result = run_with_retries(
+            pdf_path, 35, work_dir,
+            [fake_convert(first, fail_at=20), fake_convert(second)],
+        )
+        assert [c[0] for c in first] == [0, 10]
+        assert [c[0] for c in second] == [20, 30]
+        assert result.resumed_chunks == 2
+        assert result.output_path.read_text() == expected_text(35, 10)
+
+    def test_last_retry_removes_checkpoint(self, tmp_path, pdf_path):
+        work_dir = tmp_path / "work"
+        with pytest.raises(RuntimeError):
+            run_with_retries(
+                pdf_path, 20, work_dir,
+                [fake_convert([], fail_at=10) for _ in range(2)],
+                max_retries=1,
+            )
+        assert not work_dir.exists()
+
+    def test_non_retryable_error_removes_checkpoint(self):
+        assert not keep_checkpoint_for_retry(ValueError("bad pdf"), 0, 3, RETRYABLE)
+        assert not keep_checkpoint_for_retry(None, 0, 3, RETRYABLE)
+        assert keep_checkpoint_for_retry(TimeoutError(), 2, 3, RETRYABLE)
+        assert not keep_checkpoint_for_retry(TimeoutError(), 3, 3, RETRYABLE)
+        assert keep_checkpoint_for_retry(RuntimeError(), 10, None, RETRYABLE)
+
+
+class TestPageRangeConverter:
+    def test_reuses_converter_per_window(self):
+        seen = []
+
+        class FakeConverter:
+            def __init__(self):
+                self.config = {"paginate_output": True}
+
+            def __call__(self, path):
+                seen.append(list(self.config["page_range"]))
+                return SimpleNamespace(markdown=f"pages {self.config['page_range']}")
+
+        converter = FakeConverter()
+        convert = page_range_converter(converter)
+        assert convert("a.pdf", [0, 1]) == "pages [0, 1]"
+        assert convert("a.pdf", [2]) == "pages [2]"
+        assert seen == [[0, 1], [2]]
+        assert converter.config == {"paginate_output": True}
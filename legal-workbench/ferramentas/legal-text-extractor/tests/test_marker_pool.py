@@ -0,0 +1,119 @@
+"""
+Tests for the local multiprocessing chunk pool.
+
+Uses a fake worker factory (marker-pdf is not required) to check:
+1. Chunks run on warm per-process workers and are reassembled in page order
+2. Progress events follow the extract_pdf_chunked schema
+3. Chunk size is rebalanced so every process gets work
+4. Resume after a crash skips finished chunks (same plan with more workers)
+5. A worker killed mid-chunk fails the run instead of hanging it
+"""
+
+import os
+import sys
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+# Setup path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.engines.marker_pool import LocalChunkPool, balanced_chunk_size
+
+
+class FakeWorker:
+    """Picklable worker factory; fails (or dies) on a given first page if asked to."""
+
+    def __init__(self, fail_at: int = None, die_at: int = None):
+        self.fail_at = fail_at
+        self.die_at = die_at
+
+    def __call__(self):
+        warm_pid = os.getpid()
+
+        def convert(pdf_path: str, pages: list[int]) -> str:
+            if pages[0] == self.fail_at:
+                raise RuntimeError("worker killed")
+            if pages[0] == self.die_at:
+                os._exit(137)  # SIGKILL by the OOM killer: no exception, no result
+            assert os.getpid() == warm_pid  # converter built in this process
+            return "\n".join(f"page {page + 1}" for page in pages)
+
+        return convert
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "autos.pdf"
+    path.write_bytes(b"%PDF-1.4 fake content")
+    return path
+
+
+def expected_text(total_pages: int, chunk_size: int) -> str:
+    return "\n\n".join(
+        "\n".join(f"page {page + 1}" for page in range(start, min(start + chunk_size, total_pages)))
+        for start in range(0, total_pages, chunk_size)
+    )
+
+
+class TestBalancedChunkSize:
+    def test_shrinks_for_more_workers(self):
+        assert balanced_chunk_size(100, 50, 4) == 13
+        assert balanced_chunk_size(100, 10, 2) == 10
+        assert balanced_chunk_size(3, 50, 8) == 1
+
+
+class TestLocalChunkPool:
+    def test_parallel_extraction_in_order(self, tmp_path, pdf_path):
+        pool = LocalChunkPool(FakeWorker(), processes=2, chunk_size=5, start_method="fork")
+        events = list(pool.iter_extract(pdf_path, 23, tmp_path / "work"))
+
+        progress, result = events[:-1], events[-1]
+        assert result["type"] == "result"
+        data = result["data"]
+        assert data["text"] == expected_text(23, 5)
+        assert data["total_chunks"] == 5
+        assert data["workers_used"] == 2
+        assert [stat["chunk_id"] for stat in data["chunk_stats"]] == [0, 1, 2, 3, 4]
+
+        assert all(event["type"] == "progress" for event in progress)
+        assert set(progress[0]) == {
+            "type", "chunk", "total_chunks", "percent",
+            "pages_processed", "total_pages", "message",
+        }
+        assert progress[-1]["pages_processed"] == 23
+        assert progress[-1]["percent"] == 95
+
+    def test_resume_after_crash(self, tmp_path, pdf_path):
+        work_dir = tmp_path / "work"
+        crashing = LocalChunkPool(FakeWorker(fail_at=20), processes=1, chunk_size=10, start_method="fork")
+        with pytest.raises(RuntimeError):
+            crashing.extract(pdf_path, 30, work_dir)
+
+        data = LocalChunkPool(FakeWorker(), processes=1, chunk_size=10, start_method="fork").extract(
+            pdf_path, 30, work_dir
+        )
+        assert data["resumed_chunks"] == 2
+        assert [stat["chunk_id"] for stat in data["chunk_stats"]] == [2]
+        assert data["text"] == expected_text(30, 10)
+
+    def test_resume_with_more_workers_keeps_chunk_plan(self, tmp_path, pdf_path):
+        work_dir = tmp_path / "work"
+        crashing = LocalChunkPool(FakeWorker(fail_at=20), processes=1, chunk_size=10, start_method="fork")
+        with pytest.raises(RuntimeError):
+            crashing.extract(pdf_path, 30, work_dir)
+
+        # 4 workers would balance to 4-page chunks; the checkpoint was cut at 10
+        data = LocalChunkPool(FakeWorker(), processes=4, chunk_size=10, start_method="fork").extract(
+            pdf_path, 30, work_dir
+        )
+        assert data["chunk_size"] == 10
+        assert data["resumed_chunks"] == 2
+        assert data["text"] == expected_text(30, 10)
+
+    def test_killed_worker_fails_instead_of_hanging(self, tmp_path, pdf_path):
+        pool = LocalChunkPool(FakeWorker(die_at=10), processes=2, chunk_size=5, start_method="fork")
+        with pytest.raises(BrokenProcessPool):
+            pool.extract(pdf_path, 20, tmp_path / "work")
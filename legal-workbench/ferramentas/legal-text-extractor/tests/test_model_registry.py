@@ -0,0 +1,158 @@
+"""
+Tests for the process-wide Marker model registry.
+
+Uses a fake loader (marker-pdf is not required) to check:
+1. Lazy, single load under concurrent first leases
+2. Reference counting blocks unload while leased
+3. Idle unload after the configured timeout, reload on next lease
+4. Warmup (blocking and background) and metrics
+5. MarkerEngine instances share the registry
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Setup path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.engines import MarkerEngine, MarkerModelRegistry, get_marker_registry
+
+
+class FakeLoader:
+    """Counts loads; optional delay simulates create_model_dict()."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self) -> dict:
+        self.calls += 1
+        time.sleep(self.delay)
+        return {"layout_model": object(), "recognition_model": object()}
+
+
+class TestMarkerModelRegistry:
+    def test_lazy_load(self):
+        loader = FakeLoader()
+        registry = MarkerModelRegistry(loader=loader)
+        assert not registry.loaded
+        assert loader.calls == 0
+
+        with registry.lease() as models:
+            assert "layout_model" in models
+            assert registry.refcount == 1
+        assert registry.refcount == 0
+        assert registry.loaded
+
+    def test_concurrent_leases_load_once(self):
+        loader = FakeLoader(delay=0.05)
+        registry = MarkerModelRegistry(loader=loader)
+        seen = []
+
+        def worker():
+            with registry.lease() as models:
+                seen.append(id(models))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loader.calls == 1
+        assert len(set(seen)) == 1
+
+    def test_unload_blocked_while_leased(self):
+        registry = MarkerModelRegistry(loader=FakeLoader())
+        models = registry.acquire()
+        assert models is not None
+        assert not registry.unload()
+        registry.release()
+        assert registry.unload()
+        assert not registry.loaded
+
+    def test_release_without_acquire(self):
+        registry = MarkerModelRegistry(loader=FakeLoader())
+        with pytest.raises(RuntimeError):
+            registry.release()
+
+    def test_idle_unload_and_reload(self):
+        loader = FakeLoader()
+        registry = MarkerModelRegistry(loader=loader, idle_unload_seconds=0.05)
+        with registry.lease():
+            time.sleep(0.1)  # leased: timer not armed
+        assert registry.loaded
+
+        deadline = time.monotonic() + 2
+        while registry.loaded and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not registry.loaded
+        assert registry.stats()["unloads"] == 1
+
+        with registry.lease():
+            pass
+        assert loader.calls == 2
+        assert registry.generation == 2
+
+    def test_new_lease_cancels_idle_unload(self):
+        registry = MarkerModelRegistry(loader=FakeLoader(), idle_unload_seconds=0.1)
+        with registry.lease():
+            pass
+        models = registry.acquire()
+        time.sleep(0.2)
+        assert registry.loaded
+        registry.release()
+        assert models is not None
+
+    def test_warmup(self):
+        loader = FakeLoader(delay=0.02)
+        registry = MarkerModelRegistry(loader=loader)
+        registry.warmup()
+        assert registry.loaded
+
+        background = MarkerModelRegistry(loader=FakeLoader(delay=0.02))
+        thread = background.warmup(background=True)
+        thread.join(timeout=2)
+        assert background.loaded
+
+    def test_warmup_failure_propagates(self):
+        def broken():
+            raise RuntimeError("no models")
+
+        registry = MarkerModelRegistry(loader=broken)
+        with pytest.raises(RuntimeError):
+            registry.warmup()
+        assert registry.refcount == 0
+
+    def test_stats(self):
+        registry = MarkerModelRegistry(loader=FakeLoader(delay=0.02))
+        with registry.lease():
+            pass
+        stats = registry.stats()
+        assert stats["loaded"]
+        assert stats["loads"] == 1
+        assert stats["last_load_seconds"] >= 0.02
+        assert stats["process_resident_mb"] > 0
+        assert stats["model_resident_mb"] >= 0
+
+    def test_invalid_timeout(self):
+        with pytest.raises(ValueError):
+            MarkerModelRegistry(idle_unload_seconds=-1)
+
+
+class TestSharedRegistry:
+    def test_process_wide_singleton(self):
+        assert get_marker_registry() is get_marker_registry()
+
+    def test_marker_engines_share_registry(self):
+        engine = MarkerEngine()
+        other = MarkerEngine()
+        assert engine.registry is other.registry is get_marker_registry()
+
+        custom = MarkerModelRegistry(loader=FakeLoader())
+        assert MarkerEngine(registry=custom).registry is custom
@@ -0,0 +1,170 @@
+"""
+Testes para o cache persistente de páginas (src.cache).
+
+Valida que:
+1. Hash de conteúdo é estável e independe da posição da página no PDF
+2. Chave do cache separa engine e opções
+3. Despejo LRU respeita max_bytes e métricas de hit rate são contabilizadas
+4. PipelineOrchestrator pula a extração de páginas já vistas em outro job
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Setup path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.cache import PageCache, hash_pdf_pages
+from src.pipeline.orchestrator import PipelineOrchestrator
+from tests.synthetic_scans import SCAN_KINDS, write_scan_pdf
+
+
+@pytest.fixture(scope="module")
+def scans():
+    return [SCAN_KINDS["clean"](seed) for seed in range(3)]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PageCache(tmp_path / "page_cache.db", max_bytes=10_000)
+
+
+# =============================================================================
+# Hash de conteúdo
+# =============================================================================
+
+
+class TestPageHashing:
+    """Hashes de conteúdo por página."""
+
+    def test_stable_across_files(self, tmp_path, scans):
+        first = hash_pdf_pages(write_scan_pdf(scans, tmp_path / "a.pdf"))
+        second = hash_pdf_pages(write_scan_pdf(scans, tmp_path / "b.pdf"))
+        assert first == second
+        assert len(set(first)) == 3
+
+    def test_appended_pages_keep_hashes(self, tmp_path, scans):
+        """Reenvio do processo com páginas novas: páginas antigas não mudam."""
+        original = hash_pdf_pages(write_scan_pdf(scans[:2], tmp_path / "v1.pdf"))
+        extended = hash_pdf_pages(write_scan_pdf(scans, tmp_path / "v2.pdf"))
+        assert extended[:2] == original
+
+    def test_content_change_changes_hash(self, tmp_path, scans):
+        edited = scans[0].copy()
+        edited[100:110, 100:200] = 0
+        before = hash_pdf_pages(write_scan_pdf([scans[0]], tmp_path / "a.pdf"))
+        after = hash_pdf_pages(write_scan_pdf([edited], tmp_path / "b.pdf"))
+        assert before != after
+
+
+# =============================================================================
+# PageCache
+# =============================================================================
+
+
+class TestPageCache:
+    """Armazenamento, chaves e despejo."""
+
+    def test_roundtrip_and_persistence(self, tmp_path):
+        db_path = tmp_path / "cache.db"
+        PageCache(db_path).put("h1", "pdfplumber", "texto", {"safe_bbox": [0, 0, 10, 10]})
+        reopened = PageCache(db_path)
+        assert reopened.get("h1", "pdfplumber", {"safe_bbox": [0, 0, 10, 10]}) == "texto"
+
+    def test_key_depends_on_engine_and_options(self, cache):
+        cache.put("h1", "pdfplumber", "plumber", {"safe_bbox": [0, 0, 10, 10]})
+        assert cache.get("h1", "tesseract", {"safe_bbox": [0, 0, 10, 10]}) is None
+        assert cache.get("h1", "pdfplumber", {"safe_bbox": [0, 0, 20, 10]}) is None
+        # Ruído de ponto flutuante não gera chave nova
+        assert cache.get("h1", "pdfplumber", {"safe_bbox": [0, 0, 10.0001, 10]}) == "plumber"
+
+    def test_lru_eviction_bounded(self, cache):
+        for i in range(5):
+            cache.put(f"h{i}", "marker", "x" * 3000)
+            cache.get("h0", "marker")  # mantém h0 recente
+
+        stats = cache.stats()
+        assert stats["total_bytes"] <= cache.max_bytes
+        assert stats["entries"] == 3
+        assert stats["lifetime"]["evictions"] == 2
+        assert cache.get("h0", "marker") is not None
+        assert cache.get("h1", "marker") is None
+
+    def test_oversized_entry_skipped(self, cache):
+        cache.put("big", "marker", "x" * 20_000)
+        assert cache.stats()["entries"] == 0
+
+    def test_hit_rate_metrics(self, tmp_path):
+        db_path = tmp_path / "cache.db"
+        cache = PageCache(db_path)
+        cache.put("h1", "pdfplumber", "a")
+        cache.get("h1", "pdfplumber")
+        cache.get("h2", "pdfplumber")
+
+        assert cache.stats()["session"]["hit_rate"] == 0.5
+
+        other = PageCache(db_path)
+        other.get("h1", "pdfplumber")
+        stats = other.stats()
+        assert stats["session"]["hits"] == 1
+        assert stats["lifetime"]["hits"] == 2
+        assert stats["lifetime"]["misses"] == 1
+
+    def test_clear(self, cache):
+        cache.put("h1", "pdfplumber", "a")
+        cache.clear()
+        assert cache.get("h1", "pdfplumber") is None
+        assert cache.stats()["total_bytes"] == 0
+
+    def test_invalid_size(self, tmp_path):
+        with pytest.raises(ValueError):
+            PageCache(tmp_path / "cache.db", max_bytes=0)
+
+
+# =============================================================================
+# PipelineOrchestrator
+# =============================================================================
+
+
+class TestOrchestratorPageCache:
+    """Páginas inalteradas não passam pela extração no segundo job."""
+
+    @pytest.fixture
+    def orchestrator(self, tmp_path, monkeypatch):
+        orchestrator = PipelineOrchestrator(page_cache_path=tmp_path / "page_cache.db")
+        calls = []
+
+        def fake_extract(pdf_path, page_num, engine_name, page_data=None):
+            calls.append(page_num)
+            return f"texto da pagina {page_num}"
+
+        monkeypatch.setattr(orchestrator, "_extract_page_text", fake_extract)
+        orchestrator.extract_calls = calls
+        return orchestrator
+
+    def test_second_job_reuses_unchanged_pages(self, tmp_path, scans, orchestrator):
+        first = orchestrator.process(write_scan_pdf(scans[:2], tmp_path / "v1.pdf"))
+        assert first.success
+        assert orchestrator.extract_calls == [1, 2]
+        assert first.metadata["page_cache"]["hits"] == 0
+
+        orchestrator.extract_calls.clear()
+        second = orchestrator.process(write_scan_pdf(scans, tmp_path / "v2.pdf"))
+        assert orchestrator.extract_calls == [3]
+        assert second.metadata["page_cache"]["hits"] == 2
+        assert second.text.startswith(first.text)
+
+    def test_generator_reports_cache_hits(self, tmp_path, scans, orchestrator):
+        pdf_path = write_scan_pdf(scans[:2], tmp_path / "doc.pdf")
+        list(orchestrator.process_generator(pdf_path))
+        pages = list(orchestrator.process_generator(pdf_path))
+        assert [p["cache_hit"] for p in pages] == [True, True]
+        assert orchestrator._marker_cache == {}
+
+    def test_disabled_by_default(self, tmp_path, scans):
+        orchestrator = PipelineOrchestrator()
+        assert orchestrator.page_cache is None
+        assert orchestrator._hash_pages(tmp_path / "missing.pdf", []) == {}
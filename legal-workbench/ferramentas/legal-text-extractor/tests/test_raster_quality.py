@@ -0,0 +1,136 @@
+"""
+Testes para estimativa de qualidade raster (thumbnail) e roteamento de engine.
+
+Valida que:
+1. Scans limpos, sujos e degradados recebem métricas coerentes
+2. Marcas d'água (sólida e em mosaico) são detectadas; texto borrado não
+3. LayoutAnalyzer roteia scans limpos para tesseract e sujos para marker
+4. Pré-passe paralelo produz as mesmas métricas que o serial
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Setup path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import LayoutConfig, PageComplexity, PageType
+from src.core.raster_quality import compute_raster_quality, estimate_pages
+from src.steps.step_01_layout import LayoutAnalyzer
+from tests.synthetic_scans import (
+    A4_POINTS,
+    SCAN_KINDS,
+    add_watermark,
+    create_text_scan,
+    write_scan_pdf,
+)
+
+
+# =============================================================================
+# compute_raster_quality
+# =============================================================================
+
+
+class TestComputeRasterQuality:
+    """Métricas de imagem sobre thumbnails sintéticas."""
+
+    def test_clean_scan_high_contrast(self):
+        metrics = compute_raster_quality(create_text_scan(noise=3))
+        assert metrics["contrast_score"] > 0.8
+        assert metrics["noise_level"] < 0.3
+        assert not metrics["has_watermark"]
+
+    def test_dirty_scan_medium_contrast(self):
+        metrics = compute_raster_quality(create_text_scan(paper=200, ink=70, noise=8))
+        assert 0.4 < metrics["contrast_score"] < 0.8
+        assert not metrics["has_watermark"]
+
+    def test_degraded_scan(self):
+        metrics = compute_raster_quality(create_text_scan(paper=150, ink=90, noise=20))
+        assert metrics["contrast_score"] < 0.4
+        assert metrics["noise_level"] > 0.6
+
+    def test_blur_lowers_sharpness_not_watermark(self):
+        sharp = compute_raster_quality(create_text_scan())
+        blurred = compute_raster_quality(create_text_scan(blur=1.2))
+        assert blurred["sharpness"] < sharp["sharpness"] / 10
+        assert not blurred["has_watermark"]
+
+    @pytest.mark.parametrize("tiled", [True, False])
+    @pytest.mark.parametrize("seed", range(3))
+    def test_watermark_detected(self, tiled, seed):
+        page = add_watermark(create_text_scan(noise=4, seed=seed), tiled=tiled)
+        assert compute_raster_quality(page)["has_watermark"]
+
+    def test_tiled_watermark_is_periodic(self):
+        page = add_watermark(create_text_scan(), tiled=True)
+        assert compute_raster_quality(page)["periodicity"] > 100
+
+    def test_blank_page(self):
+        metrics = compute_raster_quality(np.full((842, 595), 250, dtype=np.uint8))
+        assert metrics["is_blank"]
+        assert metrics["contrast_score"] == 1.0
+
+    def test_rejects_color(self):
+        with pytest.raises(ValueError):
+            compute_raster_quality(np.zeros((10, 10, 3), dtype=np.uint8))
+
+
+# =============================================================================
+# LayoutAnalyzer
+# =============================================================================
+
+
+class TestLayoutAnalyzerRouting:
+    """Roteamento de engine com métricas reais."""
+
+    @pytest.fixture
+    def sample_pdf(self, tmp_path):
+        pages = [SCAN_KINDS[kind](seed) for seed, kind in enumerate(SCAN_KINDS)]
+        return write_scan_pdf(pages, tmp_path / "scans.pdf")
+
+    def test_routes_by_measured_quality(self, sample_pdf):
+        layout = LayoutAnalyzer().analyze(sample_pdf)
+        by_kind = dict(zip(SCAN_KINDS, layout["pages"]))
+
+        assert all(p["type"] == PageType.RASTER_NEEDED for p in layout["pages"])
+        assert by_kind["clean"]["complexity"] == PageComplexity.RASTER_CLEAN
+        assert by_kind["clean"]["recommended_engine"] == "tesseract"
+        assert by_kind["dirty"]["complexity"] == PageComplexity.RASTER_DIRTY
+        assert by_kind["degraded"]["complexity"] == PageComplexity.RASTER_DEGRADED
+        assert by_kind["watermark"]["recommended_engine"] == "marker"
+        assert "watermark_detected" in by_kind["watermark"]["cleaning_reason"]
+        assert "quality_metrics" in by_kind["clean"]
+
+    def test_single_page_path_matches_batch(self, sample_pdf):
+        import pdfplumber
+
+        analyzer = LayoutAnalyzer()
+        layout = analyzer.analyze(sample_pdf)
+        with pdfplumber.open(sample_pdf) as pdf:
+            single = [analyzer._analyze_page(page, i) for i, page in enumerate(pdf.pages, 1)]
+
+        for batch_page, single_page in zip(layout["pages"], single):
+            assert batch_page["complexity"] == single_page["complexity"]
+            assert batch_page["quality_metrics"]["contrast_score"] == pytest.approx(
+                single_page["quality_metrics"]["contrast_score"], abs=0.02
+            )
+
+    def test_parallel_prepass_matches_serial(self, tmp_path):
+        pages = [SCAN_KINDS[kind](seed) for seed in range(2) for kind in SCAN_KINDS]
+        pdf_path = write_scan_pdf(pages, tmp_path / "many.pdf")
+        jobs = [(i, [0, 0, *A4_POINTS]) for i in range(1, len(pages) + 1)]
+
+        serial = estimate_pages(pdf_path, jobs, max_workers=1)
+        parallel = estimate_pages(pdf_path, jobs, max_workers=2, parallel_min_pages=2)
+        assert serial == parallel
+
+    def test_parallel_config_in_analyzer(self, sample_pdf):
+        config = LayoutConfig(quality_max_workers=2, quality_parallel_min_pages=2)
+        serial = LayoutAnalyzer().analyze(sample_pdf)
+        parallel = LayoutAnalyzer(config=config).analyze(sample_pdf)
+        assert serial == parallel
@@ -0,0 +1,147 @@
+"""Testes para limpeza incremental pagina a pagina (StreamingCleaner)."""
+import random
+
+import pytest
+from PIL import Image
+
+from src.core.intelligence import AdvancedCleaner, StreamingCleaner
+from src.exporters.text import TextExporter
+from src.pipeline.orchestrator import PipelineOrchestrator
+
+
+def _synthetic_pages(seed: int, n_pages: int = 30) -> list[str]:
+    """Gera paginas com hifenizacao, sentencas quebradas e numeros de pagina."""
+    rng = random.Random(seed)
+    words = [
+        "processo", "autor", "réu", "contrato", "pala-", "vra,",
+        "sentença;", "Tribunal.", "decisão:", "“citação”",
+    ]
+    pages = []
+    for page_num in range(1, n_pages + 1):
+        lines = []
+        for _ in range(rng.randint(5, 40)):
+            lines.append(" ".join(rng.choice(words) for _ in range(rng.randint(1, 12))))
+            if rng.random() < 0.2:
+                lines.append("")
+        if rng.random() < 0.5:
+            lines.append(str(page_num))
+        pages.append("\n".join(lines))
+    return pages
+
+
+class TestStreamingCleaner:
+    """Test suite para StreamingCleaner"""
+
+    @pytest.fixture
+    def cleaner(self):
+        return AdvancedCleaner()
+
+    def test_hyphenation_across_page_break(self, cleaner):
+        """Palavra hifenizada no fim da pagina e unida a continuacao"""
+        pages = ["O autor requer a procedência da pala-", "vra dada pelo Tribunal."]
+        result = "".join(cleaner.clean_stream(pages, context_chars=20))
+        assert "palavra" in result
+
+    def test_broken_sentence_across_page_break(self, cleaner):
+        """Sentenca quebrada entre paginas e reunida"""
+        pages = ["Texto inicial completo.\nConforme decidido,", "o recurso foi provido."]
+        result = "".join(cleaner.clean_stream(pages, context_chars=30))
+        assert "decidido, o recurso" in result
+
+    @pytest.mark.parametrize("seed", range(10))
+    @pytest.mark.parametrize("context_chars", [100, 500])
+    def test_matches_batch_cleaning(self, cleaner, seed, context_chars):
+        """Resultado incremental equivale a limpeza do documento combinado"""
+        pages = _synthetic_pages(seed)
+        batch = cleaner.clean_page("\n\n".join(pages))
+        streamed = "".join(cleaner.clean_stream(pages, context_chars=context_chars))
+        assert streamed == batch
+
+    def test_buffer_bounded_by_page_plus_context(self, cleaner):
+        """Memoria de pico: maior pagina + contexto, nao o documento inteiro"""
+        pages = _synthetic_pages(seed=3, n_pages=60)
+        streamer = StreamingCleaner(clean_fn=cleaner.clean_page, context_chars=200)
+        list(streamer.stream(pages))
+
+        largest_page = max(len(p) for p in pages)
+        assert streamer.pages_fed == 60
+        assert streamer.peak_buffer_chars <= largest_page + 200 + len("\n\n")
+        assert streamer.peak_buffer_chars < sum(len(p) for p in pages) / 10
+
+    def test_empty_pages_skipped(self, cleaner):
+        """Paginas vazias (falhas de extracao) nao geram separadores extras"""
+        pages = ["Primeira página.", "", "   ", "Segunda página."]
+        result = "".join(cleaner.clean_stream(pages, context_chars=10))
+        assert result == "Primeira página.\n\nSegunda página."
+
+    def test_export_stream_writes_chunks(self, cleaner, tmp_path):
+        """TextExporter.export_stream escreve blocos diretamente no arquivo"""
+        pages = _synthetic_pages(seed=7)
+        output = tmp_path / "out" / "final.txt"
+
+        written = TextExporter().export_stream(
+            cleaner.clean_stream(pages, context_chars=300), output
+        )
+
+        content = output.read_text(encoding="utf-8")
+        assert written == len(content)
+        assert content == cleaner.clean_page("\n\n".join(pages))
+
+
+class TestProcessStreaming:
+    """PipelineOrchestrator.process_streaming: paginas limpas direto no arquivo"""
+
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        pages = [Image.new("L", (200, 300), 255) for _ in range(3)]
+        path = tmp_path / "autos.pdf"
+        pages[0].save(path, "PDF", save_all=True, append_images=pages[1:])
+        return path
+
+    @pytest.fixture
+    def orchestrator(self, monkeypatch):
+        orchestrator = PipelineOrchestrator()
+
+        def fake_extract(pdf_path, page_num, engine_name, page_data=None):
+            return f"Texto da página {page_num}.\nConforme decidido,"
+
+        monkeypatch.setattr(orchestrator, "_extract_page_text", fake_extract)
+        return orchestrator
+
+    def test_writes_cleaned_pages(self, orchestrator, pdf_path, tmp_path):
+        """Texto igual ao process_generator com collect_text=False + limpeza em lote"""
+        output = tmp_path / "out" / "final.txt"
+        result = orchestrator.process_streaming(pdf_path, output)
+
+        pages = [p["text"] for p in orchestrator.process_generator(pdf_path, collect_text=False)]
+        expected = orchestrator._clean_text("\n\n".join(pages))
+        assert result.success
+        assert result.text == ""
+        assert output.read_text(encoding="utf-8") == expected
+        assert result.metadata["chars_written"] == len(expected)
+        assert list(output.parent.iterdir()) == [output]
+
+    def test_pipeline_failure_leaves_no_output(self, orchestrator, tmp_path):
+        """Falha do pipeline: sem arquivo de saida (nem parcial)"""
+        output = tmp_path / "out" / "final.txt"
+        result = orchestrator.process_streaming(tmp_path / "inexistente.pdf", output)
+
+        assert not result.success
+        assert "output_path" not in result.metadata
+        assert not output.parent.exists() or not list(output.parent.iterdir())
+
+    def test_export_error_keeps_previous_output(self, orchestrator, pdf_path, tmp_path):
+        """Erro no meio da escrita: arquivo anterior intacto, parcial removido"""
+        output = tmp_path / "final.txt"
+        output.write_text("versao anterior", encoding="utf-8")
+
+        class FailingExporter(TextExporter):
+            def export_stream(self, chunks, output_path):
+                output_path.write_text(next(iter(chunks)), encoding="utf-8")
+                raise IOError("disco cheio")
+
+        with pytest.raises(IOError):
+            orchestrator.process_streaming(pdf_path, output, exporter=FailingExporter())
+
+        assert output.read_text(encoding="utf-8") == "versao anterior"
+        assert sorted(tmp_path.iterdir()) == sorted([output, pdf_path])